@@ -0,0 +1,139 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+""" Measures the time and peak memory allocated by each evaluation of a
+Workflow, excluding the work done by the data sources themselves.
+
+The workflow is made of layers of trivial data sources that add their
+inputs, so that the measurements are dominated by the overhead of the
+framework. Evaluations are measured with INFO log messages discarded, as
+in a normal run where the per-value messages of the execution layers are
+not formatted, and with INFO log messages handled, where they are.
+
+Run from the repository root with:
+
+    python -m benchmarks.benchmark_evaluation
+"""
+
+import argparse
+import logging
+import time
+import tracemalloc
+
+from force_bdss.api import (
+    DataValue,
+    ExecutionLayer,
+    InputSlotInfo,
+    KPISpecification,
+    OutputSlotInfo,
+    Workflow,
+)
+from force_bdss.tests.probe_classes.data_source import ProbeDataSourceFactory
+from force_bdss.tests.probe_classes.factory_registry import (
+    ProbeFactoryRegistry,
+)
+from force_bdss.tests.probe_classes.mco import ProbeMCOFactory
+
+
+def adder(model, parameters):
+    return [DataValue(value=sum(p.value for p in parameters))]
+
+
+def create_workflow(n_parameters, n_layers, n_data_sources):
+    """ Creates a workflow with `n_layers` layers of `n_data_sources`
+    data sources, each adding two values of the previous layer."""
+    plugin = ProbeFactoryRegistry().plugin
+    data_source_factory = ProbeDataSourceFactory(
+        plugin, input_slots_size=2, output_slots_size=1, run_function=adder
+    )
+    mco_factory = ProbeMCOFactory(plugin)
+    parameter_factory = mco_factory.parameter_factories[0]
+
+    mco_model = mco_factory.create_model()
+    names = ["p{}".format(index) for index in range(n_parameters)]
+    mco_model.parameters = [
+        parameter_factory.create_model({"name": name}) for name in names
+    ]
+
+    execution_layers = []
+    for layer_index in range(n_layers):
+        layer = ExecutionLayer()
+        outputs = []
+        for index in range(n_data_sources):
+            model = data_source_factory.create_model()
+            model.input_slot_info = [
+                InputSlotInfo(name=names[index % len(names)]),
+                InputSlotInfo(name=names[(index + 1) % len(names)]),
+            ]
+            output = "l{}_{}".format(layer_index, index)
+            model.output_slot_info = [OutputSlotInfo(name=output)]
+            outputs.append(output)
+            layer.data_sources.append(model)
+        execution_layers.append(layer)
+        names = outputs
+
+    mco_model.kpis = [KPISpecification(name=name) for name in names]
+    return Workflow(mco_model=mco_model, execution_layers=execution_layers)
+
+
+def measure(function, n_evaluations):
+    """ Returns the mean time (in seconds) and the mean peak of memory
+    allocated (in bytes) by each call to `function`."""
+    # Warm up the compiled execution plan and the data source pools
+    function()
+
+    start = time.perf_counter()
+    for _ in range(n_evaluations):
+        function()
+    elapsed = (time.perf_counter() - start) / n_evaluations
+
+    peak = 0
+    tracemalloc.start()
+    try:
+        for _ in range(n_evaluations):
+            tracemalloc.clear_traces()
+            function()
+            peak += tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return elapsed, peak / n_evaluations
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--parameters", type=int, default=10)
+    parser.add_argument("--layers", type=int, default=3)
+    parser.add_argument("--data-sources", type=int, default=5)
+    parser.add_argument("--evaluations", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    workflow = create_workflow(
+        args.parameters, args.layers, args.data_sources
+    )
+    parameter_values = list(range(args.parameters))
+
+    def evaluate():
+        return workflow.evaluate(parameter_values)
+
+    logger = logging.getLogger("force_bdss")
+    handler = logging.NullHandler()
+    level = logger.level
+
+    print("{:<10} {:>12} {:>20}".format(
+        "Logging", "Time (us)", "Peak memory (bytes)"))
+    for name, log_level in [("discarded", logging.WARNING),
+                            ("handled", logging.INFO)]:
+        logger.setLevel(log_level)
+        logger.addHandler(handler)
+        try:
+            elapsed, peak = measure(evaluate, args.evaluations)
+        finally:
+            logger.removeHandler(handler)
+            logger.setLevel(level)
+        print("{:<10} {:>12.1f} {:>20.0f}".format(
+            name, elapsed * 1e6, peak))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+""" Compares the incremental ParetoArchive with a pure Python filter of
+the non-dominated points, as a listener of the MCO progress events would
+implement it.
+
+Points are streamed one at a time, as an AposterioriOptimizerEngine
+yields them, with KPIs drawn near a front so that a large fraction of
+them is non-dominated. The pure Python filter is quadratic in the size of
+the front, so it is skipped above `--max-naive-points` points. Run from
+the repository root with:
+
+    python -m benchmarks.benchmark_pareto_archive
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+# Import the API first to avoid circular imports of the engines
+import force_bdss.api  # noqa: F401
+from force_bdss.mco.optimizer_engines.pareto_archive import ParetoArchive
+
+
+def front_points(n_points, n_kpis, seed=0):
+    """ Returns `n_points` random scores near a linear front."""
+    random_state = np.random.RandomState(seed)
+    points = random_state.random_sample((n_points, n_kpis))
+    points[:, 0] = 1.0 - points[:, 1:].sum(axis=1) / n_kpis
+    return points + 0.05 * random_state.random_sample(points.shape)
+
+
+def naive_filter(points):
+    """ Keeps the non-dominated points in a list, comparing each new
+    point with all of them in pure Python."""
+    front = []
+    for point in points.tolist():
+        if any(
+                all(a <= b for a, b in zip(other, point))
+                for other in front):
+            continue
+        front = [
+            other for other in front
+            if not all(a <= b for a, b in zip(point, other))
+        ]
+        front.append(point)
+    return front
+
+
+def archive_filter(points):
+    archive = ParetoArchive()
+    for point in points:
+        archive.add(point)
+    return archive.scores()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "--points", type=int, nargs="+", default=[500, 1000, 2000])
+    parser.add_argument("--kpis", type=int, nargs="+", default=[2, 3, 5])
+    parser.add_argument("--max-naive-points", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    print("{:<8} {:>8} {:>8} {:>12} {:>12}".format(
+        "KPIs", "Points", "Front", "Naive (s)", "Archive (s)"))
+    for n_kpis in args.kpis:
+        for n_points in args.points:
+            points = front_points(n_points, n_kpis)
+
+            start = time.perf_counter()
+            scores = archive_filter(points)
+            archive_time = time.perf_counter() - start
+
+            naive_time = "-"
+            if n_points <= args.max_naive_points:
+                start = time.perf_counter()
+                front = naive_filter(points)
+                naive_time = "{:.3f}".format(time.perf_counter() - start)
+                assert len(front) == len(scores)
+
+            print("{:<8} {:>8} {:>8} {:>12} {:>12.3f}".format(
+                n_kpis, n_points, len(scores), naive_time, archive_time))
+
+
+if __name__ == "__main__":
+    main()
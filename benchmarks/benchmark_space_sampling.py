@@ -0,0 +1,146 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+""" Compares how evenly the space samplers cover the simplex of the KPI
+weights, for the same number of samples.
+
+Each weight sample costs a full minimization to the WeightedOptimizer
+Engine, so a sampler that covers the simplex with fewer samples finds a
+comparable Pareto front faster. For each sampler, two measures are
+estimated against a dense set of reference points drawn uniformly from
+the simplex:
+
+- the dispersion, i.e. the mean and maximum distance from a reference
+  point to its nearest sample. Lower is better.
+- the energy distance between the samples and the uniform distribution
+  on the simplex, which is a discrepancy measure. Lower is better.
+
+Random samplers are averaged over several seeds. Run from the repository
+root with:
+
+    python -m benchmarks.benchmark_space_sampling
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+# Import the API first to avoid circular imports of the engines
+import force_bdss.api  # noqa: F401
+from force_bdss.mco.optimizer_engines.space_sampling import (
+    DirichletSpaceSampler,
+    HaltonSpaceSampler,
+    LatinHypercubeSpaceSampler,
+    SobolSpaceSampler,
+    UniformSpaceSampler,
+    resolution_to_sample_size,
+    unit_cube_to_simplex,
+)
+
+#: Samplers to compare, and whether their samples depend on a seed
+SAMPLERS = [
+    ("Uniform", UniformSpaceSampler, False),
+    ("Dirichlet", DirichletSpaceSampler, True),
+    ("Sobol", SobolSpaceSampler, True),
+    ("Halton", HaltonSpaceSampler, True),
+    ("LatinHypercube", LatinHypercubeSpaceSampler, True),
+]
+
+
+def reference_points(dimension, n_points, seed=0):
+    """ Draws `n_points` reference points uniformly from the simplex."""
+    random_state = np.random.RandomState(seed)
+    return unit_cube_to_simplex(
+        random_state.random_sample((n_points, dimension - 1))
+    )
+
+
+def nearest_distances(points, samples, chunk_size=1024):
+    """ Returns the distance from each of the `points` to its nearest
+    sample."""
+    distances = []
+    for start in range(0, len(points), chunk_size):
+        chunk = points[start:start + chunk_size]
+        differences = chunk[:, None, :] - samples[None, :, :]
+        distances.append(np.sqrt((differences ** 2).sum(axis=2)).min(axis=1))
+    return np.concatenate(distances)
+
+
+def mean_distance(first, second, chunk_size=1024):
+    """ Returns the mean distance between the points of `first` and
+    `second`."""
+    total = 0.0
+    for start in range(0, len(first), chunk_size):
+        chunk = first[start:start + chunk_size]
+        differences = chunk[:, None, :] - second[None, :, :]
+        total += np.sqrt((differences ** 2).sum(axis=2)).sum()
+    return total / (len(first) * len(second))
+
+
+def energy_distance(samples, reference, reference_self_distance):
+    """ Estimates the energy distance between the distribution of the
+    `samples` and the uniform distribution of the `reference` points."""
+    return (
+        2 * mean_distance(samples, reference)
+        - mean_distance(samples, samples)
+        - reference_self_distance
+    )
+
+
+def measure(sampler, reference, reference_self_distance):
+    """ Returns the generation time, mean and maximum dispersion and
+    energy distance of the samples of `sampler`."""
+    start = time.perf_counter()
+    samples = np.array(list(sampler.generate_space_sample()))
+    elapsed = time.perf_counter() - start
+
+    distances = nearest_distances(reference, samples)
+    return (
+        elapsed,
+        distances.mean(),
+        distances.max(),
+        energy_distance(samples, reference, reference_self_distance),
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "--dimensions", type=int, nargs="+", default=[3, 5, 8])
+    parser.add_argument("--resolution", type=int, default=5)
+    parser.add_argument("--references", type=int, default=4000)
+    parser.add_argument("--seeds", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print("{:<10} {:<15} {:>8} {:>10} {:>10} {:>10} {:>10}".format(
+        "Dimension", "Sampler", "Samples", "Time (ms)", "Mean disp",
+        "Max disp", "Energy"))
+    for dimension in args.dimensions:
+        reference = reference_points(dimension, args.references)
+        reference_self_distance = mean_distance(
+            reference, reference_points(dimension, args.references, seed=1)
+        )
+        n_samples = resolution_to_sample_size(dimension, args.resolution)
+
+        for name, klass, seeded in SAMPLERS:
+            seeds = range(args.seeds) if seeded else [None]
+            results = []
+            for seed in seeds:
+                kwargs = {} if seed is None else {"seed": seed}
+                sampler = klass(dimension, args.resolution, **kwargs)
+                results.append(
+                    measure(sampler, reference, reference_self_distance)
+                )
+            elapsed, mean_dispersion, max_dispersion, energy = np.mean(
+                results, axis=0)
+            print(
+                "{:<10} {:<15} {:>8} {:>10.2f} {:>10.4f} {:>10.4f} "
+                "{:>10.5f}".format(
+                    dimension, name, n_samples, elapsed * 1e3,
+                    mean_dispersion, max_dispersion, energy)
+            )
+
+
+if __name__ == "__main__":
+    main()
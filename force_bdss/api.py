@@ -41,12 +41,16 @@ from .mco.base_mco_factory import BaseMCOFactory  # noqa
 from .mco.i_evaluator import IEvaluator  # noqa
 from .mco.i_mco_factory import IMCOFactory  # noqa
 from .mco.optimizers.i_optimizer import IOptimizer  # noqa
+from .mco.optimizers.i_ask_tell_optimizer import IAskTellOptimizer  # noqa
+from .mco.optimizers.ask_tell_adapter import CallbackAskTellAdapter  # noqa
 from .mco.parameters.base_mco_parameter_factory import BaseMCOParameterFactory  # noqa
 from .mco.parameters.base_mco_parameter import BaseMCOParameter  # noqa
 from .mco.parameters.mco_parameters import FixedMCOParameterFactory, RangedMCOParameterFactory, ListedMCOParameterFactory, CategoricalMCOParameterFactory, RangedVectorMCOParameterFactory  # noqa
 from .mco.parameters.mco_parameters import FixedMCOParameter, RangedMCOParameter, ListedMCOParameter, CategoricalMCOParameter, RangedVectorMCOParameter  # noqa
-from .mco.optimizer_engines.base_optimizer_engine import BaseOptimizerEngine  # noqa
+from .mco.optimizer_engines.base_optimizer_engine import BaseOptimizerEngine, EvaluationBudgetExhausted  # noqa
 from .mco.optimizer_engines.weighted_optimizer_engine import WeightedOptimizerEngine  # noqa
+from .mco.optimizer_engines.surrogate_optimizer_engine import SurrogateOptimizerEngine  # noqa
+from .mco.optimizer_engines.grid_search_optimizer_engine import GridSearchOptimizerEngine  # noqa
 from .mco.optimizers.scipy_optimizer import ScipyOptimizer # noqa
 from .mco.optimizers.scipy_optimizer import SCIPY_ALGORITHMS_KEYS # noqa
 
@@ -13,6 +13,9 @@ from traits.api import (
     provides,
     on_trait_change
 )
+from force_bdss.core.timing_summary import DataSourceTimingSummary
+from force_bdss.events.data_source_events import DataSourceTimingEvent
+from force_bdss.events.mco_events import MCOProgressEvent
 from force_bdss.notification_listeners.base_notification_listener import (
     BaseNotificationListener,
 )
@@ -47,6 +50,11 @@ class BaseOperation(HasStrictTraits):
     #: should be paused and then resumed.
     _pause_event = Instance(ThreadingEvent, visible=False, transient=True)
 
+    #: Statistics of the data source runs, reported with the finish event
+    _timing_summary = Instance(
+        DataSourceTimingSummary, (), visible=False, transient=True
+    )
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._stop_event = ThreadingEvent()
@@ -61,18 +69,48 @@ class BaseOperation(HasStrictTraits):
 
     def verify_workflow(self):
         self.workflow_file.verify()
-        if len(self.workflow_file.errors) != 0:
+        errors = []
+        for error in self.workflow_file.errors:
+            if error.severity == "information":
+                # Information messages (such as the data sources skipped
+                # by the workflow) do not prevent the execution
+                log.warning(error.global_error)
+            else:
+                errors.append(error)
+        if len(errors) != 0:
             log.error("Unable to execute workflow due to "
                       "verification errors:")
-            for error in self.workflow_file.errors:
+            for error in errors:
                 log.error(error.local_error)
             raise RuntimeError("Workflow file has errors.")
 
     def _deliver_start_event(self):
-        self.workflow.mco_model.notify_start_event()
+        self._timing_summary.clear()
+        checkpoint = self.workflow.checkpoint
+        if checkpoint is not None and checkpoint.resumed:
+            self.workflow.mco_model.notify_start_event(resumed=True)
+        else:
+            self.workflow.mco_model.notify_start_event()
 
     def _deliver_finish_event(self):
-        self.workflow.mco_model.notify_finish_event()
+        timing_summary = self._timing_summary.summary()
+        overhead_ratio = self._timing_summary.overhead_ratio()
+        if timing_summary:
+            log.info("Data source timings (wall clock, in seconds):")
+            for label, stats in timing_summary.items():
+                log.info(
+                    "{}: {} runs, mean {:.3g}, p95 {:.3g}, max {:.3g}, "
+                    "overhead ratio {:.3g}".format(
+                        label, stats["count"], stats["mean"], stats["p95"],
+                        stats["max"], stats["overhead_ratio"]
+                    )
+                )
+            log.info(
+                "Framework overhead ratio: {:.3g}".format(overhead_ratio)
+            )
+        self.workflow.mco_model.notify_finish_event(
+            timing_summary=timing_summary, overhead_ratio=overhead_ratio
+        )
 
     @on_trait_change("workflow_file:workflow:event")
     def _deliver_event(self, event):
@@ -81,7 +119,18 @@ class BaseOperation(HasStrictTraits):
         Delivers an event to the listeners, and performs the
         control events check after the `event` is delivered.
         """
-        for listener in self.listeners[:]:
+        if isinstance(event, DataSourceTimingEvent):
+            self._timing_summary.record(event)
+
+        listeners = self.listeners[:]
+        checkpoint = self.workflow.checkpoint
+        if (isinstance(event, MCOProgressEvent)
+                and checkpoint is not None
+                and not checkpoint.record_event(event)):
+            # The event was delivered before the run was resumed
+            listeners = []
+
+        for listener in listeners:
             try:
                 listener.deliver(event)
             except Exception:
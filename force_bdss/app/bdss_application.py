@@ -10,14 +10,17 @@ from stevedore.exception import NoMatches
 
 from envisage.api import Application
 from envisage.core_plugin import CorePlugin
-from traits.api import Instance
+from traits.api import Bool, Either, Float, Instance, Str
 from traits.etsconfig.api import ETSConfig
 
+from force_bdss.core.checkpoint import OptimizationCheckpoint
+from force_bdss.core.evaluation_cache import EvaluationCache, hash_workflow
 from force_bdss.core.i_factory_registry import IFactoryRegistry
 from force_bdss.core_plugins.factory_registry_plugin import (
     FactoryRegistryPlugin
 )
 from force_bdss.io.workflow_reader import WorkflowReader
+from force_bdss.local_traits import PositiveInt
 from .workflow_file import WorkflowFile
 from .i_operation import IOperation
 
@@ -41,6 +44,30 @@ class BDSSApplication(Application):
     #: The operation to be performed.
     operation = Instance(IOperation)
 
+    #: Path of the persistent cache of the workflow evaluations. If empty,
+    #: no evaluation is cached.
+    evaluation_cache_path = Str()
+
+    #: Whether the time spent in each stage of the data source runs is
+    #: measured, and summarised when the operation finishes.
+    timing_enabled = Bool(False)
+
+    #: Path of the checkpoint of the optimization. If empty, no checkpoint
+    #: is saved.
+    checkpoint_path = Str()
+
+    #: Minimum time between two saves of the checkpoint, in seconds
+    checkpoint_interval = Float(300.0)
+
+    #: Whether the optimization is resumed from the checkpoint at
+    #: `checkpoint_path`
+    resume = Bool(False)
+
+    #: Number of progress events between the MCOProgressMetricEvents
+    #: fired by the MCO model. If None, the `progress_metric_interval` of
+    #: the MCO model is left unchanged.
+    progress_metric_interval = Either(None, PositiveInt)
+
     def __init__(self, evaluate, workflow_file, toolkit='null', **traits):
         self._set_ets_toolkit(toolkit)
 
@@ -95,6 +122,37 @@ class BDSSApplication(Application):
             )
             raise
 
+        if self.evaluation_cache_path:
+            self.workflow_file.workflow.evaluation_cache = EvaluationCache(
+                path=self.evaluation_cache_path
+            )
+        self.workflow_file.workflow.timing_enabled = self.timing_enabled
+        mco_model = self.workflow_file.workflow.mco_model
+        if (self.progress_metric_interval is not None
+                and mco_model is not None):
+            mco_model.progress_metric_interval = (
+                self.progress_metric_interval
+            )
+
+        if self.checkpoint_path:
+            checkpoint = OptimizationCheckpoint(
+                path=self.checkpoint_path,
+                interval=self.checkpoint_interval,
+                workflow_key=hash_workflow(
+                    self.workflow_file.workflow, include_mco_settings=True
+                ),
+            )
+            if self.resume:
+                try:
+                    checkpoint.load()
+                except Exception:
+                    log.exception(
+                        "Unable to resume from checkpoint '{}'.".format(
+                            self.checkpoint_path)
+                    )
+                    raise
+            self.workflow_file.workflow.checkpoint = checkpoint
+
     def _set_ets_toolkit(self, toolkit='null'):
         # This is a command-line app, we don't want GUI event loops
         try:
@@ -40,6 +40,7 @@ class EvaluateOperation(BaseOperation):
             # teared down afterwards.
             raise
         finally:
+            self.workflow.shutdown_worker_pools()
             # Tear down listeners
             self._finalize_listeners()
 
@@ -31,6 +31,9 @@ class OptimizeOperation(BaseOperation):
         self._initialize_listeners()
         self._deliver_start_event()
 
+        # Reuse data source instances for all the evaluations of the run
+        self.workflow.setup_data_sources()
+
         try:
             mco.run(self.workflow)
         except Exception:
@@ -43,9 +46,13 @@ class OptimizeOperation(BaseOperation):
             )
             raise
         finally:
+            self.workflow.teardown_data_sources()
+            self.workflow.shutdown_worker_pools()
             # Tear down listeners
             self._deliver_finish_event()
             self._finalize_listeners()
+            if self.workflow.checkpoint is not None:
+                self.workflow.checkpoint.save()
 
     def create_mco(self):
         """ Create the MCO from the model's factory. """
@@ -12,6 +12,7 @@ from force_bdss.tests.probe_classes.workflow_file import (
 )
 from force_bdss.tests.probe_classes.notification_listener import (
     ProbeUIEventNotificationListener)
+from force_bdss.events.data_source_events import DataSourceTimingEvent
 from force_bdss.events.mco_events import (
     MCOStartEvent,
     MCOFinishEvent
@@ -146,6 +147,36 @@ class TestBaseOperation(TestCase):
         self.operation._deliver_finish_event()
         self.assertIsInstance(listener.deliver_call_args[0][0], MCOFinishEvent)
 
+        # The finish event reports the timings of the data sources
+        self.operation._deliver_start_event()
+        self.operation.workflow.execution_layers[0].data_sources[0].notify(
+            DataSourceTimingEvent(
+                data_source_name="Adder",
+                wall_times={"bind": 1.0, "run": 4.0},
+            )
+        )
+        with testfixtures.LogCapture() as capture:
+            self.operation._deliver_finish_event()
+            capture.check_present(
+                (
+                    "force_bdss.app.base_operation",
+                    "INFO",
+                    "Adder: 1 runs, mean 5, p95 5, max 5, "
+                    "overhead ratio 0.25",
+                )
+            )
+        finish_event = listener.deliver_call_args[0][0]
+        self.assertIsInstance(finish_event, MCOFinishEvent)
+        self.assertEqual(["Adder"], list(finish_event.timing_summary))
+        self.assertEqual(1, finish_event.timing_summary["Adder"]["count"])
+        self.assertEqual(0.25, finish_event.overhead_ratio)
+
+        # Timings are reset at the start of each run
+        self.operation._deliver_start_event()
+        self.operation._deliver_finish_event()
+        finish_event = listener.deliver_call_args[0][0]
+        self.assertEqual({}, finish_event.timing_summary)
+
         # Now initialise a set of listeners that will raise an
         # exception when delivered to test error handling
         factory = self.registry.notification_listener_factories[0]
@@ -1,6 +1,9 @@
 #  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
 #  All rights reserved.
 
+import os
+import shutil
+import tempfile
 import unittest
 import warnings
 
@@ -12,8 +15,11 @@ from force_bdss.app.bdss_application import (
     BDSSApplication, _load_failure_callback, _import_extensions
 )
 from force_bdss.app.optimize_operation import OptimizeOperation
+from force_bdss.core.checkpoint import OptimizationCheckpoint
 from force_bdss.core.workflow import Workflow
+from force_bdss.io.workflow_reader import WorkflowReader
 from force_bdss.tests import fixtures
+from force_bdss.tests.probe_classes.workflow_file import ProbeWorkflowFile
 
 from unittest import mock
 
@@ -99,6 +105,123 @@ class TestBDSSApplication(unittest.TestCase):
 
         self.assertIsInstance(app.workflow_file.workflow, Workflow)
 
+    def test_evaluation_cache(self):
+        with testfixtures.LogCapture():
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                app = BDSSApplication(
+                    False, fixtures.get("test_empty.json")
+                )
+                app._load_workflow()
+        self.assertIsNone(app.workflow_file.workflow.evaluation_cache)
+
+        with testfixtures.LogCapture():
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                app = BDSSApplication(
+                    False, fixtures.get("test_empty.json"),
+                    evaluation_cache_path="cache.sqlite"
+                )
+                app._load_workflow()
+        cache = app.workflow_file.workflow.evaluation_cache
+        self.assertEqual("cache.sqlite", cache.path)
+
+    def test_checkpoint(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        path = os.path.join(tmp_dir, "checkpoint.pkl")
+
+        with testfixtures.LogCapture():
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                app = BDSSApplication(
+                    False, fixtures.get("test_empty.json"),
+                    checkpoint_path=path, checkpoint_interval=10.0,
+                )
+                app._load_workflow()
+        checkpoint = app.workflow_file.workflow.checkpoint
+        self.assertEqual(path, checkpoint.path)
+        self.assertEqual(10.0, checkpoint.interval)
+        self.assertFalse(checkpoint.resumed)
+        checkpoint.record_evaluation([1.0], [2.0])
+        checkpoint.save()
+
+        with testfixtures.LogCapture():
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                app = BDSSApplication(
+                    False, fixtures.get("test_empty.json"),
+                    checkpoint_path=path, resume=True,
+                )
+                app._load_workflow()
+        checkpoint = app.workflow_file.workflow.checkpoint
+        self.assertTrue(checkpoint.resumed)
+        self.assertEqual([([1.0], [2.0])], checkpoint.evaluations)
+
+        # Checkpoints of other workflows are rejected
+        OptimizationCheckpoint(path=path, workflow_key="other").save()
+        with testfixtures.LogCapture() as capture:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                app = BDSSApplication(
+                    False, fixtures.get("test_empty.json"),
+                    checkpoint_path=path, resume=True,
+                )
+                with self.assertRaises(ValueError):
+                    app._load_workflow()
+        capture.check_present(
+            (
+                "force_bdss.app.bdss_application",
+                "ERROR",
+                "Unable to resume from checkpoint '{}'.".format(path),
+            )
+        )
+
+    def test_timing_enabled(self):
+        with testfixtures.LogCapture():
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                app = BDSSApplication(
+                    False, fixtures.get("test_empty.json"),
+                    timing_enabled=True
+                )
+                app._load_workflow()
+        workflow = app.workflow_file.workflow
+        self.assertTrue(workflow.timing_enabled)
+        for layer in workflow.execution_layers:
+            self.assertTrue(layer.timing_enabled)
+
+    def test_progress_metric_interval(self):
+        workflow_file = ProbeWorkflowFile(path=fixtures.get("test_probe.json"))
+        workflow_file.read()
+        workflow = workflow_file.workflow
+
+        for interval in [None, 5]:
+            with testfixtures.LogCapture():
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore")
+                    app = BDSSApplication(
+                        False, fixtures.get("test_probe.json"),
+                        progress_metric_interval=interval
+                    )
+                    with mock.patch.object(
+                            WorkflowReader, "read", return_value=workflow):
+                        app._load_workflow()
+            self.assertEqual(
+                interval, workflow.mco_model.progress_metric_interval
+            )
+
+        # Workflows without MCO are left as they are
+        with testfixtures.LogCapture():
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                app = BDSSApplication(
+                    False, fixtures.get("test_empty.json"),
+                    progress_metric_interval=5
+                )
+                app._load_workflow()
+        self.assertIsNone(app.workflow_file.workflow.mco_model)
+
     def test_run_workflow_error(self):
 
         with testfixtures.LogCapture() as capture:
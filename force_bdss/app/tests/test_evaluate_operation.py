@@ -76,6 +76,10 @@ class TestEvaluateOperation(TestCase):
             )):
                 self.operation.run()
             capture.check(
+                # Without KPIs, no data source is used
+                ('force_bdss.app.base_operation', 'WARNING',
+                 "Data source 'test_data_source' does not contribute to "
+                 "any KPI"),
                 ('force_bdss.app.base_operation',
                  'ERROR',
                  'Unable to execute workflow due to verification errors:'),
@@ -1,14 +1,19 @@
 #  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
 #  All rights reserved.
 
+import os
+import shutil
+import tempfile
 from unittest import TestCase, mock
 
 import testfixtures
 
 from force_bdss.app.optimize_operation import OptimizeOperation
+from force_bdss.core.checkpoint import OptimizationCheckpoint
 from force_bdss.core.data_value import DataValue
 from force_bdss.events.mco_events import (
     MCOProgressEvent,
+    MCOStartEvent,
 )
 from force_bdss.mco.base_mco import BaseMCO
 from force_bdss.tests import fixtures
@@ -110,6 +115,29 @@ class TestOptimizeOperation(TestCase):
                 )
             )
 
+    def test_data_sources_lifecycle(self):
+        workflow = self.operation.workflow
+        with mock.patch.object(
+                type(workflow), "setup_data_sources") as mock_setup, \
+                mock.patch.object(
+                    type(workflow), "teardown_data_sources") as mock_teardown:
+            self.operation.run()
+        mock_setup.assert_called_once()
+        mock_teardown.assert_called_once()
+
+        # Data sources are torn down even if the MCO raises
+        def run_func(*args, **kwargs):
+            raise Exception("run_func")
+
+        mco_factory = self.registry.mco_factories[0]
+        mco_factory.optimizer.run_function = run_func
+        with mock.patch.object(
+                type(workflow), "teardown_data_sources") as mock_teardown:
+            with testfixtures.LogCapture():
+                with self.assertRaises(Exception):
+                    self.operation.run()
+        mock_teardown.assert_called_once()
+
     def test_progress_event_handling(self):
 
         self.operation._initialize_listeners()
@@ -131,6 +159,50 @@ class TestOptimizeOperation(TestCase):
         self.assertEqual(3, event.optimal_kpis[0].value, 3)
         self.assertEqual(4, event.optimal_kpis[1].value, 4)
 
+    def test_resumed_progress_events(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        path = os.path.join(tmp_dir, "checkpoint.pkl")
+        mco_model = self.operation.workflow.mco_model
+
+        # Progress events delivered before the interruption
+        self.operation.workflow.checkpoint = OptimizationCheckpoint(
+            path=path
+        )
+        self.operation._initialize_listeners()
+        mco_model.notify_progress_event(
+            [DataValue(value=1)], [DataValue(value=2)]
+        )
+        self.operation.workflow.checkpoint.save()
+
+        checkpoint = OptimizationCheckpoint(path=path)
+        checkpoint.load()
+        self.operation.workflow.checkpoint = checkpoint
+        self.operation._initialize_listeners()
+        listener = self.operation.listeners[0]
+
+        self.operation._deliver_start_event()
+        event = listener.deliver_call_args[0][0]
+        self.assertIsInstance(event, MCOStartEvent)
+        self.assertTrue(event.resumed)
+
+        # The replayed event is not delivered again, unlike new ones
+        listener.deliver_called = False
+        mco_model.notify_progress_event(
+            [DataValue(value=1)], [DataValue(value=2)]
+        )
+        self.assertFalse(listener.deliver_called)
+        mco_model.notify_progress_event(
+            [DataValue(value=3)], [DataValue(value=4)]
+        )
+        self.assertTrue(listener.deliver_called)
+        self.assertEqual(2, len(checkpoint.emitted_events))
+
+        # The checkpoint is saved at the end of the run
+        with mock.patch.object(OptimizationCheckpoint, "save") as mock_save:
+            self.operation.run()
+        mock_save.assert_called_once()
+
     def test_terminating_workflow(self):
         self.operation._stop_event.set()
         self.operation._initialize_listeners()
@@ -229,6 +301,13 @@ class TestOptimizeOperation(TestCase):
             ):
                 self.operation.run()
             capture.check(
+                # Without KPIs, no data source is used
+                (
+                    "force_bdss.app.base_operation",
+                    "WARNING",
+                    "Data source 'test_data_source' does not contribute to "
+                    "any KPI"
+                ),
                 (
                     "force_bdss.app.base_operation",
                     "ERROR",
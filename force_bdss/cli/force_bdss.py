@@ -19,8 +19,36 @@ push_exception_handler(reraise_exceptions=True)
               type=click.Path(exists=False),
               help="If specified, the log filename. "
                    " If unspecified, the log will be written to stdout.")
+@click.option("--evaluation-cache",
+              type=click.Path(exists=False),
+              help="If specified, the file of a persistent cache of the "
+                   "workflow evaluations, reused across runs.")
+@click.option("--timing",
+              is_flag=True,
+              help="Measures the time spent in each data source, and logs "
+                   "a summary at the end of the run.")
+@click.option("--checkpoint",
+              type=click.Path(exists=False),
+              help="If specified, the file where the progress of the "
+                   "optimization is saved periodically, so that it can be "
+                   "resumed with --resume.")
+@click.option("--checkpoint-interval",
+              type=float,
+              default=300.0,
+              show_default=True,
+              help="Minimum time between two checkpoints, in seconds.")
+@click.option("--resume",
+              type=click.Path(exists=True),
+              help="Resumes the optimization saved in the given checkpoint "
+                   "file, which keeps being updated.")
+@click.option("--progress-metric-interval",
+              type=click.IntRange(min=1),
+              help="If specified, the number of progress events between "
+                   "the reports of the hypervolume of the KPIs.")
 @click.argument('workflow_filepath', type=click.Path(exists=True))
-def run(evaluate, logfile, workflow_filepath):
+def run(evaluate, logfile, evaluation_cache, timing, checkpoint,
+        checkpoint_interval, resume, progress_metric_interval,
+        workflow_filepath):
     logging_config = {}
     logging_config["level"] = logging.INFO
 
@@ -33,7 +61,13 @@ def run(evaluate, logfile, workflow_filepath):
     try:
         application = BDSSApplication(
             evaluate=evaluate,
-            workflow_file=workflow_filepath
+            workflow_file=workflow_filepath,
+            evaluation_cache_path=evaluation_cache or "",
+            timing_enabled=timing,
+            checkpoint_path=resume or checkpoint or "",
+            checkpoint_interval=checkpoint_interval,
+            resume=resume is not None,
+            progress_metric_interval=progress_metric_interval,
         )
 
         application.run()
@@ -26,3 +26,19 @@ class BaseModel(EventNotifierMixin, ABCHasStrictTraits):
         state = nested_getstate(state)
         state = {"id": self.factory.id, "model_data": state}
         return state
+
+    def __reduce_ex__(self, protocol):
+        # The serialized state can not be restored without the factory,
+        # so models are pickled as their factory and model data
+        return (
+            _rebuild_model,
+            (self.factory, self.__getstate__()["model_data"])
+        )
+
+
+def _rebuild_model(factory, model_data):
+    """ Recreates a pickled model from its `factory` and `model_data`."""
+    model_class = factory.model_class
+    if hasattr(model_class, "from_json"):
+        return model_class.from_json(factory, model_data)
+    return factory.create_model(model_data)
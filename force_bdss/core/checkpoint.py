@@ -0,0 +1,185 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+from collections import Counter
+import json
+import logging
+import os
+import pickle
+import threading
+import time
+
+from traits.api import Any, Bool, Dict, Float, HasStrictTraits, List, Str
+
+log = logging.getLogger(__name__)
+
+#: Version of the format of the checkpoint files
+CHECKPOINT_VERSION = 1
+
+
+class OptimizationCheckpoint(HasStrictTraits):
+    """Snapshot of the progress of an optimization, saved periodically to
+    a local file, from which an interrupted OptimizeOperation can be
+    resumed.
+
+    The checkpoint records the KPI values evaluated by the optimizer
+    engine, the state the engine needs to skip its completed work (such as
+    the weight samples and scaling factors of a WeightedOptimizerEngine),
+    and the MCOProgressEvents delivered to the notification listeners.
+    It is pickled to `path` at most every `interval` seconds, through a
+    temporary file, so that a crash while saving leaves the previous
+    checkpoint intact.
+
+    Once loaded, the progress events it recorded are not delivered again
+    if the resumed optimization emits them once more, for instance while
+    replaying the evaluations of an optimizer that can not skip its
+    completed work.
+    """
+
+    #: Path of the checkpoint file
+    path = Str()
+
+    #: Minimum time between two saves, in seconds
+    interval = Float(300.0)
+
+    #: Hash of the optimized workflow and of its MCO settings, as returned
+    #: by `hash_workflow` with `include_mco_settings`.
+    #: Checkpoints of another workflow can not be loaded.
+    workflow_key = Str()
+
+    #: Whether the checkpoint was loaded from a previous run
+    resumed = Bool(False)
+
+    #: (point, KPI values) pairs of the evaluations of the optimization
+    evaluations = List()
+
+    #: State of the optimizer engine, by name
+    engine_state = Dict(Str)
+
+    #: Keys of the progress events delivered to the listeners, as returned
+    #: by `event_key`
+    emitted_events = List(Str)
+
+    #: Number of times each event delivered before the optimization was
+    #: resumed may still be emitted again
+    _replays = Any(transient=True)
+
+    #: Time of the last save, as returned by `time.monotonic`
+    _last_save = Float(transient=True)
+
+    #: Lock protecting the checkpoint from concurrent evaluations
+    _lock = Any(transient=True)
+
+    def __init__(self, *args, **kwargs):
+        self._lock = threading.RLock()
+        super().__init__(*args, **kwargs)
+        self._replays = Counter()
+        self._last_save = time.monotonic()
+
+    def record_evaluation(self, point, kpi_values):
+        """ Records the `kpi_values` evaluated at `point`."""
+        with self._lock:
+            self.evaluations.append((point, list(kpi_values)))
+        self.save_if_due()
+
+    def record_event(self, event):
+        """ Records a progress `event` delivered to the listeners.
+
+        Returns
+        -------
+        new: bool
+            False if the event was already delivered before the
+            optimization was resumed, in which case it should not be
+            delivered again
+        """
+        key = event_key(event)
+        with self._lock:
+            if self._replays[key] > 0:
+                self._replays[key] -= 1
+                return False
+            self.emitted_events.append(key)
+        self.save_if_due()
+        return True
+
+    def update_engine_state(self, **state):
+        """ Updates the state of the optimizer engine with the `state`
+        keyword arguments."""
+        with self._lock:
+            self.engine_state.update(state)
+        self.save_if_due()
+
+    def save_if_due(self):
+        """ Saves the checkpoint if the last save is older than the
+        `interval`."""
+        if time.monotonic() - self._last_save >= self.interval:
+            self.save()
+
+    def save(self):
+        """ Saves the checkpoint to `path`."""
+        with self._lock:
+            data = {
+                "version": CHECKPOINT_VERSION,
+                "workflow_key": self.workflow_key,
+                "evaluations": list(self.evaluations),
+                "engine_state": dict(self.engine_state),
+                "emitted_events": list(self.emitted_events),
+            }
+            temporary_path = "{}.tmp".format(self.path)
+            with open(temporary_path, "wb") as checkpoint_file:
+                pickle.dump(data, checkpoint_file)
+            os.replace(temporary_path, self.path)
+            self._last_save = time.monotonic()
+        log.info(
+            "Saved checkpoint '{}' after {} evaluations".format(
+                self.path, len(data["evaluations"]))
+        )
+
+    def load(self):
+        """ Loads the checkpoint saved at `path`, to resume the
+        optimization.
+
+        Raises
+        ------
+        ValueError
+            If the file is not a checkpoint, or a checkpoint of a different
+            workflow
+        """
+        with open(self.path, "rb") as checkpoint_file:
+            try:
+                data = pickle.load(checkpoint_file)
+            except Exception as exception:
+                raise ValueError(
+                    "Unable to read checkpoint '{}': {}".format(
+                        self.path, exception)
+                )
+        if (not isinstance(data, dict)
+                or data.get("version") != CHECKPOINT_VERSION):
+            raise ValueError(
+                "File '{}' is not a checkpoint of version {}".format(
+                    self.path, CHECKPOINT_VERSION)
+            )
+        if self.workflow_key and data["workflow_key"] != self.workflow_key:
+            raise ValueError(
+                "Checkpoint '{}' was saved for a different workflow".format(
+                    self.path)
+            )
+
+        with self._lock:
+            self.evaluations = data["evaluations"]
+            self.engine_state = data["engine_state"]
+            self.emitted_events = data["emitted_events"]
+            self._replays = Counter(self.emitted_events)
+            self.resumed = True
+        log.info(
+            "Resuming from checkpoint '{}': {} evaluations, {} progress "
+            "events".format(
+                self.path, len(self.evaluations), len(self.emitted_events))
+        )
+
+
+def event_key(event):
+    """ Returns a key identifying the data of a progress `event`, as
+    returned by its `serialize` method."""
+    return json.dumps(
+        [type(event).__name__, event.serialize()], default=repr
+    )
@@ -27,6 +27,13 @@ class DataValue(HasStrictTraits):
     #: A flag for the quality of the data.
     quality = Enum("AVERAGE", "POOR", "GOOD")
 
+    #: Derivatives of the value with respect to each input data value of
+    #: the data source that computed it, in the order of the input slots.
+    #: Each entry is an array_like of shape `shape(value) + shape(input)`,
+    #: or None if the value does not depend on that input. None if the
+    #: data source does not provide derivatives.
+    derivatives = Any()
+
     def __str__(self):
 
         s = "{} {} = {}".format(
@@ -40,4 +47,8 @@ class DataValue(HasStrictTraits):
         return s
 
     def __getstate__(self):
-        return pop_dunder_recursive(super().__getstate__())
+        state = pop_dunder_recursive(super().__getstate__())
+        # Derivatives are only serialized when provided
+        if state.get("derivatives", 0) is None:
+            del state["derivatives"]
+        return state
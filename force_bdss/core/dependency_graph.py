@@ -0,0 +1,224 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+from traits.api import Dict, HasStrictTraits, Instance, Int, List, Str
+
+from force_bdss.core.execution_plan import find_unused_data_sources
+from force_bdss.core.verifier import VerifierError
+from force_bdss.data_sources.base_data_source_model import BaseDataSourceModel
+
+
+class DependencyGraph(HasStrictTraits):
+    """Dependencies between the data sources of a Workflow, resolved from
+    the names of their input and output slots rather than from the
+    execution layers they belong to.
+
+    Each data source depends on the data sources producing the names of
+    its input slots. Names of the MCO parameters are available from the
+    start, so they do not introduce any dependency.
+    """
+
+    #: The data source models of the workflow, in layer order
+    nodes = List(Instance(BaseDataSourceModel))
+
+    #: For each node, the indices of the nodes it depends on
+    dependencies = List(List(Int))
+
+    #: For each node, the indices of the nodes depending on it
+    dependents = List(List(Int))
+
+    #: Node index of the producer of each data value name. MCO parameter
+    #: names are mapped to None.
+    producers = Dict(Str)
+
+    #: Input names of each node that are not produced by any data
+    #: source or MCO parameter, as (node index, name) pairs
+    unresolved_names = List()
+
+    #: Names that are produced more than once
+    duplicated_names = List(Str)
+
+    #: Indices of the nodes whose outputs never reach any KPI
+    unused_nodes = List(Int)
+
+    @classmethod
+    def from_workflow(cls, workflow):
+        """ Builds the dependency graph of the data sources in `workflow`.
+
+        Parameters
+        ----------
+        workflow: Workflow
+            The workflow to analyse
+
+        Returns
+        -------
+        graph: DependencyGraph
+            The dependency graph of the workflow data sources
+        """
+        nodes = [
+            model
+            for layer in workflow.execution_layers
+            for model in layer.data_sources
+        ]
+
+        producers = {}
+        duplicated_names = []
+
+        def add_producer(name, node):
+            if name in producers and name not in duplicated_names:
+                duplicated_names.append(name)
+            producers[name] = node
+
+        if workflow.mco_model is not None:
+            for parameter in workflow.mco_model.parameters:
+                if parameter.name != "":
+                    add_producer(parameter.name, None)
+        for index, model in enumerate(nodes):
+            for output_slot_info in model.output_slot_info:
+                if output_slot_info.name != "":
+                    add_producer(output_slot_info.name, index)
+
+        dependencies = [[] for _ in nodes]
+        dependents = [[] for _ in nodes]
+        unresolved_names = []
+        for index, model in enumerate(nodes):
+            for input_slot_info in model.input_slot_info:
+                name = input_slot_info.name
+                if name not in producers:
+                    unresolved_names.append((index, name))
+                    continue
+                producer = producers[name]
+                if producer is None or producer in dependencies[index]:
+                    continue
+                dependencies[index].append(producer)
+                dependents[producer].append(index)
+
+        unused = find_unused_data_sources(workflow)
+        unused_nodes = [
+            index for index, model in enumerate(nodes) if model in unused
+        ]
+
+        return cls(
+            nodes=nodes,
+            unused_nodes=unused_nodes,
+            dependencies=dependencies,
+            dependents=dependents,
+            producers=producers,
+            unresolved_names=unresolved_names,
+            duplicated_names=duplicated_names,
+        )
+
+    def find_cycles(self):
+        """ Finds the groups of data sources that depend on each other.
+
+        Returns
+        -------
+        cycles: list of lists of int
+            The node indices of each strongly connected component of the
+            graph that contains a cycle, in ascending order.
+        """
+        # Iterative version of Tarjan's algorithm, to avoid hitting the
+        # recursion limit on long chains of data sources
+        index_of = {}
+        lowlink = {}
+        stack = []
+        on_stack = set()
+        cycles = []
+        counter = 0
+
+        for root in range(len(self.nodes)):
+            if root in index_of:
+                continue
+            work = [(root, 0)]
+            while work:
+                node, child_index = work.pop()
+                if child_index == 0:
+                    index_of[node] = lowlink[node] = counter
+                    counter += 1
+                    stack.append(node)
+                    on_stack.add(node)
+                children = self.dependencies[node]
+                if child_index < len(children):
+                    child = children[child_index]
+                    work.append((node, child_index + 1))
+                    if child not in index_of:
+                        work.append((child, 0))
+                    elif child in on_stack:
+                        lowlink[node] = min(lowlink[node], index_of[child])
+                    continue
+
+                if lowlink[node] == index_of[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1 or node in children:
+                        cycles.append(sorted(component))
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+
+        return sorted(cycles)
+
+    def verify(self):
+        """ Verify that the data sources can be scheduled by their
+        dependencies.
+
+        The graph must have:
+        - no input names that are not produced by any data source or
+          MCO parameter
+        - no names produced more than once
+        - no cycles
+
+        Returns
+        -------
+        errors : list of VerifierErrors
+            The list of all detected errors in the dependency graph.
+        """
+        errors = []
+
+        for index, name in self.unresolved_names:
+            errors.append(
+                VerifierError(
+                    subject=self.nodes[index],
+                    local_error=(
+                        "Input '{}' is not produced by any data source "
+                        "or MCO parameter".format(name)
+                    ),
+                    global_error=(
+                        "A data source input can not be resolved"
+                    ),
+                )
+            )
+
+        for name in self.duplicated_names:
+            errors.append(
+                VerifierError(
+                    subject=self,
+                    global_error=(
+                        "The name '{}' is produced by more than one data "
+                        "source or MCO parameter".format(name)
+                    ),
+                )
+            )
+
+        for cycle in self.find_cycles():
+            names = [self.nodes[index].factory.name for index in cycle]
+            errors.append(
+                VerifierError(
+                    subject=self.nodes[cycle[0]],
+                    local_error=(
+                        "Data source is part of a dependency cycle"
+                    ),
+                    global_error=(
+                        "The data sources {} depend on each other".format(
+                            names
+                        )
+                    ),
+                )
+            )
+
+        return errors
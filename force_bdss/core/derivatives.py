@@ -0,0 +1,98 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+import logging
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+
+class NotDifferentiable(Exception):
+    """Raised when a data value required by a Jacobian has no
+    derivatives."""
+
+
+def chain_kpi_jacobian(parameter_values, data_values, input_names,
+                       kpi_results):
+    """ Chains the derivatives of the data values computed by the data
+    sources of a workflow into the Jacobian of the KPIs with respect to
+    the MCO parameters.
+
+    Parameters
+    ----------
+    parameter_values: list of DataValue
+        The data values of the MCO parameters. Vector parameters are
+        flattened, in order, into the columns of the Jacobian.
+    data_values: list of DataValue
+        The data values computed by the data sources, which may carry
+        the `derivatives` of their value with respect to each of the
+        inputs of their data source
+    input_names: dict
+        The names of the inputs of the data source computing each data
+        value, by name of the data value
+    kpi_results: list of DataValue
+        The data values of the scalar KPIs
+
+    Returns
+    -------
+    jacobian: numpy.ndarray or None
+        The K x P Jacobian of the K KPIs with respect to the P flattened
+        parameter values, or None if any of the data values the KPIs
+        depend on has no derivatives.
+    """
+    columns = {}
+    n_columns = 0
+    for dv in parameter_values:
+        size = np.size(dv.value)
+        columns[dv.name] = (n_columns, size)
+        n_columns += size
+
+    data_values_by_name = {dv.name: dv for dv in data_values}
+    jacobians = {}
+
+    def jacobian_of(name):
+        # Jacobian of the flattened data value `name` with respect to
+        # the flattened parameters
+        if name in jacobians:
+            return jacobians[name]
+        if name in columns:
+            start, size = columns[name]
+            jacobian = np.zeros((size, n_columns))
+            jacobian[:, start:start + size] = np.eye(size)
+        else:
+            dv = data_values_by_name.get(name)
+            inputs = input_names.get(name)
+            if dv is None or inputs is None or dv.derivatives is None:
+                raise NotDifferentiable(name)
+            if len(dv.derivatives) != len(inputs):
+                log.warning(
+                    "Data value {} has {} derivatives, but its data "
+                    "source has {} inputs".format(
+                        name, len(dv.derivatives), len(inputs))
+                )
+                raise NotDifferentiable(name)
+
+            size = np.size(dv.value)
+            jacobian = np.zeros((size, n_columns))
+            for derivative, input_name in zip(dv.derivatives, inputs):
+                if derivative is None:
+                    continue
+                input_jacobian = jacobian_of(input_name)
+                derivative = np.reshape(
+                    np.asarray(derivative, dtype=float),
+                    (size, len(input_jacobian))
+                )
+                jacobian += derivative @ input_jacobian
+        jacobians[name] = jacobian
+        return jacobian
+
+    try:
+        rows = [jacobian_of(kpi.name) for kpi in kpi_results]
+    except NotDifferentiable as e:
+        log.info(
+            "KPI Jacobian not available, since data value {} has no "
+            "derivatives".format(e)
+        )
+        return None
+    return np.concatenate(rows, axis=0)
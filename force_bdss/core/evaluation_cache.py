@@ -0,0 +1,242 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+from traits.api import Any, Either, Float, HasStrictTraits, Int, Str
+
+from force_bdss.local_traits import PositiveInt
+
+log = logging.getLogger(__name__)
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS evaluations ("
+    "key TEXT PRIMARY KEY, "
+    "kpis BLOB NOT NULL, "
+    "accessed REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS evaluations_accessed "
+    "ON evaluations (accessed)",
+)
+
+
+class EvaluationCache(HasStrictTraits):
+    """Persistent cache of the KPI values computed by a Workflow, stored
+    in a SQLite database file, so that the evaluations of a previous run
+    do not need to be computed again.
+
+    Evaluations are keyed by a hash of the parts of the workflow that
+    determine its KPI values, as returned by `hash_workflow`, and of the
+    parameter values. The database can be shared by several processes on
+    the same machine: each process (and thread) opens its own connection,
+    and SQLite serializes the concurrent writes.
+    """
+
+    #: Path of the SQLite database file. It is created if it does not
+    #: exist.
+    path = Str()
+
+    #: Maximum number of cached evaluations. The least recently used ones
+    #: are evicted first. If None, the cache grows without limit.
+    max_entries = Either(None, PositiveInt)
+
+    #: Time in seconds to wait for other processes to release the database
+    #: before raising an error.
+    timeout = Float(30.0)
+
+    #: Number of lookups that found cached KPI values in this process
+    hits = Int(0)
+
+    #: Number of lookups that did not find cached KPI values in this
+    #: process
+    misses = Int(0)
+
+    #: Connections of each thread to the database
+    _local = Any(transient=True)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._local = threading.local()
+
+    def lookup(self, workflow_key, parameter_values):
+        """ Returns the KPI values cached for the `parameter_values` of the
+        workflow with hash `workflow_key`, or None if there are none.
+
+        Parameters
+        ----------
+        workflow_key: str
+            The hash of the workflow, as returned by `hash_workflow`
+        parameter_values: list
+            The values of the MCO parameters
+
+        Returns
+        -------
+        kpi_values: list or None
+            The cached KPI values
+        """
+        key = _evaluation_key(workflow_key, parameter_values)
+        connection = self._connection()
+        with connection:
+            row = connection.execute(
+                "SELECT kpis FROM evaluations WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            connection.execute(
+                "UPDATE evaluations SET accessed = ? WHERE key = ?",
+                (time.time(), key),
+            )
+        self.hits += 1
+        return pickle.loads(row[0])
+
+    def store(self, workflow_key, parameter_values, kpi_values):
+        """ Caches the `kpi_values` computed for the `parameter_values` of
+        the workflow with hash `workflow_key`, evicting the least recently
+        used evaluations if the cache exceeds `max_entries`.
+
+        Parameters
+        ----------
+        workflow_key: str
+            The hash of the workflow, as returned by `hash_workflow`
+        parameter_values: list
+            The values of the MCO parameters
+        kpi_values: list
+            The values of the KPIs
+        """
+        key = _evaluation_key(workflow_key, parameter_values)
+        try:
+            kpis = pickle.dumps(list(kpi_values))
+        except Exception:
+            log.warning(
+                "Unable to store KPI values {} in the evaluation "
+                "cache.".format(kpi_values)
+            )
+            return
+
+        connection = self._connection()
+        with connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO evaluations (key, kpis, accessed) "
+                "VALUES (?, ?, ?)",
+                (key, kpis, time.time()),
+            )
+            if self.max_entries is not None:
+                connection.execute(
+                    "DELETE FROM evaluations WHERE key IN ("
+                    "SELECT key FROM evaluations ORDER BY accessed DESC "
+                    "LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+
+    def clear(self):
+        """ Removes all the cached evaluations."""
+        connection = self._connection()
+        with connection:
+            connection.execute("DELETE FROM evaluations")
+
+    def close(self):
+        """ Closes the connection of the calling thread to the database.
+        A new one is opened on the next access."""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def __len__(self):
+        return self._connection().execute(
+            "SELECT COUNT(*) FROM evaluations"
+        ).fetchone()[0]
+
+    def _connection(self):
+        """ Returns the connection of the calling thread to the database,
+        opening it if necessary. Connections are never shared with forked
+        processes."""
+        local = self._local
+        if (getattr(local, "connection", None) is None
+                or local.pid != os.getpid()):
+            connection = sqlite3.connect(self.path, timeout=self.timeout)
+            # Write-ahead logging lets readers proceed while another
+            # process writes
+            connection.execute("PRAGMA journal_mode=WAL")
+            with connection:
+                for statement in _SCHEMA:
+                    connection.execute(statement)
+            local.connection = connection
+            local.pid = os.getpid()
+        return local.connection
+
+    def __setstate__(self, state):
+        # Connections are transient, and never sent to other processes
+        super().__setstate__(state)
+        self._local = threading.local()
+
+
+#: Settings of the data source models that do not affect their results
+_DATA_SOURCE_SETTINGS = ("cache_size", "cache_memory_limit")
+
+
+def hash_workflow(workflow, include_mco_settings=False):
+    """ Returns a stable hash of the parts of the `workflow` that determine
+    its KPI values: the names and types of the MCO parameters, the names
+    of the KPIs and the data source models of each execution layer.
+
+    The settings of the MCO and of the execution of the workflow (such as
+    its concurrency, or the caches of the data sources) do not change the
+    KPI values, so cached evaluations are still used after they change.
+
+    Parameters
+    ----------
+    workflow: Workflow
+        The workflow to hash
+    include_mco_settings: bool
+        Whether the state of the MCO model is hashed as well, for instance
+        to check that an optimization is resumed with the same settings
+
+    Returns
+    -------
+    key: str
+        Hexadecimal digest of the hashed state
+    """
+    mco_model = workflow.mco_model
+    state = {"execution_layers": []}
+    if mco_model is not None:
+        state["parameters"] = [
+            (parameter.name, parameter.type)
+            for parameter in mco_model.parameters
+        ]
+        state["kpis"] = [kpi.name for kpi in mco_model.kpis]
+        if include_mco_settings:
+            state["mco_model"] = mco_model.__getstate__()
+
+    for layer in workflow.execution_layers:
+        layer_state = []
+        for model in layer.data_sources:
+            model_state = model.__getstate__()
+            for name in _DATA_SOURCE_SETTINGS:
+                model_state["model_data"].pop(name, None)
+            layer_state.append(model_state)
+        state["execution_layers"].append(layer_state)
+
+    data = json.dumps(state, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def _evaluation_key(workflow_key, parameter_values):
+    """ Returns the key of an evaluation of the workflow with hash
+    `workflow_key` at `parameter_values`. NumPy values are converted
+    to the equivalent Python objects, so that they share the same key."""
+    values = [
+        value.tolist() if hasattr(value, "tolist") else value
+        for value in parameter_values
+    ]
+    data = json.dumps(values, default=repr)
+    return hashlib.sha256(
+        (workflow_key + data).encode("utf-8")
+    ).hexdigest()
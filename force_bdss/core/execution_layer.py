@@ -1,22 +1,74 @@
 #  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
 #  All rights reserved.
 
+from concurrent.futures import Future, wait
 from copy import deepcopy
 import logging
+from multiprocessing.util import Finalize
+import time
+import uuid
 
-from traits.api import HasStrictTraits, List, on_trait_change
+from traits.api import (
+    Any, Bool, Dict, Either, Enum, HasStrictTraits, Instance, List, Tuple,
+    on_trait_change
+)
 
 from force_bdss.core.data_value import DataValue
 from force_bdss.core.verifier import VerifierError
+from force_bdss.core.worker_pool import WORKER_POOL_MODES, create_worker_pool
+from force_bdss.data_sources.base_data_source import BaseDataSource
 from force_bdss.data_sources.base_data_source_model import BaseDataSourceModel
+from force_bdss.data_sources.data_source_cache import (
+    DataSourceCache, cache_key
+)
+from force_bdss.data_sources.data_source_pool import DataSourcePool
 from force_bdss.events.event_notifier_mixin import EventNotifierMixin
+from force_bdss.local_traits import PositiveInt
 # (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
 # All rights reserved.
 
-from force_bdss.utilities import pop_dunder_recursive, nested_getstate
+from force_bdss.utilities import (
+    create_from_traits,
+    nested_getstate,
+    picklable_traits,
+    pop_dunder_recursive,
+)
 
 log = logging.getLogger(__name__)
 
+# CPU time of the calling thread, where available (Python >= 3.7)
+_cpu_time = getattr(time, "thread_time", time.process_time)
+
+
+class DataSourceRun(HasStrictTraits):
+    """Handle of the run of a data source submitted to a worker pool."""
+
+    #: The model of the running data source
+    model = Instance(BaseDataSourceModel)
+
+    #: The running data source, or None if it runs in another process
+    data_source = Instance(BaseDataSource)
+
+    #: The (input, output) slots of the data source
+    slots = Tuple()
+
+    #: The future of the result of the run method
+    future = Instance(Future)
+
+    #: Whether the run has been finished or cancelled
+    finished = Bool(False)
+
+    #: Key of the results in the cache of the data source, or None if
+    #: they must not be cached
+    cache_key = Any()
+
+    #: Whether the results were found in the cache, rather than run
+    cached = Bool(False)
+
+    #: (wall clock time, CPU time) pair of each timed stage of the run,
+    #: or None if the run is not timed
+    timings = Any()
+
 
 class ExecutionLayer(EventNotifierMixin, HasStrictTraits):
     """Represents a single layer in the execution stack.
@@ -26,113 +78,682 @@ class ExecutionLayer(EventNotifierMixin, HasStrictTraits):
     #: The data sources in the execution layer.
     data_sources = List(BaseDataSourceModel)
 
-    def execute_layer(self, environment_data_values):
+    #: Concurrency backend used to run the data sources. Data sources in
+    #: the same layer cannot depend on each other, so they can be run
+    #: concurrently in a pool of threads or processes. Data sources run
+    #: in a "Process" pool must have picklable factories and input data
+    #: values.
+    concurrency_mode = Enum(*WORKER_POOL_MODES)
+
+    #: Maximum number of concurrent workers. If None, the default of the
+    #: underlying executor is used.
+    max_workers = Either(None, PositiveInt)
+
+    #: Executor running the data sources when `concurrency_mode` is not
+    #: "Serial". Created on first use and kept alive between evaluations.
+    _worker_pool = Any(transient=True)
+
+    #: Idle data source instances kept for reuse between evaluations
+    _data_source_pool = Instance(DataSourcePool, (), transient=True)
+
+    #: Whether data source instances are kept for reuse between evaluations
+    _reuse_data_sources = Bool(False, transient=True)
+
+    #: Caches of the results of the data sources with a `cache_size`
+    _result_caches = Dict(transient=True)
+
+    #: (input, output) slots of each data source model run in "Process"
+    #: mode, so that they are not retrieved on every evaluation
+    _process_slots = Dict(transient=True)
+
+    #: Key of the instances of each data source model kept for reuse by
+    #: the worker processes. Replaced when the model changes its slots,
+    #: so that the workers create a new instance.
+    _process_reuse_keys = Dict(transient=True)
+
+    #: Whether the time spent in each stage of the data source runs is
+    #: measured, and reported with a DataSourceTimingEvent
+    timing_enabled = Bool(False, transient=True)
+
+    def execute_layer(self, environment_data_values, input_indices=None,
+                      data_sources=None):
         """ Performs the evaluation of a single layer.
 
         Parameters
         ----------
         environment_data_values: list
             A list of data values to submit to the evaluators.
+        input_indices: list of lists of int, optional
+            For each data source, the indices of the data values in
+            `environment_data_values` to bind to its input slots, as
+            precomputed by an ExecutionPlan. If None, the data values are
+            bound by name.
+        data_sources: list of BaseDataSourceModel, optional
+            The models of the layer data sources to run, in order. If
+            None, all the `data_sources` of the layer are run.
 
         NOTE: The above parameter is going to go away as soon as we move
         to unlimited layers and remove the distinction between data sources
         and KPI calculators.
         """
-        results = []
+        if data_sources is None:
+            data_sources = self.data_sources
+        if input_indices is None:
+            input_indices = [None] * len(data_sources)
+
+        worker_pool = self._get_worker_pool()
+        if worker_pool is None:
+            results = []
+            for model, indices in zip(data_sources, input_indices):
+                timings = {} if self.timing_enabled else None
+                data_source, passed_data_values, slots = (
+                    self._prepare_data_source(
+                        model, environment_data_values, indices,
+                        timings=timings)
+                )
+                key, cached = self._lookup_results(model, passed_data_values)
+                if cached is not None:
+                    self._release_data_source(model, data_source, slots)
+                    results.extend(cached)
+                    continue
+                try:
+                    with _timing(timings, "run"):
+                        res = data_source._run(model, passed_data_values)
+                except Exception:
+                    log.exception(
+                        "Evaluation could not be performed. "
+                        "Run method raised exception."
+                    )
+                    self._data_source_pool.discard(model, data_source)
+                    raise
+                self._release_data_source(model, data_source, slots)
+                with _timing(timings, "validate"):
+                    res = self._process_results(model, res, slots[1])
+                self._store_results(model, key, res)
+                if timings is not None:
+                    model.notify_timing_event(timings)
+                results.extend(res)
+        else:
+            results = self._execute_concurrently(
+                worker_pool, environment_data_values, input_indices,
+                data_sources
+            )
 
-        for model in self.data_sources:
+        # Finally, return all the computed data values from all evaluators,
+        # properly named.
+        return results
+
+    def execute_layer_batch(self, batch_environment_data_values,
+                            input_indices=None, data_sources=None):
+        """ Performs the evaluation of a single layer for several points
+        at once. Each data source is called once through its `run_batch`
+        method, with the inputs of all the points.
+
+        The data sources are run in the calling thread, regardless of the
+        `concurrency_mode`.
+
+        Parameters
+        ----------
+        batch_environment_data_values: list of lists of DataValue
+            For each point, the data values to submit to the evaluators.
+        input_indices: list of lists of int, optional
+            For each data source, the indices of the data values in the
+            environment of each point to bind to its input slots, as
+            precomputed by an ExecutionPlan. If None, the data values are
+            bound by name.
+        data_sources: list of BaseDataSourceModel, optional
+            The models of the layer data sources to run, in order. If
+            None, all the `data_sources` of the layer are run.
+
+        Returns
+        -------
+        batch_results: list of lists of DataValue
+            For each point, all the computed data values, properly named.
+        """
+        if data_sources is None:
+            data_sources = self.data_sources
+        if input_indices is None:
+            input_indices = [None] * len(data_sources)
+
+        n_points = len(batch_environment_data_values)
+        batch_results = [[] for _ in range(n_points)]
+        for model, indices in zip(data_sources, input_indices):
             factory = model.factory
+            timings = {} if self.timing_enabled else None
+            data_source, slots = self._acquire_data_source(model, timings)
+            in_slots, out_slots = slots
             try:
-                data_source = factory.create_data_source()
+                with _timing(timings, "bind"):
+                    batched_data_values = [
+                        self._bind_inputs(
+                            model, environment_data_values, indices,
+                            in_slots
+                        )
+                        for environment_data_values
+                        in batch_environment_data_values
+                    ]
+            except Exception:
+                self._release_data_source(model, data_source, slots)
+                raise
+
+            # Only run the points whose results are not cached
+            lookups = [
+                self._lookup_results(model, passed_data_values)
+                for passed_data_values in batched_data_values
+            ]
+            missing = [
+                index for index, (_, cached) in enumerate(lookups)
+                if cached is None
+            ]
+            for index, (_, cached) in enumerate(lookups):
+                if cached is not None:
+                    batch_results[index].extend(cached)
+            if not missing:
+                self._release_data_source(model, data_source, slots)
+                continue
+
+            log.info(
+                "Evaluating for Data Source {} at {} points".format(
+                    factory.name, len(missing))
+            )
+            model.notify_start_event()
+            try:
+                with _timing(timings, "run"):
+                    batch_res = data_source.run_batch(
+                        model,
+                        [batched_data_values[index] for index in missing]
+                    )
             except Exception:
                 log.exception(
-                    "Unable to create data source from factory '{}' "
-                    "in plugin '{}'. This may indicate a programming "
-                    "error in the plugin".format(factory.id, factory.plugin_id)
+                    "Evaluation could not be performed. "
+                    "Run method raised exception."
                 )
+                self._data_source_pool.discard(model, data_source)
                 raise
+            model.notify_finish_event()
+            self._release_data_source(model, data_source, slots)
 
-            # Get the slots for this data source. These must be matched to
-            # the appropriate values in the environment data values.
-            # Matching is by position.
-            in_slots, out_slots = data_source.slots(model)
-
-            # Binding performs the extraction of the specified data values
-            # satisfying the above input slots from the environment data values
-            # considering what the user specified in terms of names (which is
-            # in the model input slot info
-            # The resulting data are the ones picked by name from the
-            # environment data values, and in the appropriate ordering as
-            # needed by the input slots.
-            passed_data_values = _bind_data_values(
-                environment_data_values, model.input_slot_info, in_slots
+            if (not isinstance(batch_res, list)
+                    or len(batch_res) != len(missing)):
+                error_txt = (
+                    "The run_batch method of data source {} must return a"
+                    " list with the results of each of the {} points."
+                    " It returned instead {}. Fix the run_batch() method"
+                    " to return the appropriate entity.".format(
+                        factory.name, len(missing), type(batch_res)
+                    )
+                )
+                log.error(error_txt)
+                raise RuntimeError(error_txt)
+
+            for index, res in zip(missing, batch_res):
+                with _timing(timings, "validate"):
+                    res = self._process_results(model, res, out_slots)
+                self._store_results(model, lookups[index][0], res)
+                batch_results[index].extend(res)
+            if timings is not None:
+                model.notify_timing_event(timings)
+
+        return batch_results
+
+    def _execute_concurrently(self, worker_pool, environment_data_values,
+                              input_indices, data_sources):
+        """ Submits the `data_sources` of the layer to the `worker_pool`
+        and collects their results in the order of `data_sources`.
+        """
+        in_process = self.concurrency_mode == "Process"
+        runs = []
+        results = []
+        try:
+            for model, indices in zip(data_sources, input_indices):
+                runs.append(
+                    self._start_data_source(
+                        worker_pool, model, environment_data_values,
+                        indices, in_process=in_process
+                    )
+                )
+            for run in runs:
+                results.extend(self._finish_data_source(run))
+        except Exception:
+            # Do not leave work queued for the following evaluations
+            # if any of the data sources failed.
+            for run in runs:
+                self._cancel_data_source(run)
+            raise
+
+        return results
+
+    def _start_data_source(self, worker_pool, model, environment_data_values,
+                           input_indices=None, in_process=False):
+        """ Prepares the data source of `model` and submits its run to the
+        `worker_pool`, or runs it immediately if the pool is None.
+
+        The start event of the data source is fired from the calling
+        thread, so that listeners are never notified concurrently.
+
+        Parameters
+        ----------
+        worker_pool: concurrent.futures.Executor or None
+            The executor to submit the run to
+        model: BaseDataSourceModel
+            The model of the data source to run
+        environment_data_values: list of DataValue
+            The data values available to the data source
+        input_indices: list of int, optional
+            The indices of the input data values in
+            `environment_data_values`. If None, they are bound by name.
+        in_process: bool
+            Whether the `worker_pool` runs in separate processes
+
+        Returns
+        -------
+        run: DataSourceRun
+            The handle of the submitted run, to be passed to
+            `_finish_data_source` or `_cancel_data_source`
+        """
+        timings = {} if self.timing_enabled else None
+        data_source, passed_data_values, slots = self._prepare_data_source(
+            model, environment_data_values, input_indices, in_process,
+            timings=timings
+        )
+        key, cached = self._lookup_results(model, passed_data_values)
+        if cached is not None:
+            if data_source is not None:
+                self._release_data_source(model, data_source, slots)
+            future = Future()
+            future.set_result(cached)
+            return DataSourceRun(
+                model=model, slots=slots, future=future, cached=True
             )
 
-            # execute data source, passing only relevant data values.
-            log.info("Evaluating for Data Source {}".format(factory.name))
+        model.notify_start_event()
+
+        # The run is timed by the thread executing it, and its result
+        # is returned with the wall clock and CPU times
+        if worker_pool is None:
+            future = Future()
+            try:
+                future.set_result(
+                    _timed_call(data_source.run, model, passed_data_values)
+                )
+            except Exception as e:
+                future.set_exception(e)
+        elif in_process:
+            future = worker_pool.submit(
+                _timed_call,
+                _run_data_source,
+                model.factory,
+                model.__getstate__()["model_data"],
+                passed_data_values,
+                self._process_reuse_key(model),
+            )
+        else:
+            future = worker_pool.submit(
+                _timed_call, data_source.run, model, passed_data_values
+            )
+
+        return DataSourceRun(
+            model=model, data_source=data_source, slots=slots, future=future,
+            cache_key=key, timings=timings
+        )
+
+    def _finish_data_source(self, run):
+        """ Waits for a `run` started by `_start_data_source` to complete,
+        and returns its data values named as specified in the model.
+
+        The finish event of the data source is fired from the calling
+        thread.
+        """
+        model = run.model
+        if run.cached:
+            run.finished = True
+            return run.future.result()
+
+        try:
+            res, wall_time, cpu_time = run.future.result()
+        except Exception:
+            log.exception(
+                "Evaluation could not be performed. "
+                "Run method raised exception."
+            )
+            self._cancel_data_source(run)
+            raise
+
+        run.finished = True
+        model.notify_finish_event()
+        if run.data_source is not None:
+            self._release_data_source(model, run.data_source, run.slots)
+        timings = run.timings
+        if timings is not None:
+            _add_timing(timings, "run", wall_time, cpu_time)
+        with _timing(timings, "validate"):
+            res = self._process_results(model, res, run.slots[1])
+        self._store_results(model, run.cache_key, res)
+        if timings is not None:
+            model.notify_timing_event(timings)
+        return res
+
+    def _cancel_data_source(self, run):
+        """ Cancels a `run` started by `_start_data_source`, if it has not
+        finished yet, and discards its data source."""
+        if run.finished:
+            return
+        run.finished = True
+        if not run.future.cancel():
+            # The run can not be interrupted: wait for it to complete
+            # before tearing down its data source.
+            wait([run.future])
+        if run.data_source is not None:
+            self._data_source_pool.discard(run.model, run.data_source)
+
+    def _prepare_data_source(self, model, environment_data_values,
+                             input_indices=None, in_process=False,
+                             timings=None):
+        """ Acquires a data source for `model` and binds its input slots
+        to the `environment_data_values`, by position if `input_indices`
+        are given or by name otherwise.
+
+        If `in_process` is True the data source is run in a worker
+        process, so it is only created here to retrieve the slots the
+        first time, and is not returned.
+
+        The time taken by each stage is added to `timings`, if given.
+
+        Returns
+        -------
+        data_source, passed_data_values, slots: tuple
+            The data source instance (or None in "Process" mode), the data
+            values to pass to its run method and its (input, output) slots.
+        """
+        factory = model.factory
+        if in_process:
+            data_source = None
+            slots = self._process_slots.get(model)
+            if slots is None:
+                with _timing(timings, "create"):
+                    probe = self._create_data_source(model, setup=False)
+                with _timing(timings, "slots"):
+                    slots = probe.slots(model)
+                self._process_slots[model] = slots
+        else:
+            data_source, slots = self._acquire_data_source(model, timings)
+
+        # Get the slots for this data source. These must be matched to
+        # the appropriate values in the environment data values.
+        # Matching is by position.
+        in_slots, _ = slots
+
+        # Binding performs the extraction of the specified data values
+        # satisfying the above input slots from the environment data values
+        # considering what the user specified in terms of names (which is
+        # in the model input slot info
+        # The resulting data are the ones picked by name from the
+        # environment data values, and in the appropriate ordering as
+        # needed by the input slots.
+        try:
+            with _timing(timings, "bind"):
+                passed_data_values = self._bind_inputs(
+                    model, environment_data_values, input_indices, in_slots
+                )
+        except Exception:
+            if data_source is not None:
+                self._release_data_source(model, data_source, slots)
+            raise
+
+        # execute data source, passing only relevant data values.
+        log.info("Evaluating for Data Source {}".format(factory.name))
+        if log.isEnabledFor(logging.INFO):
+            # Formatting the values is expensive: skip it when the log
+            # messages are discarded anyway.
             log.info("Passed values:")
             for idx, dv in enumerate(passed_data_values):
                 log.info("{}: {}".format(idx, dv))
 
+        return data_source, passed_data_values, slots
+
+    def _lookup_results(self, model, passed_data_values):
+        """ Looks up the results of the data source of `model` for the
+        `passed_data_values` in its cache, if caching is enabled for it.
+
+        Returns
+        -------
+        key, results: tuple
+            The key of the results in the cache (None if they must not be
+            cached) and the cached results (None if they must be run).
+        """
+        if model.cache_size == 0 or not model.deterministic:
+            return None, None
+        key = cache_key(model, passed_data_values)
+        if key is None:
+            return None, None
+
+        cache = self._get_result_cache(model)
+        results = cache.lookup(key)
+        model.notify_cache_event(results is not None, cache)
+        if results is not None:
+            log.info(
+                "Using cached results for Data Source {}".format(
+                    model.factory.name)
+            )
+        return key, results
+
+    def _store_results(self, model, key, results):
+        """ Caches the `results` of the data source of `model` under
+        `key`, unless the key is None."""
+        if key is not None:
+            self._get_result_cache(model).store(key, results)
+
+    def _get_result_cache(self, model):
+        """ Returns the cache of the results of `model`, creating it if
+        necessary and keeping its limits up to date with the model."""
+        cache = self._result_caches.get(model)
+        if cache is None:
+            cache = DataSourceCache(
+                size=model.cache_size, memory_limit=model.cache_memory_limit
+            )
+            self._result_caches[model] = cache
+        else:
+            cache.size = model.cache_size
+            cache.memory_limit = model.cache_memory_limit
+        return cache
+
+    @staticmethod
+    def _bind_inputs(model, environment_data_values, input_indices,
+                     in_slots):
+        """ Returns the data values of `environment_data_values` bound to
+        the input slots of `model`, by position if `input_indices` are
+        given or by name otherwise."""
+        if input_indices is None:
+            return _bind_data_values(
+                environment_data_values, model.input_slot_info, in_slots
+            )
+        return _bind_indexed_data_values(
+            environment_data_values, input_indices, in_slots
+        )
+
+    def _create_data_source(self, model, setup=True):
+        """ Creates a new data source from the factory of `model` and,
+        if `setup` is True, calls its setup hook."""
+        factory = model.factory
+        try:
+            data_source = factory.create_data_source()
+        except Exception:
+            log.exception(
+                "Unable to create data source from factory '{}' "
+                "in plugin '{}'. This may indicate a programming "
+                "error in the plugin".format(factory.id, factory.plugin_id)
+            )
+            raise
+
+        if setup:
             try:
-                res = data_source._run(model, passed_data_values)
+                data_source.setup(model)
             except Exception:
                 log.exception(
-                    "Evaluation could not be performed. "
-                    "Run method raised exception."
+                    "Unable to set up data source from factory '{}' "
+                    "in plugin '{}'. This may indicate a programming "
+                    "error in the plugin".format(
+                        factory.id, factory.plugin_id)
                 )
                 raise
 
-            if not isinstance(res, list):
-                error_txt = (
-                    "The run method of data source {} must return a list."
-                    " It returned instead {}. Fix the run() method to return"
-                    " the appropriate entity.".format(factory.name, type(res))
-                )
-                log.error(error_txt)
-                raise RuntimeError(error_txt)
+        return data_source
+
+    def _acquire_data_source(self, model, timings=None):
+        """ Returns an idle data source for `model` from the pool, if
+        reuse of data sources is enabled and one is available, or a newly
+        created one otherwise. The time taken to create the data source
+        and retrieve its slots is added to `timings`, if given.
+
+        Returns
+        -------
+        data_source, slots: tuple
+            The data source instance and its (input, output) slots.
+        """
+        if self._reuse_data_sources:
+            entry = self._data_source_pool.acquire(model)
+            if entry is not None:
+                return entry
 
-            if len(res) != len(out_slots):
+        with _timing(timings, "create"):
+            data_source = self._create_data_source(model)
+        try:
+            with _timing(timings, "slots"):
+                slots = data_source.slots(model)
+        except Exception:
+            self._data_source_pool.discard(model, data_source)
+            raise
+        return data_source, slots
+
+    def _release_data_source(self, model, data_source, slots):
+        """ Returns the `data_source` to the pool if reuse of data sources
+        is enabled, or tears it down otherwise."""
+        if self._reuse_data_sources:
+            self._data_source_pool.release(model, data_source, slots)
+        else:
+            self._data_source_pool.discard(model, data_source)
+
+    def _process_results(self, model, res, out_slots):
+        """ Validates the result `res` of a data source run against its
+        output slots, and names the returned data values as specified in
+        the `model`. Unnamed data values are discarded."""
+        factory = model.factory
+        if not isinstance(res, list):
+            error_txt = (
+                "The run method of data source {} must return a list."
+                " It returned instead {}. Fix the run() method to return"
+                " the appropriate entity.".format(factory.name, type(res))
+            )
+            log.error(error_txt)
+            raise RuntimeError(error_txt)
+
+        if len(res) != len(out_slots):
+            error_txt = (
+                "The number of data values ({} values) returned"
+                " by '{}' does not match the number"
+                " of output slots it specifies ({} values)."
+                " This is likely a plugin error."
+            ).format(len(res), factory.name, len(out_slots))
+            log.error(error_txt)
+            raise RuntimeError(error_txt)
+
+        for idx, dv in enumerate(res):
+            if not isinstance(dv, DataValue):
                 error_txt = (
-                    "The number of data values ({} values) returned"
-                    " by '{}' does not match the number"
-                    " of output slots it specifies ({} values)."
-                    " This is likely a plugin error."
-                ).format(len(res), factory.name, len(out_slots))
+                    "The result list returned by DataSource {} contains"
+                    " an entry that is not a DataValue. An entry of type"
+                    " {} was instead found in position {}."
+                    " Fix the DataSource.run() method"
+                    " to return the appropriate entity.".format(
+                        factory.name, type(dv), idx
+                    )
+                )
                 log.error(error_txt)
                 raise RuntimeError(error_txt)
 
-            for idx, dv in enumerate(res):
-                if not isinstance(dv, DataValue):
-                    error_txt = (
-                        "The result list returned by DataSource {} contains"
-                        " an entry that is not a DataValue. An entry of type"
-                        " {} was instead found in position {}."
-                        " Fix the DataSource.run() method"
-                        " to return the appropriate entity.".format(
-                            factory.name, type(dv), idx
-                        )
-                    )
-                    log.error(error_txt)
-                    raise RuntimeError(error_txt)
+        # At this point, the returned data values are unnamed.
+        # Add the names as specified by the user.
+        for dv, output_slot_info in zip(res, model.output_slot_info):
+            dv.name = output_slot_info.name
 
-            # At this point, the returned data values are unnamed.
-            # Add the names as specified by the user.
-            for dv, output_slot_info in zip(res, model.output_slot_info):
-                dv.name = output_slot_info.name
-
-            # If the name was not specified, simply discard the value,
-            # because apparently the user is not interested in it.
-            res = [r for r in res if r.name != ""]
-            results.extend(res)
+        # If the name was not specified, simply discard the value,
+        # because apparently the user is not interested in it.
+        res = [r for r in res if r.name != ""]
 
+        if log.isEnabledFor(logging.INFO):
             log.info("Returned values:")
             for idx, dv in enumerate(res):
                 log.info("{}: {}".format(idx, dv))
 
-        # Finally, return all the computed data values from all evaluators,
-        # properly named.
-        return results
+        return res
+
+    def setup_data_sources(self):
+        """ Enables the reuse of data source instances across the
+        evaluations of the layer. Each data source is created and set up
+        once, and then kept until `teardown_data_sources` is called or
+        its model fires `changes_slots`.
+
+        Data sources run in "Process" mode are kept by each worker
+        process instead, and torn down when the worker exits.
+        """
+        self._reuse_data_sources = True
+
+    def teardown_data_sources(self):
+        """ Tears down all the data sources kept for reuse, and disables
+        further reuse. In "Process" mode, the worker pool is shut down so
+        that the workers tear down their data sources."""
+        self._reuse_data_sources = False
+        self._data_source_pool.clear()
+        if self._process_reuse_keys:
+            self._process_reuse_keys = {}
+            self.shutdown_worker_pool()
+
+    def _process_reuse_key(self, model):
+        """ Returns the key of the instance of the data source of `model`
+        kept for reuse by the worker processes, or None if data sources
+        are not reused."""
+        if not self._reuse_data_sources:
+            return None
+        key = self._process_reuse_keys.get(model)
+        if key is None:
+            key = (id(model), uuid.uuid4().hex)
+            self._process_reuse_keys[model] = key
+        return key
+
+    def _get_worker_pool(self):
+        """ Returns the executor for the current `concurrency_mode`,
+        creating it if necessary. Returns None in "Serial" mode."""
+        if self._worker_pool is None:
+            self._worker_pool = create_worker_pool(
+                self.concurrency_mode, self.max_workers
+            )
+        return self._worker_pool
+
+    def shutdown_worker_pool(self):
+        """ Shuts down the executor used to run the data sources, if any.
+        A new one is created on the next call to `execute_layer`."""
+        if self._worker_pool is not None:
+            self._worker_pool.shutdown()
+            self._worker_pool = None
+
+    @on_trait_change("concurrency_mode,max_workers")
+    def _reset_worker_pool(self):
+        self.shutdown_worker_pool()
+
+    @on_trait_change("data_sources:changes_slots")
+    def _invalidate_data_source(self, model, name, new):
+        self._data_source_pool.invalidate(model)
+        self._process_slots.pop(model, None)
+        self._process_reuse_keys.pop(model, None)
+
+    @on_trait_change("data_sources[]")
+    def _discard_removed_data_sources(self, object, name, old, new):
+        # For item changes, `old` holds the removed data sources
+        for model in old:
+            self._data_source_pool.invalidate(model)
+            self._process_slots.pop(model, None)
+            self._process_reuse_keys.pop(model, None)
+            self._result_caches.pop(model, None)
 
     def verify(self):
         """ Verify an ExecutionLayer.
@@ -168,6 +789,11 @@ class ExecutionLayer(EventNotifierMixin, HasStrictTraits):
         state = nested_getstate(state)
         return state
 
+    def __reduce_ex__(self, protocol):
+        # The serialized state can not be restored without a factory
+        # registry, so the object is recreated from its traits instead
+        return create_from_traits, (type(self), picklable_traits(self))
+
     @classmethod
     def from_json(cls, factory_registry, json_data):
         """ Instantiate an ExecutionLayer object from a `json_data`
@@ -246,3 +872,169 @@ def _bind_data_values(available_data_values, model_slot_map, slots):
         )
 
     return passed_data_values
+
+
+def _bind_indexed_data_values(available_data_values, indices, slots):
+    """
+    Given the data values in the environment, the slots a given data
+    source expects and the precomputed environment index of each of these
+    slots, returns the data values in the order of the slots.
+    """
+    if len(slots) != len(indices):
+        raise RuntimeError(
+            "The length of the slots is not equal to"
+            " the length of the slot map. This may"
+            " indicate a file error."
+        )
+
+    return [available_data_values[index] for index in indices]
+
+
+#: (key, data source, model) of the data sources kept for reuse by a
+#: worker process, by the id of their model in the parent process
+_worker_data_sources = {}
+
+#: Finalizer tearing down the data sources kept by a worker process when
+#: it exits
+_worker_finalizer = None
+
+
+def _run_data_source(factory, model_data, parameters, reuse_key=None):
+    """ Runs a data source in a worker process. The model is rebuilt from
+    its serialized `model_data`, since it cannot be shared with the
+    parent process.
+
+    If a `reuse_key` is given, the data source is kept by the worker and
+    reused by the following runs with the same key. It is torn down when
+    a run with a new key for the same model is received, or when the
+    worker exits.
+    """
+    model = factory.model_class.from_json(factory, model_data)
+    if reuse_key is None:
+        data_source = factory.create_data_source()
+        data_source.setup(model)
+        try:
+            return data_source.run(model, parameters)
+        finally:
+            data_source.teardown(model)
+
+    model_id, key = reuse_key
+    entry = _worker_data_sources.pop(model_id, None)
+    if entry is not None and entry[0] != key:
+        _teardown_worker_data_source(*entry)
+        entry = None
+    if entry is None:
+        _register_worker_finalizer()
+        data_source = factory.create_data_source()
+        data_source.setup(model)
+        entry = (key, data_source, model)
+
+    try:
+        results = entry[1].run(model, parameters)
+    except Exception:
+        _teardown_worker_data_source(*entry)
+        raise
+    _worker_data_sources[model_id] = entry
+    return results
+
+
+def _teardown_worker_data_source(key, data_source, model):
+    """ Tears down a data source kept by a worker process, logging any
+    exception raised by its teardown hook."""
+    try:
+        data_source.teardown(model)
+    except Exception:
+        log.exception(
+            "Unable to tear down data source from factory '{}' "
+            "in plugin '{}'. This may indicate a programming "
+            "error in the plugin".format(
+                model.factory.id, model.factory.plugin_id
+            )
+        )
+
+
+def _register_worker_finalizer():
+    """ Registers the teardown of the data sources kept by the worker
+    process at its exit, if not already done."""
+    global _worker_finalizer
+    if _worker_finalizer is None:
+        _worker_finalizer = Finalize(
+            None, _teardown_worker_data_sources, exitpriority=10
+        )
+
+
+def _teardown_worker_data_sources():
+    """ Tears down all the data sources kept by a worker process."""
+    while _worker_data_sources:
+        _, entry = _worker_data_sources.popitem()
+        _teardown_worker_data_source(*entry)
+
+
+def _timed_call(function, *args):
+    """ Calls `function` with `args`, and returns its result along with
+    the wall clock and CPU time taken by the call. The CPU time is that
+    of the calling thread, so the call must be made by the thread (or
+    process) doing the work."""
+    wall_start, cpu_start = time.perf_counter(), _cpu_time()
+    result = function(*args)
+    return (
+        result,
+        time.perf_counter() - wall_start,
+        _cpu_time() - cpu_start,
+    )
+
+
+def _timing(timings, stage):
+    """ Returns a context manager adding the wall clock and CPU time spent
+    in its block to the `stage` of `timings`, or doing nothing if
+    `timings` is None."""
+    if timings is None:
+        return _NO_TIMING
+    return _StageTimer(timings, stage)
+
+
+class _StageTimer:
+    """ Context manager timing a stage of a data source run. Kept as a
+    slotted class, rather than a generator, because it is created several
+    times per run."""
+
+    __slots__ = ("timings", "stage", "wall_start", "cpu_start")
+
+    def __init__(self, timings, stage):
+        self.timings = timings
+        self.stage = stage
+
+    def __enter__(self):
+        self.wall_start = time.perf_counter()
+        self.cpu_start = _cpu_time()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _add_timing(
+            self.timings, self.stage,
+            time.perf_counter() - self.wall_start,
+            _cpu_time() - self.cpu_start,
+        )
+
+
+class _NoTiming:
+    """ Context manager used when the data source runs are not timed."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+
+_NO_TIMING = _NoTiming()
+
+
+def _add_timing(timings, stage, wall_time, cpu_time):
+    """ Adds a (`wall_time`, `cpu_time`) pair to the `stage` of
+    `timings`."""
+    previous_wall_time, previous_cpu_time = timings.get(stage, (0.0, 0.0))
+    timings[stage] = (
+        previous_wall_time + wall_time, previous_cpu_time + cpu_time
+    )
@@ -0,0 +1,180 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+from traits.api import HasStrictTraits, Int, List
+
+
+class ExecutionPlan(HasStrictTraits):
+    """Precomputed bindings of a Workflow, created by `Workflow.compile`.
+
+    During an evaluation, the data values generated by the MCO and by each
+    execution layer are collected in a flat list, the environment. The
+    position of every named data value in the environment only depends on
+    the workflow structure, so the names of the input slots and KPIs can
+    be resolved to integer indices once, rather than looked up by name on
+    every evaluation.
+    """
+
+    #: Size of the environment after the MCO parameters are bound
+    parameters_size = Int()
+
+    #: For each execution layer, the indices of the data sources to run.
+    #: Data sources whose outputs never reach a KPI are skipped if the
+    #: workflow prunes them.
+    data_source_indices = List(List(Int))
+
+    #: For each execution layer, the environment indices of the input
+    #: slots of each of its data sources to run
+    input_indices = List(List(List(Int)))
+
+    #: Size of the environment after the execution of each layer
+    layer_sizes = List(Int)
+
+    #: Environment indices of the data values of each KPI, in the order
+    #: of the MCO KPIs
+    kpi_indices = List(Int)
+
+    @classmethod
+    def from_workflow(cls, workflow):
+        """ Resolves the names of the MCO parameters, data source slots and
+        KPIs of the `workflow` into environment indices.
+
+        Parameters
+        ----------
+        workflow: Workflow
+            The workflow to compile
+
+        Returns
+        -------
+        plan: ExecutionPlan
+            The execution plan of the workflow
+
+        Raises
+        ------
+        RuntimeError
+            If an input slot refers to a name that is not available in
+            the environment of its execution layer.
+        """
+        names = [
+            parameter.name
+            for parameter in workflow.mco_model.parameters
+            if parameter.name != ""
+        ]
+        # Later data values shadow earlier ones with the same name
+        lookup_map = {name: index for index, name in enumerate(names)}
+        parameters_size = len(names)
+
+        if workflow.prune_data_sources:
+            unused = find_unused_data_sources(workflow)
+        else:
+            unused = []
+
+        data_source_indices = []
+        input_indices = []
+        layer_sizes = []
+        for layer in workflow.execution_layers:
+            layer_data_source_indices = [
+                index for index, model in enumerate(layer.data_sources)
+                if model not in unused
+            ]
+            models = [
+                layer.data_sources[index]
+                for index in layer_data_source_indices
+            ]
+            data_source_indices.append(layer_data_source_indices)
+            input_indices.append([
+                _resolve_names(lookup_map, model.input_slot_info)
+                for model in models
+            ])
+
+            # Data sources in the same layer can only use the outputs
+            # of the previous layers
+            for model in models:
+                for output_slot_info in model.output_slot_info:
+                    if output_slot_info.name != "":
+                        lookup_map[output_slot_info.name] = len(names)
+                        names.append(output_slot_info.name)
+            layer_sizes.append(len(names))
+
+        kpi_indices = [
+            index
+            for kpi in workflow.mco_model.kpis
+            for index, name in enumerate(names)
+            if name == kpi.name
+        ]
+
+        return cls(
+            parameters_size=parameters_size,
+            data_source_indices=data_source_indices,
+            input_indices=input_indices,
+            layer_sizes=layer_sizes,
+            kpi_indices=kpi_indices,
+        )
+
+
+def find_unused_data_sources(workflow):
+    """ Returns the data sources of the `workflow` whose outputs never
+    reach any of its KPIs, neither directly nor through other data
+    sources.
+
+    A data source is used if any of its named outputs is a KPI, or an
+    input of a used data source. Names are matched regardless of the
+    execution layers, so the result is conservative when several data
+    sources produce the same name. Data sources without output slots in
+    their model are always considered used, since they may name their
+    outputs themselves or only act through side effects.
+
+    Parameters
+    ----------
+    workflow: Workflow
+        The workflow to analyse
+
+    Returns
+    -------
+    unused: list of BaseDataSourceModel
+        The unused data source models, in layer order
+    """
+    models = [
+        model
+        for layer in workflow.execution_layers
+        for model in layer.data_sources
+    ]
+    required_names = set()
+    if workflow.mco_model is not None:
+        required_names.update(kpi.name for kpi in workflow.mco_model.kpis)
+
+    used = set()
+    changed = True
+    while changed:
+        changed = False
+        for index, model in enumerate(models):
+            if index in used:
+                continue
+            if not model.output_slot_info or any(
+                    output_slot_info.name in required_names
+                    for output_slot_info in model.output_slot_info
+                    if output_slot_info.name != ""):
+                used.add(index)
+                required_names.update(
+                    input_slot_info.name
+                    for input_slot_info in model.input_slot_info
+                )
+                changed = True
+
+    return [
+        model for index, model in enumerate(models) if index not in used
+    ]
+
+
+def _resolve_names(lookup_map, model_slot_map):
+    """ Returns the environment indices of the names in `model_slot_map`,
+    raising the same error as the binding by name if any is missing."""
+    try:
+        return [lookup_map[slot_map.name] for slot_map in model_slot_map]
+    except KeyError as e:
+        raise RuntimeError(
+            "Unable to find requested name '{}' in available "
+            "data values. Current data value names: {}".format(
+                e.args[0], list(lookup_map.keys())
+            )
+        )
@@ -1,6 +1,7 @@
 #  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
 #  All rights reserved.
 
+import pickle
 from unittest import TestCase
 
 from traits.testing.unittest_tools import UnittestTools
@@ -22,3 +23,13 @@ class TestBaseModel(TestCase, UnittestTools):
         with self.assertTraitChanges(
                 self.model, 'event', count=1):
             self.model.notify(BaseDriverEvent())
+
+    def test_pickle(self):
+        model = self.factory.create_model()
+        model.parameters = [
+            self.factory.parameter_factories[0].create_model({"x": 2})
+        ]
+        unpickled = pickle.loads(pickle.dumps(model))
+        self.assertIsInstance(unpickled, type(model))
+        self.assertIs(type(unpickled.factory), type(self.factory))
+        self.assertEqual(model.__getstate__(), unpickled.__getstate__())
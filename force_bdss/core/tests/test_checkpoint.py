@@ -0,0 +1,83 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from force_bdss.core.checkpoint import OptimizationCheckpoint, event_key
+from force_bdss.events.mco_events import MCOProgressEvent
+from force_bdss.core.data_value import DataValue
+
+
+class TestOptimizationCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.path = os.path.join(self.tmp_dir, "checkpoint.pkl")
+        self.checkpoint = OptimizationCheckpoint(
+            path=self.path, workflow_key="workflow"
+        )
+
+    def progress_event(self, value):
+        return MCOProgressEvent(
+            optimal_point=[DataValue(value=value)],
+            optimal_kpis=[DataValue(value=2 * value)],
+        )
+
+    def test_save_load(self):
+        self.checkpoint.record_evaluation([1.0, 2.0], [3.0])
+        self.checkpoint.update_engine_state(scaling_factors=[1.0, 2.0])
+        self.assertTrue(self.checkpoint.record_event(self.progress_event(1)))
+        self.assertFalse(os.path.exists(self.path))
+        self.checkpoint.save()
+        self.assertTrue(os.path.exists(self.path))
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+
+        checkpoint = OptimizationCheckpoint(
+            path=self.path, workflow_key="workflow"
+        )
+        self.assertFalse(checkpoint.resumed)
+        checkpoint.load()
+        self.assertTrue(checkpoint.resumed)
+        self.assertEqual([([1.0, 2.0], [3.0])], checkpoint.evaluations)
+        self.assertEqual(
+            {"scaling_factors": [1.0, 2.0]}, checkpoint.engine_state
+        )
+        self.assertEqual(
+            [event_key(self.progress_event(1))], checkpoint.emitted_events
+        )
+
+    def test_replayed_events(self):
+        self.checkpoint.record_event(self.progress_event(1))
+        self.checkpoint.record_event(self.progress_event(1))
+        self.checkpoint.save()
+
+        checkpoint = OptimizationCheckpoint(path=self.path)
+        checkpoint.load()
+        # Each event delivered before the resume is only suppressed once
+        self.assertFalse(checkpoint.record_event(self.progress_event(1)))
+        self.assertTrue(checkpoint.record_event(self.progress_event(2)))
+        self.assertFalse(checkpoint.record_event(self.progress_event(1)))
+        self.assertTrue(checkpoint.record_event(self.progress_event(1)))
+        self.assertEqual(4, len(checkpoint.emitted_events))
+
+    def test_save_interval(self):
+        self.checkpoint.interval = 0.0
+        self.checkpoint.record_evaluation([1.0], [2.0])
+        self.assertTrue(os.path.exists(self.path))
+
+    def test_load_errors(self):
+        with open(self.path, "w") as checkpoint_file:
+            checkpoint_file.write("not a checkpoint")
+        with self.assertRaisesRegex(ValueError, "Unable to read"):
+            self.checkpoint.load()
+
+        self.checkpoint.save()
+        checkpoint = OptimizationCheckpoint(
+            path=self.path, workflow_key="other"
+        )
+        with self.assertRaisesRegex(ValueError, "different workflow"):
+            checkpoint.load()
+        self.assertFalse(checkpoint.resumed)
@@ -13,6 +13,13 @@ class TestDataValue(unittest.TestCase):
         self.assertEqual(dv.value, None)
         self.assertEqual(dv.accuracy, None)
         self.assertEqual(dv.quality, "AVERAGE")
+        self.assertIsNone(dv.derivatives)
+
+    def test_getstate(self):
+        dv = DataValue(name="p1", value=10)
+        self.assertNotIn("derivatives", dv.__getstate__())
+        dv.derivatives = [2.0]
+        self.assertEqual([2.0], dv.__getstate__()["derivatives"])
 
     def test_string(self):
         dv = DataValue(type="PRESSURE", name="p1", value=10)
@@ -0,0 +1,127 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+import unittest
+
+from force_bdss.core.dependency_graph import DependencyGraph
+from force_bdss.core.execution_layer import ExecutionLayer
+from force_bdss.core.input_slot_info import InputSlotInfo
+from force_bdss.core.output_slot_info import OutputSlotInfo
+from force_bdss.core.workflow import Workflow
+from force_bdss.tests.probe_classes.data_source import ProbeDataSourceFactory
+from force_bdss.tests.probe_classes.factory_registry import (
+    ProbeFactoryRegistry,
+)
+from force_bdss.tests.probe_classes.mco import ProbeMCOFactory
+
+
+class TestDependencyGraph(unittest.TestCase):
+    def setUp(self):
+        self.registry = ProbeFactoryRegistry()
+        self.plugin = self.registry.plugin
+        self.data_source_factory = ProbeDataSourceFactory(
+            self.plugin, input_slots_size=1, output_slots_size=1
+        )
+
+        mco_factory = ProbeMCOFactory(self.plugin)
+        mco_model = mco_factory.create_model()
+        parameter_factory = mco_factory.parameter_factories[0]
+        mco_model.parameters = [
+            parameter_factory.create_model({"name": "in1"}),
+        ]
+        self.workflow = Workflow(mco_model=mco_model)
+
+    def _add_data_source(self, layer, input_name, output_name):
+        while len(self.workflow.execution_layers) <= layer:
+            self.workflow.execution_layers.append(ExecutionLayer())
+        model = self.data_source_factory.create_model()
+        model.input_slot_info = [InputSlotInfo(name=input_name)]
+        model.output_slot_info = [OutputSlotInfo(name=output_name)]
+        self.workflow.execution_layers[layer].data_sources.append(model)
+        return model
+
+    def test_from_workflow(self):
+        # Dependencies are resolved regardless of the layers
+        first = self._add_data_source(0, "res1", "res2")
+        second = self._add_data_source(0, "in1", "res1")
+        third = self._add_data_source(1, "res1", "res3")
+
+        graph = DependencyGraph.from_workflow(self.workflow)
+
+        self.assertEqual([first, second, third], graph.nodes)
+        self.assertEqual([[1], [], [1]], graph.dependencies)
+        self.assertEqual([[], [0, 2], []], graph.dependents)
+        self.assertEqual(
+            {"in1": None, "res1": 1, "res2": 0, "res3": 2}, graph.producers
+        )
+        self.assertEqual([], graph.find_cycles())
+        self.assertEqual([], graph.verify())
+
+    def test_empty_workflow(self):
+        graph = DependencyGraph.from_workflow(Workflow())
+        self.assertEqual([], graph.nodes)
+        self.assertEqual([], graph.verify())
+
+    def test_unresolved_names(self):
+        model = self._add_data_source(0, "foo", "res1")
+
+        graph = DependencyGraph.from_workflow(self.workflow)
+        self.assertEqual([(0, "foo")], graph.unresolved_names)
+
+        errors = graph.verify()
+        self.assertEqual(1, len(errors))
+        self.assertIs(model, errors[0].subject)
+        self.assertEqual(
+            "Input 'foo' is not produced by any data source or MCO "
+            "parameter",
+            errors[0].local_error,
+        )
+
+    def test_duplicated_names(self):
+        self._add_data_source(0, "in1", "res1")
+        self._add_data_source(1, "in1", "res1")
+        mco_model = self.workflow.mco_model
+        parameter_factory = mco_model.factory.parameter_factories[0]
+        mco_model.parameters.append(
+            parameter_factory.create_model({"name": "in1"})
+        )
+
+        graph = DependencyGraph.from_workflow(self.workflow)
+        self.assertEqual(["in1", "res1"], graph.duplicated_names)
+
+        errors = graph.verify()
+        self.assertEqual(2, len(errors))
+        self.assertIs(graph, errors[0].subject)
+        self.assertEqual(
+            "The name 'in1' is produced by more than one data source or "
+            "MCO parameter",
+            errors[0].global_error,
+        )
+
+    def test_cycles(self):
+        self._add_data_source(0, "res3", "res1")
+        self._add_data_source(0, "res1", "res2")
+        self._add_data_source(0, "res2", "res3")
+        self._add_data_source(0, "res4", "res4")
+        self._add_data_source(0, "in1", "res5")
+
+        graph = DependencyGraph.from_workflow(self.workflow)
+        self.assertEqual([[0, 1, 2], [3]], graph.find_cycles())
+
+        errors = graph.verify()
+        self.assertEqual(2, len(errors))
+        self.assertIs(graph.nodes[0], errors[0].subject)
+        self.assertEqual(
+            "Data source is part of a dependency cycle",
+            errors[0].local_error,
+        )
+        self.assertIs(graph.nodes[3], errors[1].subject)
+
+    def test_long_chain(self):
+        # Cycle detection must not be limited by the recursion limit
+        names = ["in1"] + ["res{}".format(i) for i in range(2000)]
+        for input_name, output_name in zip(names[:-1], names[1:]):
+            self._add_data_source(0, input_name, output_name)
+
+        graph = DependencyGraph.from_workflow(self.workflow)
+        self.assertEqual([], graph.find_cycles())
@@ -0,0 +1,72 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+import unittest
+
+import numpy as np
+
+from force_bdss.core.data_value import DataValue
+from force_bdss.core.derivatives import chain_kpi_jacobian
+
+
+class TestChainKPIJacobian(unittest.TestCase):
+    def setUp(self):
+        # A scalar and a vector parameter
+        self.parameters = [
+            DataValue(name="x", value=2.0),
+            DataValue(name="y", value=[1.0, 3.0]),
+        ]
+        self.input_names = {
+            "norm": ["y"],
+            "out": ["x", "norm"],
+        }
+
+    def data_values(self, norm_derivatives, out_derivatives):
+        # norm = y0 ** 2 + y1 ** 2, out = x * norm
+        return [
+            DataValue(name="norm", value=10.0, derivatives=norm_derivatives),
+            DataValue(name="out", value=20.0, derivatives=out_derivatives),
+        ]
+
+    def test_chain(self):
+        data_values = self.data_values([[2.0, 6.0]], [10.0, 2.0])
+        kpi_results = [data_values[1], data_values[0]]
+        jacobian = chain_kpi_jacobian(
+            self.parameters, data_values, self.input_names, kpi_results
+        )
+        np.testing.assert_array_equal(
+            [[10.0, 4.0, 12.0], [0.0, 2.0, 6.0]], jacobian
+        )
+
+    def test_parameter_kpi(self):
+        jacobian = chain_kpi_jacobian(
+            self.parameters, [], {}, [self.parameters[0]]
+        )
+        np.testing.assert_array_equal([[1.0, 0.0, 0.0]], jacobian)
+
+    def test_independent_input(self):
+        # The output does not depend on the non differentiable norm
+        data_values = self.data_values(None, [10.0, None])
+        jacobian = chain_kpi_jacobian(
+            self.parameters, data_values, self.input_names, data_values[1:]
+        )
+        np.testing.assert_array_equal([[10.0, 0.0, 0.0]], jacobian)
+
+    def test_not_differentiable(self):
+        data_values = self.data_values(None, [10.0, 2.0])
+        self.assertIsNone(
+            chain_kpi_jacobian(
+                self.parameters, data_values, self.input_names,
+                data_values[1:]
+            )
+        )
+
+        # Derivatives that do not match the inputs are ignored
+        data_values = self.data_values([[2.0, 6.0]], [10.0])
+        with self.assertLogs("force_bdss.core.derivatives"):
+            self.assertIsNone(
+                chain_kpi_jacobian(
+                    self.parameters, data_values, self.input_names,
+                    data_values[1:]
+                )
+            )
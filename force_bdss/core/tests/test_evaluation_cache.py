@@ -0,0 +1,109 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+from concurrent.futures import ProcessPoolExecutor
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from force_bdss.core.evaluation_cache import EvaluationCache, hash_workflow
+from force_bdss.tests import fixtures
+from force_bdss.tests.probe_classes.workflow_file import ProbeWorkflowFile
+
+
+def store_evaluations(cache, offset):
+    for index in range(20):
+        cache.store("workflow", [offset, index], [offset * index])
+    return len(cache)
+
+
+class TestEvaluationCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.path = os.path.join(self.tmp_dir, "cache.sqlite")
+        self.cache = EvaluationCache(path=self.path)
+        self.addCleanup(self.cache.close)
+
+    def test_lookup_store(self):
+        self.assertIsNone(self.cache.lookup("workflow", [1.0, 2.0]))
+        self.cache.store("workflow", [1.0, 2.0], [3.0, None])
+        self.assertEqual(
+            [3.0, None], self.cache.lookup("workflow", [1.0, 2.0])
+        )
+        self.assertEqual(
+            [3.0, None],
+            self.cache.lookup("workflow", np.array([1.0, 2.0])),
+        )
+        self.assertIsNone(self.cache.lookup("other", [1.0, 2.0]))
+        self.assertEqual(2, self.cache.hits)
+        self.assertEqual(2, self.cache.misses)
+        self.assertEqual(1, len(self.cache))
+
+        self.cache.clear()
+        self.assertEqual(0, len(self.cache))
+
+    def test_persistence(self):
+        self.cache.store("workflow", ["a", 1], [np.float64(2.0)])
+        self.cache.close()
+
+        cache = EvaluationCache(path=self.path)
+        self.addCleanup(cache.close)
+        self.assertEqual([2.0], cache.lookup("workflow", ["a", 1]))
+
+    def test_eviction(self):
+        self.cache.max_entries = 2
+        self.cache.store("workflow", [1], [1])
+        self.cache.store("workflow", [2], [2])
+        self.cache.lookup("workflow", [1])
+        self.cache.store("workflow", [3], [3])
+
+        self.assertEqual(2, len(self.cache))
+        self.assertIsNone(self.cache.lookup("workflow", [2]))
+        self.assertEqual([1], self.cache.lookup("workflow", [1]))
+
+    def test_unpicklable_kpis(self):
+        self.cache.store("workflow", [1], [lambda: None])
+        self.assertEqual(0, len(self.cache))
+
+    def test_multiple_processes(self):
+        # Caches are sent to the workers without their connections
+        cache = pickle.loads(pickle.dumps(self.cache))
+        self.assertEqual(self.path, cache.path)
+
+        with ProcessPoolExecutor(max_workers=4) as executor:
+            list(executor.map(
+                store_evaluations, [self.cache] * 4, range(4)
+            ))
+        self.assertEqual(80, len(self.cache))
+        self.assertEqual([6], self.cache.lookup("workflow", [3, 2]))
+
+    def test_hash_workflow(self):
+        workflow_file = ProbeWorkflowFile(path=fixtures.get("test_probe.json"))
+        workflow_file.read()
+        workflow = workflow_file.workflow
+
+        key = hash_workflow(workflow)
+        self.assertEqual(key, hash_workflow(workflow))
+
+        workflow.notification_listeners = []
+        self.assertEqual(key, hash_workflow(workflow))
+
+        # Settings of the MCO and of the execution do not change the
+        # KPI values
+        mco_key = hash_workflow(workflow, include_mco_settings=True)
+        self.assertNotEqual(key, mco_key)
+        workflow.mco_model.kpis[0].objective = "MAXIMISE"
+        workflow.concurrency_mode = "Thread"
+        workflow.execution_layers[0].data_sources[0].cache_size = 10
+        self.assertEqual(key, hash_workflow(workflow))
+        self.assertNotEqual(
+            mco_key, hash_workflow(workflow, include_mco_settings=True)
+        )
+
+        workflow.mco_model.kpis[0].name = "baz"
+        self.assertNotEqual(key, hash_workflow(workflow))
@@ -9,14 +9,23 @@ import testfixtures
 from traits.testing.unittest_tools import UnittestTools
 
 from force_bdss.core.data_value import DataValue
-from force_bdss.core.execution_layer import ExecutionLayer, _bind_data_values
+from force_bdss.core.execution_layer import (
+    ExecutionLayer,
+    _bind_data_values,
+    _run_data_source,
+    _teardown_worker_data_sources,
+)
 from force_bdss.core.input_slot_info import InputSlotInfo
 from force_bdss.core.output_slot_info import OutputSlotInfo
 from force_bdss.core.slot import Slot
+from force_bdss.tests.probe_classes.data_source import ProbeDataSourceFactory
 from force_bdss.tests.probe_classes.factory_registry import (
     ProbeFactoryRegistry,
 )
 from force_bdss.events.base_driver_event import BaseDriverEvent
+from force_bdss.events.data_source_events import (
+    TIMING_STAGES, DataSourceCacheEvent, DataSourceTimingEvent
+)
 from force_bdss.tests import fixtures
 
 
@@ -218,6 +227,432 @@ class TestExecutionLayer(TestCase, UnittestTools):
             self.layer.execute_layer(data_values)
         mock_run.assert_called_once()
 
+    def test_execute_layer_concurrent_results(self):
+        data_values = [DataValue(name="foo"), DataValue(name="bar")]
+
+        def first_run(self, *args, **kwargs):
+            return [DataValue(value=1)]
+
+        def second_run(self, *args, **kwargs):
+            return [DataValue(value=2)]
+
+        first_factory = ProbeDataSourceFactory(
+            self.plugin, run_function=first_run)
+        second_factory = ProbeDataSourceFactory(
+            self.plugin, run_function=second_run)
+        first_model = first_factory.create_model()
+        first_model.input_slot_info = [InputSlotInfo(name="foo")]
+        first_model.output_slot_info = [OutputSlotInfo(name="one")]
+        second_model = second_factory.create_model()
+        second_model.input_slot_info = [InputSlotInfo(name="bar")]
+        second_model.output_slot_info = [OutputSlotInfo(name="two")]
+
+        self.layer.data_sources = [first_model, second_model]
+        self.layer.concurrency_mode = "Thread"
+        self.layer.max_workers = 2
+
+        # Start and finish events of both data sources
+        with self.assertTraitChanges(self.layer, "event", count=4):
+            res = self.layer.execute_layer(data_values)
+        self.assertEqual(["one", "two"], [dv.name for dv in res])
+        self.assertEqual([1, 2], [dv.value for dv in res])
+        self.assertIsNotNone(self.layer._worker_pool)
+
+        self.layer.shutdown_worker_pool()
+        self.assertIsNone(self.layer._worker_pool)
+
+    def test_execute_layer_batch(self):
+        batch_data_values = [
+            [DataValue(name="foo", value=value)] for value in range(3)
+        ]
+
+        def run(model, parameters):
+            return [DataValue(value=2 * parameters[0].value)]
+
+        factory = ProbeDataSourceFactory(self.plugin, run_function=run)
+        model = factory.create_model()
+        model.input_slot_info = [InputSlotInfo(name="foo")]
+        model.output_slot_info = [OutputSlotInfo(name="bar")]
+        self.layer.data_sources = [model, factory.create_model()]
+
+        # Data sources are called once for all the points
+        with self.assertTraitChanges(self.layer, "event", count=4):
+            res = self.layer.execute_layer_batch(
+                batch_data_values, input_indices=[[0], [0]]
+            )
+        self.assertEqual(3, len(res))
+        for value, point_res in enumerate(res):
+            self.assertEqual(["bar"], [dv.name for dv in point_res])
+            self.assertEqual([2 * value], [dv.value for dv in point_res])
+
+        ds_class = "force_bdss.tests.probe_classes.data_source.ProbeDataSource"
+        with mock.patch(
+            ds_class + ".run_batch",
+            return_value=[[DataValue(value=1)]] * 3
+        ) as mock_run_batch, mock.patch(ds_class + ".run") as mock_run:
+            self.layer.data_sources = [model]
+            res = self.layer.execute_layer_batch(batch_data_values)
+        mock_run_batch.assert_called_once()
+        mock_run.assert_not_called()
+        self.assertEqual([[1], [1], [1]], [
+            [dv.value for dv in point_res] for point_res in res
+        ])
+
+    def test_execute_layer_batch_errors(self):
+        batch_data_values = [[DataValue(name="foo")]] * 2
+        self.layer.data_sources[0].input_slot_info = [
+            InputSlotInfo(name="foo")
+        ]
+        self.layer.data_sources = self.layer.data_sources[:1]
+
+        ds_class = "force_bdss.tests.probe_classes.data_source.ProbeDataSource"
+        with mock.patch(ds_class + ".run_batch", return_value=[[]]):
+            with testfixtures.LogCapture():
+                with self.assertRaisesRegex(
+                        RuntimeError,
+                        "The run_batch method of data source "
+                        "test_data_source must return a list with the "
+                        "results of each of the 2 points"):
+                    self.layer.execute_layer_batch(batch_data_values)
+
+        factory = self.registry.data_source_factories[0]
+        factory.raises_on_data_source_run = True
+        with testfixtures.LogCapture() as capture:
+            with self.assertRaises(Exception):
+                self.layer.execute_layer_batch(batch_data_values)
+            capture.check_present(
+                (
+                    "force_bdss.core.execution_layer",
+                    "ERROR",
+                    "Evaluation could not be performed. "
+                    "Run method raised exception.",
+                ),
+            )
+
+    def test_result_cache(self):
+        calls = []
+
+        def run(model, parameters):
+            calls.append(parameters[0].value)
+            return [DataValue(value=2 * parameters[0].value)]
+
+        factory = ProbeDataSourceFactory(self.plugin, run_function=run)
+        model = factory.create_model()
+        model.input_slot_info = [InputSlotInfo(name="foo")]
+        model.output_slot_info = [OutputSlotInfo(name="bar")]
+        self.layer.data_sources = [model]
+
+        def execute(value):
+            res = self.layer.execute_layer(
+                [DataValue(name="foo", value=value)])
+            return [dv.value for dv in res]
+
+        # Caching is opt-in
+        self.assertEqual([2], execute(1))
+        self.assertEqual([2], execute(1))
+        self.assertEqual([1, 1], calls)
+        self.assertEqual({}, self.layer._result_caches)
+
+        model.cache_size = 2
+        del calls[:]
+        self.assertEqual([2], execute(1))
+        # Only the cache event is fired on a hit
+        with self.assertTraitChanges(self.layer, "event", count=1):
+            self.assertEqual([2], execute(1))
+        self.assertEqual([4], execute(2))
+        self.assertEqual([6], execute(3))
+
+        self.layer.concurrency_mode = "Thread"
+        with self.assertTraitChanges(self.layer, "event", count=1):
+            self.assertEqual([6], execute(3))
+        # The least recently used result has been evicted
+        self.assertEqual([2], execute(1))
+        self.layer.shutdown_worker_pool()
+        self.assertEqual([1, 2, 3, 1], calls)
+        cache = self.layer._result_caches[model]
+        self.assertEqual(2, cache.hits)
+        self.assertEqual(4, cache.misses)
+
+        # Batches only run the missing points
+        del calls[:]
+        res = self.layer.execute_layer_batch([
+            [DataValue(name="foo", value=value)] for value in [1, 4, 3]
+        ])
+        self.assertEqual([[2], [8], [6]], [
+            [dv.value for dv in point_res] for point_res in res
+        ])
+        self.assertEqual([4], calls)
+
+        # Changes to the model invalidate its cached results
+        del calls[:]
+        model.output_slot_info[0].name = "baz"
+        self.assertEqual([4], execute(2))
+        self.assertEqual([2], calls)
+
+        # Non-deterministic data sources are always run
+        del calls[:]
+        model.deterministic = False
+        self.assertEqual([4], execute(2))
+        self.assertEqual([2], calls)
+
+        self.layer.data_sources = []
+        self.assertEqual({}, self.layer._result_caches)
+
+    def test_result_cache_event(self):
+        model = self.layer.data_sources[0]
+        model.input_slot_info = [InputSlotInfo(name="foo")]
+        model.cache_size = 1
+        self.layer.data_sources = [model]
+        data_values = [DataValue(name="foo", value=1)]
+
+        events = []
+        self.layer.on_trait_change(
+            lambda event: events.append(event), "event")
+        self.layer.execute_layer(data_values)
+        self.layer.execute_layer(data_values)
+
+        cache_events = [
+            event for event in events
+            if isinstance(event, DataSourceCacheEvent)
+        ]
+        self.assertEqual([False, True], [e.hit for e in cache_events])
+        self.assertEqual([1, 1], cache_events[-1].serialize())
+
+    def test_execute_layer_process_mode(self):
+        data_values = [DataValue(name="foo")]
+        for model in self.layer.data_sources:
+            model.input_slot_info = [InputSlotInfo(name="foo")]
+        self.layer.data_sources[0].output_slot_info = [
+            OutputSlotInfo(name="one")]
+        self.layer.data_sources[1].output_slot_info = [
+            OutputSlotInfo(name="two")]
+        self.layer.concurrency_mode = "Process"
+        self.layer.max_workers = 1
+
+        try:
+            with self.assertTraitChanges(self.layer, "event", count=4):
+                res = self.layer.execute_layer(data_values)
+        finally:
+            self.layer.shutdown_worker_pool()
+        self.assertEqual(["one", "two"], [dv.name for dv in res])
+
+    def test_process_mode_slots(self):
+        data_values = [DataValue(name="foo")]
+        for model in self.layer.data_sources:
+            model.input_slot_info = [InputSlotInfo(name="foo")]
+        self.layer.concurrency_mode = "Process"
+        self.layer.max_workers = 1
+        self.addCleanup(self.layer.shutdown_worker_pool)
+
+        # The slots are only retrieved once for each data source
+        with mock.patch.object(
+                ExecutionLayer, "_create_data_source", autospec=True,
+                side_effect=ExecutionLayer._create_data_source
+        ) as mock_create:
+            self.layer.execute_layer(data_values)
+            self.layer.setup_data_sources()
+            self.layer.execute_layer(data_values)
+            self.assertEqual(2, mock_create.call_count)
+
+            self.layer.data_sources[0].input_slots_type = "VOLUME"
+            self.layer.execute_layer(data_values)
+            self.assertEqual(3, mock_create.call_count)
+
+        self.assertEqual(2, len(self.layer._process_reuse_keys))
+        self.layer.teardown_data_sources()
+        self.assertEqual({}, self.layer._process_reuse_keys)
+        self.assertIsNone(self.layer._worker_pool)
+
+    def test_run_data_source_reuse(self):
+        model = self.layer.data_sources[0]
+        factory = model.factory
+        model_data = model.__getstate__()["model_data"]
+        parameters = [DataValue(value=1)]
+        ds_class = "force_bdss.data_sources.base_data_source.BaseDataSource"
+        self.addCleanup(_teardown_worker_data_sources)
+
+        with mock.patch(ds_class + ".setup") as mock_setup, \
+                mock.patch(ds_class + ".teardown") as mock_teardown:
+            # Without a key, the data source is not kept
+            _run_data_source(factory, model_data, parameters)
+            self.assertEqual(1, mock_setup.call_count)
+            self.assertEqual(1, mock_teardown.call_count)
+
+            _run_data_source(factory, model_data, parameters, (1, "a"))
+            _run_data_source(factory, model_data, parameters, (1, "a"))
+            self.assertEqual(2, mock_setup.call_count)
+            self.assertEqual(1, mock_teardown.call_count)
+
+            # A new key replaces the data source of the model
+            _run_data_source(factory, model_data, parameters, (1, "b"))
+            self.assertEqual(3, mock_setup.call_count)
+            self.assertEqual(2, mock_teardown.call_count)
+
+            _teardown_worker_data_sources()
+            self.assertEqual(3, mock_teardown.call_count)
+
+    def test_concurrent_run_error(self):
+        data_values = [DataValue(name="foo")]
+        self.layer.data_sources[0].input_slot_info = [
+            InputSlotInfo(name="foo")
+        ]
+        self.layer.data_sources[1].input_slot_info = [
+            InputSlotInfo(name="foo")
+        ]
+        self.layer.concurrency_mode = "Thread"
+
+        factory = self.registry.data_source_factories[0]
+        factory.raises_on_data_source_run = True
+
+        with testfixtures.LogCapture() as capture:
+            with self.assertRaises(Exception):
+                self.layer.execute_layer(data_values)
+            capture.check_present(
+                (
+                    "force_bdss.core.execution_layer",
+                    "ERROR",
+                    "Evaluation could not be performed. "
+                    "Run method raised exception.",
+                ),
+            )
+        self.layer.shutdown_worker_pool()
+
+    def test_reset_worker_pool(self):
+        self.layer.concurrency_mode = "Thread"
+        pool = self.layer._get_worker_pool()
+        self.assertIs(pool, self.layer._get_worker_pool())
+
+        self.layer.max_workers = 3
+        self.assertIsNone(self.layer._worker_pool)
+        self.layer.concurrency_mode = "Serial"
+        self.assertIsNone(self.layer._get_worker_pool())
+
+    def test_reuse_data_sources(self):
+        data_values = [DataValue(name="foo")]
+        for model in self.layer.data_sources:
+            model.input_slot_info = [InputSlotInfo(name="foo")]
+        ds_class = "force_bdss.data_sources.base_data_source.BaseDataSource"
+
+        # By default, data sources are created for every evaluation
+        with mock.patch(ds_class + ".setup") as mock_setup, \
+                mock.patch(ds_class + ".teardown") as mock_teardown:
+            self.layer.execute_layer(data_values)
+            self.layer.execute_layer(data_values)
+        self.assertEqual(4, mock_setup.call_count)
+        self.assertEqual(4, mock_teardown.call_count)
+
+        self.layer.setup_data_sources()
+        with mock.patch(ds_class + ".setup") as mock_setup, \
+                mock.patch(ds_class + ".teardown") as mock_teardown:
+            self.layer.execute_layer(data_values)
+            self.layer.execute_layer(data_values)
+            self.assertEqual(2, mock_setup.call_count)
+            self.assertEqual(0, mock_teardown.call_count)
+
+            # Changing the slots discards the data source of the model
+            self.layer.data_sources[0].input_slots_type = "VOLUME"
+            self.assertEqual(1, mock_teardown.call_count)
+            self.layer.execute_layer(data_values)
+            self.assertEqual(3, mock_setup.call_count)
+
+            self.layer.teardown_data_sources()
+            self.assertEqual(3, mock_teardown.call_count)
+
+    def test_timing_events(self):
+        data_values = [DataValue(name="foo")]
+        for model in self.layer.data_sources:
+            model.input_slot_info = [InputSlotInfo(name="foo")]
+        self.layer.data_sources[0].output_slot_info = [
+            OutputSlotInfo(name="one")]
+        events = []
+        self.layer.on_trait_change(
+            lambda event: events.append(event), "event"
+        )
+
+        # Runs are not timed by default
+        self.layer.execute_layer(data_values)
+        self.assertEqual(4, len(events))
+        self.assertFalse(any(
+            isinstance(event, DataSourceTimingEvent) for event in events
+        ))
+
+        self.layer.timing_enabled = True
+
+        for concurrency_mode in ["Serial", "Thread"]:
+            events.clear()
+            self.layer.concurrency_mode = concurrency_mode
+            self.layer.execute_layer(data_values)
+            timing_events = [
+                event for event in events
+                if isinstance(event, DataSourceTimingEvent)
+            ]
+            self.assertEqual(2, len(timing_events))
+            self.assertEqual(["one"], timing_events[0].output_names)
+            for event in timing_events:
+                self.assertEqual(
+                    "test_data_source", event.data_source_name
+                )
+                self.assertEqual(
+                    set(TIMING_STAGES), set(event.wall_times)
+                )
+                self.assertEqual(set(TIMING_STAGES), set(event.cpu_times))
+                for wall_time in event.wall_times.values():
+                    self.assertGreaterEqual(wall_time, 0.0)
+        self.layer.shutdown_worker_pool()
+
+        # Reused data sources are not created again
+        self.layer.concurrency_mode = "Serial"
+        self.layer.setup_data_sources()
+        self.layer.execute_layer(data_values)
+        events.clear()
+        self.layer.execute_layer(data_values)
+        timing_events = [
+            event for event in events
+            if isinstance(event, DataSourceTimingEvent)
+        ]
+        self.assertEqual(2, len(timing_events))
+        for event in timing_events:
+            self.assertEqual(
+                {"bind", "run", "validate"}, set(event.wall_times)
+            )
+        self.layer.teardown_data_sources()
+
+    def test_reuse_data_sources_run_error(self):
+        data_values = [DataValue(name="foo")]
+        self.layer.data_sources[0].input_slot_info = [
+            InputSlotInfo(name="foo")
+        ]
+        factory = self.registry.data_source_factories[0]
+        factory.raises_on_data_source_run = True
+        self.layer.setup_data_sources()
+
+        with testfixtures.LogCapture():
+            with self.assertRaises(Exception):
+                self.layer.execute_layer(data_values)
+        # Data sources that raised are not kept for reuse
+        self.assertIsNone(
+            self.layer._data_source_pool.acquire(self.layer.data_sources[0])
+        )
+
+    def test_setup_error(self):
+        ds_class = "force_bdss.data_sources.base_data_source.BaseDataSource"
+        with testfixtures.LogCapture() as capture:
+            with mock.patch(ds_class + ".setup", side_effect=Exception):
+                with self.assertRaises(Exception):
+                    self.layer.execute_layer([])
+            capture.check(
+                (
+                    "force_bdss.core.execution_layer",
+                    "ERROR",
+                    "Unable to set up data source from factory "
+                    "'force.bdss.enthought.plugin.test.v0.factory."
+                    "probe_data_source' in plugin "
+                    "'force.bdss.enthought.plugin.test.v0'."
+                    " This may indicate a programming "
+                    "error in the plugin",
+                )
+            )
+
     def test_from_json(self):
         json_path = fixtures.get("test_probe.json")
         with open(json_path) as f:
@@ -245,8 +680,12 @@ class TestExecutionLayer(TestCase, UnittestTools):
                 "output_slots_type": "PRESSURE",
                 "input_slots_size": 1,
                 "output_slots_size": 1,
+                "cache_size": 0,
+                "cache_memory_limit": None,
+                "deterministic": True,
             }
         )
+        layer_data.update({"concurrency_mode": "Serial", "max_workers": None})
         self.assertDictEqual(layer.__getstate__(), layer_data)
 
     def test_empty_layer_from_json(self):
@@ -0,0 +1,116 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+import unittest
+
+from force_bdss.core.execution_layer import ExecutionLayer
+from force_bdss.core.execution_plan import (
+    ExecutionPlan, find_unused_data_sources
+)
+from force_bdss.core.input_slot_info import InputSlotInfo
+from force_bdss.core.kpi_specification import KPISpecification
+from force_bdss.core.output_slot_info import OutputSlotInfo
+from force_bdss.core.workflow import Workflow
+from force_bdss.tests.probe_classes.factory_registry import (
+    ProbeFactoryRegistry,
+)
+
+
+class TestExecutionPlan(unittest.TestCase):
+    def setUp(self):
+        registry = ProbeFactoryRegistry()
+        mco_factory = registry.mco_factories[0]
+        parameter_factory = mco_factory.parameter_factories[0]
+        ds_factory = registry.data_source_factories[0]
+
+        mco_model = mco_factory.create_model()
+        mco_model.parameters = [
+            parameter_factory.create_model({"name": "in1"}),
+            parameter_factory.create_model({"name": ""}),
+            parameter_factory.create_model({"name": "in2"}),
+        ]
+        mco_model.kpis = [
+            KPISpecification(name="res3"),
+            KPISpecification(name="in1"),
+        ]
+
+        first = ds_factory.create_model({"output_slots_size": 2})
+        first.input_slot_info = [InputSlotInfo(name="in2")]
+        first.output_slot_info = [
+            OutputSlotInfo(name="res1"), OutputSlotInfo(name="")
+        ]
+        second = ds_factory.create_model()
+        second.input_slot_info = [InputSlotInfo(name="in1")]
+        second.output_slot_info = [OutputSlotInfo(name="res2")]
+        third = ds_factory.create_model({"input_slots_size": 2})
+        third.input_slot_info = [
+            InputSlotInfo(name="res2"), InputSlotInfo(name="res1")
+        ]
+        third.output_slot_info = [OutputSlotInfo(name="res3")]
+
+        self.workflow = Workflow(
+            mco_model=mco_model,
+            execution_layers=[
+                ExecutionLayer(data_sources=[first, second]),
+                ExecutionLayer(data_sources=[third]),
+            ],
+        )
+
+    def test_from_workflow(self):
+        plan = ExecutionPlan.from_workflow(self.workflow)
+
+        # Environment: in1, in2, res1, res2, res3
+        self.assertEqual(2, plan.parameters_size)
+        self.assertEqual([[0, 1], [0]], plan.data_source_indices)
+        self.assertEqual([[[1], [0]], [[3, 2]]], plan.input_indices)
+        self.assertEqual([4, 5], plan.layer_sizes)
+        self.assertEqual([4, 0], plan.kpi_indices)
+
+    def test_unused_data_sources(self):
+        # The second data source only feeds an unused one
+        second = self.workflow.execution_layers[0].data_sources[1]
+        unused = second.factory.create_model()
+        unused.input_slot_info = [InputSlotInfo(name="res2")]
+        unused.output_slot_info = [OutputSlotInfo(name="res4")]
+        self.workflow.execution_layers[1].data_sources.append(unused)
+        third = self.workflow.execution_layers[1].data_sources[0]
+        third.input_slot_info[0].name = "res1"
+        self.assertEqual(
+            [second, unused], find_unused_data_sources(self.workflow)
+        )
+
+        self.workflow.prune_data_sources = True
+        plan = ExecutionPlan.from_workflow(self.workflow)
+        # Environment: in1, in2, res1, res3
+        self.assertEqual([[0], [0]], plan.data_source_indices)
+        self.assertEqual([[[1]], [[2, 2]]], plan.input_indices)
+        self.assertEqual([3, 4], plan.layer_sizes)
+        self.assertEqual([3, 0], plan.kpi_indices)
+
+        self.workflow.prune_data_sources = False
+        plan = ExecutionPlan.from_workflow(self.workflow)
+        self.assertEqual([[0, 1], [0, 1]], plan.data_source_indices)
+
+        # Data sources without output slots may have side effects, so
+        # they and their inputs are always used
+        unused.output_slot_info = []
+        self.assertEqual([], find_unused_data_sources(self.workflow))
+
+    def test_shadowed_names(self):
+        layer = self.workflow.execution_layers[1]
+        layer.data_sources[0].output_slot_info[0].name = "res1"
+        self.workflow.mco_model.kpis[0].name = "res1"
+
+        plan = ExecutionPlan.from_workflow(self.workflow)
+        self.assertEqual([2, 4, 0], plan.kpi_indices)
+
+    def test_missing_name(self):
+        layer = self.workflow.execution_layers[0]
+        layer.data_sources[1].input_slot_info[0].name = "res2"
+
+        with self.assertRaisesRegex(
+            RuntimeError,
+            "Unable to find requested name 'res2' in available "
+            r"data values. Current data value names: \['in1', 'in2'\]",
+        ):
+            ExecutionPlan.from_workflow(self.workflow)
@@ -0,0 +1,58 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+from unittest import TestCase
+
+from force_bdss.core.timing_summary import DataSourceTimingSummary
+from force_bdss.events.data_source_events import DataSourceTimingEvent
+
+
+class TestDataSourceTimingSummary(TestCase):
+
+    def setUp(self):
+        self.summary = DataSourceTimingSummary()
+
+    def _record(self, name, run, overhead, output_names=()):
+        self.summary.record(
+            DataSourceTimingEvent(
+                data_source_name=name,
+                output_names=list(output_names),
+                wall_times={"bind": overhead, "run": run},
+                cpu_times={"bind": overhead, "run": run / 2},
+            )
+        )
+
+    def test_empty(self):
+        self.assertEqual({}, self.summary.summary())
+        self.assertEqual(0.0, self.summary.overhead_ratio())
+
+    def test_summary(self):
+        for run in range(1, 21):
+            self._record("Adder", float(run), 1.0, ["out"])
+        self._record("Adder", 4.0, 0.0)
+        self._record("Multiplier", 0.0, 1.0)
+
+        summary = self.summary.summary()
+        self.assertEqual(
+            {"Adder (out)", "Adder", "Multiplier"}, set(summary)
+        )
+
+        stats = summary["Adder (out)"]
+        self.assertEqual(20, stats["count"])
+        self.assertAlmostEqual(11.5, stats["mean"])
+        self.assertAlmostEqual(20.05, stats["p95"])
+        self.assertAlmostEqual(21.0, stats["max"])
+        self.assertAlmostEqual(210.0, stats["plugin_time"])
+        self.assertAlmostEqual(20.0, stats["overhead_time"])
+        self.assertAlmostEqual(20.0 / 210.0, stats["overhead_ratio"])
+        self.assertAlmostEqual(125.0, stats["cpu_time"])
+
+        self.assertEqual(1, summary["Adder"]["count"])
+        self.assertEqual(0.0, summary["Adder"]["overhead_ratio"])
+        self.assertEqual(
+            float("inf"), summary["Multiplier"]["overhead_ratio"]
+        )
+        self.assertAlmostEqual(21.0 / 214.0, self.summary.overhead_ratio())
+
+        self.summary.clear()
+        self.assertEqual({}, self.summary.summary())
@@ -141,8 +141,11 @@ class TestVerifier(unittest.TestCase):
 
         ds_model.output_slot_info[0].name = ''
         errors = verify_workflow(wf)
-        self.assertEqual(len(errors), 3)
+        self.assertEqual(len(errors), 4)
         self.assertIn("All output variables have undefined names",
                       errors[1].local_error)
         self.assertIn("An output variable has an undefined name",
                       errors[2].local_error)
+        self.assertEqual("information", errors[3].severity)
+        self.assertIn("Data source outputs are not used by any KPI",
+                      errors[3].local_error)
@@ -0,0 +1,27 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from unittest import TestCase
+
+from force_bdss.core.worker_pool import create_worker_pool
+
+
+class TestWorkerPool(TestCase):
+
+    def test_create_worker_pool(self):
+        self.assertIsNone(create_worker_pool("Serial"))
+
+        pool = create_worker_pool("Thread", max_workers=2)
+        self.assertIsInstance(pool, ThreadPoolExecutor)
+        pool.shutdown()
+
+        pool = create_worker_pool("Process", max_workers=1)
+        self.assertIsInstance(pool, ProcessPoolExecutor)
+        pool.shutdown()
+
+    def test_unsupported_mode(self):
+        with self.assertRaisesRegex(
+                NotImplementedError,
+                "Worker pool mode GPU is not supported"):
+            create_worker_pool("GPU")
@@ -3,11 +3,19 @@
 
 from copy import deepcopy
 import json
+import os
+import pickle
+import shutil
+import tempfile
 import unittest
 
+import numpy as np
+
 from traits.testing.api import UnittestTools
 
 from force_bdss.events.base_driver_event import BaseDriverEvent
+from force_bdss.core.checkpoint import OptimizationCheckpoint
+from force_bdss.core.evaluation_cache import EvaluationCache
 from force_bdss.core.execution_layer import ExecutionLayer
 from force_bdss.core.kpi_specification import KPISpecification
 from force_bdss.core.output_slot_info import OutputSlotInfo
@@ -44,6 +52,10 @@ class TestWorkflow(unittest.TestCase, UnittestTools):
                 "mco_model": None,
                 "execution_layers": [],
                 "notification_listeners": [],
+                "scheduling_mode": "Layered",
+                "concurrency_mode": "Serial",
+                "max_workers": None,
+                "prune_data_sources": False,
             },
         )
 
@@ -251,6 +263,267 @@ class TestWorkflow(unittest.TestCase, UnittestTools):
                     self.assertEqual(kpi_results[i].name, spec[i][0])
                     self.assertEqual(kpi_results[i].value, spec[i][1])
 
+    def test_compile(self):
+        workflow_file = ProbeWorkflowFile(path=fixtures.get("test_probe.json"))
+        workflow_file.read()
+        workflow = workflow_file.workflow
+
+        plan = workflow.compile()
+        self.assertEqual([[[0]]], plan.input_indices)
+        self.assertEqual([1], plan.kpi_indices)
+        self.assertIs(plan, workflow.compile())
+
+        # Changing any name invalidates the plan
+        model = workflow.execution_layers[0].data_sources[0]
+        model.output_slot_info[0].name = "baz"
+        self.assertEqual([], workflow.compile().kpi_indices)
+
+        workflow.mco_model.kpis[0].name = "baz"
+        self.assertEqual([1], workflow.compile().kpi_indices)
+
+        workflow.mco_model.parameters[0].name = "in1"
+        with self.assertRaisesRegex(
+                RuntimeError, "Unable to find requested name 'foo'"):
+            workflow.compile()
+
+        model.input_slot_info[0].name = "in1"
+        plan = workflow.compile()
+        workflow.execution_layers.append(ExecutionLayer())
+        self.assertIsNot(plan, workflow.compile())
+        self.assertEqual([[[0]], []], workflow.compile().input_indices)
+
+    def test_execute_plan_mismatch(self):
+        workflow_file = ProbeWorkflowFile(path=fixtures.get("test_probe.json"))
+        workflow_file.read()
+        workflow = workflow_file.workflow
+
+        # The data source names its own output, which is not described
+        # in the model
+        def run(model, parameters):
+            return [DataValue(name="bar", value=1)]
+
+        model = workflow.execution_layers[0].data_sources[0]
+        model.factory.run_function = run
+        model.output_slot_info = []
+
+        with self.assertLogs("force_bdss.core.workflow", "WARNING"):
+            kpi_results = workflow.execute([DataValue(value=0)])
+        self.assertEqual(1, len(kpi_results))
+        self.assertEqual(1, kpi_results[0].value)
+
+    def _create_graph_workflow(self):
+        # A single layer in which each data source depends on the
+        # following one:
+        #   res2 = res1 + in2 ; res1 = in1 + in2 ; out1 = res2 + res1
+        def adder(model, parameters):
+            return [DataValue(value=sum(p.value for p in parameters))]
+
+        adder_factory = ProbeDataSourceFactory(
+            self.plugin,
+            input_slots_size=2,
+            output_slots_size=1,
+            run_function=adder,
+        )
+        mco_factory = ProbeMCOFactory(self.plugin)
+        mco_model = mco_factory.create_model()
+        parameter_factory = mco_factory.parameter_factories[0]
+        mco_model.parameters = [
+            parameter_factory.create_model({"name": "in1"}),
+            parameter_factory.create_model({"name": "in2"}),
+        ]
+        mco_model.kpis = [KPISpecification(name="out1")]
+
+        layer = ExecutionLayer()
+        for inputs, output in [
+            (["res1", "in2"], "res2"),
+            (["in1", "in2"], "res1"),
+            (["res2", "res1"], "out1"),
+        ]:
+            model = adder_factory.create_model()
+            model.input_slot_info = [
+                InputSlotInfo(name=name) for name in inputs
+            ]
+            model.output_slot_info = [OutputSlotInfo(name=output)]
+            layer.data_sources.append(model)
+
+        return Workflow(
+            mco_model=mco_model,
+            execution_layers=[layer],
+            scheduling_mode="Graph",
+        )
+
+    def test_graph_execution(self):
+        data_values = [
+            DataValue(value=10, name="in1"),
+            DataValue(value=15, name="in2"),
+        ]
+        for concurrency_mode in ["Serial", "Thread"]:
+            workflow = self._create_graph_workflow()
+            workflow.concurrency_mode = concurrency_mode
+            try:
+                with self.assertTraitChanges(
+                        workflow, "event", count=6):
+                    kpi_results = workflow.execute(data_values)
+            finally:
+                workflow.shutdown_worker_pools()
+            self.assertEqual(1, len(kpi_results))
+            self.assertEqual(65, kpi_results[0].value)
+            self.assertIsNone(workflow._worker_pool)
+
+        # The layered scheduling can not resolve the dependencies
+        workflow.scheduling_mode = "Layered"
+        with self.assertRaisesRegex(
+                RuntimeError, "Unable to find requested name 'res1'"):
+            workflow.execute(data_values)
+
+    def test_prune_data_sources(self):
+        data_values = [
+            DataValue(value=10, name="in1"),
+            DataValue(value=15, name="in2"),
+        ]
+        workflow = self._create_graph_workflow()
+        first, second, third = workflow.execution_layers[0].data_sources
+        workflow.execution_layers = [
+            ExecutionLayer(data_sources=[second]),
+            ExecutionLayer(data_sources=[first, third]),
+        ]
+        third.input_slot_info[0].name = "res1"
+        workflow.mco_model.kpis[0].name = "out1"
+
+        # The first data source does not contribute to the KPI, and
+        # is only skipped if pruning is enabled
+        self.assertFalse(workflow.prune_data_sources)
+        workflow.prune_data_sources = True
+        errors = [
+            error for error in workflow.verify()
+            if error.severity == "information"
+        ]
+        self.assertEqual(1, len(errors))
+        self.assertIs(first, errors[0].subject)
+        self.assertEqual(
+            "Data source 'test_data_source' does not contribute to any "
+            "KPI and is skipped",
+            errors[0].global_error
+        )
+
+        for scheduling_mode in ["Layered", "Graph"]:
+            workflow.scheduling_mode = scheduling_mode
+            # Start and finish events of the two used data sources
+            with self.assertTraitChanges(workflow, "event", count=4):
+                kpi_results = workflow.execute(data_values)
+            self.assertEqual([50], [kpi.value for kpi in kpi_results])
+
+            workflow.prune_data_sources = False
+            with self.assertTraitChanges(workflow, "event", count=6):
+                kpi_results = workflow.execute(data_values)
+            self.assertEqual([50], [kpi.value for kpi in kpi_results])
+            workflow.prune_data_sources = True
+
+    def test_graph_execution_errors(self):
+        data_values = [
+            DataValue(value=10, name="in1"),
+            DataValue(value=15, name="in2"),
+        ]
+        workflow = self._create_graph_workflow()
+        n_errors = len(workflow.verify())
+
+        model = workflow.execution_layers[0].data_sources[1]
+        model.input_slot_info[0].name = "res2"
+        errors = workflow.verify()
+        self.assertEqual(n_errors + 1, len(errors))
+        self.assertIn("depend on each other", errors[-1].global_error)
+        with self.assertRaisesRegex(
+                RuntimeError, "Unable to schedule the data sources"):
+            workflow.execute(data_values)
+
+        model.input_slot_info[0].name = "in1"
+        workflow.concurrency_mode = "Thread"
+
+        def fail(model, parameters):
+            raise ValueError("fail")
+
+        model.factory.run_function = fail
+        try:
+            with self.assertRaisesRegex(ValueError, "fail"):
+                workflow.execute(data_values)
+        finally:
+            workflow.shutdown_worker_pools()
+
+    def test_evaluate_batch(self):
+        parameter_matrix = [[10, 15], [1, 2], [0, 0]]
+        expected = [[65], [8], [0]]
+
+        workflow = self._create_graph_workflow()
+        kpi_results = workflow.evaluate_batch(parameter_matrix)
+        self.assertEqual((3, 1), kpi_results.shape)
+        self.assertEqual(expected, kpi_results.tolist())
+
+        # Layered execution calls each data source once for all points
+        first, second, third = workflow.execution_layers[0].data_sources
+        workflow.scheduling_mode = "Layered"
+        workflow.execution_layers = [
+            ExecutionLayer(data_sources=[second]),
+            ExecutionLayer(data_sources=[first]),
+            ExecutionLayer(data_sources=[third]),
+        ]
+        with self.assertTraitChanges(workflow, "event", count=6):
+            kpi_results = workflow.evaluate_batch(parameter_matrix)
+        self.assertEqual(expected, kpi_results.tolist())
+        self.assertEqual(
+            [[65]], workflow.evaluate_batch([[10, 15]]).tolist()
+        )
+        self.assertEqual((0, 1), workflow.evaluate_batch([]).shape)
+
+    def test_evaluate_batch_non_numerical(self):
+        workflow_file = ProbeWorkflowFile(path=fixtures.get("test_probe.json"))
+        workflow_file.read()
+        workflow = workflow_file.workflow
+
+        kpi_results = workflow.evaluate_batch([[1.0], [2.0]])
+        self.assertEqual((2, 1), kpi_results.shape)
+        self.assertTrue(np.isnan(kpi_results).all())
+
+        workflow.mco_model.kpis[0].name = ""
+        kpi_results = workflow.evaluate_batch([[1.0]])
+        self.assertEqual((1, 0), kpi_results.shape)
+
+    def test_evaluation_cache(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        workflow = self._create_graph_workflow()
+        workflow.evaluation_cache = EvaluationCache(
+            path=os.path.join(tmp_dir, "cache.sqlite")
+        )
+        self.addCleanup(workflow.evaluation_cache.close)
+
+        self.assertEqual([65], workflow.evaluate([10, 15]))
+        with self.assertTraitDoesNotChange(workflow, "event"):
+            self.assertEqual([65], workflow.evaluate([10, 15]))
+
+        # Only the missing rows of a batch are evaluated
+        with self.assertTraitChanges(workflow, "event", count=6):
+            kpi_results = workflow.evaluate_batch([[10, 15], [1, 2]])
+        self.assertEqual([[65], [8]], kpi_results.tolist())
+        with self.assertTraitDoesNotChange(workflow, "event"):
+            kpi_results = workflow.evaluate_batch([[1, 2], [10, 15]])
+        self.assertEqual([[8], [65]], kpi_results.tolist())
+        self.assertEqual(4, workflow.evaluation_cache.hits)
+
+        # Execution settings do not invalidate the cached evaluations
+        workflow.prune_data_sources = False
+        workflow.execution_layers[0].data_sources[0].cache_size = 10
+        with self.assertTraitDoesNotChange(workflow, "event"):
+            self.assertEqual([65], workflow.evaluate([10, 15]))
+
+        # Changes to the workflow invalidate the cached evaluations
+        workflow.mco_model.kpis[0].name = "res1"
+        self.assertEqual([25], workflow.evaluate([10, 15]))
+        workflow.mco_model.kpis[0].name = "out1"
+        self.assertEqual([65], workflow.evaluate([10, 15]))
+        model = workflow.execution_layers[0].data_sources[1]
+        model.input_slot_info[0].name = "in2"
+        self.assertEqual([75], workflow.evaluate([10, 15]))
+
     def test__internal_evaluate(self):
         workflow_file = ProbeWorkflowFile(path=fixtures.get("test_probe.json"))
         workflow_file.read()
@@ -268,6 +541,110 @@ class TestWorkflow(unittest.TestCase, UnittestTools):
         self.assertEqual(1, len(kpi_results))
         self.assertIsNone(kpi_results[0])
 
+    def _create_differentiable_workflow(self, differentiable=True):
+        # layer 0: res1 = in1 + in2, res2 = in3 * in4
+        # layer 1: out1 = res1 * res2
+        def adder(model, parameters):
+            first, second = (dv.value for dv in parameters)
+            return [DataValue(value=first + second, derivatives=[1, 1])]
+
+        def multiplier(model, parameters):
+            first, second = (dv.value for dv in parameters)
+            derivatives = [second, first] if differentiable else None
+            return [DataValue(value=first * second, derivatives=derivatives)]
+
+        adder_factory = ProbeDataSourceFactory(
+            self.plugin, input_slots_size=2, run_function=adder)
+        multiplier_factory = ProbeDataSourceFactory(
+            self.plugin, input_slots_size=2, run_function=multiplier)
+
+        mco_factory = ProbeMCOFactory(self.plugin)
+        mco_model = mco_factory.create_model()
+        parameter_factory = mco_factory.parameter_factories[0]
+        mco_model.parameters = [
+            parameter_factory.create_model({"name": name})
+            for name in ["in1", "in2", "in3", "in4"]
+        ]
+        mco_model.kpis = [
+            KPISpecification(name="out1"), KPISpecification(name="in4")
+        ]
+
+        models = []
+        for factory, inputs, output in [
+                (adder_factory, ["in1", "in2"], "res1"),
+                (multiplier_factory, ["in3", "in4"], "res2"),
+                (multiplier_factory, ["res1", "res2"], "out1")]:
+            model = factory.create_model()
+            model.input_slot_info = [
+                InputSlotInfo(name=name) for name in inputs
+            ]
+            model.output_slot_info = [OutputSlotInfo(name=output)]
+            models.append(model)
+
+        return Workflow(
+            mco_model=mco_model,
+            execution_layers=[
+                ExecutionLayer(data_sources=models[:2]),
+                ExecutionLayer(data_sources=models[2:]),
+            ],
+        )
+
+    def test_evaluate_with_jacobian(self):
+        workflow = self._create_differentiable_workflow()
+        for scheduling_mode in ["Layered", "Graph"]:
+            workflow.scheduling_mode = scheduling_mode
+            kpi_values, jacobian = workflow.evaluate_with_jacobian(
+                [1, 2, 3, 4])
+            # out1 = (in1 + in2) * in3 * in4
+            self.assertEqual([36, 4], kpi_values)
+            np.testing.assert_array_equal(
+                [[12, 12, 12, 9], [0, 0, 0, 1]], jacobian
+            )
+
+        # Workflows with a non differentiable data source fall back
+        workflow = self._create_differentiable_workflow(differentiable=False)
+        kpi_values, jacobian = workflow.evaluate_with_jacobian([1, 2, 3, 4])
+        self.assertEqual([36, 4], kpi_values)
+        self.assertIsNone(jacobian)
+
+    def test_evaluate_with_jacobian_cache(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        workflow = self._create_differentiable_workflow()
+        workflow.evaluation_cache = EvaluationCache(
+            path=os.path.join(tmp_dir, "cache.sqlite")
+        )
+        self.addCleanup(workflow.evaluation_cache.close)
+
+        kpi_values, jacobian = workflow.evaluate_with_jacobian([1, 2, 3, 4])
+        self.assertIsNotNone(jacobian)
+        self.assertEqual(kpi_values, workflow.evaluate([1, 2, 3, 4]))
+        self.assertEqual(1, workflow.evaluation_cache.hits)
+
+        # Cached KPI values have no Jacobian
+        kpi_values, jacobian = workflow.evaluate_with_jacobian([1, 2, 3, 4])
+        self.assertEqual([36, 4], kpi_values)
+        self.assertIsNone(jacobian)
+
+    def test_timing_enabled(self):
+        workflow = self._create_graph_workflow()
+        layer = workflow.execution_layers[0]
+        self.assertFalse(layer.timing_enabled)
+
+        workflow.timing_enabled = True
+        self.assertTrue(layer.timing_enabled)
+        new_layer = ExecutionLayer()
+        workflow.execution_layers.append(new_layer)
+        self.assertTrue(new_layer.timing_enabled)
+
+        data_values = [
+            DataValue(value=10, name="in1"),
+            DataValue(value=15, name="in2"),
+        ]
+        # Start, finish and timing events of each data source
+        with self.assertTraitChanges(workflow, "event", count=9):
+            workflow.execute(data_values)
+
     def test_from_json(self):
         registry = DummyFactoryRegistry()
         json_path = fixtures.get("test_workflow_reader.json")
@@ -316,14 +693,44 @@ class TestWorkflow(unittest.TestCase, UnittestTools):
                                     "output_slot_info": [
                                         {"name": "output_slot_name"}
                                     ],
+                                    "cache_size": 0,
+                                    "cache_memory_limit": None,
+                                    "deterministic": True,
                                 },
                             }
-                        ]
+                        ],
+                        "concurrency_mode": "Serial",
+                        "max_workers": None,
                     }
                 ],
+                "scheduling_mode": "Layered",
+                "concurrency_mode": "Serial",
+                "max_workers": None,
+                "prune_data_sources": False,
             },
         )
 
+    def test_pickle(self):
+        registry = DummyFactoryRegistry()
+        with open(fixtures.get("test_workflow_reader.json")) as f:
+            data = json.load(f)
+        workflow = Workflow.from_json(registry, data["workflow"])
+        workflow.scheduling_mode = "Graph"
+        workflow.timing_enabled = True
+        workflow.checkpoint = OptimizationCheckpoint(path="checkpoint.pkl")
+
+        unpickled = pickle.loads(pickle.dumps(workflow))
+        self.assertDictEqual(workflow.__getstate__(), unpickled.__getstate__())
+        self.assertTrue(unpickled.timing_enabled)
+        # Only the process running the optimization saves the checkpoint
+        self.assertIsNone(unpickled.checkpoint)
+        self.assertTrue(unpickled.execution_layers[0].timing_enabled)
+        # Shared references are preserved
+        self.assertIs(
+            unpickled.mco_model.parameters[0].factory,
+            unpickled.mco_model.factory.parameter_factories[0],
+        )
+
     def test_persistent_wfdata(self):
         registry = DummyFactoryRegistry()
         json_path = fixtures.get("test_workflow_reader.json")
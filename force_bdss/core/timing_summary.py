@@ -0,0 +1,109 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+import numpy as np
+from traits.api import Dict, HasStrictTraits
+
+
+class DataSourceTimingSummary(HasStrictTraits):
+    """Aggregates the DataSourceTimingEvents of a run into statistics of
+    the wall clock time taken by each data source.
+
+    Data sources are identified by the name of their factory and the
+    names of their outputs, so that several data sources from the same
+    factory are summarised separately.
+    """
+
+    #: Wall clock time of each recorded run, by data source
+    _run_times = Dict()
+
+    #: Total wall clock time spent in the run method, by data source
+    _plugin_times = Dict()
+
+    #: Total wall clock time spent in the other stages, by data source
+    _overhead_times = Dict()
+
+    #: Total CPU time of the recorded runs, by data source
+    _cpu_times = Dict()
+
+    def record(self, event):
+        """ Adds the times reported by a DataSourceTimingEvent.
+
+        Parameters
+        ----------
+        event: DataSourceTimingEvent
+            The event to record
+        """
+        label = event.data_source_name
+        if event.output_names:
+            label += " ({})".format(", ".join(event.output_names))
+
+        plugin_time = event.wall_times.get("run", 0.0)
+        overhead_time = sum(
+            wall_time for stage, wall_time in event.wall_times.items()
+            if stage != "run"
+        )
+        self._run_times.setdefault(label, []).append(
+            plugin_time + overhead_time
+        )
+        self._plugin_times[label] = (
+            self._plugin_times.get(label, 0.0) + plugin_time
+        )
+        self._overhead_times[label] = (
+            self._overhead_times.get(label, 0.0) + overhead_time
+        )
+        self._cpu_times[label] = (
+            self._cpu_times.get(label, 0.0) + sum(event.cpu_times.values())
+        )
+
+    def summary(self):
+        """ Returns the statistics of the recorded runs of each data
+        source.
+
+        Returns
+        -------
+        summary: dict
+            For each data source, a dictionary with the number of runs
+            ("count"), the "mean", 95th percentile ("p95") and "max" of
+            their wall clock time, the total time spent in the plugin
+            ("plugin_time") and in the framework ("overhead_time"), their
+            "overhead_ratio" and the total "cpu_time", all in seconds.
+        """
+        summary = {}
+        for label, run_times in self._run_times.items():
+            run_times = np.asarray(run_times)
+            plugin_time = self._plugin_times[label]
+            overhead_time = self._overhead_times[label]
+            summary[label] = {
+                "count": len(run_times),
+                "mean": float(run_times.mean()),
+                "p95": float(np.percentile(run_times, 95)),
+                "max": float(run_times.max()),
+                "plugin_time": plugin_time,
+                "overhead_time": overhead_time,
+                "overhead_ratio": _ratio(overhead_time, plugin_time),
+                "cpu_time": self._cpu_times[label],
+            }
+        return summary
+
+    def overhead_ratio(self):
+        """ Returns the ratio between the total time spent by the
+        framework around the recorded runs, and the total time spent in
+        the data sources themselves."""
+        return _ratio(
+            sum(self._overhead_times.values()),
+            sum(self._plugin_times.values()),
+        )
+
+    def clear(self):
+        """ Discards all the recorded runs."""
+        self._run_times = {}
+        self._plugin_times = {}
+        self._overhead_times = {}
+        self._cpu_times = {}
+
+
+def _ratio(overhead_time, plugin_time):
+    if plugin_time > 0:
+        return overhead_time / plugin_time
+    return float("inf") if overhead_time > 0 else 0.0
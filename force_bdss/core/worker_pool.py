@@ -0,0 +1,37 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+#: Names of the supported concurrency backends. "Serial" performs all
+#: the work in the calling thread, "Thread" uses a pool of threads and
+#: "Process" a pool of worker processes.
+WORKER_POOL_MODES = ("Serial", "Thread", "Process")
+
+
+def create_worker_pool(mode, max_workers=None):
+    """ Creates an executor for the concurrency backend `mode`.
+
+    Parameters
+    ----------
+    mode: str
+        One of the WORKER_POOL_MODES
+    max_workers: int, optional
+        Maximum number of workers in the pool. If None, the default of
+        the concurrent.futures executor is used.
+
+    Returns
+    -------
+    pool: concurrent.futures.Executor or None
+        The executor, or None if the `mode` is "Serial"
+    """
+    if mode == "Serial":
+        return None
+    if mode == "Thread":
+        return ThreadPoolExecutor(max_workers=max_workers)
+    if mode == "Process":
+        return ProcessPoolExecutor(max_workers=max_workers)
+    raise NotImplementedError(
+        f"Worker pool mode {mode} is not supported. Available modes "
+        f"are {WORKER_POOL_MODES}"
+    )
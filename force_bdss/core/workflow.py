@@ -1,26 +1,47 @@
 #  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
 #  All rights reserved.
 
+from concurrent.futures import FIRST_COMPLETED, wait
 from copy import deepcopy
 import logging
 
+import numpy as np
 from traits.api import (
+    Any,
+    Bool,
+    Either,
+    Enum,
     HasStrictTraits,
     Instance,
     List,
+    Str,
     provides,
     on_trait_change,
 )
 
+from force_bdss.core.dependency_graph import DependencyGraph
+from force_bdss.core.derivatives import chain_kpi_jacobian
+from force_bdss.core.checkpoint import OptimizationCheckpoint
+from force_bdss.core.evaluation_cache import EvaluationCache, hash_workflow
 from force_bdss.core.execution_layer import ExecutionLayer
+from force_bdss.core.execution_plan import (
+    ExecutionPlan, find_unused_data_sources
+)
 from force_bdss.core.verifier import VerifierError
+from force_bdss.core.worker_pool import WORKER_POOL_MODES, create_worker_pool
 from force_bdss.events.event_notifier_mixin import EventNotifierMixin
 from force_bdss.mco.base_mco_model import BaseMCOModel
 from force_bdss.notification_listeners.base_notification_listener_model \
     import BaseNotificationListenerModel
 from force_bdss.mco.i_evaluator import IEvaluator
 from force_bdss.core.data_value import DataValue
-from force_bdss.utilities import pop_dunder_recursive, nested_getstate
+from force_bdss.local_traits import PositiveInt
+from force_bdss.utilities import (
+    create_from_traits,
+    nested_getstate,
+    picklable_traits,
+    pop_dunder_recursive,
+)
 
 
 log = logging.getLogger(__name__)
@@ -42,6 +63,57 @@ class Workflow(EventNotifierMixin, HasStrictTraits):
     #: Contains information about the listeners to be setup
     notification_listeners = List(BaseNotificationListenerModel)
 
+    #: Strategy used to schedule the data sources. "Layered" executes the
+    #: layers one after another. "Graph" ignores the layers, and starts
+    #: each data source as soon as the data values it requires are
+    #: available.
+    scheduling_mode = Enum("Layered", "Graph")
+
+    #: Concurrency backend used to run the data sources in "Graph"
+    #: scheduling mode. In "Layered" mode, each execution layer uses its
+    #: own settings.
+    concurrency_mode = Enum(*WORKER_POOL_MODES)
+
+    #: Maximum number of concurrent workers in "Graph" scheduling mode.
+    #: If None, the default of the underlying executor is used.
+    max_workers = Either(None, PositiveInt)
+
+    #: Whether the data sources whose outputs never reach any KPI,
+    #: directly or through other data sources, are skipped during the
+    #: execution. Disabled by default, since such data sources may be
+    #: run for their side effects (e.g. writing files).
+    prune_data_sources = Bool(False)
+
+    #: Persistent cache of the KPI values computed by `evaluate` and
+    #: `evaluate_batch`. If None, every evaluation is computed.
+    evaluation_cache = Instance(EvaluationCache, transient=True)
+
+    #: Checkpoint of the optimization of the workflow, updated by the
+    #: optimizer engines and the OptimizeOperation. If None, no checkpoint
+    #: is saved.
+    checkpoint = Instance(OptimizationCheckpoint, transient=True)
+
+    #: Whether the time spent in each stage of the data source runs is
+    #: measured, and reported with a DataSourceTimingEvent. Applies to
+    #: all the execution layers.
+    timing_enabled = Bool(False, transient=True)
+
+    #: The compiled bindings of the workflow. Reset to None whenever
+    #: the names of the parameters, slots or KPIs change.
+    _execution_plan = Instance(ExecutionPlan, transient=True)
+
+    #: The dependencies between the data sources of the workflow. Reset
+    #: to None together with the `_execution_plan`.
+    _dependency_graph = Instance(DependencyGraph, transient=True)
+
+    #: Executor running the data sources in "Graph" scheduling mode
+    _worker_pool = Any(transient=True)
+
+    #: Hash of the workflow keying its evaluations in the
+    #: `evaluation_cache`. Reset to None whenever the MCO parameters, KPIs
+    #: or data source models change.
+    _workflow_key = Either(None, Str, transient=True)
+
     def execute(self, data_values):
         """Executes the given workflow using the list of data values.
         Returns a list of data values for the KPI results
@@ -56,17 +128,310 @@ class Workflow(EventNotifierMixin, HasStrictTraits):
         kpis : list of DataValues
             The DataValues containing the KPI results.
         """
+        kpi_results, _ = self._execute_all(data_values)
+        return kpi_results
+
+    def _execute_all(self, data_values):
+        """Executes the workflow using the list of data values. Returns
+        the data values of the KPI results, and all the data values
+        available at the end of the execution."""
+        if self.scheduling_mode == "Graph":
+            return self._execute_graph(data_values)
+
+        plan = self.compile()
+        data_sources = self._data_sources_to_run(plan)
         available_data_values = self.mco_model.bind_parameters(data_values)
 
         for index, layer in enumerate(self.execution_layers):
             log.info("Computing data layer {}".format(index))
-            ds_results = layer.execute_layer(available_data_values)
+            input_indices = None if plan is None else plan.input_indices[index]
+            ds_results = layer.execute_layer(
+                available_data_values, input_indices=input_indices,
+                data_sources=data_sources[index]
+            )
             available_data_values += ds_results
 
+            if (plan is not None
+                    and len(available_data_values) != plan.layer_sizes[index]):
+                # Some data source returned data values that are not
+                # described by the model (e.g. named by the plugin), so
+                # the remaining bindings must be done by name.
+                log.warning(
+                    "The data values computed by layer {} do not match "
+                    "the compiled execution plan. This may indicate a "
+                    "file error.".format(index)
+                )
+                plan = None
+
         log.info("Aggregating KPI data")
-        kpi_results = self.mco_model.bind_kpis(available_data_values)
+        if plan is None:
+            kpi_results = self.mco_model.bind_kpis(available_data_values)
+        else:
+            kpi_results = [
+                available_data_values[index] for index in plan.kpi_indices
+            ]
 
-        return kpi_results
+        return kpi_results, available_data_values
+
+    def execute_batch(self, batch_data_values):
+        """Executes the workflow for several points at once, layer by
+        layer. Each data source is called once per layer with the inputs
+        of all the points, through its `run_batch` method.
+
+        In "Graph" scheduling mode, the points are executed one at a time.
+
+        Parameters
+        ----------
+        batch_data_values : list of lists of DataValue
+            For each point, the data values that the MCO generally
+            provides.
+
+        Returns
+        -------
+        batch_kpis : list of lists of DataValues
+            For each point, the DataValues containing the KPI results.
+        """
+        if self.scheduling_mode == "Graph":
+            return [
+                self._execute_graph(data_values)[0]
+                for data_values in batch_data_values
+            ]
+
+        plan = self.compile()
+        data_sources = self._data_sources_to_run(plan)
+        batch_available_data_values = [
+            self.mco_model.bind_parameters(data_values)
+            for data_values in batch_data_values
+        ]
+
+        for index, layer in enumerate(self.execution_layers):
+            log.info("Computing data layer {}".format(index))
+            input_indices = None if plan is None else plan.input_indices[index]
+            batch_results = layer.execute_layer_batch(
+                batch_available_data_values, input_indices=input_indices,
+                data_sources=data_sources[index]
+            )
+            for available_data_values, ds_results in zip(
+                    batch_available_data_values, batch_results):
+                available_data_values += ds_results
+
+            if plan is not None and any(
+                    len(available_data_values) != plan.layer_sizes[index]
+                    for available_data_values in batch_available_data_values):
+                log.warning(
+                    "The data values computed by layer {} do not match "
+                    "the compiled execution plan. This may indicate a "
+                    "file error.".format(index)
+                )
+                plan = None
+
+        log.info("Aggregating KPI data")
+        if plan is None:
+            return [
+                self.mco_model.bind_kpis(available_data_values)
+                for available_data_values in batch_available_data_values
+            ]
+        return [
+            [available_data_values[index] for index in plan.kpi_indices]
+            for available_data_values in batch_available_data_values
+        ]
+
+    def _execute_graph(self, data_values):
+        """Executes the workflow by scheduling each data source as soon as
+        all the data sources it depends on have completed, regardless of
+        the execution layers.
+
+        Parameters
+        ----------
+        data_values : list of DataValue
+            The data values that the MCO generally provides.
+
+        Returns
+        -------
+        kpis : list of DataValues
+            The DataValues containing the KPI results.
+        data_values : list of DataValues
+            All the data values available at the end of the execution.
+        """
+        graph = self.compile_dependency_graph()
+        errors = graph.verify()
+        if errors:
+            error_txt = (
+                "Unable to schedule the data sources by their dependencies: "
+                + "; ".join(error.global_error for error in errors)
+            )
+            log.error(error_txt)
+            raise RuntimeError(error_txt)
+
+        available_data_values = self.mco_model.bind_parameters(data_values)
+        index_of = {dv.name: idx for idx, dv in enumerate(
+            available_data_values)}
+
+        # The execution layer of each data source handles its pooling,
+        # binding and result validation
+        layers = [
+            layer
+            for layer in self.execution_layers
+            for _ in layer.data_sources
+        ]
+        skipped = set(graph.unused_nodes) if self.prune_data_sources else set()
+        n_waiting = [len(deps) for deps in graph.dependencies]
+        ready = [
+            node for node, n in enumerate(n_waiting)
+            if n == 0 and node not in skipped
+        ]
+        worker_pool = self._get_worker_pool()
+        in_process = self.concurrency_mode == "Process"
+
+        running = {}
+        try:
+            while ready or running:
+                for node in ready:
+                    model = graph.nodes[node]
+                    log.info("Starting data source {}".format(node))
+                    input_indices = [
+                        index_of[input_slot_info.name]
+                        for input_slot_info in model.input_slot_info
+                    ]
+                    run = layers[node]._start_data_source(
+                        worker_pool, model, available_data_values,
+                        input_indices, in_process=in_process
+                    )
+                    running[run.future] = (node, run)
+                ready = []
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                # Collect simultaneous completions in a deterministic order
+                for node, run in sorted(running.pop(f) for f in done):
+                    ds_results = layers[node]._finish_data_source(run)
+                    for dv in ds_results:
+                        index_of[dv.name] = len(available_data_values)
+                        available_data_values.append(dv)
+                    for dependent in graph.dependents[node]:
+                        n_waiting[dependent] -= 1
+                        if (n_waiting[dependent] == 0
+                                and dependent not in skipped):
+                            ready.append(dependent)
+        except Exception:
+            for node, run in running.values():
+                layers[node]._cancel_data_source(run)
+            raise
+
+        log.info("Aggregating KPI data")
+        return (
+            self.mco_model.bind_kpis(available_data_values),
+            available_data_values
+        )
+
+    def _data_sources_to_run(self, plan):
+        """ Returns, for each execution layer, the models of the data
+        sources to run according to the execution `plan`."""
+        return [
+            [layer.data_sources[index] for index in indices]
+            for layer, indices in zip(
+                self.execution_layers, plan.data_source_indices)
+        ]
+
+    def compile_dependency_graph(self):
+        """ Resolves the dependencies between the data sources of the
+        workflow from the names of their slots, as used by the "Graph"
+        scheduling mode.
+
+        The resulting graph is cached until any of the names in the
+        workflow changes.
+
+        Returns
+        -------
+        graph : DependencyGraph
+            The dependency graph of the workflow data sources.
+        """
+        if self._dependency_graph is None:
+            self._dependency_graph = DependencyGraph.from_workflow(self)
+        return self._dependency_graph
+
+    def compile(self):
+        """ Resolves the bindings of the MCO parameters, data source slots
+        and KPIs to positions in the list of available data values, so
+        that they are not looked up by name on every evaluation.
+
+        The resulting plan is cached until any of the names in the
+        workflow changes.
+
+        Returns
+        -------
+        plan : ExecutionPlan
+            The compiled execution plan of the workflow.
+        """
+        if self._execution_plan is None:
+            self._execution_plan = ExecutionPlan.from_workflow(self)
+        return self._execution_plan
+
+    @on_trait_change(
+        "prune_data_sources,"
+        "mco_model,mco_model.parameters.name,mco_model.kpis.name,"
+        "execution_layers.data_sources.input_slot_info.name,"
+        "execution_layers.data_sources.output_slot_info.name,"
+        "execution_layers.data_sources.changes_slots"
+    )
+    def _invalidate_compiled_bindings(self):
+        self._execution_plan = None
+        self._dependency_graph = None
+
+    def _get_workflow_key(self):
+        """ Returns the hash of the workflow keying its evaluations in
+        the `evaluation_cache`, computing it if necessary."""
+        if self._workflow_key is None:
+            self._workflow_key = hash_workflow(self)
+        return self._workflow_key
+
+    @on_trait_change(
+        "mco_model,mco_model.parameters.-transient,"
+        "mco_model.kpis.-transient,"
+        "execution_layers.data_sources.-transient,"
+        "execution_layers.data_sources.input_slot_info.-transient,"
+        "execution_layers.data_sources.output_slot_info.-transient,"
+        "execution_layers.data_sources.changes_slots"
+    )
+    def _invalidate_workflow_key(self):
+        self._workflow_key = None
+
+    def _get_worker_pool(self):
+        """ Returns the executor used in "Graph" scheduling mode, creating
+        it if necessary. Returns None in "Serial" concurrency mode."""
+        if self._worker_pool is None:
+            self._worker_pool = create_worker_pool(
+                self.concurrency_mode, self.max_workers
+            )
+        return self._worker_pool
+
+    @on_trait_change("concurrency_mode,max_workers")
+    def _reset_worker_pool(self):
+        if self._worker_pool is not None:
+            self._worker_pool.shutdown()
+            self._worker_pool = None
+
+    def setup_data_sources(self):
+        """ Enables the reuse of data source instances across workflow
+        evaluations, until `teardown_data_sources` is called."""
+        for layer in self.execution_layers:
+            layer.setup_data_sources()
+
+    def teardown_data_sources(self):
+        """ Tears down all the data source instances kept for reuse."""
+        for layer in self.execution_layers:
+            layer.teardown_data_sources()
+
+    @on_trait_change("timing_enabled,execution_layers[]")
+    def _update_layers_timing(self):
+        for layer in self.execution_layers:
+            layer.timing_enabled = self.timing_enabled
+
+    def shutdown_worker_pools(self):
+        """ Shuts down the worker pools used by the execution layers to
+        run their data sources concurrently."""
+        self._reset_worker_pool()
+        for layer in self.execution_layers:
+            layer.shutdown_worker_pool()
 
     def verify(self):
         """ Verify the workflow.
@@ -101,6 +466,28 @@ class Workflow(EventNotifierMixin, HasStrictTraits):
             for layer in self.execution_layers:
                 errors += layer.verify()
 
+            if self.scheduling_mode == "Graph":
+                errors += self.compile_dependency_graph().verify()
+
+            for model in find_unused_data_sources(self):
+                errors.append(
+                    VerifierError(
+                        subject=model,
+                        severity="information",
+                        local_error=(
+                            "Data source outputs are not used by any KPI"
+                        ),
+                        global_error=(
+                            "Data source '{}' does not contribute to any "
+                            "KPI{}".format(
+                                model.factory.name,
+                                " and is skipped"
+                                if self.prune_data_sources else ""
+                            )
+                        ),
+                    )
+                )
+
         return errors
 
     def evaluate(self, parameter_values):
@@ -119,19 +506,153 @@ class Workflow(EventNotifierMixin, HasStrictTraits):
             List of values corresponding to each MCO KPI in the
             workflow
         """
-        return self._internal_evaluate(parameter_values)
+        if self.evaluation_cache is None:
+            return self._internal_evaluate(parameter_values)
 
-    def _internal_evaluate(self, parameter_values):
-        """Evaluates the workflow using the given parameter values
-        running on the internal process"""
+        workflow_key = self._get_workflow_key()
+        kpi_values = self.evaluation_cache.lookup(
+            workflow_key, parameter_values
+        )
+        if kpi_values is None:
+            kpi_values = self._internal_evaluate(parameter_values)
+            self.evaluation_cache.store(
+                workflow_key, parameter_values, kpi_values
+            )
+        return kpi_values
 
-        data_values = [
-            DataValue(type=parameter.type, name=parameter.name, value=value)
-            for parameter, value in zip(
-                self.mco_model.parameters, parameter_values
+    def evaluate_with_jacobian(self, parameter_values):
+        """Evaluates the workflow at a given set of MCO parameter values,
+        along with the Jacobian of the KPIs with respect to the parameters.
+
+        The Jacobian is chained from the `derivatives` of the data values
+        returned by the data sources. It is None if any of the data
+        values the KPIs depend on has no derivatives, or if the KPI
+        values are retrieved from the `evaluation_cache`, in which case
+        the optimizer falls back to finite differences.
+
+        Parameters
+        ----------
+        parameter_values: list
+            List of values to assign to each BaseMCOParameter defined
+            in the workflow
+
+        Returns
+        -------
+        kpi_results: list
+            List of values corresponding to each MCO KPI in the
+            workflow
+        jacobian: numpy.ndarray or None
+            K x P array of the derivatives of each of the K KPIs with
+            respect to each of the P parameter values, where vector
+            parameters are flattened
+        """
+        workflow_key = None
+        if self.evaluation_cache is not None:
+            workflow_key = self._get_workflow_key()
+            kpi_values = self.evaluation_cache.lookup(
+                workflow_key, parameter_values
+            )
+            if kpi_values is not None:
+                return kpi_values, None
+
+        data_values = self._parameter_data_values(parameter_values)
+        kpi_results, available_data_values = self._execute_all(data_values)
+        kpi_values = [kpi.value for kpi in kpi_results]
+        if workflow_key is not None:
+            self.evaluation_cache.store(
+                workflow_key, parameter_values, kpi_values
             )
+
+        input_names = {
+            output_slot_info.name: [
+                input_slot_info.name
+                for input_slot_info in model.input_slot_info
+            ]
+            for layer in self.execution_layers
+            for model in layer.data_sources
+            for output_slot_info in model.output_slot_info
+            if output_slot_info.name
+        }
+        jacobian = chain_kpi_jacobian(
+            data_values, available_data_values, input_names, kpi_results
+        )
+        return kpi_values, jacobian
+
+    def evaluate_batch(self, parameter_matrix):
+        """Public method to evaluate the workflow at several sets of
+        MCO parameter values at once. Data sources that implement
+        `BaseDataSource.run_batch` are called once per execution layer
+        with all the points.
+
+        Parameters
+        ----------
+        parameter_matrix: array_like
+            N x P array (or list of lists), where each of the N rows
+            contains the values to assign to each of the P
+            BaseMCOParameters defined in the workflow
+
+        Returns
+        -------
+        kpi_results: numpy.ndarray
+            N x K array of the values corresponding to each of the K MCO
+            KPIs in the workflow, for each row of `parameter_matrix`
+        """
+        if self.evaluation_cache is None:
+            return self._internal_evaluate_batch(parameter_matrix)
+
+        # Only evaluate the rows that are not cached
+        workflow_key = self._get_workflow_key()
+        parameter_matrix = list(parameter_matrix)
+        cached = [
+            self.evaluation_cache.lookup(workflow_key, parameter_values)
+            for parameter_values in parameter_matrix
+        ]
+        missing = [
+            index for index, kpi_values in enumerate(cached)
+            if kpi_values is None
+        ]
+        if missing:
+            kpi_results = self._internal_evaluate_batch(
+                [parameter_matrix[index] for index in missing]
+            )
+            for index, kpi_values in zip(missing, kpi_results.tolist()):
+                self.evaluation_cache.store(
+                    workflow_key, parameter_matrix[index], kpi_values
+                )
+                cached[index] = kpi_values
+
+        return _to_kpi_array(cached, len(self.mco_model.kpis))
+
+    def _internal_evaluate_batch(self, parameter_matrix):
+        """Evaluates the workflow at each row of `parameter_matrix`
+        running on the internal process"""
+
+        batch_data_values = [
+            [
+                DataValue(type=parameter.type, name=parameter.name,
+                          value=value)
+                for parameter, value in zip(
+                    self.mco_model.parameters, parameter_values
+                )
+            ]
+            for parameter_values in parameter_matrix
         ]
 
+        batch_kpi_results = self.execute_batch(batch_data_values)
+
+        return _to_kpi_array(
+            [
+                [kpi.value for kpi in kpi_results]
+                for kpi_results in batch_kpi_results
+            ],
+            len(self.mco_model.kpis)
+        )
+
+    def _internal_evaluate(self, parameter_values):
+        """Evaluates the workflow using the given parameter values
+        running on the internal process"""
+
+        data_values = self._parameter_data_values(parameter_values)
         kpi_results = self.execute(data_values)
 
         # Return just the values to the MCO, since the DataValue
@@ -140,6 +661,15 @@ class Workflow(EventNotifierMixin, HasStrictTraits):
 
         return kpi_values
 
+    def _parameter_data_values(self, parameter_values):
+        """Returns the data values of the MCO `parameter_values`"""
+        return [
+            DataValue(type=parameter.type, name=parameter.name, value=value)
+            for parameter, value in zip(
+                self.mco_model.parameters, parameter_values
+            )
+        ]
+
     def __getstate__(self):
         """ Returns state dictionary of the object. For a nested dict,
         __getstate__ is applied to zero level items and first level items.
@@ -148,6 +678,15 @@ class Workflow(EventNotifierMixin, HasStrictTraits):
         state = nested_getstate(state)
         return state
 
+    def __reduce_ex__(self, protocol):
+        # The serialized state can not be restored without a factory
+        # registry, so the object is recreated from its traits instead
+        traits = picklable_traits(self)
+        # The checkpoint is only updated by the process running the
+        # optimization
+        traits.pop("checkpoint", None)
+        return create_from_traits, (type(self), traits)
+
     @classmethod
     def from_json(cls, factory_registry, json_data):
         """ Generates the `Workflow` instance from the `json_data` dictionary.
@@ -278,3 +817,20 @@ class Workflow(EventNotifierMixin, HasStrictTraits):
             The BaseDriverEvent that has been changed
         """
         self.notify(event)
+
+
+def _to_kpi_array(batch_kpi_values, n_kpis):
+    """ Returns the list of KPI values of each point as an N x K array,
+    where K is `n_kpis` if the list is empty. The array is numerical
+    whenever all the KPI values are numbers (or None, converted to NaN).
+    """
+    if batch_kpi_values:
+        n_kpis = len(batch_kpi_values[0])
+    kpi_array = np.empty((len(batch_kpi_values), n_kpis), dtype=object)
+    for row, kpi_values in zip(kpi_array, batch_kpi_values):
+        row[:] = kpi_values
+
+    try:
+        return kpi_array.astype(float)
+    except (TypeError, ValueError):
+        return kpi_array
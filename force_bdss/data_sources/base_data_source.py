@@ -30,6 +30,33 @@ class BaseDataSource(ABCHasStrictTraits):
         model.notify_finish_event()
         return result
 
+    def setup(self, model):
+        """ Lifecycle hook called once after the DataSource has been
+        created, before its first run. Reimplement this method to
+        acquire expensive resources (e.g. load tables, open licence
+        handles) that can be reused across evaluations.
+
+        During an OptimizeOperation, DataSource instances are reused
+        for all the evaluations of the same model, until the model
+        fires `changes_slots` or the operation ends.
+
+        Parameters
+        ----------
+        model: BaseDataSourceModel
+            The model of the DataSource, instantiated through create_model()
+        """
+
+    def teardown(self, model):
+        """ Lifecycle hook called once when the DataSource is discarded.
+        Reimplement this method to release the resources acquired in
+        `setup`.
+
+        Parameters
+        ----------
+        model: BaseDataSourceModel
+            The model of the DataSource, instantiated through create_model()
+        """
+
     @abc.abstractmethod
     def run(self, model, parameters):
         """
@@ -48,8 +75,39 @@ class BaseDataSource(ABCHasStrictTraits):
         Returns
         -------
         List(DataValue)
-            A list containing the computed Data Values.
+            A list containing the computed Data Values. Data sources that
+            can compute the derivatives of their outputs with respect to
+            their inputs may set the `derivatives` of the returned Data
+            Values, which the Workflow chains into the Jacobian of the
+            KPIs used by gradient based optimizers.
+        """
+
+    def run_batch(self, model, batched_parameters):
+        """
+        Executes the Data Source evaluation for several points at once,
+        as requested by `Workflow.evaluate_batch`. The default
+        implementation calls `run` for each point. Reimplement this
+        method if your DataSource can evaluate all the points more
+        efficiently in a single call (e.g. vectorised NumPy models).
+
+        Parameters
+        ----------
+        model: BaseDataSourceModel
+            The model of the DataSource, instantiated through create_model()
+
+        batched_parameters: List(List(DataValue))
+            For each point, the list of DataValue objects that would be
+            passed to `run`.
+
+        Returns
+        -------
+        List(List(DataValue))
+            For each point, in the same order as `batched_parameters`,
+            the list of computed Data Values that `run` would return.
         """
+        return [
+            self.run(model, parameters) for parameters in batched_parameters
+        ]
 
     @abc.abstractmethod
     def slots(self, model):
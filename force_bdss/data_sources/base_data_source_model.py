@@ -5,7 +5,7 @@ from copy import deepcopy
 from logging import getLogger
 
 from traits.api import (
-    Instance, List, Event, on_trait_change, Type
+    Bool, Either, Instance, Int, List, Event, on_trait_change, Type
 )
 
 from force_bdss.core.base_model import BaseModel
@@ -14,9 +14,12 @@ from force_bdss.core.output_slot_info import OutputSlotInfo
 from force_bdss.core.verifier import VerifierError
 from force_bdss.data_sources.i_data_source_factory import IDataSourceFactory
 from force_bdss.events.data_source_events import (
+    DataSourceCacheEvent,
     DataSourceStartEvent,
-    DataSourceFinishEvent
+    DataSourceFinishEvent,
+    DataSourceTimingEvent,
 )
+from force_bdss.local_traits import PositiveInt
 
 
 logger = getLogger(__name__)
@@ -53,6 +56,22 @@ class BaseDataSourceModel(BaseModel):
     #: this and adapt the visual entries.
     changes_slots = Event()
 
+    #: Maximum number of results of the data source kept in memory, so
+    #: that it is not run again for inputs it has already been run with.
+    #: Results are looked up by the state of the model and the values of
+    #: the inputs, and the least recently used ones are evicted first.
+    #: 0 disables the cache.
+    cache_size = Int(0, visible=False)
+
+    #: Maximum estimated memory usage of the cached results, in bytes.
+    #: If None, only `cache_size` limits the cache.
+    cache_memory_limit = Either(None, PositiveInt, visible=False)
+
+    #: Whether the data source always returns the same results for the
+    #: same inputs. Results of non-deterministic data sources are never
+    #: cached.
+    deterministic = Bool(True, visible=False)
+
     #: Type of the Data Source Start event
     _start_event_type = Type(DataSourceStartEvent,
                              visible=False, transient=True)
@@ -172,6 +191,37 @@ class BaseDataSourceModel(BaseModel):
             )
         )
 
+    def notify_cache_event(self, hit, cache):
+        """ Creates event reporting a lookup of the data source results
+        in its `cache`."""
+        self.notify(
+            DataSourceCacheEvent(
+                hit=hit, hits=cache.hits, misses=cache.misses
+            )
+        )
+
+    def notify_timing_event(self, timings):
+        """ Creates event reporting the time spent in each stage of a run
+        of the data source.
+
+        Parameters
+        ----------
+        timings: dict
+            (wall clock time, CPU time) pair of each timed stage
+        """
+        self.notify(
+            DataSourceTimingEvent(
+                data_source_name=self.factory.name,
+                output_names=[p.name for p in self.output_slot_info],
+                wall_times={
+                    stage: times[0] for stage, times in timings.items()
+                },
+                cpu_times={
+                    stage: times[1] for stage, times in timings.items()
+                },
+            )
+        )
+
     @on_trait_change("+changes_slots")
     def _trigger_changes_slots(self, obj, name, new):
         changes_slots = self.traits()[name].changes_slots
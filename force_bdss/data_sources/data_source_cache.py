@@ -0,0 +1,187 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+from collections import OrderedDict
+import hashlib
+import json
+import pickle
+import sys
+from threading import Lock
+
+from traits.api import Any, Either, HasStrictTraits, Int
+
+from force_bdss.local_traits import PositiveInt
+
+
+class DataSourceCache(HasStrictTraits):
+    """Least recently used cache of the results of a data source, keyed
+    on the state of its model and the values of its inputs.
+
+    Entries are evicted, least recently used first, when the number of
+    cached results exceeds `size` or their estimated memory usage exceeds
+    `memory_limit`.
+
+    The cache keeps its own copies of the result DataValues, and returns
+    new copies on each hit, since the callers rename them in place. The
+    values themselves are shared.
+    """
+
+    #: Maximum number of cached results
+    size = PositiveInt(1)
+
+    #: Maximum estimated memory usage of the cached results, in bytes. If
+    #: None, only `size` limits the cache.
+    memory_limit = Either(None, PositiveInt)
+
+    #: Number of lookups that found a cached result
+    hits = Int(0)
+
+    #: Number of lookups that did not find a cached result
+    misses = Int(0)
+
+    #: Estimated memory usage of the cached results, in bytes
+    memory_usage = Int(0)
+
+    #: Cached (results, memory usage) pairs, in least recently used order
+    _entries = Any(transient=True)
+
+    #: Lock protecting `_entries` from concurrent access
+    _lock = Any(transient=True)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def lookup(self, key):
+        """ Returns the results cached for `key`, or None if there are
+        none, and updates the hit and miss counters.
+
+        Parameters
+        ----------
+        key: str
+            The cache key, as returned by `cache_key`
+
+        Returns
+        -------
+        results: list of DataValue or None
+            The cached results
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return _copy_data_values(entry[0])
+
+    def store(self, key, results):
+        """ Caches the `results` for `key`, evicting the least recently
+        used entries if the cache exceeds its limits. Results that alone
+        exceed the `memory_limit` are not cached.
+
+        Parameters
+        ----------
+        key: str
+            The cache key, as returned by `cache_key`
+        results: list of DataValue
+            The results of the data source
+        """
+        memory_usage = sys.getsizeof(key) + sum(
+            sys.getsizeof(dv) + _memory_size(dv.value) for dv in results
+        )
+        if self.memory_limit is not None and memory_usage > self.memory_limit:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.memory_usage -= previous[1]
+            self._entries[key] = (_copy_data_values(results), memory_usage)
+            self.memory_usage += memory_usage
+            self._evict()
+
+    def clear(self):
+        """ Removes all the cached results. The hit and miss counters are
+        not reset."""
+        with self._lock:
+            self._entries.clear()
+            self.memory_usage = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _evict(self):
+        while len(self._entries) > self.size or (
+                self.memory_limit is not None
+                and self.memory_usage > self.memory_limit):
+            _, (_, memory_usage) = self._entries.popitem(last=False)
+            self.memory_usage -= memory_usage
+
+    def _size_changed(self):
+        if self._lock is not None:
+            with self._lock:
+                self._evict()
+
+    def _memory_limit_changed(self):
+        self._size_changed()
+
+
+def cache_key(model, data_values):
+    """ Returns a stable key for the results of the data source of `model`
+    run with the input `data_values`.
+
+    Parameters
+    ----------
+    model: BaseDataSourceModel
+        The model of the data source
+    data_values: list of DataValue
+        The data values bound to the input slots of the data source
+
+    Returns
+    -------
+    key: str or None
+        The hexadecimal digest of the model state and the input values,
+        or None if the input values can not be serialized
+    """
+    model_data = json.dumps(
+        model.__getstate__()["model_data"], sort_keys=True, default=str
+    )
+    try:
+        inputs = pickle.dumps([(dv.type, dv.value) for dv in data_values])
+    except Exception:
+        return None
+    return hashlib.sha256(model_data.encode("utf-8") + inputs).hexdigest()
+
+
+def _memory_size(value, seen=None):
+    """ Returns the estimated memory usage of `value`, in bytes, including
+    the data of NumPy arrays (also when they are views) and the items of
+    lists, tuples, sets and dictionaries. The objects whose ids are in
+    `seen` are not counted again."""
+    if seen is None:
+        seen = set()
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+
+    size = sys.getsizeof(value)
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        # Arrays viewing the data of another one do not include it in
+        # their size
+        return max(size, nbytes)
+    if isinstance(value, dict):
+        size += sum(
+            _memory_size(key, seen) + _memory_size(item, seen)
+            for key, item in value.items()
+        )
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(_memory_size(item, seen) for item in value)
+    return size
+
+
+def _copy_data_values(data_values):
+    """ Returns copies of the `data_values`, sharing their values."""
+    return [dv.clone_traits() for dv in data_values]
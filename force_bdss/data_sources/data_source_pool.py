@@ -0,0 +1,88 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+import logging
+from threading import Lock
+
+from traits.api import Any, Dict, HasStrictTraits
+
+log = logging.getLogger(__name__)
+
+
+class DataSourcePool(HasStrictTraits):
+    """Keeps the idle BaseDataSource instances created for each
+    BaseDataSourceModel, so that they can be reused by subsequent
+    evaluations instead of being created again.
+
+    An instance is acquired for the duration of a single run, and is
+    therefore never used by two threads at the same time. Instances are
+    set up when they are created and torn down when they are discarded
+    from the pool.
+    """
+
+    #: Idle (data source, slots) pairs for each data source model
+    _idle = Dict(transient=True)
+
+    #: Lock protecting `_idle` from concurrent access
+    _lock = Any(transient=True)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lock = Lock()
+
+    def acquire(self, model):
+        """ Removes an idle data source for `model` from the pool.
+
+        Parameters
+        ----------
+        model: BaseDataSourceModel
+            The model of the requested data source
+
+        Returns
+        -------
+        (data_source, slots): tuple or None
+            An idle data source with the slots it returned for the
+            `model`, or None if the pool has no idle data source
+        """
+        with self._lock:
+            entries = self._idle.get(model)
+            if entries:
+                return entries.pop()
+        return None
+
+    def release(self, model, data_source, slots):
+        """ Returns an acquired `data_source`, with its `slots` for the
+        `model`, to the pool."""
+        with self._lock:
+            self._idle.setdefault(model, []).append((data_source, slots))
+
+    def discard(self, model, data_source):
+        """ Tears down an acquired `data_source` of `model` instead of
+        returning it to the pool. Any exception raised by the teardown
+        hook is logged, since the data source is discarded anyway."""
+        try:
+            data_source.teardown(model)
+        except Exception:
+            log.exception(
+                "Unable to tear down data source from factory '{}' "
+                "in plugin '{}'. This may indicate a programming "
+                "error in the plugin".format(
+                    model.factory.id, model.factory.plugin_id
+                )
+            )
+
+    def invalidate(self, model):
+        """ Tears down and discards the idle data sources of `model`.
+        Must be called when the model changes its slots."""
+        with self._lock:
+            entries = self._idle.pop(model, [])
+        for data_source, _ in entries:
+            self.discard(model, data_source)
+
+    def clear(self):
+        """ Tears down and discards all the idle data sources."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for model, entries in idle.items():
+            for data_source, _ in entries:
+                self.discard(model, data_source)
@@ -47,7 +47,13 @@ class TestBaseDataSourceModel(unittest.TestCase, UnittestTools):
             model.__getstate__(),
             {
                 "id": "id",
-                "model_data": {"input_slot_info": [], "output_slot_info": []},
+                "model_data": {
+                    "input_slot_info": [],
+                    "output_slot_info": [],
+                    "cache_size": 0,
+                    "cache_memory_limit": None,
+                    "deterministic": True,
+                },
             },
         )
 
@@ -70,6 +76,9 @@ class TestBaseDataSourceModel(unittest.TestCase, UnittestTools):
                         {"source": "Environment", "name": "bar"},
                     ],
                     "output_slot_info": [{"name": "baz"}, {"name": "quux"}],
+                    "cache_size": 0,
+                    "cache_memory_limit": None,
+                    "deterministic": True,
                 },
             },
         )
@@ -124,6 +133,9 @@ class TestBaseDataSourceModel(unittest.TestCase, UnittestTools):
                 {"source": "Environment", "name": "bar"},
             ],
             "output_slot_info": [{"name": "baz"}, {"name": "quux"}],
+            "cache_size": 2,
+            "cache_memory_limit": None,
+            "deterministic": True,
         }
         model = DummyDataSourceModel.from_json(factory, model_data)
         self.assertDictEqual(
@@ -143,6 +155,9 @@ class TestBaseDataSourceModel(unittest.TestCase, UnittestTools):
                     {"source": "Environment", "name": "bar"},
                 ],
                 "output_slot_info": [{"name": "baz"}, {"name": "quux"}],
+                "cache_size": 2,
+                "cache_memory_limit": None,
+                "deterministic": True,
             },
         )
         # Test notification events
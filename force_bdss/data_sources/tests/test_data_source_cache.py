@@ -0,0 +1,150 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+import threading
+import unittest
+
+import numpy as np
+
+from force_bdss.core.data_value import DataValue
+from force_bdss.data_sources.data_source_cache import (
+    DataSourceCache, _memory_size, cache_key
+)
+from force_bdss.tests.probe_classes.factory_registry import (
+    ProbeFactoryRegistry,
+)
+
+
+class TestDataSourceCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = DataSourceCache(size=2)
+        self.results = [DataValue(name="foo", value=1)]
+
+    def test_lookup_store(self):
+        self.assertIsNone(self.cache.lookup("a"))
+        self.cache.store("a", self.results)
+        cached = self.cache.lookup("a")
+        self.assertEqual(1, len(cached))
+        self.assertIsNot(self.results[0], cached[0])
+        self.assertEqual("foo", cached[0].name)
+        self.assertEqual(1, self.cache.hits)
+        self.assertEqual(1, self.cache.misses)
+        self.assertEqual(1, len(self.cache))
+
+        # Returned data values can be modified without affecting the cache
+        cached = self.cache.lookup("a")
+        cached.append(DataValue())
+        cached[0].name = "bar"
+        self.results[0].name = "baz"
+        cached = self.cache.lookup("a")
+        self.assertEqual(1, len(cached))
+        self.assertEqual("foo", cached[0].name)
+        self.assertEqual(1, cached[0].value)
+
+    def test_lru_eviction(self):
+        self.cache.store("a", self.results)
+        self.cache.store("b", self.results)
+        self.cache.lookup("a")
+        self.cache.store("c", self.results)
+        self.assertEqual(2, len(self.cache))
+        self.assertIsNone(self.cache.lookup("b"))
+        self.assertIsNotNone(self.cache.lookup("a"))
+        self.assertIsNotNone(self.cache.lookup("c"))
+
+        self.cache.size = 1
+        self.assertEqual(1, len(self.cache))
+        self.assertIsNotNone(self.cache.lookup("c"))
+
+    def test_memory_limit(self):
+        large = [DataValue(value=np.zeros(1000))]
+        self.cache.store("a", self.results)
+        usage = self.cache.memory_usage
+        self.assertGreater(usage, 0)
+
+        self.cache.memory_limit = 2 * usage
+        self.cache.store("b", large)
+        self.assertIsNone(self.cache.lookup("b"))
+        self.assertEqual(usage, self.cache.memory_usage)
+
+        self.cache.memory_limit = None
+        self.cache.store("b", large)
+        self.assertEqual(2, len(self.cache))
+        self.cache.memory_limit = self.cache.memory_usage - 1
+        self.assertEqual(1, len(self.cache))
+        self.assertIsNone(self.cache.lookup("a"))
+
+    def test_memory_size(self):
+        array = np.zeros(1000)
+        self.assertGreaterEqual(_memory_size(array), 8000)
+        # Views are counted with the data they refer to
+        self.assertGreaterEqual(_memory_size(array[::2]), 4000)
+        # Items of containers are counted, but only once
+        self.assertGreaterEqual(_memory_size([array, [array]]), 8000)
+        self.assertLess(_memory_size([array, [array]]), 16000)
+        self.assertGreater(
+            _memory_size({"a": [1.0] * 100}), _memory_size([1.0] * 100)
+        )
+
+    def test_clear(self):
+        self.cache.store("a", self.results)
+        self.cache.lookup("a")
+        self.cache.clear()
+        self.assertEqual(0, len(self.cache))
+        self.assertEqual(0, self.cache.memory_usage)
+        self.assertEqual(1, self.cache.hits)
+
+    def test_concurrent_access(self):
+        def work(offset):
+            for index in range(100):
+                key = str(offset + index % 5)
+                if self.cache.lookup(key) is None:
+                    self.cache.store(key, self.results)
+
+        threads = [
+            threading.Thread(target=work, args=(offset,))
+            for offset in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(400, self.cache.hits + self.cache.misses)
+        self.assertEqual(2, len(self.cache))
+
+
+class TestCacheKey(unittest.TestCase):
+    def setUp(self):
+        registry = ProbeFactoryRegistry()
+        self.model = registry.data_source_factories[0].create_model()
+
+    def test_cache_key(self):
+        data_values = [DataValue(type="PRESSURE", value=1.0)]
+        key = cache_key(self.model, data_values)
+        self.assertEqual(key, cache_key(self.model, data_values))
+
+        # Names of the inputs are irrelevant
+        self.assertEqual(key, cache_key(
+            self.model, [DataValue(type="PRESSURE", value=1.0, name="foo")]
+        ))
+        self.assertNotEqual(key, cache_key(
+            self.model, [DataValue(type="PRESSURE", value=2.0)]
+        ))
+        self.assertNotEqual(key, cache_key(
+            self.model, [DataValue(type="VOLUME", value=1.0)]
+        ))
+
+        self.model.output_slots_type = "VOLUME"
+        self.assertNotEqual(key, cache_key(self.model, data_values))
+
+    def test_cache_key_array(self):
+        data_values = [DataValue(value=np.arange(2000.0))]
+        other_values = [DataValue(value=np.arange(2000.0))]
+        other_values[0].value[1000] = -1
+        self.assertNotEqual(
+            cache_key(self.model, data_values),
+            cache_key(self.model, other_values),
+        )
+
+    def test_cache_key_unpicklable(self):
+        data_values = [DataValue(value=lambda: None)]
+        self.assertIsNone(cache_key(self.model, data_values))
@@ -0,0 +1,78 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+import unittest
+from unittest import mock
+
+import testfixtures
+
+from force_bdss.data_sources.data_source_pool import DataSourcePool
+from force_bdss.tests.probe_classes.factory_registry import (
+    ProbeFactoryRegistry,
+)
+
+
+class TestDataSourcePool(unittest.TestCase):
+    def setUp(self):
+        registry = ProbeFactoryRegistry()
+        self.factory = registry.data_source_factories[0]
+        self.model = self.factory.create_model()
+        self.data_source = self.factory.create_data_source()
+        self.slots = self.data_source.slots(self.model)
+        self.pool = DataSourcePool()
+
+    def test_acquire_release(self):
+        self.assertIsNone(self.pool.acquire(self.model))
+
+        self.pool.release(self.model, self.data_source, self.slots)
+        data_source, slots = self.pool.acquire(self.model)
+        self.assertIs(self.data_source, data_source)
+        self.assertIs(self.slots, slots)
+
+        # The data source is in use, so it can not be acquired again
+        self.assertIsNone(self.pool.acquire(self.model))
+
+    def test_invalidate(self):
+        other_model = self.factory.create_model()
+        self.pool.release(self.model, self.data_source, self.slots)
+        self.pool.release(
+            other_model, self.factory.create_data_source(), self.slots)
+
+        with mock.patch.object(
+                type(self.data_source), "teardown") as mock_teardown:
+            self.pool.invalidate(self.model)
+        mock_teardown.assert_called_once_with(self.model)
+        self.assertIsNone(self.pool.acquire(self.model))
+        self.assertIsNotNone(self.pool.acquire(other_model))
+
+    def test_clear(self):
+        other_model = self.factory.create_model()
+        self.pool.release(self.model, self.data_source, self.slots)
+        self.pool.release(
+            other_model, self.factory.create_data_source(), self.slots)
+
+        with mock.patch.object(
+                type(self.data_source), "teardown") as mock_teardown:
+            self.pool.clear()
+        self.assertEqual(2, mock_teardown.call_count)
+        self.assertIsNone(self.pool.acquire(self.model))
+        self.assertIsNone(self.pool.acquire(other_model))
+
+    def test_discard_error(self):
+        with mock.patch.object(
+                type(self.data_source), "teardown",
+                side_effect=Exception):
+            with testfixtures.LogCapture() as capture:
+                self.pool.discard(self.model, self.data_source)
+            capture.check(
+                (
+                    "force_bdss.data_sources.data_source_pool",
+                    "ERROR",
+                    "Unable to tear down data source from factory "
+                    "'force.bdss.enthought.plugin.test.v0.factory."
+                    "probe_data_source' in plugin "
+                    "'force.bdss.enthought.plugin.test.v0'."
+                    " This may indicate a programming "
+                    "error in the plugin",
+                )
+            )
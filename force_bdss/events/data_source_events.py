@@ -4,10 +4,21 @@
 from .mco_events import MCORuntimeEvent
 
 from traits.api import (
+    Bool,
+    Dict,
+    Float,
+    Int,
     List,
     Str
 )
 
+#: Stages of a Data Source run that are timed. "run" is the time spent in
+#: the plugin, while the others are spent in the framework: "create"
+#: (creation and setup of the data source), "slots" (retrieval of its
+#: slots), "bind" (binding of its inputs) and "validate" (validation and
+#: naming of its results).
+TIMING_STAGES = ("create", "slots", "bind", "run", "validate")
+
 
 class DataSourceStartEvent(MCORuntimeEvent):
     """ The Data Source driver should emit this event when the
@@ -43,3 +54,58 @@ class DataSourceFinishEvent(MCORuntimeEvent):
             List(Str): output names
         """
         return self.output_names
+
+
+class DataSourceCacheEvent(MCORuntimeEvent):
+    """ Emitted every time the results of a Data Source with a cache
+    are looked up, instead of running it."""
+
+    #: Whether the results were found in the cache
+    hit = Bool()
+
+    #: Total number of lookups that found cached results
+    hits = Int()
+
+    #: Total number of lookups that did not find cached results
+    misses = Int()
+
+    def serialize(self):
+        """ Provides serialized form of DataSourceCacheEvent
+        for further data storage
+        (e.g. in csv format) or processing.
+
+        Returns:
+            List(Int): number of hits and misses
+        """
+        return [self.hits, self.misses]
+
+
+class DataSourceTimingEvent(MCORuntimeEvent):
+    """ Emitted after each run of a Data Source, with the time spent in
+    each of the TIMING_STAGES of the run, in seconds. Stages that were
+    not needed (e.g. "create" when the data source is reused) are
+    missing."""
+
+    #: Name of the Data Source factory
+    data_source_name = Str()
+
+    #: The names assigned to the outputs.
+    output_names = List(Str())
+
+    #: Wall clock time spent in each stage
+    wall_times = Dict(Str(), Float())
+
+    #: CPU time of the thread executing each stage
+    cpu_times = Dict(Str(), Float())
+
+    def serialize(self):
+        """ Provides serialized form of DataSourceTimingEvent
+        for further data storage
+        (e.g. in csv format) or processing.
+
+        Returns:
+            List: data source name and wall clock time of each stage
+        """
+        return [self.data_source_name] + [
+            self.wall_times.get(stage, 0.0) for stage in TIMING_STAGES
+        ]
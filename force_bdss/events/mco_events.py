@@ -4,8 +4,11 @@
 from copy import deepcopy
 
 from traits.api import (
+    Bool,
+    Dict,
     List,
     Instance,
+    Int,
     Float,
     Str,
 )
@@ -25,6 +28,10 @@ class MCOStartEvent(BaseDriverEvent, UIEventMixin):
     #: The names associated to the KPIs
     kpi_names = List(Str())
 
+    #: Whether the MCO resumes an interrupted run, whose progress events
+    #: were already delivered
+    resumed = Bool(False)
+
     def serialize(self):
         """ Provides serialized form of MCOStartEvent for further data storage
         (e.g. in csv format) or processing.
@@ -49,6 +56,14 @@ class MCOStartEvent(BaseDriverEvent, UIEventMixin):
 class MCOFinishEvent(BaseDriverEvent, UIEventMixin):
     """ The MCO driver should emit this event when the evaluation ends."""
 
+    #: Statistics of the runs of each data source during the evaluation,
+    #: as returned by `DataSourceTimingSummary.summary`
+    timing_summary = Dict(Str(), Dict())
+
+    #: Ratio between the time spent by the framework around the data
+    #: source runs and the time spent in the data sources themselves
+    overhead_ratio = Float()
+
     def serialize(self):
         """
         We don't expect these events to carry any information
@@ -101,6 +116,39 @@ class MCOProgressEvent(BaseDriverEvent, UIEventMixin):
         return cls(**data)
 
 
+class MCOProgressMetricEvent(BaseDriverEvent):
+    """ Reports the progress of the MCO run by the hypervolume and the
+    size of the non-dominated front of the KPIs reported so far. It is
+    emitted periodically by MCO models whose `progress_metric_interval`
+    is set.
+    """
+
+    #: Number of points reported by MCOProgressEvents so far
+    n_points = Int()
+
+    #: Number of non-dominated points among them
+    front_size = Int()
+
+    #: Volume of the KPI minimization scores dominated by the front, and
+    #: bounded by the `reference_point`
+    hypervolume = Float()
+
+    #: Whether the hypervolume is a Monte Carlo estimate
+    estimated = Bool(False)
+
+    #: Minimization scores bounding the hypervolume
+    reference_point = List(Float())
+
+    def serialize(self):
+        """ Provides serialized form of MCOProgressMetricEvent for further
+        data storage or processing.
+
+        Returns:
+            List: number of points, front size and hypervolume
+        """
+        return [self.n_points, self.front_size, self.hypervolume]
+
+
 class MCORuntimeEvent(BaseDriverEvent):
     """ The base class for the MCO events fired during the workflow
     execution. This is a supplementary event type that is used to
@@ -128,6 +176,13 @@ class WeightedMCOProgressEvent(MCOProgressEvent):
     #: Weights assigned to each KPI during the MCO optimization
     weights = List(Float())
 
+    #: Number of objective evaluations of the weighted optimization
+    evaluations = Int()
+
+    #: Number of objective evaluations saved by warm-starting the
+    #: weighted optimization, relative to a cold start
+    evaluation_reduction = Float()
+
     def _weights_default(self):
         """Default weights are normalised and uniform for each KPI"""
         if self.optimal_kpis:
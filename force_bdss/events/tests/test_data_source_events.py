@@ -4,8 +4,10 @@
 from unittest import TestCase
 
 from force_bdss.events.data_source_events import (
+    TIMING_STAGES,
     DataSourceStartEvent,
     DataSourceFinishEvent,
+    DataSourceTimingEvent,
 )
 from force_bdss.events.mco_events import MCORuntimeEvent
 
@@ -44,3 +46,16 @@ class TestDataSourceEvents(TestCase):
         event = DataSourceStartEvent()
 
         self.assertListEqual(event.serialize(), [])
+
+    def test_timing_event(self):
+        event = DataSourceTimingEvent(
+            data_source_name="Adder",
+            output_names=["out"],
+            wall_times={"bind": 0.5, "run": 2.0},
+            cpu_times={"bind": 0.5, "run": 1.0},
+        )
+        self.assertIsInstance(event, MCORuntimeEvent)
+        self.assertEqual(
+            ["Adder", 0.0, 0.0, 0.5, 2.0, 0.0], event.serialize()
+        )
+        self.assertEqual(5, len(TIMING_STAGES))
@@ -8,6 +8,7 @@ from force_bdss.core.data_value import DataValue
 from force_bdss.events.base_driver_event import BaseDriverEvent
 from force_bdss.events.mco_events import (
     MCOProgressEvent,
+    MCOProgressMetricEvent,
     WeightedMCOProgressEvent,
     MCOStartEvent,
     WeightedMCOStartEvent,
@@ -69,6 +70,7 @@ class TestMCOEvents(unittest.TestCase):
                 "model_data": {
                     "parameter_names": ["p1", "p2"],
                     "kpi_names": ["k1", "k2", "k3"],
+                    "resumed": False,
                 },
                 "id": "force_bdss.events.mco_events.MCOStartEvent",
             },
@@ -80,7 +82,7 @@ class TestMCOEvents(unittest.TestCase):
         self.assertDictEqual(
             event.__getstate__(),
             {
-                "model_data": {},
+                "model_data": {"timing_summary": {}, "overhead_ratio": 0.0},
                 "id": "force_bdss.events.mco_events.MCOFinishEvent",
             },
         )
@@ -141,6 +143,43 @@ class TestMCOEvents(unittest.TestCase):
 
         self.assertListEqual([12, 13, 10, 1.0], event.serialize())
 
+    def test_progress_metric_event(self):
+        event = MCOProgressMetricEvent(
+            n_points=10,
+            front_size=4,
+            hypervolume=2.5,
+            reference_point=[1.0, 2.0],
+        )
+        self.assertListEqual([10, 4, 2.5], event.serialize())
+        self.assertDictEqual(
+            event.__getstate__(),
+            {
+                "model_data": {
+                    "n_points": 10,
+                    "front_size": 4,
+                    "hypervolume": 2.5,
+                    "estimated": False,
+                    "reference_point": [1.0, 2.0],
+                },
+                "id": "force_bdss.events.mco_events.MCOProgressMetricEvent",
+            },
+        )
+        self.assertFalse(isinstance(event, UIEventMixin))
+
+    def test_weighted_progress_event_evaluations(self):
+        event = WeightedMCOProgressEvent(
+            optimal_kpis=[DataValue(value=10)],
+            optimal_point=[DataValue(value=12)],
+            weights=[1.0],
+            evaluations=12,
+            evaluation_reduction=8.5,
+        )
+        state = event.__getstate__()["model_data"]
+        self.assertEqual(12, state["evaluations"])
+        self.assertEqual(8.5, state["evaluation_reduction"])
+        # The evaluation statistics are not part of the serialized data
+        self.assertListEqual([12, 10, 1.0], event.serialize())
+
     def test_default_weights_weighted_progress_event(self):
         event = WeightedMCOProgressEvent(
             optimal_kpis=[DataValue(value=10)],
@@ -190,6 +229,7 @@ class TestMCOEvents(unittest.TestCase):
             "model_data": {
                 "parameter_names": ["p1", "p2"],
                 "kpi_names": ["k1", "k2", "k3"],
+                "resumed": False,
             },
             "id": "force_bdss.events.mco_events.MCOStartEvent",
         }
@@ -199,7 +239,12 @@ class TestMCOEvents(unittest.TestCase):
 
         finish_data = {
             "id": "force_bdss.events.mco_events.MCOFinishEvent",
-            "model_data": {},
+            "model_data": {
+                "timing_summary": {
+                    "Adder (out)": {"count": 2, "mean": 0.1},
+                },
+                "overhead_ratio": 0.5,
+            },
         }
         finish_event = BaseDriverEvent.from_json(finish_data)
         self.assertIsInstance(finish_event, MCOFinishEvent)
@@ -264,6 +309,7 @@ class TestMCOEvents(unittest.TestCase):
             "model_data": {
                 "parameter_names": ["p1", "p2"],
                 "kpi_names": ["k1", "k2", "k3"],
+                "resumed": False,
             },
             "id": "force_bdss.events.mco_events.MCOStartEvent",
         }
@@ -277,6 +323,7 @@ class TestMCOEvents(unittest.TestCase):
             "model_data": {
                 "parameter_names": ["p1", "p2"],
                 "kpi_names": ["k1", "k2", "k3"],
+                "resumed": False,
             },
             "id": "force_bdss.events.mco_events.MCOStartEvent",
         }
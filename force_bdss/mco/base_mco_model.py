@@ -4,16 +4,23 @@
 from copy import deepcopy
 import logging
 
-from traits.api import Instance, List, Type
+from traits.api import Either, Instance, List, Type
 
 from force_bdss.core.base_model import BaseModel
 from force_bdss.events.mco_events import (
     MCOStartEvent,
     MCOFinishEvent,
-    MCOProgressEvent
+    MCOProgressEvent,
+    MCOProgressMetricEvent,
 )
 from force_bdss.core.kpi_specification import KPISpecification
 from force_bdss.core.verifier import VerifierError
+from force_bdss.local_traits import PositiveInt
+from force_bdss.mco.hypervolume import HypervolumeTracker
+from force_bdss.mco.optimizer_engines.utilities import (
+    convert_to_score,
+    kpi_score_bounds,
+)
 from .parameters.base_mco_parameter import BaseMCOParameter
 from .i_mco_factory import IMCOFactory
 
@@ -50,6 +57,20 @@ class BaseMCOModel(BaseModel):
     #: Type of the MCO Start event
     _finish_event_type = Type(MCOFinishEvent, visible=False, transient=True)
 
+    #: Number of progress events between the MCOProgressMetricEvents
+    #: reporting the hypervolume of the KPIs. If None, no progress metric
+    #: is computed. The reference point of the hypervolume is taken from
+    #: the bounds of the KPIs that use bounds, and from the first
+    #: reported KPIs otherwise.
+    progress_metric_interval = Either(
+        None, PositiveInt, visible=False, transient=True
+    )
+
+    #: Tracker of the hypervolume of the reported KPIs
+    _hypervolume_tracker = Instance(
+        HypervolumeTracker, visible=False, transient=True
+    )
+
     def bind_parameters(self, data_values):
         """ Bind and filter values from the MCO to the model parameters.
 
@@ -149,18 +170,39 @@ class BaseMCOModel(BaseModel):
 
         return errors
 
-    def notify_start_event(self):
-        """ Creates base event indicating the start of the MCO."""
+    def notify_start_event(self, **kwargs):
+        """ Creates base event indicating the start of the MCO.
+
+        Parameters
+        ----------
+        kwargs:
+            Additional attributes of the start event, such as whether the
+            run is `resumed`.
+        """
+        self._hypervolume_tracker = None
         self.notify(
             self._start_event_type(
                 parameter_names=list(p.name for p in self.parameters),
                 kpi_names=list(kpi.name for kpi in self.kpis),
+                **kwargs
             )
         )
 
-    def notify_finish_event(self):
-        """ Creates base event indicating the finished MCO."""
-        self.notify(self._finish_event_type())
+    def notify_finish_event(self, **kwargs):
+        """ Creates base event indicating the finished MCO.
+
+        Parameters
+        ----------
+        kwargs:
+            Additional attributes of the finish event, such as the
+            `timing_summary` of the data source runs.
+        """
+        tracker = self._hypervolume_tracker
+        if (self.progress_metric_interval is not None
+                and tracker is not None
+                and tracker.n_points % self.progress_metric_interval):
+            self._notify_progress_metric_event()
+        self.notify(self._finish_event_type(**kwargs))
 
     def notify_progress_event(self, optimal_point, optimal_kpis, **kwargs):
         """Notify the discovery of a new optimal point.
@@ -185,6 +227,40 @@ class BaseMCOModel(BaseModel):
             )
         )
 
+        if self.progress_metric_interval is None:
+            return
+        if self._hypervolume_tracker is None:
+            lower, upper = kpi_score_bounds(self.kpis)
+            self._hypervolume_tracker = HypervolumeTracker(
+                reference_point=upper,
+                lower_point=lower,
+                n_warmup=self.progress_metric_interval,
+            )
+        tracker = self._hypervolume_tracker
+        tracker.update(
+            convert_to_score([dv.value for dv in optimal_kpis], self.kpis)
+        )
+        if tracker.n_points % self.progress_metric_interval == 0:
+            self._notify_progress_metric_event()
+
+    def _notify_progress_metric_event(self):
+        """ Notifies the hypervolume and front size of the KPIs reported
+        so far."""
+        tracker = self._hypervolume_tracker
+        reference_point = tracker.reference_point
+        self.notify(
+            MCOProgressMetricEvent(
+                n_points=tracker.n_points,
+                front_size=tracker.front_size,
+                hypervolume=tracker.hypervolume,
+                estimated=tracker.estimated,
+                reference_point=(
+                    [] if reference_point is None
+                    else [float(value) for value in reference_point]
+                ),
+            )
+        )
+
     @classmethod
     def from_json(cls, factory, json_data):
         """ Instantiate an BaseMCOModel object from a `json_data`
@@ -0,0 +1,234 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+import logging
+
+import numpy as np
+from traits.api import (
+    Any, Bool, Either, Float, HasStrictTraits, Instance, Int, List, Property
+)
+
+from force_bdss.local_traits import PositiveInt
+from force_bdss.mco.optimizer_engines.pareto_archive import ParetoArchive
+
+log = logging.getLogger(__name__)
+
+#: Largest number of KPIs whose hypervolume is computed exactly
+MAX_EXACT_DIMENSION = 3
+
+
+def hypervolume(scores, reference_point):
+    """ Returns the volume of the region dominated by the `scores` and
+    bounded by the `reference_point`, for up to three KPIs.
+
+    Parameters
+    ----------
+    scores: array_like
+        N x K array of minimization scores. Scores that do not dominate
+        the reference point do not contribute to the volume.
+    reference_point: array_like
+        The K scores bounding the dominated region
+
+    Returns
+    -------
+    volume: float
+        The hypervolume of the scores
+    """
+    reference_point = np.asarray(reference_point, dtype=float)
+    scores = np.asarray(scores, dtype=float).reshape(
+        -1, len(reference_point))
+    scores = scores[(scores < reference_point).all(axis=1)]
+    if len(scores) == 0:
+        return 0.0
+
+    dimension = len(reference_point)
+    if dimension == 1:
+        return float(reference_point[0] - scores[:, 0].min())
+    if dimension == 2:
+        # Sweep the points by increasing first score: each point lowering
+        # the second score adds a rectangle to the volume
+        scores = scores[np.lexsort((scores[:, 1], scores[:, 0]))]
+        lowest = np.minimum.accumulate(scores[:, 1])
+        previous = np.concatenate([reference_point[1:], lowest[:-1]])
+        heights = np.clip(previous - scores[:, 1], 0.0, None)
+        return float(((reference_point[0] - scores[:, 0]) * heights).sum())
+    if dimension == 3:
+        # Sum the slices between successive third scores, whose areas
+        # are the two dimensional hypervolumes of the points below them
+        scores = scores[np.argsort(scores[:, 2], kind="mergesort")]
+        tops = np.concatenate([scores[1:, 2], reference_point[2:]])
+        volume = 0.0
+        for index in range(len(scores)):
+            depth = tops[index] - scores[index, 2]
+            if depth > 0:
+                volume += depth * hypervolume(
+                    scores[:index + 1, :2], reference_point[:2])
+        return volume
+    raise ValueError(
+        "The hypervolume is only computed exactly for up to {} KPIs, "
+        "not {}".format(MAX_EXACT_DIMENSION, dimension)
+    )
+
+
+def hypervolume_contribution(score, scores, reference_point):
+    """ Returns the volume dominated by `score` but by none of the
+    `scores`, for up to three KPIs."""
+    score = np.asarray(score, dtype=float)
+    reference_point = np.asarray(reference_point, dtype=float)
+    if not (score < reference_point).all():
+        return 0.0
+    box = float(np.prod(reference_point - score))
+    if len(scores) == 0:
+        return box
+    # The part of the box of `score` already dominated by the scores
+    overlap = hypervolume(np.maximum(scores, score), reference_point)
+    return max(box - overlap, 0.0)
+
+
+class HypervolumeTracker(HasStrictTraits):
+    """ Tracks the hypervolume and size of the non-dominated front of the
+    minimization scores of the points reported by an MCO, as they are
+    reported.
+
+    The hypervolume is updated exactly, by the contribution of each new
+    non-dominated point, for up to three KPIs. For more KPIs, it is
+    estimated from `n_samples` random points of the box between the
+    `lower_point` and the `reference_point`, which costs O(n_samples K)
+    per update, and ignores the region of the front below the lower
+    point.
+
+    Unknown (NaN) coordinates of the reference and lower points are
+    inferred from the range of the first `n_warmup` scores, extended by
+    a tenth of it. No hypervolume is computed until then.
+    """
+
+    #: Scores bounding the region where the hypervolume is measured
+    reference_point = Any()
+
+    #: Lower corner of the box sampled by the Monte Carlo estimate
+    lower_point = Any()
+
+    #: Number of scores from which unknown coordinates of the reference
+    #: and lower points are inferred
+    n_warmup = PositiveInt(10)
+
+    #: Number of random points of the Monte Carlo estimate
+    n_samples = PositiveInt(10000)
+
+    #: Seed of the random points of the Monte Carlo estimate
+    seed = Either(None, Int)
+
+    #: Current hypervolume of the front
+    hypervolume = Float(0.0)
+
+    #: Whether the hypervolume is a Monte Carlo estimate
+    estimated = Property(Bool())
+
+    #: Number of non-dominated points
+    front_size = Property(Int())
+
+    #: Number of scores reported
+    n_points = Int(0)
+
+    #: Non-dominated scores
+    _archive = Instance(ParetoArchive, ())
+
+    #: Scores reported before the reference point is known
+    _pending = List()
+
+    #: Random points of the Monte Carlo estimate, and whether each of
+    #: them is dominated by the front
+    _samples = Any()
+    _dominated = Any()
+
+    def _get_estimated(self):
+        return (
+            self.reference_point is not None
+            and len(self.reference_point) > MAX_EXACT_DIMENSION
+        )
+
+    def _get_front_size(self):
+        return len(self._archive)
+
+    def update(self, score):
+        """ Reports the minimization `score` of a new point.
+
+        Returns
+        -------
+        changed: bool
+            Whether the front has changed
+        """
+        self.n_points += 1
+        score = np.asarray(score, dtype=float).ravel()
+        if not self._ready():
+            self._pending.append(score)
+            if len(self._pending) < self.n_warmup:
+                return False
+            self._infer_bounds(np.array(self._pending))
+            pending, self._pending = self._pending, []
+            changed = [self._add(pending_score) for pending_score in pending]
+            return any(changed)
+        return self._add(score)
+
+    def _ready(self):
+        if self.reference_point is None:
+            return False
+        bounds = [self.reference_point]
+        if self.estimated:
+            bounds.append(self.lower_point)
+        return all(
+            bound is not None and not np.isnan(bound).any()
+            for bound in bounds
+        )
+
+    def _infer_bounds(self, scores):
+        """ Sets the unknown coordinates of the reference and lower points
+        from the range of the `scores`."""
+        dimension = scores.shape[1]
+        highest = scores.max(axis=0)
+        lowest = scores.min(axis=0)
+        margin = 0.1 * (highest - lowest)
+        margin = np.where(
+            margin > 0, margin, np.maximum(0.1 * np.abs(highest), 1.0))
+
+        reference_point = self.reference_point
+        if reference_point is None:
+            reference_point = np.full(dimension, np.nan)
+        reference_point = np.asarray(reference_point, dtype=float)
+        self.reference_point = np.where(
+            np.isnan(reference_point), highest + margin, reference_point)
+
+        lower_point = self.lower_point
+        if lower_point is None:
+            lower_point = np.full(dimension, np.nan)
+        lower_point = np.asarray(lower_point, dtype=float)
+        self.lower_point = np.where(
+            np.isnan(lower_point), lowest - margin, lower_point)
+        log.info(
+            "Hypervolume reference point: {}".format(self.reference_point))
+
+    def _add(self, score):
+        front = self._archive.scores()
+        added, _ = self._archive.add(score)
+        if not added:
+            return False
+
+        if not self.estimated:
+            self.hypervolume += hypervolume_contribution(
+                score, front, self.reference_point)
+            return True
+
+        if self._samples is None:
+            random_state = np.random.RandomState(self.seed)
+            lower = np.minimum(self.lower_point, self.reference_point)
+            self._samples = lower + random_state.random_sample(
+                (self.n_samples, len(lower))
+            ) * (self.reference_point - lower)
+            self._dominated = np.zeros(self.n_samples, dtype=bool)
+        self._dominated |= (self._samples >= score).all(axis=1)
+        box = np.prod(
+            self.reference_point
+            - np.minimum(self.lower_point, self.reference_point)
+        )
+        self.hypervolume = float(self._dominated.mean() * box)
+        return True
@@ -15,7 +15,13 @@ class IEvaluator(Interface):
     MCO runner. It can be passed in as an argument to a MCO run and
     used to evaluate the state of a system for a given set of
     parameters, returning a set of KPIs. This avoids the need for the
-    MCO to obtain any information regarding the Envisage application."""
+    MCO to obtain any information regarding the Envisage application.
+
+    Evaluators that can compute the derivatives of the KPIs may also
+    provide an `evaluate_with_jacobian(parameter_values)` method, which
+    returns the KPI values along with their Jacobian with respect to the
+    flattened parameter values, or None if it is not available, as
+    `Workflow.evaluate_with_jacobian` does."""
 
     #: An instance of the MCO model information
     mco_model = Instance(BaseMCOModel)
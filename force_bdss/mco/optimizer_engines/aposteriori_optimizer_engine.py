@@ -2,12 +2,23 @@
 #  All rights reserved.
 
 import logging
+import os
+from threading import RLock
 
-from traits.api import Str, Instance
+from traits.api import Any, Bool, Either, Enum, Instance, Str
 
+from force_bdss.core.worker_pool import WORKER_POOL_MODES, create_worker_pool
+from force_bdss.local_traits import PositiveInt
+from force_bdss.mco.optimizers.ask_tell_adapter import CallbackAskTellAdapter
+from force_bdss.mco.optimizers.i_ask_tell_optimizer import IAskTellOptimizer
 from force_bdss.mco.optimizers.i_optimizer import IOptimizer
 
-from .base_optimizer_engine import BaseOptimizerEngine
+from .base_optimizer_engine import (
+    BaseOptimizerEngine,
+    EvaluationBudgetExhausted,
+)
+from .evaluation_archive import point_key
+from .pareto_archive import ParetoArchive
 
 log = logging.getLogger(__name__)
 
@@ -20,14 +31,63 @@ class AposterioriOptimizerEngine(BaseOptimizerEngine):
     A multi-objective function is optimized using the a posteriori
     method of a multi-objective optimizer (e.g. Nevergrad).
     The optimization result is some part of the Pareto-efficient set.
+
+    If the `evaluation_budget` or `time_limit` is reached, the
+    optimization ends, and the Pareto-efficient points among all the
+    points evaluated so far are yielded, unless they already were.
     """
 
     #: Optimizer name
     name = Str("APosteriori_Optimizer")
 
     #: IOptimizer class that provides library backend for optimizing a
-    #: callable
-    optimizer = Instance(IOptimizer, transient=True)
+    #: callable, or IAskTellOptimizer class proposing the points to
+    #: evaluate
+    optimizer = Either(
+        Instance(IOptimizer), Instance(IAskTellOptimizer), transient=True
+    )
+
+    #: Concurrency backend evaluating the points proposed by the
+    #: optimizer. Unless "Serial", an IOptimizer is driven through the
+    #: ask/tell protocol by a CallbackAskTellAdapter. In "Process" mode,
+    #: the evaluator must be picklable.
+    concurrency_mode = Enum(*WORKER_POOL_MODES)
+
+    #: Maximum number of workers evaluating the points. If None, the
+    #: default of the concurrent.futures executor is used.
+    max_workers = Either(None, PositiveInt)
+
+    #: Maximum number of points evaluated at the same time. If None,
+    #: `max_workers` or the number of processors is used.
+    batch_size = Either(None, PositiveInt)
+
+    #: Yield only the points that enter the `pareto_archive`, rather than
+    #: every point yielded by the optimizer
+    pareto_filter = Bool(False)
+
+    #: Non-dominated (point, KPI values) pairs yielded by the optimizer
+    #: during the last `optimize` call. It is only updated if
+    #: `pareto_filter` is set.
+    pareto_archive = Instance(
+        ParetoArchive, (), visible=False, transient=True
+    )
+
+    #: Non-dominated (point, KPI values) pairs of all the points evaluated
+    #: during the current `optimize` call, yielded if the optimization is
+    #: ended by the budget. It is only updated if the `evaluation_budget`
+    #: or `time_limit` is set.
+    _evaluated_front = Instance(ParetoArchive, (), transient=True)
+
+    #: Lock protecting the `_evaluated_front` from optimizers evaluating
+    #: points in several threads
+    _front_lock = Any(transient=True)
+
+    #: Keys of the points yielded during the current `optimize` call
+    _yielded_keys = Any(transient=True)
+
+    def __init__(self, *args, **kwargs):
+        self._front_lock = RLock()
+        super().__init__(*args, **kwargs)
 
     def optimize(self, **kwargs):
         """ Generates optimization results.
@@ -38,17 +98,91 @@ class AposterioriOptimizerEngine(BaseOptimizerEngine):
             MCO parameter and KPI values at point of optimization
         """
 
-        # Clear the KPI cache at the start of the optimization
-        self._kpi_cache = {}
+        # Start the optimization with empty evaluation and Pareto archives
+        self.evaluation_archive.clear()
+        self.pareto_archive.clear()
+        self._evaluated_front.clear()
+        self._yielded_keys = set()
+        self.start_budget()
+        self.restore_evaluations()
 
-        #: get pareto set
-        for point in self.optimizer.optimize_function(
+        if (self.concurrency_mode == "Serial"
+                and not isinstance(self.optimizer, IAskTellOptimizer)):
+            points = self.optimizer.optimize_function(
                 self._score,
                 self.parameters,
-                **kwargs):
-            # Retrieve the cached raw KPI values
-            kpis = self.retrieve_result(point)
-            yield point, kpis
+                **kwargs)
+        else:
+            points = self._ask_tell_optimize(**kwargs)
+
+        #: get pareto set
+        try:
+            for point in points:
+                # Retrieve the cached raw KPI values
+                kpis = self.retrieve_result(point)
+                if self._accept_result(point, kpis):
+                    self._yielded_keys.add(point_key(point))
+                    yield point, kpis
+        except EvaluationBudgetExhausted as exception:
+            log.warning(
+                "{}: yielding the Pareto-efficient points evaluated so "
+                "far".format(exception)
+            )
+            with self._front_lock:
+                best_points = self._evaluated_front.items
+            for point, kpis in best_points:
+                if (point_key(point) not in self._yielded_keys
+                        and self._accept_result(point, kpis)):
+                    yield point, kpis
+
+    def cache_result(self, input_point, kpi_values):
+        """Stores an evaluated set of MCO parameters and corresponding
+        KPI values, and keeps track of the non-dominated ones if the
+        optimization is limited by a budget"""
+        super().cache_result(input_point, kpi_values)
+        if self.evaluation_budget is None and self.time_limit is None:
+            return
+        with self._front_lock:
+            self._evaluated_front.add(
+                self._minimization_score(kpi_values),
+                (input_point, kpi_values)
+            )
+
+    def _accept_result(self, point, kpis):
+        """ Returns whether the optimization result at `point` should
+        be yielded, that is if the `pareto_filter` is not set, or if the
+        result enters the `pareto_archive`."""
+        if not self.pareto_filter:
+            return True
+        added, _ = self.pareto_archive.add(
+            self._minimization_score(kpis), (point, kpis)
+        )
+        return added
+
+    def _ask_tell_optimize(self, **kwargs):
+        """ Drives the optimizer through the ask/tell protocol, evaluating
+        the points in a worker pool of `concurrency_mode`.
+
+        Yields
+        ------
+        point: list of MCO parameter values
+            Each optimal point, as soon as it is found by the optimizer
+        """
+        optimizer = self.optimizer
+        if not isinstance(optimizer, IAskTellOptimizer):
+            optimizer = CallbackAskTellAdapter(optimizer=optimizer)
+        batch_size = self.batch_size or self.max_workers or os.cpu_count()
+
+        optimizer.start(self.parameters, **kwargs)
+        worker_pool = create_worker_pool(
+            self.concurrency_mode, self.max_workers)
+        try:
+            yield from self.drive_ask_tell(
+                optimizer, worker_pool, batch_size=batch_size or 1
+            )
+        finally:
+            if worker_pool is not None:
+                worker_pool.shutdown()
 
     def unpacked_score(self, *unpacked_input):
         packed_input = list(unpacked_input)
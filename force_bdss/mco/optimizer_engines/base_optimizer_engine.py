@@ -2,20 +2,42 @@
 #  All rights reserved.
 
 import abc
+from concurrent.futures import FIRST_COMPLETED, wait
 import logging
+import time
 
+import numpy as np
 from traits.api import (
-    ABCHasStrictTraits, List, Instance, Bool, Property, Dict)
+    ABCHasStrictTraits, Any, Either, Float, Int, List, Instance, Bool,
+    Property, on_trait_change)
 
 from force_bdss.core.kpi_specification import KPISpecification
+from force_bdss.local_traits import PositiveInt
 from force_bdss.mco.parameters.base_mco_parameter import BaseMCOParameter
+from force_bdss.mco.parameters.mco_parameters import RangedMCOParameter
 from force_bdss.mco.i_evaluator import IEvaluator
-from force_bdss.mco.optimizer_engines.utilities import convert_to_score
-from force_bdss.utilities import pop_dunder_recursive
+from force_bdss.mco.optimizer_engines.evaluation_archive import (
+    EvaluationArchive,
+    point_key,
+)
+from force_bdss.mco.optimizer_engines.utilities import (
+    convert_jacobian_to_score,
+    convert_to_score,
+)
+from force_bdss.utilities import (
+    create_from_traits,
+    picklable_traits,
+    pop_dunder_recursive,
+)
 
 log = logging.getLogger(__name__)
 
 
+class EvaluationBudgetExhausted(Exception):
+    """Raised by an optimizer engine instead of evaluating a new point,
+    once its evaluation budget or time limit is reached."""
+
+
 class BaseOptimizerEngine(ABCHasStrictTraits):
     """
     Optimizer Engine performs black-box optimization (minimization) of
@@ -40,8 +62,20 @@ class BaseOptimizerEngine(ABCHasStrictTraits):
         IEvaluator, visible=False, transient=True
     )
 
-    #: Caches KPI values between optimization runs
-    _kpi_cache = Dict(transient=True)
+    #: Archive of the KPI values evaluated during an optimization. It is
+    #: shared by all the optimization runs of an `optimize` call, so that
+    #: points are never evaluated twice.
+    evaluation_archive = Instance(
+        EvaluationArchive, (), visible=False, transient=True
+    )
+
+    #: Tolerance of the lookups of the `evaluation_archive`, relative to
+    #: the range of each Ranged parameter. A point then reuses the KPI
+    #: values of an archived point whose Ranged parameter values all lie
+    #: within the tolerance, and whose other parameter values are equal.
+    #: It should be well below the step of the finite differences of the
+    #: optimizer. If None, only exactly equal points are reused.
+    archive_tolerance = Either(None, Float)
 
     #: Default (initial) guess on input parameter values
     initial_parameter_value = Property(
@@ -62,6 +96,37 @@ class BaseOptimizerEngine(ABCHasStrictTraits):
     #: data, e.g. Pareto front only
     verbose_run = Bool(False)
 
+    #: Whether the KPI Jacobians of evaluators providing an
+    #: `evaluate_with_jacobian` method are computed along with the KPI
+    #: values, so that they can be used as gradients by the optimizer
+    use_derivatives = Bool(False)
+
+    #: Maximum number of KPI evaluations of an `optimize` call. Points
+    #: found in the `evaluation_archive` are not counted. If None, the
+    #: number of evaluations is not limited.
+    evaluation_budget = Either(None, PositiveInt)
+
+    #: Maximum wall-clock duration of an `optimize` call, in seconds. No
+    #: new evaluation is started once it has elapsed, but evaluations in
+    #: progress are completed. If None, the duration is not limited.
+    time_limit = Either(None, Float)
+
+    #: Number of KPI evaluations since the budget was started
+    evaluation_count = Int(0, visible=False, transient=True)
+
+    #: Point key, KPI values and KPI Jacobian (or None) of the last point
+    #: evaluated along with its Jacobian
+    _last_jacobian = Any(transient=True)
+
+    #: Time at which the budget was started, as returned by
+    #: `time.monotonic`
+    _budget_start = Either(None, Float, transient=True)
+
+    #: Evaluation count and time at which the current run of an engine
+    #: sharing its budget between several runs must end
+    _run_evaluation_limit = Either(None, Int, transient=True)
+    _run_deadline = Either(None, Float, transient=True)
+
     def _get_initial_parameter_value(self):
         return [p.initial_value for p in self.parameters]
 
@@ -92,31 +157,302 @@ class BaseOptimizerEngine(ABCHasStrictTraits):
         library.
         """
 
+    def archive_tolerances(self):
+        """ Returns the absolute tolerance of the lookups of the
+        `evaluation_archive` for each flattened parameter value, derived
+        from the bounds of the Ranged parameters and the
+        `archive_tolerance`, or None if it is not set."""
+        if self.archive_tolerance is None:
+            return None
+        tolerances = []
+        for parameter in self.parameters:
+            if isinstance(parameter, RangedMCOParameter):
+                widths = np.abs(np.subtract(
+                    np.ravel(parameter.upper_bound),
+                    np.ravel(parameter.lower_bound)
+                ))
+                tolerances.extend(self.archive_tolerance * widths)
+            else:
+                tolerances.append(0.0)
+        return np.array(tolerances, dtype=float)
+
+    @on_trait_change(
+        "archive_tolerance,evaluation_archive,"
+        "parameters,parameters.[lower_bound,upper_bound]"
+    )
+    def _update_archive_tolerances(self):
+        self.evaluation_archive.tolerances = self.archive_tolerances()
+
+    def start_budget(self):
+        """ Starts counting the evaluations and the elapsed time against
+        the `evaluation_budget` and `time_limit`. Engines call it at the
+        start of `optimize`."""
+        self.evaluation_count = 0
+        self._budget_start = time.monotonic()
+        self._run_evaluation_limit = None
+        self._run_deadline = None
+
+    def remaining_evaluations(self):
+        """ Returns the number of evaluations left in the budget of the
+        current run, or None if it is not limited."""
+        limits = [
+            limit for limit in [
+                self.evaluation_budget, self._run_evaluation_limit]
+            if limit is not None
+        ]
+        if not limits:
+            return None
+        return max(min(limits) - self.evaluation_count, 0)
+
+    def remaining_time(self):
+        """ Returns the time left before the time limit of the current
+        run, in seconds, or None if it is not limited."""
+        if self._budget_start is None:
+            self._budget_start = time.monotonic()
+        now = time.monotonic()
+        deadlines = [
+            deadline for deadline in [
+                None if self.time_limit is None
+                else self._budget_start + self.time_limit,
+                self._run_deadline,
+            ]
+            if deadline is not None
+        ]
+        if not deadlines:
+            return None
+        return max(min(deadlines) - now, 0.0)
+
+    def budget_exhausted(self, pending=0):
+        """ Returns whether a new evaluation would exceed the budget of
+        the current run, given a number of `pending` evaluations already
+        started but not counted yet."""
+        remaining = self.remaining_evaluations()
+        if remaining is not None and remaining <= pending:
+            return True
+        remaining_time = self.remaining_time()
+        return remaining_time is not None and remaining_time <= 0
+
+    def share_budget(self, n_runs):
+        """ Limits the current run to an equal share of the evaluations
+        and time left for the `n_runs` runs that remain, including the
+        current one. Runs ending early leave their unused share to the
+        following ones. Each run is allowed at least one evaluation, as
+        long as the whole budget is not exhausted."""
+        self._run_evaluation_limit = None
+        self._run_deadline = None
+        remaining = self.remaining_evaluations()
+        if remaining is not None:
+            self._run_evaluation_limit = (
+                self.evaluation_count + max(remaining // n_runs, 1))
+        remaining_time = self.remaining_time()
+        if remaining_time is not None:
+            self._run_deadline = time.monotonic() + remaining_time / n_runs
+
+    def _check_budget(self, pending=0):
+        """ Raises EvaluationBudgetExhausted if a new evaluation would
+        exceed the budget of the current run."""
+        if self.budget_exhausted(pending):
+            raise EvaluationBudgetExhausted(
+                "Evaluation budget exhausted after {} evaluations".format(
+                    self.evaluation_count)
+            )
+
+    def drive_ask_tell(self, optimizer, worker_pool=None, batch_size=1,
+                       score=None):
+        """ Drives a started IAskTellOptimizer to completion. The KPIs of
+        up to `batch_size` points asked to the `optimizer` are evaluated
+        at the same time by the `worker_pool`, and their scores are told
+        back as soon as they are completed. Points already in the
+        `evaluation_archive` are not evaluated again.
+
+        Once the budget of the engine is exhausted, no new point is
+        evaluated: the evaluations in progress are completed, and
+        EvaluationBudgetExhausted is raised after their results.
+
+        Parameters
+        ----------
+        optimizer: IAskTellOptimizer
+            The optimizer proposing the points, already started
+        worker_pool: concurrent.futures.Executor, optional
+            The executor evaluating the points with the
+            `single_point_evaluator`, which must be picklable for a pool
+            of worker processes. If None, the points are evaluated one at
+            a time in the calling thread.
+        batch_size: int
+            The maximum number of points evaluated at the same time
+        score: Callable, optional
+            Returns the value told to the optimizer from the KPI values
+            of a point. If None, the minimization score of the KPIs is
+            told.
+
+        Yields
+        ------
+        point: list of MCO parameter values
+            Each optimal point, as soon as it is found by the optimizer
+        """
+        if score is None:
+            score = self._minimization_score
+
+        in_flight = {}
+        n_results = 0
+        exhausted = False
+        try:
+            while True:
+                n_points = batch_size - len(in_flight)
+                points = []
+                if n_points > 0 and not exhausted:
+                    points = optimizer.ask(n_points)
+                for point in points:
+                    kpi_values = self.evaluation_archive.get(point)
+                    if kpi_values is not None:
+                        optimizer.tell(point, score(kpi_values))
+                    elif exhausted or self.budget_exhausted(len(in_flight)):
+                        # The point is never told, and the optimizer
+                        # is stopped once the evaluations in progress
+                        # are completed
+                        exhausted = True
+                    elif worker_pool is None:
+                        optimizer.tell(point, score(self._evaluate(point)))
+                    else:
+                        future = worker_pool.submit(
+                            self.single_point_evaluator.evaluate, point
+                        )
+                        in_flight[future] = point
+
+                if in_flight:
+                    done, _ = wait(
+                        list(in_flight), return_when=FIRST_COMPLETED
+                    )
+                    for future in done:
+                        point = in_flight.pop(future)
+                        kpi_values = future.result()
+                        self.evaluation_count += 1
+                        self.cache_result(point, kpi_values)
+                        optimizer.tell(point, score(kpi_values))
+
+                results = optimizer.result()
+                yield from results[n_results:]
+                n_results = len(results)
+
+                if exhausted and not in_flight:
+                    raise EvaluationBudgetExhausted(
+                        "Evaluation budget exhausted after {} "
+                        "evaluations".format(self.evaluation_count)
+                    )
+                if not in_flight and not points:
+                    if optimizer.is_finished():
+                        break
+                    raise RuntimeError(
+                        "The optimizer did not propose any point, but has "
+                        "not finished"
+                    )
+        finally:
+            for future in in_flight:
+                future.cancel()
+            if not optimizer.is_finished():
+                optimizer.stop()
+
     def cache_result(self, input_point, kpi_values):
         """Stores an evaluated set of MCO parameters and corresponding
-        KPI values"""
-        key = self._get_kpi_cache_key(input_point)
-        self._kpi_cache[key] = kpi_values
+        KPI values, and records them in the checkpoint of the evaluator,
+        if any"""
+        self.evaluation_archive.add(input_point, kpi_values)
+        checkpoint = self._checkpoint()
+        if checkpoint is not None:
+            checkpoint.record_evaluation(input_point, kpi_values)
+
+    def _checkpoint(self):
+        """ Returns the OptimizationCheckpoint of the evaluator, or None
+        if the progress of the optimization is not saved."""
+        return getattr(self.single_point_evaluator, "checkpoint", None)
+
+    def restore_evaluations(self):
+        """ Archives the evaluations recorded in the checkpoint of the
+        evaluator, when resuming an interrupted optimization, so that they
+        are not evaluated again. Restored evaluations are not counted
+        against the `evaluation_budget`. Engines call it at the start of
+        `optimize`, once the `evaluation_archive` is cleared.
+
+        Returns
+        -------
+        n_restored: int
+            The number of restored evaluations
+        """
+        checkpoint = self._checkpoint()
+        if checkpoint is None or not checkpoint.resumed:
+            return 0
+        for point, kpi_values in checkpoint.evaluations:
+            self.evaluation_archive.add(point, kpi_values)
+        log.info(
+            "Restored {} evaluations from the checkpoint".format(
+                len(checkpoint.evaluations))
+        )
+        return len(checkpoint.evaluations)
 
     def retrieve_result(self, input_point):
         """Returns the evaluated set KPI values for a given set of
-        corresponding of MCO parameters"""
-        key = self._get_kpi_cache_key(input_point)
-        return self._kpi_cache[key]
+        corresponding of MCO parameters. Points that are not archived,
+        for instance because the archive discarded them to stay within
+        its memory limit, are evaluated again. The points are already
+        scored, so the lookup is not counted by the archive again."""
+        kpi_values = self.evaluation_archive.get(input_point, count=False)
+        if kpi_values is None:
+            kpi_values = self._evaluate(input_point)
+        return kpi_values
 
     def _get_kpi_cache_key(self, input_point):
         """Returns a hashable key object based on a set of MCO parameter
          values corresponding to an evaluation point"""
+        return point_key(input_point)
 
-        key = []
-        for value in input_point:
-            # Handles nested vector parameters
-            if isinstance(value, (list, tuple)):
-                key.append(self._get_kpi_cache_key(value))
-            else:
-                key.append(value)
+    def _evaluate(self, input_point):
+        """ Evaluates the KPI values at the `input_point` using the
+        `single_point_evaluator`, and archives them."""
+        evaluate_with_jacobian = self._jacobian_evaluator()
+        if evaluate_with_jacobian is None:
+            kpi_values = self.single_point_evaluator.evaluate(input_point)
+        else:
+            kpi_values, jacobian = evaluate_with_jacobian(input_point)
+            self._last_jacobian = (
+                point_key(input_point), kpi_values, jacobian
+            )
+        self.evaluation_count += 1
+        self.cache_result(input_point, kpi_values)
+        return kpi_values
+
+    def _evaluate_batch(self, points, worker_pool=None):
+        """ Returns the KPI values at each of the `points`. Points that
+        are not archived are evaluated concurrently by the `worker_pool`
+        with the `single_point_evaluator`, or one at a time in the calling
+        thread if it is None, and archived. The budget of the engine is
+        not checked: callers size their batches with
+        `remaining_evaluations`."""
+        results = [self.evaluation_archive.get(point) for point in points]
+        missing = [
+            index for index, kpi_values in enumerate(results)
+            if kpi_values is None
+        ]
+        if worker_pool is None:
+            for index in missing:
+                results[index] = self._evaluate(points[index])
+        else:
+            evaluate = self.single_point_evaluator.evaluate
+            missing_points = [points[index] for index in missing]
+            for index, kpi_values in zip(
+                    missing, worker_pool.map(evaluate, missing_points)):
+                self.evaluation_count += 1
+                self.cache_result(points[index], kpi_values)
+                results[index] = kpi_values
+        return results
 
-        return tuple(key)
+    def _jacobian_evaluator(self):
+        """ Returns the `evaluate_with_jacobian` method of the evaluator,
+        or None if derivatives are not used or not supported."""
+        if not self.use_derivatives:
+            return None
+        return getattr(
+            self.single_point_evaluator, "evaluate_with_jacobian", None
+        )
 
     def _score(self, input_point):
         """ Evaluates the workflow state at the `input_point` using the
@@ -125,17 +461,45 @@ class BaseOptimizerEngine(ABCHasStrictTraits):
         from the rest of the OptimizerEngine methods and the user.
         This is also useful for the testing purposes, when the `evaluate`
         method is mocked.
+
+        Points already in the `evaluation_archive` are not evaluated
+        again. Other points raise EvaluationBudgetExhausted once the
+        `evaluation_budget` or `time_limit` is reached, which ends the
+        optimization.
         """
 
-        # Calculate and cache the raw KPI values
-        kpi_values = self.single_point_evaluator.evaluate(input_point)
-        self.cache_result(input_point, kpi_values)
+        # Calculate and archive the raw KPI values
+        kpi_values = self.evaluation_archive.get(input_point)
+        if kpi_values is None:
+            self._check_budget()
+            kpi_values = self._evaluate(input_point)
 
         # Return the score to be minimized
         score = self._minimization_score(kpi_values)
         log.info("Objective score: {}".format(score))
         return score
 
+    def _score_jacobian(self, input_point):
+        """ Returns the Jacobian of the minimization score of the KPIs at
+        the `input_point` with respect to the flattened parameter values,
+        or None if the evaluator can not compute it. The Jacobian of the
+        last evaluated point is reused. Other points are evaluated again
+        within the budget, unless they are archived, in which case None
+        is returned and the optimizer falls back to finite differences."""
+        key = point_key(input_point)
+        if self._last_jacobian is None or self._last_jacobian[0] != key:
+            if (self._jacobian_evaluator() is None
+                    or self.evaluation_archive.get(
+                        input_point, count=False) is not None):
+                return None
+            self._check_budget()
+            self._evaluate(input_point)
+
+        _, kpi_values, jacobian = self._last_jacobian
+        if jacobian is None:
+            return None
+        return convert_jacobian_to_score(jacobian, kpi_values, self.kpis)
+
     def _minimization_score(self, score):
         """ Transforms the optimization `score` array to the minimization
         format. The minimization format implies that all optimization KPIs
@@ -144,3 +508,8 @@ class BaseOptimizerEngine(ABCHasStrictTraits):
 
     def __getstate__(self):
         return pop_dunder_recursive(super().__getstate__())
+
+    def __reduce_ex__(self, protocol):
+        # Engines are pickled along with their transient parameters,
+        # KPIs and evaluator, so that they can be run in worker processes
+        return create_from_traits, (type(self), picklable_traits(self))
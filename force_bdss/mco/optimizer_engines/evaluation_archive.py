@@ -0,0 +1,373 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+from itertools import product
+from threading import RLock
+
+import numpy as np
+
+from traits.api import Any, Either, HasStrictTraits, Int
+
+from force_bdss.local_traits import PositiveInt
+
+#: Number of rows allocated by an empty archive on the first insertion
+INITIAL_CAPACITY = 256
+
+#: Width of the cells of the grid of the approximate lookups, in
+#: tolerances. Wide cells hold more points, but a lookup rarely needs to
+#: probe the neighbouring cells.
+GRID_CELL_TOLERANCES = 64
+
+
+class EvaluationArchive(HasStrictTraits):
+    """Archive of the KPI values evaluated at each point of the parameter
+    space, shared by all the optimization runs of an optimizer engine.
+
+    Points and KPI values are stored as the rows of two preallocated
+    NumPy arrays, which double in size when full, and are looked up
+    through a hash index of the points. Points made of vector parameters
+    are flattened. Once the arrays reach `memory_limit`, the oldest
+    evaluations are overwritten first. The archive can be shared by
+    threads evaluating points concurrently.
+
+    If `tolerances` are set, a point that was not archived exactly matches
+    the nearest archived point whose flattened values all lie within the
+    tolerances, which avoids evaluating again points that only differ by
+    rounding errors. Archived numerical points are then also indexed in a
+    grid hash, whose cells are `GRID_CELL_TOLERANCES` tolerances wide, so
+    that a lookup only compares the point with the few archived points of
+    the cells within its tolerances.
+    """
+
+    #: Maximum memory used by the point and KPI arrays, in bytes. If
+    #: None, the archive is unbounded.
+    memory_limit = Either(None, PositiveInt, default=2 ** 28)
+
+    #: Number of lookups that found an archived evaluation
+    hits = Int(0)
+
+    #: Number of lookups that did not find an archived evaluation
+    misses = Int(0)
+
+    #: Absolute tolerance of the approximate lookups for each flattened
+    #: parameter value, as an array. A tolerance of zero only matches
+    #: equal values. If None, only archived points are matched.
+    tolerances = Any()
+
+    #: Number of lookups matched by an archived point within the
+    #: `tolerances`, that is of evaluations avoided by the approximate
+    #: lookups. They are also counted in the `hits`.
+    approximate_hits = Int(0)
+
+    #: Flattened points of the archived evaluations, one per row
+    _points = Any()
+
+    #: KPI values of the archived evaluations, one per row
+    _kpis = Any()
+
+    #: Row of each archived point, by point key
+    _index = Any()
+
+    #: Key of the point stored in each row, or None for unused rows
+    _keys = Any()
+
+    #: Rows of the archived points in each cell of the grid of the
+    #: approximate lookups, by cell coordinates
+    _grid = Any()
+
+    #: Width of the cells of the grid, for each flattened parameter value
+    _cell_widths = Any()
+
+    #: Number of rows in use
+    _size = Int(0)
+
+    #: Row overwritten by the next insertion once the archive is full
+    _next_row = Int(0)
+
+    #: Lock protecting the archive from concurrent access
+    _lock = Any(transient=True)
+
+    def __init__(self, *args, **kwargs):
+        self._lock = RLock()
+        super().__init__(*args, **kwargs)
+        self.clear()
+
+    def add(self, point, kpi_values):
+        """ Archives the `kpi_values` evaluated at `point`. Evaluations
+        with a different number of parameters or KPIs than the archived
+        ones replace the whole archive.
+
+        Parameters
+        ----------
+        point: list
+            The MCO parameter values, possibly nested
+        kpi_values: list
+            The KPI values evaluated at `point`
+        """
+        key = point_key(point)
+        point_row = _as_row(_flatten(point))
+        kpi_row = _as_row(kpi_values)
+
+        with self._lock:
+            row = self._index.get(key)
+            if row is None:
+                if self._size and (
+                        point_row.size != self._points.shape[1]
+                        or kpi_row.size != self._kpis.shape[1]):
+                    self.clear()
+                row = self._allocate_row(point_row, kpi_row)
+                self._index[key] = row
+                self._keys[row] = key
+                self._grid_add(row, point_row)
+
+            self._points = _store(self._points, row, point_row)
+            self._kpis = _store(self._kpis, row, kpi_row)
+
+    def get(self, point, count=True):
+        """ Returns the KPI values archived for `point`, or None if it was
+        never evaluated, and updates the hit and miss counters.
+
+        Parameters
+        ----------
+        point: list
+            The MCO parameter values, possibly nested
+        count: bool
+            Whether the lookup is counted in the hit and miss counters.
+            Lookups of a point that was already looked up, such as those
+            retrieving the KPI values of an optimal point, are not.
+
+        Returns
+        -------
+        kpi_values: list or None
+            The archived KPI values
+        """
+        key = point_key(point)
+        with self._lock:
+            row = self._index.get(key)
+            if row is None and self._grid is not None:
+                row = self._nearest_row(_as_row(_flatten(point)))
+                if row is not None and count:
+                    self.approximate_hits += 1
+            if row is None:
+                if count:
+                    self.misses += 1
+                return None
+            if count:
+                self.hits += 1
+            return self._kpis[row].tolist()
+
+    def points(self):
+        """ Returns the flattened archived points, from the oldest to the
+        most recent, as the rows of an array."""
+        return self._ordered(self._points)
+
+    def kpi_values(self):
+        """ Returns the archived KPI values, from the oldest to the most
+        recent evaluation, as the rows of an array."""
+        return self._ordered(self._kpis)
+
+    def clear(self):
+        """ Removes all the archived evaluations. The hit and miss
+        counters are not reset."""
+        with self._lock:
+            self._points = np.empty((0, 0))
+            self._kpis = np.empty((0, 0))
+            self._index = {}
+            self._keys = []
+            self._size = 0
+            self._next_row = 0
+            self._reset_grid()
+
+    @property
+    def memory_usage(self):
+        """ Memory allocated by the point and KPI arrays, in bytes."""
+        return self._points.nbytes + self._kpis.nbytes
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, point):
+        return point_key(point) in self._index
+
+    def _allocate_row(self, point_row, kpi_row):
+        """ Returns the row where a new evaluation is stored, growing the
+        arrays or overwriting the oldest evaluation as required."""
+        capacity = len(self._keys)
+        if self._size < capacity:
+            row = self._size
+            self._size += 1
+            return row
+
+        row_nbytes = max(
+            point_row.size * max(point_row.itemsize, self._points.itemsize)
+            + kpi_row.size * max(kpi_row.itemsize, self._kpis.itemsize),
+            1,
+        )
+        max_capacity = (
+            None if self.memory_limit is None
+            else max(self.memory_limit // row_nbytes, 1)
+        )
+        if max_capacity is None or capacity < max_capacity:
+            new_capacity = max(2 * capacity, INITIAL_CAPACITY)
+            if max_capacity is not None:
+                new_capacity = min(new_capacity, max_capacity)
+            self._points = _resize(self._points, new_capacity, point_row)
+            self._kpis = _resize(self._kpis, new_capacity, kpi_row)
+            self._keys.extend([None] * (new_capacity - capacity))
+            row = self._size
+            self._size += 1
+            return row
+
+        # The archive is full: overwrite the oldest evaluation
+        row = self._next_row
+        del self._index[self._keys[row]]
+        self._grid_discard(row)
+        self._next_row = (row + 1) % capacity
+        return row
+
+    def _reset_grid(self):
+        """ Indexes the archived points in a new grid, if `tolerances`
+        are set."""
+        self._grid = None
+        self._cell_widths = None
+        if self.tolerances is None:
+            return
+        tolerances = np.asarray(self.tolerances, dtype=float).ravel()
+        # Values with a zero tolerance are hashed into cells of unit width,
+        # and only match equal values
+        self._cell_widths = np.where(
+            tolerances > 0, GRID_CELL_TOLERANCES * tolerances, 1.0)
+        self._grid = {}
+        for row in range(self._size):
+            self._grid_add(row, self._points[row])
+
+    def _grid_cell(self, point_row):
+        """ Returns the coordinates of the grid cell of `point_row`, or
+        None if it can not be matched approximately."""
+        if point_row.size != self._cell_widths.size:
+            return None
+        try:
+            point_row = point_row.astype(float)
+        except (TypeError, ValueError):
+            return None
+        if not np.isfinite(point_row).all():
+            return None
+        return tuple(
+            np.floor(point_row / self._cell_widths).astype(int).tolist())
+
+    def _grid_add(self, row, point_row):
+        if self._grid is None:
+            return
+        cell = self._grid_cell(point_row)
+        if cell is not None:
+            self._grid.setdefault(cell, set()).add(row)
+
+    def _grid_discard(self, row):
+        if self._grid is None:
+            return
+        cell = self._grid_cell(self._points[row])
+        rows = self._grid.get(cell)
+        if rows is not None:
+            rows.discard(row)
+            if not rows:
+                del self._grid[cell]
+
+    def _nearest_row(self, point_row):
+        """ Returns the row of the archived point nearest to `point_row`
+        within the `tolerances`, or None if there is none."""
+        if self._grid_cell(point_row) is None:
+            return None
+        point_row = point_row.astype(float)
+        tolerances = np.asarray(self.tolerances, dtype=float).ravel()
+        # The cells within the tolerances of the point, along each axis
+        lowest = np.floor((point_row - tolerances) / self._cell_widths)
+        highest = np.floor((point_row + tolerances) / self._cell_widths)
+        candidates = []
+        for cell in product(*(
+                range(int(low), int(high) + 1)
+                for low, high in zip(lowest, highest))):
+            candidates.extend(self._grid.get(cell, ()))
+        if not candidates:
+            return None
+
+        deviations = np.abs(
+            self._points[candidates].astype(float) - point_row)
+        within = (deviations <= tolerances).all(axis=1)
+        if not within.any():
+            return None
+        scaled = deviations / np.where(tolerances > 0, tolerances, 1.0)
+        distances = np.where(within, scaled.max(axis=1), np.inf)
+        return candidates[int(np.argmin(distances))]
+
+    def _ordered(self, array):
+        if self._size < len(self._keys):
+            return array[:self._size].copy()
+        return np.roll(array, -self._next_row, axis=0)
+
+    def __setstate__(self, state):
+        # Locks are transient, and created again when unpickled
+        self._lock = RLock()
+        super().__setstate__(state)
+
+    def _tolerances_changed(self):
+        with self._lock:
+            self._reset_grid()
+
+    def _memory_limit_changed(self):
+        # Rows beyond the new limit are only discarded on the next
+        # insertion into a full archive, so start afresh instead
+        self.clear()
+
+
+def point_key(point):
+    """Returns a hashable key object based on a set of MCO parameter
+    values corresponding to an evaluation point"""
+    key = []
+    for value in point:
+        # Handles nested vector parameters
+        if isinstance(value, (list, tuple)):
+            key.append(point_key(value))
+        else:
+            key.append(value)
+
+    return tuple(key)
+
+
+def _flatten(point):
+    """ Returns the values of a possibly nested `point` as a flat list."""
+    values = []
+    for value in point:
+        if isinstance(value, (list, tuple, np.ndarray)):
+            values.extend(_flatten(value))
+        else:
+            values.append(value)
+    return values
+
+
+def _as_row(values):
+    """ Returns `values` as a one dimensional array, of objects if they
+    are not all numerical."""
+    row = np.asarray(values)
+    if row.dtype.kind not in "biuf" or row.ndim != 1:
+        row = np.empty(len(values), dtype=object)
+        row[:] = list(values)
+    return row
+
+
+def _resize(array, capacity, row):
+    """ Returns a copy of `array` with `capacity` rows of the size of
+    `row`, and a data type that can hold both."""
+    dtype = row.dtype if array.size == 0 else np.result_type(array, row)
+    resized = np.empty((capacity, row.size), dtype=dtype)
+    if len(array):
+        resized[:len(array)] = array
+    return resized
+
+
+def _store(array, row_index, row):
+    """ Stores `row` in `array`, converting the array to objects if it
+    can not hold the values of `row`."""
+    if row.dtype != array.dtype and np.result_type(array, row) != array.dtype:
+        array = array.astype(np.result_type(array, row))
+    array[row_index] = row
+    return array
@@ -0,0 +1,140 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+import itertools
+import logging
+
+from traits.api import Either, Enum, Instance, Int, Property, Str
+
+from force_bdss.core.worker_pool import WORKER_POOL_MODES, create_worker_pool
+from force_bdss.local_traits import PositiveInt
+from force_bdss.mco.parameters.mco_parameters import RangedVectorMCOParameter
+
+from .base_optimizer_engine import BaseOptimizerEngine
+from .pareto_archive import ParetoArchive
+
+log = logging.getLogger(__name__)
+
+
+def parameter_grid_values(parameter):
+    """ Returns the values of a `parameter` on the grid: its
+    `sample_values`, or for a RangedVectorMCOParameter, the vectors
+    combining the sample values of each of its components."""
+    if isinstance(parameter, RangedVectorMCOParameter):
+        return [
+            list(vector)
+            for vector in itertools.product(*parameter.sample_values)
+        ]
+    return list(parameter.sample_values)
+
+
+class GridSearchOptimizerEngine(BaseOptimizerEngine):
+    """ Exhaustive search of the grid of the `sample_values` of the MCO
+    parameters.
+
+    Notes
+    -----
+    The points of the Cartesian product of the sample values of each
+    parameter are generated lazily, and evaluated `chunk_size` points at
+    a time. Only the non-dominated points evaluated so far are kept, so
+    that large design-of-experiments sweeps run in bounded memory.
+
+    The search stops before the `evaluation_budget` is exceeded, or once
+    the `time_limit` has elapsed when a chunk is completed, and the
+    non-dominated points of the part of the grid searched are yielded.
+    """
+
+    #: Optimizer name
+    name = Str("Grid_Search_Optimizer")
+
+    #: Concurrency backend evaluating the points of a chunk. In "Process"
+    #: mode, the evaluator must be picklable.
+    concurrency_mode = Enum(*WORKER_POOL_MODES)
+
+    #: Maximum number of workers evaluating the points. If None, the
+    #: default of the concurrent.futures executor is used.
+    max_workers = Either(None, PositiveInt)
+
+    #: Number of grid points evaluated at once
+    chunk_size = PositiveInt(256)
+
+    #: Number of points of the grid
+    grid_size = Property(Int, visible=False)
+
+    #: Non-dominated (point, KPI values) pairs evaluated during the last
+    #: `optimize` call. Points with equal KPI values are all kept.
+    pareto_archive = Instance(
+        ParetoArchive, kw={"accept_duplicates": True}, visible=False,
+        transient=True
+    )
+
+    def _get_grid_size(self):
+        size = 1
+        for parameter in self.parameters:
+            size *= len(parameter_grid_values(parameter))
+        return size
+
+    def grid_points(self):
+        """ Generates the points of the grid, without holding them in
+        memory.
+
+        Yields
+        ------
+        point: list
+            The MCO parameter values of each point of the grid, in
+            lexicographic order of the sample values
+        """
+        for point in itertools.product(*[
+                parameter_grid_values(parameter)
+                for parameter in self.parameters]):
+            yield list(point)
+
+    def optimize(self, **kwargs):
+        """ Generates optimization results.
+
+        Yields
+        ----------
+        optimization result: tuple(list, list)
+            MCO parameter and KPI values of each point of the grid as soon
+            as it is evaluated if `verbose_run`, or else of the
+            Pareto-efficient points, once the grid has been searched
+        """
+        self.evaluation_archive.clear()
+        self.pareto_archive.clear()
+        self.start_budget()
+        self.restore_evaluations()
+        log.info("Searching a grid of {} points".format(self.grid_size))
+
+        points = self.grid_points()
+        worker_pool = create_worker_pool(
+            self.concurrency_mode, self.max_workers)
+        try:
+            while True:
+                if self.budget_exhausted():
+                    log.warning(
+                        "Evaluation budget exhausted after {} of the {} "
+                        "grid points".format(
+                            self.evaluation_count, self.grid_size)
+                    )
+                    break
+                chunk_size = self.chunk_size
+                remaining = self.remaining_evaluations()
+                if remaining is not None:
+                    chunk_size = min(chunk_size, remaining)
+                chunk = list(itertools.islice(points, chunk_size))
+                if not chunk:
+                    break
+                chunk_kpis = self._evaluate_batch(chunk, worker_pool)
+                for point, kpi_values in zip(chunk, chunk_kpis):
+                    self.pareto_archive.add(
+                        self._minimization_score(kpi_values),
+                        (point, kpi_values)
+                    )
+                if self.verbose_run:
+                    yield from zip(chunk, chunk_kpis)
+        finally:
+            if worker_pool is not None:
+                worker_pool.shutdown()
+
+        if not self.verbose_run:
+            yield from self.pareto_archive.items
@@ -0,0 +1,134 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+import numpy as np
+
+from traits.api import Any, Bool, HasStrictTraits, Int
+
+#: Number of rows allocated by an empty archive on the first insertion
+INITIAL_CAPACITY = 64
+
+
+class ParetoArchive(HasStrictTraits):
+    """Archive of the non-dominated points found by an optimization,
+    updated incrementally as points are evaluated.
+
+    Each point is archived along with its minimization scores, as
+    returned by `convert_to_score`. A score dominates another if none of
+    its entries is larger and at least one is smaller. Inserting a point
+    compares its scores with those of the archived points at once, as the
+    rows of a preallocated NumPy array, and removes the points it
+    dominates, so that each insertion costs O(N K) for N archived points
+    and K KPIs.
+    """
+
+    #: Archive points whose scores are equal to those of an archived
+    #: point. Otherwise, they are rejected, since they do not change the
+    #: front.
+    accept_duplicates = Bool(False)
+
+    #: Scores of the archived points, one per row
+    _scores = Any()
+
+    #: Archived items, in the order of the score rows
+    _items = Any()
+
+    #: Number of archived points
+    _size = Int(0)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.clear()
+
+    def add(self, score, item=None):
+        """ Archives `item` if its `score` is not dominated by the score
+        of an archived point, and removes the archived points it
+        dominates.
+
+        Parameters
+        ----------
+        score: array_like
+            The minimization scores of the point
+        item: object
+            The archived object, such as the MCO parameter and KPI values
+            of the point
+
+        Returns
+        -------
+        added: bool
+            Whether the item was archived
+        removed: list
+            The archived items dominated by the new one, and removed
+        """
+        score = np.asarray(score, dtype=float).ravel()
+        if self._size == 0:
+            self._append(score, item)
+            return True, []
+        if score.size != self._scores.shape[1]:
+            raise ValueError(
+                "Scores of {} KPIs can not be archived along with scores "
+                "of {} KPIs".format(score.size, self._scores.shape[1])
+            )
+
+        front = self._scores[:self._size]
+        equal = (front == score).all(axis=1)
+        rejected = (front <= score).all(axis=1)
+        if self.accept_duplicates:
+            rejected &= ~equal
+        if rejected.any():
+            return False, []
+
+        dominated = (score <= front).all(axis=1) & ~equal
+        removed = []
+        if dominated.any():
+            removed = [
+                item for item, remove in zip(self._items, dominated)
+                if remove
+            ]
+            keep = ~dominated
+            self._size = int(keep.sum())
+            self._scores[:self._size] = front[keep]
+            self._items = [
+                item for item, kept in zip(self._items, keep) if kept
+            ]
+
+        self._append(score, item)
+        return True, removed
+
+    def dominates(self, score):
+        """ Returns whether the `score` is dominated by, or equal to, the
+        score of an archived point."""
+        if self._size == 0:
+            return False
+        score = np.asarray(score, dtype=float).ravel()
+        return bool((self._scores[:self._size] <= score).all(axis=1).any())
+
+    @property
+    def items(self):
+        """ The archived items, from the oldest to the most recent."""
+        return list(self._items)
+
+    def scores(self):
+        """ Returns the scores of the archived points, in the order of the
+        `items`, as the rows of an array."""
+        return self._scores[:self._size].copy()
+
+    def clear(self):
+        """ Removes all the archived points."""
+        self._scores = np.empty((0, 0))
+        self._items = []
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def _append(self, score, item):
+        if self._size == len(self._scores):
+            capacity = max(2 * self._size, INITIAL_CAPACITY)
+            scores = np.empty((capacity, score.size))
+            if self._size:
+                scores[:self._size] = self._scores[:self._size]
+            self._scores = scores
+        self._scores[self._size] = score
+        self._items.append(item)
+        self._size += 1
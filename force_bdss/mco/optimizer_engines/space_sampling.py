@@ -4,11 +4,16 @@
 import abc
 import numpy as np
 
-from traits.api import ABCHasStrictTraits, Bool, ListFloat
+from traits.api import ABCHasStrictTraits, Bool, Either, Int, ListFloat
 
 from force_bdss.local_traits import PositiveInt
 
 
+#: Default number of sample vectors in each array generated by the
+#: bulk samplers
+DEFAULT_CHUNK_SIZE = 4096
+
+
 def resolution_to_sample_size(space_dimension, n_points):
     """ Calculates what is the exact number of space samples (vectors
     of dimension `space_dimension`) we should pick, in order to have
@@ -17,12 +22,80 @@ def resolution_to_sample_size(space_dimension, n_points):
     search models and the number of samples from the uniform-along-each-axis
     sampling.
     """
-    samples_total = (
-            np.math.factorial(space_dimension + n_points - 2)
-            / np.math.factorial(space_dimension - 1)
-            / np.math.factorial(n_points - 1)
-    )
-    return int(samples_total)
+    return binomial(space_dimension + n_points - 2, space_dimension - 1)
+
+
+def binomial(n, k):
+    """ Exact binomial coefficient of the integers `n` and `k`, or zero
+    if `k` is out of the [0, n] range."""
+    n, k = int(n), int(k)
+    if k < 0 or k > n:
+        return 0
+    k = min(k, n - k)
+    coefficient = 1
+    for i in range(1, k + 1):
+        # Exact at each step, since the result is binomial(n - k + i, i)
+        coefficient = coefficient * (n - k + i) // i
+    return coefficient
+
+
+def simplex_lattice_chunks(dimension, total, chunk_size=DEFAULT_CHUNK_SIZE):
+    """ Enumerates the vectors of `dimension` non-negative integers that
+    add up to `total`, in descending lexicographic order.
+
+    Each vector is computed directly from its rank in the enumeration,
+    so that the lattice is streamed in chunks of consecutive vectors
+    without ever being held in memory as a whole.
+
+    Parameters
+    ----------
+    dimension: int
+        Number of entries of each vector
+    total: int
+        Sum of the entries of each vector
+    chunk_size: int
+        Maximum number of vectors of each chunk
+
+    Yields
+    ------
+    chunk: numpy.ndarray
+        Array of shape (n_vectors, dimension) of consecutive vectors. The
+        data type is int64, or Python integers for lattices whose size
+        does not fit in 64 bits.
+    """
+    size = binomial(total + dimension - 1, dimension - 1)
+    dtype = np.int64 if size < 2 ** 62 else object
+
+    # For each entry but the last, the number of vectors whose later
+    # entries add up to at most t, for t in [0, total]
+    cumulative_counts = [
+        np.array(
+            [binomial(t + n_later, n_later) for t in range(total + 1)],
+            dtype=dtype,
+        )
+        for n_later in range(dimension - 1, 0, -1)
+    ]
+
+    for start in range(0, size, chunk_size):
+        stop = min(start + chunk_size, size)
+        if dtype is object:
+            ranks = np.array(range(start, stop), dtype=object)
+        else:
+            ranks = np.arange(start, stop, dtype=dtype)
+
+        chunk = np.empty((stop - start, dimension), dtype=dtype)
+        remaining = np.full(stop - start, total, dtype=dtype)
+        for entry, counts in enumerate(cumulative_counts):
+            # The amount left for the later entries is the smallest one
+            # whose count of vectors exceeds the rank
+            later_total = np.searchsorted(counts, ranks, side="right")
+            ranks = ranks - np.where(
+                later_total > 0, counts[later_total - 1], 0
+            )
+            chunk[:, entry] = remaining - later_total
+            remaining = later_total.astype(dtype)
+        chunk[:, dimension - 1] = remaining
+        yield chunk
 
 
 class SpaceSampler(ABCHasStrictTraits):
@@ -88,6 +161,13 @@ class DirichletSpaceSampler(SpaceSampler):
     #: Dirichlet distribution parameter
     alpha = ListFloat()
 
+    #: Seed of the random number generator. If None, the global NumPy
+    #: random number generator is used.
+    seed = Either(None, Int)
+
+    #: Maximum number of sample vectors generated at once
+    chunk_size = PositiveInt(DEFAULT_CHUNK_SIZE)
+
     #: Distribution generation function
     _distribution_function = np.random.dirichlet
 
@@ -102,9 +182,23 @@ class DirichletSpaceSampler(SpaceSampler):
         self.alpha = [_centering_coef] * self.dimension
 
     def generate_space_sample(self):
+        for chunk in self.generate_space_sample_chunks():
+            yield from chunk.tolist()
+
+    def generate_space_sample_chunks(self):
+        """ Draws all the sample vectors, as the rows of arrays of at
+        most `chunk_size` vectors.
+
+        Yields
+        ------
+        chunk: numpy.ndarray
+            Array of shape (n_vectors, dimension) of sample vectors
+        """
         n_points = resolution_to_sample_size(self.dimension, self.resolution)
-        for _ in range(n_points):
-            yield self._get_sample_point()
+        random_state = _random_state(self.seed)
+        for start in range(0, n_points, self.chunk_size):
+            size = min(self.chunk_size, n_points - start)
+            yield random_state.dirichlet(self.alpha, size)
 
     def _get_sample_point(self):
         return self._distribution_function(self.alpha).tolist()
@@ -131,15 +225,20 @@ class UniformSpaceSampler(SpaceSampler):
     #: Controls whether zero entries can appear in sample vector
     with_zero_values = Bool(False)
 
+    #: Maximum number of sample vectors generated at once
+    chunk_size = PositiveInt(DEFAULT_CHUNK_SIZE)
+
     def generate_space_sample(self, **kwargs):
         yield from self._get_sample_point()
 
-    def _get_sample_point(self):
-        """
+    def generate_space_sample_chunks(self):
+        """ Generates all the sample vectors, as the rows of arrays of at
+        most `chunk_size` vectors.
+
         Yields
-        ----------
-            Yields all the possible combinations satisfying the requirement
-            that the sum of all the weights must always be 1.0
+        ------
+        chunk: numpy.ndarray
+            Array of shape (n_vectors, dimension) of sample vectors
         """
         n_combinations = self.resolution
         if not self.with_zero_values:
@@ -148,35 +247,307 @@ class UniformSpaceSampler(SpaceSampler):
         # If we are only returning one weight combination, it must
         # equal 1.0 since the weights are all normalised. No zero
         # values will be allowed in this case.
-        try:
-            scaling = 1.0 / (n_combinations - 1)
-        except ZeroDivisionError:
-            yield [1.0]
+        if n_combinations == 1:
+            yield np.ones((1, 1))
+            return
 
-        else:
-            for int_w in self._int_weights():
-                yield [scaling * val for val in int_w]
+        scaling = 1.0 / (n_combinations - 1)
+        for int_weights in self._int_weight_chunks():
+            yield scaling * int_weights.astype(float)
+
+    def _get_sample_point(self):
+        """
+        Yields
+        ----------
+            Yields all the possible combinations satisfying the requirement
+            that the sum of all the weights must always be 1.0
+        """
+        for chunk in self.generate_space_sample_chunks():
+            yield from chunk.tolist()
+
+    def _int_weight_chunks(self):
+        """Helper routine for the `generate_space_sample_chunks`. Generates
+        integer value vectors, whose l1-norm equals the number of
+        divisions, in chunks."""
+        # Vectors without zero values are the vectors with zero values
+        # of a smaller l1-norm, plus one
+        offset = 0 if self.with_zero_values else 1
+        for chunk in simplex_lattice_chunks(
+                self.dimension, self.resolution - 1, self.chunk_size):
+            yield chunk + offset
+
+    def _int_weights(self):
+        """Generates integer values vectors, whose l1-norm equal the
+        number of divisions."""
+        for chunk in self._int_weight_chunks():
+            yield from chunk.tolist()
+
+
+class QuasiRandomSpaceSampler(SpaceSampler):
+    """ Base class for the samplers of low-discrepancy points of the unit
+    hypercube, mapped onto the simplex of the weight vectors.
+
+    A point of the (dimension - 1)-hypercube is mapped to the spacings
+    between its sorted coordinates, which is a uniform mapping onto the
+    simplex. Sequences of low discrepancy, which fill the hypercube more
+    evenly than independent random points, then give a better coverage
+    of the simplex with the same number of samples.
+    """
+
+    #: Number of sample vectors. If None, the number of vectors of a
+    #: UniformSpaceSampler with the same dimension and resolution.
+    n_samples = Either(None, PositiveInt)
+
+    #: Randomize the points of the sequence, which otherwise are
+    #: deterministic
+    scramble = Bool(True)
+
+    #: Seed of the randomization. If None, the randomization differs at
+    #: every generation.
+    seed = Either(None, Int)
+
+    #: Maximum number of sample vectors generated at once
+    chunk_size = PositiveInt(DEFAULT_CHUNK_SIZE)
+
+    def generate_space_sample(self, **kwargs):
+        yield from self._get_sample_point()
+
+    def generate_space_sample_chunks(self):
+        """ Generates all the sample vectors, as the rows of arrays of at
+        most `chunk_size` vectors.
 
-    def _int_weights(self, resolution=None, dimension=None):
-        """Helper routine for the `_get_sample_point`. Generates integer values
-        vectors, whose l1-norm equal `resolution`."""
+        Yields
+        ------
+        chunk: numpy.ndarray
+            Array of shape (n_vectors, dimension) of sample vectors
+        """
+        n_samples = self.n_samples
+        if n_samples is None:
+            n_samples = resolution_to_sample_size(
+                self.dimension, self.resolution)
+
+        random_state = np.random.RandomState(self.seed)
+        points = self._unit_cube_points(n_samples, random_state)
+        for start in range(0, n_samples, self.chunk_size):
+            yield unit_cube_to_simplex(points[start:start + self.chunk_size])
+
+    def _get_sample_point(self):
+        """
+        Yields
+        ----------
+            Yields the sample vectors, whose entries add up to 1.0
+        """
+        for chunk in self.generate_space_sample_chunks():
+            yield from chunk.tolist()
+
+    @abc.abstractmethod
+    def _unit_cube_points(self, n_samples, random_state):
+        """ Returns `n_samples` points of the (dimension - 1)-hypercube
+        as the rows of an array, using `random_state` to randomize them.
+        """
+
+
+class SobolSpaceSampler(QuasiRandomSpaceSampler):
+    """ Samples the simplex with the Sobol' sequence [1], using the
+    direction numbers of Joe and Kuo [2]. When scrambled, a random
+    digital shift is applied to the sequence. Supports up to 22
+    dimensions.
+
+    The sequence is best balanced when the number of samples is a power
+    of two.
+
+    References
+    -------
+    [1] I. M. Sobol', "On the distribution of points in a cube and the
+    approximate evaluation of integrals", USSR Computational Mathematics
+    and Mathematical Physics, vol. 7, pp. 86-112, 1967
+    [2] S. Joe and F. Y. Kuo, "Constructing Sobol sequences with better
+    two-dimensional projections", SIAM Journal on Scientific Computing,
+    vol. 30, pp. 2635-2654, 2008
+    """
+
+    def _unit_cube_points(self, n_samples, random_state):
+        cube_dimension = self.dimension - 1
+        if cube_dimension > len(SOBOL_DIRECTION_NUMBERS) + 1:
+            raise ValueError(
+                "The Sobol' sampler supports up to {} dimensions".format(
+                    len(SOBOL_DIRECTION_NUMBERS) + 2)
+            )
+        directions = _sobol_directions(cube_dimension)
+
+        # The gray code of the index selects the direction numbers to
+        # combine for each point
+        indices = np.arange(n_samples, dtype=np.uint64)
+        gray_codes = indices ^ (indices >> np.uint64(1))
+        integers = np.zeros((n_samples, cube_dimension), dtype=np.uint64)
+        for bit in range(SOBOL_BITS):
+            selected = ((gray_codes >> np.uint64(bit)) & np.uint64(1)) == 1
+            integers[selected] ^= directions[:, bit]
+
+        if self.scramble:
+            integers ^= random_state.randint(
+                0, 2 ** SOBOL_BITS, size=cube_dimension, dtype=np.uint64)
+        return integers / float(2 ** SOBOL_BITS)
+
+
+class HaltonSpaceSampler(QuasiRandomSpaceSampler):
+    """ Samples the simplex with the Halton sequence [1], whose
+    coordinates are the radical inverses of the sample index in the
+    successive prime bases. When scrambled, the sequence is shifted by a
+    random vector, modulo 1.
 
-        if dimension is None:
-            dimension = self.dimension
+    References
+    -------
+    [1] J. H. Halton, "On the efficiency of certain quasi-random sequences
+    of points in evaluating multi-dimensional integrals", Numerische
+    Mathematik, vol. 2, pp. 84-90, 1960
+    """
 
-        if resolution is None:
-            resolution = self.resolution
+    def _unit_cube_points(self, n_samples, random_state):
+        cube_dimension = self.dimension - 1
+        points = np.empty((n_samples, cube_dimension))
+        for axis, base in enumerate(_primes(cube_dimension)):
+            points[:, axis] = _radical_inverse(np.arange(n_samples), base)
 
-            if not self.with_zero_values:
-                resolution += dimension
+        if self.scramble:
+            points = (points + random_state.random_sample(cube_dimension)) % 1
+        return points
+
+
+class LatinHypercubeSpaceSampler(QuasiRandomSpaceSampler):
+    """ Samples the simplex with a Latin hypercube design [1]: each axis
+    of the hypercube is divided in as many strata as samples, and every
+    stratum holds exactly one sample. Samples lie at the center of their
+    strata, unless scrambled.
+
+    References
+    -------
+    [1] M. D. McKay, R. J. Beckman and W. J. Conover, "A comparison of
+    three methods for selecting values of input variables in the analysis
+    of output from a computer code", Technometrics, vol. 21, pp. 239-245,
+    1979
+    """
 
-        if dimension == 1:
-            yield [resolution - 1]
+    def _unit_cube_points(self, n_samples, random_state):
+        cube_dimension = self.dimension - 1
+        strata = np.empty((n_samples, cube_dimension))
+        for axis in range(cube_dimension):
+            strata[:, axis] = random_state.permutation(n_samples)
+        if self.scramble:
+            offsets = random_state.random_sample(strata.shape)
         else:
-            if self.with_zero_values:
-                integers = np.arange(resolution - 1, -1, -1)
-            else:
-                integers = np.arange(resolution - 2, 0, -1)
-            for i in integers:
-                for entry in self._int_weights(resolution - i, dimension - 1):
-                    yield [i] + entry
+            offsets = 0.5
+        return (strata + offsets) / n_samples
+
+
+def unit_cube_to_simplex(points):
+    """ Maps points of the unit hypercube onto the simplex of the vectors
+    of non-negative entries that add up to 1, uniformly.
+
+    Parameters
+    ----------
+    points: numpy.ndarray
+        Array of shape (n_points, dimension - 1) of points in [0, 1]
+
+    Returns
+    -------
+    vectors: numpy.ndarray
+        Array of shape (n_points, dimension) of the spacings between the
+        sorted coordinates of each point, 0 and 1
+    """
+    points = np.sort(points, axis=1)
+    n_points = len(points)
+    bounded = np.hstack(
+        [np.zeros((n_points, 1)), points, np.ones((n_points, 1))]
+    )
+    return np.diff(bounded, axis=1)
+
+
+#: Number of bits of the integers of the Sobol' sequence
+SOBOL_BITS = 32
+
+#: Primitive polynomials (including their leading and trailing
+#: coefficients) and initial direction numbers of the Sobol' sequence,
+#: for all axes but the first, from the new-joe-kuo-6.21201 table
+SOBOL_DIRECTION_NUMBERS = [
+    (3, [1]),
+    (7, [1, 3]),
+    (11, [1, 3, 1]),
+    (13, [1, 1, 1]),
+    (19, [1, 1, 3, 3]),
+    (25, [1, 3, 5, 13]),
+    (37, [1, 1, 5, 5, 17]),
+    (41, [1, 1, 5, 5, 5]),
+    (47, [1, 1, 7, 11, 19]),
+    (55, [1, 1, 5, 1, 1]),
+    (59, [1, 1, 1, 3, 11]),
+    (61, [1, 3, 5, 5, 31]),
+    (67, [1, 3, 3, 9, 7, 49]),
+    (91, [1, 1, 1, 15, 21, 21]),
+    (97, [1, 3, 1, 13, 27, 49]),
+    (103, [1, 1, 1, 15, 7, 5]),
+    (109, [1, 3, 1, 15, 13, 25]),
+    (115, [1, 1, 5, 5, 19, 61]),
+    (131, [1, 3, 7, 11, 23, 15, 103]),
+    (137, [1, 3, 7, 13, 13, 15, 69]),
+]
+
+
+def _sobol_directions(cube_dimension):
+    """ Returns the direction numbers of the first `cube_dimension` axes
+    of the Sobol' sequence, as an array of shape
+    (cube_dimension, SOBOL_BITS)."""
+    directions = np.zeros((cube_dimension, SOBOL_BITS), dtype=np.uint64)
+    if cube_dimension == 0:
+        return directions
+
+    # The first axis is the van der Corput sequence in base 2
+    directions[0] = [1 << (SOBOL_BITS - 1 - bit) for bit in range(SOBOL_BITS)]
+
+    for axis in range(1, cube_dimension):
+        polynomial, initial = SOBOL_DIRECTION_NUMBERS[axis - 1]
+        degree = polynomial.bit_length() - 1
+        numbers = list(initial)
+        for bit in range(degree, SOBOL_BITS):
+            number = numbers[bit - degree] ^ (numbers[bit - degree] << degree)
+            for term in range(1, degree):
+                if (polynomial >> (degree - term)) & 1:
+                    number ^= numbers[bit - term] << term
+            numbers.append(number)
+        directions[axis] = [
+            number << (SOBOL_BITS - 1 - bit)
+            for bit, number in enumerate(numbers)
+        ]
+    return directions
+
+
+def _primes(n_primes):
+    """ Returns the first `n_primes` prime numbers."""
+    primes = []
+    candidate = 2
+    while len(primes) < n_primes:
+        if all(candidate % prime for prime in primes):
+            primes.append(candidate)
+        candidate += 1
+    return primes
+
+
+def _radical_inverse(indices, base):
+    """ Returns the radical inverses of the integer `indices` in `base`,
+    obtained by mirroring their digits around the radix point."""
+    indices = np.array(indices, dtype=np.int64)
+    inverses = np.zeros(len(indices))
+    scale = 1.0 / base
+    while np.any(indices > 0):
+        inverses += (indices % base) * scale
+        indices //= base
+        scale /= base
+    return inverses
+
+
+def _random_state(seed):
+    """ Returns a random number generator seeded with `seed`, or the
+    global NumPy random number generator if `seed` is None."""
+    if seed is None:
+        return np.random
+    return np.random.RandomState(seed)
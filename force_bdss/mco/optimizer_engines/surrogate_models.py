@@ -0,0 +1,268 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+import abc
+import logging
+
+import numpy as np
+from scipy import linalg, optimize, stats
+from traits.api import ABCHasStrictTraits, Any, Bool, Float
+
+log = logging.getLogger(__name__)
+
+
+class BaseSurrogateModel(ABCHasStrictTraits):
+    """ Regression model of an expensive scalar objective function,
+    fitted to the values it took at evaluated points. The model predicts
+    the objective at new points, along with an estimate of the
+    uncertainty of the prediction.
+
+    Points are expected to be scaled to the unit hypercube.
+    """
+
+    @abc.abstractmethod
+    def fit(self, points, values):
+        """ Fits the model to the objective `values` at the `points`.
+
+        Parameters
+        ----------
+        points: numpy.ndarray
+            N x D array of the evaluated points
+        values: numpy.ndarray
+            Array of the N objective values at the points
+        """
+
+    @abc.abstractmethod
+    def predict(self, points):
+        """ Predicts the objective at `points`.
+
+        Parameters
+        ----------
+        points: numpy.ndarray
+            M x D array of the points
+
+        Returns
+        -------
+        mean: numpy.ndarray
+            The M predicted objective values
+        std: numpy.ndarray
+            The M standard deviations of the predictions
+        """
+
+
+class GaussianProcessSurrogate(BaseSurrogateModel):
+    """ Gaussian process regression with a Matern 5/2 kernel, whose
+    length scales along each axis are fitted by maximizing the marginal
+    likelihood of the evaluated values.
+    """
+
+    #: Variance of the evaluation noise, relative to the variance of the
+    #: values. A small value regularizes the kernel matrix.
+    noise = Float(1e-6)
+
+    #: Bounds of the length scales of the kernel
+    length_scale_bounds = Any((1e-2, 1e1))
+
+    #: Fit the length scales at every `fit`, rather than keeping the
+    #: current ones
+    optimize_length_scales = Bool(True)
+
+    #: Length scales of the kernel along each axis
+    length_scales = Any()
+
+    #: Fitted points, Cholesky factor of their kernel matrix, weights of
+    #: the kernel functions and signal variance
+    _points = Any()
+    _cholesky = Any()
+    _alpha = Any()
+    _signal_variance = Float(1.0)
+
+    #: Mean and scale of the fitted values
+    _offset = Float(0.0)
+    _scale = Float(1.0)
+
+    def fit(self, points, values):
+        points = np.asarray(points, dtype=float)
+        values, self._offset, self._scale = _standardize(values)
+
+        if (self.length_scales is None
+                or len(self.length_scales) != points.shape[1]):
+            self.length_scales = np.full(points.shape[1], 0.5)
+        if self.optimize_length_scales and len(points) > 1:
+            self.length_scales = self._fit_length_scales(points, values)
+
+        self._points = points
+        self._cholesky, self._alpha, self._signal_variance = (
+            self._factorize(points, values, self.length_scales)
+        )
+
+    def predict(self, points):
+        points = np.asarray(points, dtype=float)
+        kernel = _matern52(points, self._points, self.length_scales)
+        mean = kernel @ self._alpha
+        reduction = linalg.solve_triangular(
+            self._cholesky, kernel.T, lower=True)
+        variance = self._signal_variance * np.clip(
+            1.0 - (reduction ** 2).sum(axis=0), 0.0, None)
+        return (
+            mean * self._scale + self._offset,
+            np.sqrt(variance) * self._scale,
+        )
+
+    def _factorize(self, points, values, length_scales):
+        """ Returns the Cholesky factor of the kernel matrix, the weights
+        of the kernel functions and the maximum likelihood estimate of
+        the signal variance."""
+        kernel = _matern52(points, points, length_scales)
+        kernel[np.diag_indices_from(kernel)] += self.noise
+        cholesky = linalg.cholesky(kernel, lower=True)
+        alpha = linalg.cho_solve((cholesky, True), values)
+        signal_variance = max(values @ alpha / len(values), 1e-12)
+        return cholesky, alpha, signal_variance
+
+    def _negative_log_likelihood(self, log_length_scales, points, values):
+        """ Negative marginal log likelihood of the values, with the
+        signal variance at its maximum likelihood estimate."""
+        try:
+            cholesky, _, signal_variance = self._factorize(
+                points, values, np.exp(log_length_scales))
+        except linalg.LinAlgError:
+            return 1e25
+        return (
+            0.5 * len(values) * np.log(signal_variance)
+            + np.log(np.diag(cholesky)).sum()
+        )
+
+    def _fit_length_scales(self, points, values):
+        lower, upper = np.log(self.length_scale_bounds)
+        result = optimize.minimize(
+            self._negative_log_likelihood,
+            np.clip(np.log(self.length_scales), lower, upper),
+            args=(points, values),
+            method="L-BFGS-B",
+            bounds=[(lower, upper)] * points.shape[1],
+        )
+        return np.exp(result.x)
+
+
+class RBFSurrogate(BaseSurrogateModel):
+    """ Cubic radial basis function interpolation with a linear
+    polynomial tail.
+
+    Interpolation carries no statistical uncertainty, so the standard
+    deviation of a prediction is taken as the distance to the nearest
+    evaluated point, times the spread of the values. It vanishes at the
+    evaluated points and grows away from them, which lets acquisition
+    functions balance the predicted value against the exploration of
+    the space.
+    """
+
+    #: Smoothing of the interpolation. Zero interpolates the values
+    #: exactly.
+    smoothing = Float(0.0)
+
+    #: Fitted points, and weights of the basis functions and of the
+    #: polynomial tail
+    _points = Any()
+    _weights = Any()
+    _coefficients = Any()
+
+    #: Mean and scale of the fitted values
+    _offset = Float(0.0)
+    _scale = Float(1.0)
+
+    def fit(self, points, values):
+        points = np.asarray(points, dtype=float)
+        values, self._offset, self._scale = _standardize(values)
+        n_points, dimension = points.shape
+
+        basis = _distances(points, points) ** 3
+        basis[np.diag_indices_from(basis)] += self.smoothing
+        tail = np.hstack([np.ones((n_points, 1)), points])
+        system = np.block([
+            [basis, tail],
+            [tail.T, np.zeros((dimension + 1, dimension + 1))],
+        ])
+        right_hand_side = np.concatenate([values, np.zeros(dimension + 1)])
+        solution = np.linalg.lstsq(system, right_hand_side, rcond=None)[0]
+
+        self._points = points
+        self._weights = solution[:n_points]
+        self._coefficients = solution[n_points:]
+
+    def predict(self, points):
+        points = np.asarray(points, dtype=float)
+        distances = _distances(points, self._points)
+        mean = (
+            (distances ** 3) @ self._weights
+            + self._coefficients[0]
+            + points @ self._coefficients[1:]
+        )
+        return (
+            mean * self._scale + self._offset,
+            distances.min(axis=1) * self._scale,
+        )
+
+
+#: Surrogate models available to the SurrogateOptimizerEngine, by name
+SURROGATE_MODELS = {
+    "GaussianProcess": GaussianProcessSurrogate,
+    "RBF": RBFSurrogate,
+}
+
+
+def expected_improvement(mean, std, best):
+    """ Returns the expected improvement of a minimization over the
+    `best` value found so far, for predictions of normal distribution.
+
+    Parameters
+    ----------
+    mean: numpy.ndarray
+        The predicted objective values
+    std: numpy.ndarray
+        The standard deviations of the predictions
+    best: float
+        The lowest objective value found so far
+
+    Returns
+    -------
+    improvement: numpy.ndarray
+        The expected improvement, which is larger for better points
+    """
+    mean = np.asarray(mean, dtype=float)
+    std = np.maximum(np.asarray(std, dtype=float), 1e-12)
+    z = (best - mean) / std
+    return (best - mean) * stats.norm.cdf(z) + std * stats.norm.pdf(z)
+
+
+def lower_confidence_bound(mean, std, exploration_weight):
+    """ Returns the opposite of the lower confidence bound of a
+    minimization, `mean - exploration_weight * std`, so that, like the
+    expected improvement, it is larger for better points."""
+    return exploration_weight * np.asarray(std) - np.asarray(mean)
+
+
+def _standardize(values):
+    """ Returns the values with zero mean and unit variance, along with
+    their mean and scale."""
+    values = np.asarray(values, dtype=float)
+    offset = values.mean()
+    scale = values.std()
+    if scale == 0.0:
+        scale = 1.0
+    return (values - offset) / scale, offset, scale
+
+
+def _distances(first, second):
+    """ Returns the Euclidean distances between the rows of `first` and
+    `second`."""
+    differences = first[:, None, :] - second[None, :, :]
+    return np.sqrt((differences ** 2).sum(axis=2))
+
+
+def _matern52(first, second, length_scales):
+    """ Returns the Matern 5/2 kernel between the rows of `first` and
+    `second`, with unit variance."""
+    r = _distances(first / length_scales, second / length_scales)
+    sqrt5_r = np.sqrt(5.0) * r
+    return (1.0 + sqrt5_r + sqrt5_r ** 2 / 3.0) * np.exp(-sqrt5_r)
@@ -0,0 +1,346 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+import logging
+import time
+
+import numpy as np
+from scipy import optimize as scipy_optimize
+from traits.api import Either, Enum, Float, Int, List, Str
+
+from force_bdss.core.worker_pool import WORKER_POOL_MODES, create_worker_pool
+from force_bdss.local_traits import PositiveInt
+from force_bdss.mco.optimizer_engines.surrogate_models import (
+    SURROGATE_MODELS,
+    expected_improvement,
+    lower_confidence_bound,
+)
+from force_bdss.mco.optimizer_engines.utilities import (
+    kpi_score_bounds,
+    non_dominated_mask,
+)
+from force_bdss.mco.optimizers.scipy_optimizer import ScipyOptimizer
+from force_bdss.mco.parameters.mco_parameters import (
+    RangedMCOParameter,
+    RangedVectorMCOParameter,
+)
+
+from .base_optimizer_engine import BaseOptimizerEngine
+
+log = logging.getLogger(__name__)
+
+
+def augmented_chebyshev(scores, weights, rho=0.05):
+    """ Scalarizes normalized minimization `scores` with the augmented
+    Chebyshev function of ParEGO [1], whose minima with positive
+    `weights` span the whole Pareto front, including its non convex
+    parts.
+
+    Parameters
+    ----------
+    scores: numpy.ndarray
+        N x K array of normalized scores
+    weights: numpy.ndarray
+        The K weights of the scores
+    rho: float
+        Weight of the sum of the weighted scores, which discards the
+        weakly Pareto-efficient points
+
+    Returns
+    -------
+    values: numpy.ndarray
+        The N scalarized scores
+
+    References
+    ----------
+    [1] J. Knowles, "ParEGO: A Hybrid Algorithm With On-Line Landscape
+    Approximation for Expensive Multiobjective Optimization Problems",
+    IEEE Transactions on Evolutionary Computation, vol. 10, pp. 50-66,
+    2006
+    """
+    weighted = np.asarray(scores) * np.asarray(weights)
+    return weighted.max(axis=1) + rho * weighted.sum(axis=1)
+
+
+class SurrogateOptimizerEngine(BaseOptimizerEngine):
+    """ Surrogate-assisted multi-objective optimization, for workflows
+    whose evaluations are expensive.
+
+    Notes
+    -----
+    The KPIs are evaluated on an initial Latin hypercube design of the
+    parameter space. Then, at every iteration, a batch of new points is
+    proposed by the ParEGO method: for each point of the batch, random
+    weights scalarize the normalized KPI scores with the augmented
+    Chebyshev function, a surrogate model is fitted to the scalarized
+    scores of the evaluation archive, and its acquisition function is
+    maximized. The KPIs of the batch are evaluated concurrently, until
+    `max_evaluations`, the `evaluation_budget` or the `time_limit` is
+    reached.
+
+    Only Ranged and RangedVector parameters are supported. The KPI
+    scores are normalized by the `kpi_bounds` of the KPIs that use
+    bounds, and by the range of their evaluated values otherwise.
+    """
+
+    #: Optimizer name
+    name = Str("Surrogate_Optimizer")
+
+    #: Surrogate model of the scalarized KPI scores
+    surrogate_model = Enum(*sorted(SURROGATE_MODELS))
+
+    #: Acquisition function, maximized to propose new points
+    acquisition_function = Enum(
+        "ExpectedImprovement", "LowerConfidenceBound"
+    )
+
+    #: Weight of the uncertainty of the surrogate in the lower confidence
+    #: bound
+    exploration_weight = Float(2.0)
+
+    #: Number of KPI evaluations of the optimization
+    max_evaluations = PositiveInt(50)
+
+    #: Number of points of the initial design, including the initial
+    #: parameter values. If None, twice the number of parameter values
+    #: plus one.
+    n_initial_points = Either(None, PositiveInt)
+
+    #: Number of points proposed and evaluated at every iteration
+    batch_size = PositiveInt(4)
+
+    #: Number of random points where the acquisition function is
+    #: evaluated, before refining the best of them
+    n_candidates = PositiveInt(1000)
+
+    #: Seed of the initial design, weights and candidate points. If None,
+    #: they differ at every optimization.
+    seed = Either(None, Int)
+
+    #: Concurrency backend evaluating the KPIs of a batch. In "Process"
+    #: mode, the evaluator must be picklable.
+    concurrency_mode = Enum(*WORKER_POOL_MODES)
+
+    #: Maximum number of workers evaluating the KPIs. If None, the
+    #: default of the concurrent.futures executor is used.
+    max_workers = Either(None, PositiveInt)
+
+    #: Time spent fitting the surrogate models at each iteration of the
+    #: last `optimize` call, in seconds
+    fit_times = List(Float, visible=False, transient=True)
+
+    def optimize(self, **kwargs):
+        """ Generates optimization results.
+
+        Yields
+        ----------
+        optimization result: tuple(list, list)
+            MCO parameter and KPI values of each evaluated point if
+            `verbose_run`, or else of the Pareto-efficient points, once
+            the optimization has finished
+        """
+        for parameter in self.parameters:
+            if not isinstance(
+                    parameter,
+                    (RangedMCOParameter, RangedVectorMCOParameter)):
+                raise TypeError(
+                    "The SurrogateOptimizerEngine only supports Ranged "
+                    "and RangedVector parameters"
+                )
+
+        self.evaluation_archive.clear()
+        self.start_budget()
+        self.restore_evaluations()
+        self.fit_times = []
+        random_state = np.random.RandomState(self.seed)
+        lower, upper = self._flat_parameter_bounds()
+
+        n_initial_points = self.n_initial_points
+        if n_initial_points is None:
+            n_initial_points = 2 * len(lower) + 1
+        n_initial_points = min(
+            n_initial_points, self._evaluations_left(0))
+        unit_points = self._initial_design(
+            n_initial_points, lower, upper, random_state)
+
+        evaluated_points = np.empty((0, len(lower)))
+        points, kpis = [], []
+        worker_pool = create_worker_pool(
+            self.concurrency_mode, self.max_workers)
+        try:
+            while True:
+                batch = [
+                    ScipyOptimizer.translate_array_to_mco(
+                        lower + unit_point * (upper - lower),
+                        self.parameters)
+                    for unit_point in unit_points
+                ]
+                batch_kpis = self._evaluate_batch(batch, worker_pool)
+                evaluated_points = np.vstack([evaluated_points, unit_points])
+                points.extend(batch)
+                kpis.extend(batch_kpis)
+                if self.verbose_run:
+                    yield from zip(batch, batch_kpis)
+
+                n_points = min(
+                    self.batch_size, self._evaluations_left(len(points)))
+                if n_points <= 0:
+                    break
+                scores = np.array([
+                    self._minimization_score(kpi_values)
+                    for kpi_values in kpis
+                ])
+                unit_points = self._propose_batch(
+                    evaluated_points, scores, n_points, random_state)
+        finally:
+            if worker_pool is not None:
+                worker_pool.shutdown()
+
+        if not self.verbose_run:
+            scores = np.array([
+                self._minimization_score(kpi_values) for kpi_values in kpis
+            ])
+            for index in np.flatnonzero(non_dominated_mask(scores)):
+                yield points[index], kpis[index]
+
+    def surrogate_statistics(self):
+        """ Returns the number of KPI evaluations and the time spent
+        fitting the surrogate models during the last `optimize` call.
+
+        Returns
+        -------
+        statistics: dict
+            The number of "evaluations", and the "surrogate_fit_time" in
+            seconds
+        """
+        return {
+            "evaluations": len(self.evaluation_archive),
+            "surrogate_fit_time": float(np.sum(self.fit_times)),
+        }
+
+    def _evaluations_left(self, n_evaluated):
+        """ Returns the number of points that can still be evaluated,
+        within both the `max_evaluations` of the optimization and the
+        budget of the engine, given the `n_evaluated` points."""
+        if self.budget_exhausted():
+            return 0
+        n_points = self.max_evaluations - n_evaluated
+        remaining = self.remaining_evaluations()
+        if remaining is not None:
+            n_points = min(n_points, remaining)
+        return n_points
+
+    def _flat_parameter_bounds(self):
+        """ Returns the lower and upper bounds of the flattened parameter
+        values."""
+        lower, upper = [], []
+        for lower_bound, upper_bound in self.parameter_bounds:
+            lower.extend(np.ravel(lower_bound))
+            upper.extend(np.ravel(upper_bound))
+        return np.array(lower, dtype=float), np.array(upper, dtype=float)
+
+    def _initial_design(self, n_points, lower, upper, random_state):
+        """ Returns the initial parameter values, scaled to the unit
+        hypercube, followed by a Latin hypercube design of the other
+        points."""
+        initial_point, _ = ScipyOptimizer.get_initial_and_bounds(
+            self.parameters)
+        width = np.where(upper > lower, upper - lower, 1.0)
+        design = [np.clip((initial_point - lower) / width, 0.0, 1.0)]
+
+        n_points -= 1
+        if n_points > 0:
+            strata = np.array([
+                random_state.permutation(n_points) for _ in lower
+            ]).T
+            design.extend(
+                (strata + random_state.random_sample(strata.shape))
+                / n_points
+            )
+        return np.array(design)
+
+    def _normalized_scores(self, scores):
+        """ Returns the minimization `scores` scaled to the unit range of
+        the KPI bounds, for KPIs that use bounds, or else of the scores.
+        """
+        lower, upper = kpi_score_bounds(self.kpis)
+        lowest = np.where(np.isnan(lower), scores.min(axis=0), lower)
+        highest = np.where(np.isnan(upper), scores.max(axis=0), upper)
+        spread = np.where(highest > lowest, highest - lowest, 1.0)
+        return (scores - lowest) / spread
+
+    def _propose_batch(self, evaluated_points, scores, n_points,
+                       random_state):
+        """ Proposes `n_points` new points in the unit hypercube, each one
+        maximizing the acquisition function of a surrogate model of the
+        scores scalarized with random weights."""
+        normalized_scores = self._normalized_scores(scores)
+        dimension = evaluated_points.shape[1]
+        min_distance = 1e-6 * np.sqrt(dimension)
+
+        batch = []
+        fit_time = 0.0
+        for _ in range(n_points):
+            weights = random_state.dirichlet(
+                np.ones(normalized_scores.shape[1]))
+            values = augmented_chebyshev(normalized_scores, weights)
+
+            model = SURROGATE_MODELS[self.surrogate_model]()
+            start = time.perf_counter()
+            model.fit(evaluated_points, values)
+            fit_time += time.perf_counter() - start
+
+            known_points = np.vstack([evaluated_points] + batch)
+            batch.append(self._maximize_acquisition(
+                model, values.min(), known_points, min_distance,
+                random_state))
+
+        self.fit_times.append(fit_time)
+        log.info(
+            "Fitted {} surrogate models of {} points in {:.3f} s".format(
+                n_points, len(evaluated_points), fit_time)
+        )
+        return np.array(batch)
+
+    def _acquisition(self, model, points, best):
+        """ Returns the acquisition function of the surrogate `model` at
+        the `points`, which is larger for better points."""
+        mean, std = model.predict(points)
+        if self.acquisition_function == "ExpectedImprovement":
+            return expected_improvement(mean, std, best)
+        return lower_confidence_bound(mean, std, self.exploration_weight)
+
+    def _maximize_acquisition(self, model, best, known_points, min_distance,
+                              random_state):
+        """ Returns the point of the unit hypercube maximizing the
+        acquisition function, which is at least `min_distance` away from
+        the `known_points`. The best of `n_candidates` random points is
+        refined by a bounded local optimization."""
+        dimension = known_points.shape[1]
+        candidates = random_state.random_sample(
+            (self.n_candidates, dimension))
+        acquisition = self._acquisition(model, candidates, best)
+        acquisition[
+            self._distance_to(candidates, known_points) < min_distance
+        ] = -np.inf
+        candidate = candidates[np.argmax(acquisition)]
+
+        result = scipy_optimize.minimize(
+            lambda x: -self._acquisition(model, x[None, :], best)[0],
+            candidate,
+            method="L-BFGS-B",
+            bounds=[(0.0, 1.0)] * dimension,
+        )
+        refined = np.clip(result.x, 0.0, 1.0)
+        if (self._distance_to(refined[None, :], known_points)[0]
+                >= min_distance
+                and -result.fun >= acquisition.max()):
+            return refined
+        return candidate
+
+    @staticmethod
+    def _distance_to(points, known_points):
+        """ Returns the distance from each of the `points` to the nearest
+        of the `known_points`."""
+        differences = points[:, None, :] - known_points[None, :, :]
+        return np.sqrt((differences ** 2).sum(axis=2)).min(axis=1)
@@ -3,13 +3,44 @@
 
 from unittest import TestCase
 
-from force_bdss.api import RangedMCOParameterFactory
+from traits.api import HasStrictTraits, provides
+
+from force_bdss.api import KPISpecification, RangedMCOParameterFactory
 from force_bdss.tests.dummy_classes.mco import DummyMCOFactory
 from force_bdss.mco.optimizer_engines.aposteriori_optimizer_engine import (
     AposterioriOptimizerEngine
 )
-from force_bdss.tests.probe_classes.optimizer import ProbeOptimizer
-from force_bdss.tests.probe_classes.evaluator import ProbeEvaluator
+from force_bdss.mco.optimizers.i_optimizer import IOptimizer
+from force_bdss.tests.probe_classes.optimizer import (
+    ProbeAskTellOptimizer,
+    ProbeOptimizer,
+)
+from force_bdss.tests.probe_classes.evaluator import (
+    GaussProbeEvaluator,
+    ProbeEvaluator,
+)
+
+
+@provides(IOptimizer)
+class SweepProbeOptimizer(HasStrictTraits):
+    """Evaluates and yields each point of a line through the parameter
+    space"""
+
+    def optimize_function(self, func, params):
+        for value in [0.0, 0.5, 0.4, 0.1, 0.9, 0.45, 0.3]:
+            point = [value] * len(params)
+            func(point)
+            yield point
+
+
+@provides(IOptimizer)
+class FinalProbeOptimizer(SweepProbeOptimizer):
+    """Evaluates each point of a line through the parameter space, and
+    only yields the last one"""
+
+    def optimize_function(self, func, params):
+        points = list(super().optimize_function(func, params))
+        yield points[-1]
 
 
 class TestAposterioriEngine(TestCase):
@@ -37,7 +68,15 @@ class TestAposterioriEngine(TestCase):
         state = self.engine.__getstate__()
         self.assertDictEqual(
             {"name": "APosteriori_Optimizer",
-                "verbose_run": False},
+                "verbose_run": False,
+                "use_derivatives": False,
+                "evaluation_budget": None,
+                "time_limit": None,
+                "archive_tolerance": None,
+                "concurrency_mode": "Serial",
+                "max_workers": None,
+                "batch_size": None,
+                "pareto_filter": False},
             state,
         )
 
@@ -49,3 +88,79 @@ class TestAposterioriEngine(TestCase):
             self.assertEqual(len(self.parameters), len(point))
             self.assertEqual(2, len(kpis))
         self.assertEqual(n_points, 10)
+        # The point is scored 10 times, and its KPIs retrieved without
+        # counting the lookups again
+        self.assertEqual(9, self.engine.evaluation_archive.hits)
+        self.assertEqual(1, self.engine.evaluation_archive.misses)
+
+    def test_optimize_concurrent(self):
+        # Callback optimizers are adapted to the ask/tell protocol
+        self.engine.concurrency_mode = "Thread"
+        self.engine.max_workers = 2
+        results = list(self.engine.optimize())
+        self.assertEqual(10, len(results))
+        for point, kpis in results:
+            self.assertEqual([0.5] * 4, point)
+            self.assertEqual([1.0, 1.0], kpis)
+        self.assertEqual(1, len(self.engine.evaluation_archive))
+
+    def test_optimize_ask_tell(self):
+        self.engine.single_point_evaluator = GaussProbeEvaluator()
+        self.engine.kpis = [KPISpecification(), KPISpecification()]
+        for mode in ["Serial", "Thread"]:
+            self.engine.optimizer = ProbeAskTellOptimizer(n_points=7)
+            self.engine.concurrency_mode = mode
+            self.engine.batch_size = 3
+            results = list(self.engine.optimize())
+            self.assertEqual(1, len(results))
+            point, kpis = results[0]
+            self.assertAlmostEqual(0.5, point[0])
+            self.assertEqual(
+                list(GaussProbeEvaluator().evaluate(point)), list(kpis)
+            )
+            self.assertEqual(7, len(self.engine.evaluation_archive))
+
+    def test_optimize_pareto_filter(self):
+        self.engine.single_point_evaluator = GaussProbeEvaluator()
+        self.engine.kpis = [KPISpecification(), KPISpecification()]
+        self.engine.optimizer = SweepProbeOptimizer()
+        self.assertEqual(7, len(list(self.engine.optimize())))
+        self.assertEqual(0, len(self.engine.pareto_archive))
+
+        # Only the points entering the Pareto archive are yielded: 0.1
+        # is dominated by 0.4, 0.9 by 0.5, and 0.45 and 0.3 trade off
+        # with the archived points
+        self.engine.pareto_filter = True
+        points = [point[0] for point, _ in self.engine.optimize()]
+        self.assertEqual([0.0, 0.5, 0.4, 0.45, 0.3], points)
+        self.assertEqual(
+            [0.5, 0.4, 0.45, 0.3],
+            [point[0] for point, _ in self.engine.pareto_archive.items]
+        )
+
+    def test_optimize_evaluation_budget(self):
+        self.engine.single_point_evaluator = GaussProbeEvaluator()
+        self.engine.kpis = [KPISpecification(), KPISpecification()]
+        self.engine.evaluation_budget = 4
+
+        # The Pareto-efficient points among 0.0, 0.5, 0.4 and 0.1 are
+        # yielded when the budget is exhausted
+        self.engine.optimizer = FinalProbeOptimizer()
+        points = [point[0] for point, _ in self.engine.optimize()]
+        self.assertEqual([0.5, 0.4], points)
+        self.assertEqual(4, self.engine.evaluation_count)
+
+        # Points already yielded by the optimizer are not yielded again
+        self.engine.optimizer = SweepProbeOptimizer()
+        points = [point[0] for point, _ in self.engine.optimize()]
+        self.assertEqual([0.0, 0.5, 0.4, 0.1], points)
+
+        for mode in ["Serial", "Thread"]:
+            self.engine.optimizer = ProbeAskTellOptimizer(n_points=7)
+            self.engine.concurrency_mode = mode
+            self.engine.batch_size = 3
+            points = [point[0] for point, _ in self.engine.optimize()]
+            self.assertEqual(4, len(self.engine.evaluation_archive))
+            self.assertEqual(
+                [2 / 6, 3 / 6], sorted(points)
+            )
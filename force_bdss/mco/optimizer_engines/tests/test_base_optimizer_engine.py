@@ -1,13 +1,30 @@
 #  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
 #  All rights reserved.
 
-from unittest import TestCase
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase, mock
 
-from force_bdss.api import KPISpecification, RangedMCOParameterFactory
+import numpy as np
+
+from force_bdss.api import (
+    FixedMCOParameterFactory,
+    KPISpecification,
+    RangedMCOParameterFactory,
+    RangedVectorMCOParameterFactory,
+    Workflow,
+)
+from force_bdss.mco.optimizer_engines.base_optimizer_engine import (
+    EvaluationBudgetExhausted,
+)
 from force_bdss.tests.dummy_classes.mco import DummyMCOFactory
 from force_bdss.tests.dummy_classes.optimizer_engine import (
     DummyOptimizerEngine,
 )
+from force_bdss.tests.probe_classes.evaluator import (
+    DifferentiableGaussProbeEvaluator,
+    GaussProbeEvaluator,
+)
+from force_bdss.tests.probe_classes.optimizer import ProbeAskTellOptimizer
 from force_bdss.tests.probe_classes.workflow_file import ProbeWorkflowFile
 from force_bdss.tests import fixtures
 
@@ -34,11 +51,100 @@ class TestBaseOptimizerEngine(TestCase):
         kpi_values = self.workflow.evaluate(point)
         score = self.optimizer_engine._score(point)
 
-        self.assertDictEqual(
-            {(1.0,): kpi_values}, self.optimizer_engine._kpi_cache
-        )
+        archive = self.optimizer_engine.evaluation_archive
+        self.assertEqual(1, len(archive))
+        self.assertEqual(kpi_values, archive.get(point))
         self.assertEqual(0, score.size)
 
+    def test_score_archived_point(self):
+        self.optimizer_engine.kpis = [KPISpecification()]
+        self.optimizer_engine.cache_result([1.0], [2.0])
+        with mock.patch.object(
+                Workflow, "evaluate",
+                return_value=[3.0]) as mock_evaluate:
+            self.assertEqual([2.0], self.optimizer_engine._score([1.0]))
+            mock_evaluate.assert_not_called()
+
+            self.assertEqual([3.0], self.optimizer_engine._score([2.0]))
+            mock_evaluate.assert_called_once_with([2.0])
+
+        self.assertEqual(2, len(self.optimizer_engine.evaluation_archive))
+
+    def test_archive_tolerance(self):
+        self.optimizer_engine.kpis = [KPISpecification()]
+        self.optimizer_engine.parameters = [
+            RangedMCOParameterFactory(self.factory).create_model(
+                {"lower_bound": 0.0, "upper_bound": 10.0}
+            ),
+            RangedVectorMCOParameterFactory(self.factory).create_model(
+                {"dimension": 2, "lower_bound": [0.0, -1.0],
+                 "upper_bound": [1.0, 1.0]}
+            ),
+            FixedMCOParameterFactory(self.factory).create_model(),
+        ]
+        archive = self.optimizer_engine.evaluation_archive
+        self.assertIsNone(self.optimizer_engine.archive_tolerances())
+        self.assertIsNone(archive.tolerances)
+
+        self.optimizer_engine.archive_tolerance = 1e-6
+        np.testing.assert_allclose(
+            [1e-5, 1e-6, 2e-6, 0.0],
+            self.optimizer_engine.archive_tolerances()
+        )
+        np.testing.assert_allclose(
+            [1e-5, 1e-6, 2e-6, 0.0], archive.tolerances
+        )
+
+        # The tolerances follow the bounds of the parameters
+        self.optimizer_engine.parameters[0].upper_bound = 20.0
+        np.testing.assert_allclose(
+            [2e-5, 1e-6, 2e-6, 0.0], archive.tolerances
+        )
+
+        # Points within the tolerances of an evaluated point are not
+        # evaluated
+        self.optimizer_engine.cache_result([1.0, [0.5, 0.5], 1], [2.0])
+        with mock.patch.object(
+                Workflow, "evaluate",
+                return_value=[3.0]) as mock_evaluate:
+            self.assertEqual(
+                [2.0],
+                self.optimizer_engine._score([1.0 + 1e-9, [0.5, 0.5], 1])
+            )
+            mock_evaluate.assert_not_called()
+            self.assertEqual(
+                [3.0],
+                self.optimizer_engine._score([1.0 + 1e-4, [0.5, 0.5], 1])
+            )
+        self.assertEqual(1, archive.approximate_hits)
+        self.assertEqual(1, self.optimizer_engine.evaluation_count)
+
+    def test_score_jacobian(self):
+        evaluator = DifferentiableGaussProbeEvaluator()
+        engine = self.optimizer_engine
+        engine.single_point_evaluator = evaluator
+        engine.kpis = [KPISpecification(), KPISpecification()]
+        engine.use_derivatives = True
+
+        engine._score([0.5, 0.5])
+        np.testing.assert_allclose(
+            [[0.34, 0.0], [0.0, -0.34]], engine._score_jacobian([0.5, 0.5]))
+        self.assertEqual(1, evaluator.count)
+
+        # Archived points are not evaluated again for their Jacobian
+        engine._score([0.2, 0.2])
+        self.assertIsNone(engine._score_jacobian([0.5, 0.5]))
+        self.assertEqual(2, evaluator.count)
+
+        # Other points are evaluated within the budget
+        engine.evaluation_budget = 3
+        engine.start_budget()
+        self.assertIsNotNone(engine._score_jacobian([0.1, 0.1]))
+        engine.evaluation_budget = 1
+        with self.assertRaises(EvaluationBudgetExhausted):
+            engine._score_jacobian([0.3, 0.3])
+        self.assertEqual(3, evaluator.count)
+
     def test_parameter_bounds(self):
         self.optimizer_engine.parameters = [
             RangedMCOParameterFactory(self.factory).create_model(
@@ -105,22 +211,188 @@ class TestBaseOptimizerEngine(TestCase):
         self.optimizer_engine.cache_result(
             input_point, kpi_values
         )
-        self.assertDictEqual(
-            {('a', 1, 'list'): [4, 8, 1.0]},
-            self.optimizer_engine._kpi_cache
-        )
+        archive = self.optimizer_engine.evaluation_archive
+        self.assertEqual(1, len(archive))
+        self.assertIn(input_point, archive)
 
     def test_retrieve_result(self):
-        self.optimizer_engine._kpi_cache = {
-            ('a', 1, 'list'): [4, 8, 1.0]
-        }
+        self.optimizer_engine.cache_result(
+            ['a', 1, 'list'], [4, 8, 1.0]
+        )
 
         input_point = ['a', 1, 'list']
         kpi_values = self.optimizer_engine.retrieve_result(
             input_point)
         self.assertEqual([4, 8, 1.0], kpi_values)
 
+        # Points missing from the archive are evaluated again
+        with mock.patch.object(
+                Workflow, "evaluate",
+                return_value=[1.0]) as mock_evaluate:
+            kpi_values = self.optimizer_engine.retrieve_result([2.0])
+        mock_evaluate.assert_called_once_with([2.0])
+        self.assertEqual([1.0], kpi_values)
+        self.assertIn([2.0], self.optimizer_engine.evaluation_archive)
+
     def test___getstate__(self):
         state_dict = self.optimizer_engine.__getstate__()
-        self.assertEqual(1, len(state_dict))
+        self.assertEqual(5, len(state_dict))
         self.assertEqual(False, state_dict["verbose_run"])
+        self.assertEqual(False, state_dict["use_derivatives"])
+        self.assertIsNone(state_dict["evaluation_budget"])
+        self.assertIsNone(state_dict["time_limit"])
+        self.assertIsNone(state_dict["archive_tolerance"])
+
+    def test_drive_ask_tell(self):
+        self.optimizer_engine.single_point_evaluator = GaussProbeEvaluator()
+        self.optimizer_engine.kpis = [KPISpecification(), KPISpecification()]
+        optimizer = ProbeAskTellOptimizer(n_points=5)
+
+        for worker_pool in [None, ThreadPoolExecutor(max_workers=2)]:
+            self.optimizer_engine.evaluation_archive.clear()
+            optimizer.start([1, 1])
+            results = list(self.optimizer_engine.drive_ask_tell(
+                optimizer, worker_pool, batch_size=2
+            ))
+            self.assertEqual([[0.5, 0.5]], results)
+            self.assertEqual(5, len(optimizer.told))
+            self.assertEqual(5, len(self.optimizer_engine.evaluation_archive))
+            if worker_pool is not None:
+                worker_pool.shutdown()
+
+    def test_drive_ask_tell_archived(self):
+        self.optimizer_engine.kpis = [KPISpecification()]
+        self.optimizer_engine.cache_result([0.0], [2.0])
+        optimizer = ProbeAskTellOptimizer(n_points=2)
+        optimizer.start([1])
+        with mock.patch.object(
+                Workflow, "evaluate",
+                return_value=[3.0]) as mock_evaluate:
+            list(self.optimizer_engine.drive_ask_tell(optimizer))
+        mock_evaluate.assert_called_once_with([1.0])
+        self.assertEqual(
+            [([0.0], [2.0]), ([1.0], [3.0])],
+            [(point, list(value)) for point, value in optimizer.told]
+        )
+
+    def test_drive_ask_tell_not_finished(self):
+        optimizer = ProbeAskTellOptimizer(n_points=2)
+        optimizer.start([1])
+        with mock.patch.object(
+                ProbeAskTellOptimizer, "ask", return_value=[]):
+            with self.assertRaisesRegex(RuntimeError, "not finished"):
+                list(self.optimizer_engine.drive_ask_tell(optimizer))
+        # The optimization is abandoned
+        self.assertEqual([], optimizer.points)
+
+    def test_evaluate_batch(self):
+        self.optimizer_engine.cache_result([0.0], [2.0])
+        for worker_pool in [None, ThreadPoolExecutor(max_workers=2)]:
+            with mock.patch.object(
+                    Workflow, "evaluate",
+                    side_effect=lambda point: [point[0] + 1.0]
+            ) as mock_evaluate:
+                kpis = self.optimizer_engine._evaluate_batch(
+                    [[0.0], [1.0], [2.0]], worker_pool)
+            self.assertEqual([[2.0], [2.0], [3.0]], kpis)
+            self.assertEqual(2, mock_evaluate.call_count)
+            self.assertEqual(3, len(self.optimizer_engine.evaluation_archive))
+
+            self.optimizer_engine.evaluation_archive.clear()
+            self.optimizer_engine.cache_result([0.0], [2.0])
+            if worker_pool is not None:
+                worker_pool.shutdown()
+
+    def test_evaluation_budget(self):
+        engine = self.optimizer_engine
+        engine.kpis = [KPISpecification()]
+        engine.evaluation_budget = 2
+        engine.start_budget()
+        self.assertEqual(2, engine.remaining_evaluations())
+        self.assertIsNone(engine.remaining_time())
+
+        with mock.patch.object(
+                Workflow, "evaluate",
+                return_value=[3.0]) as mock_evaluate:
+            engine._score([1.0])
+            engine._score([2.0])
+            self.assertTrue(engine.budget_exhausted())
+            with self.assertRaisesRegex(
+                    EvaluationBudgetExhausted, "after 2 evaluations"):
+                engine._score([3.0])
+            # Archived points do not need the budget
+            self.assertEqual([3.0], engine._score([1.0]))
+        self.assertEqual(2, mock_evaluate.call_count)
+        self.assertEqual(2, engine.evaluation_count)
+
+        engine.start_budget()
+        self.assertEqual(0, engine.evaluation_count)
+        self.assertFalse(engine.budget_exhausted())
+        self.assertTrue(engine.budget_exhausted(pending=2))
+
+    def test_time_limit(self):
+        engine = self.optimizer_engine
+        engine.time_limit = 10.0
+        with mock.patch(
+                "force_bdss.mco.optimizer_engines.base_optimizer_engine"
+                ".time.monotonic", return_value=100.0) as mock_monotonic:
+            engine.start_budget()
+            self.assertEqual(10.0, engine.remaining_time())
+            self.assertIsNone(engine.remaining_evaluations())
+
+            mock_monotonic.return_value = 104.0
+            self.assertEqual(6.0, engine.remaining_time())
+            self.assertFalse(engine.budget_exhausted())
+
+            mock_monotonic.return_value = 110.0
+            self.assertEqual(0.0, engine.remaining_time())
+            self.assertTrue(engine.budget_exhausted())
+            with self.assertRaises(EvaluationBudgetExhausted):
+                engine._score([1.0])
+
+    def test_share_budget(self):
+        engine = self.optimizer_engine
+        engine.evaluation_budget = 10
+        engine.time_limit = 12.0
+        with mock.patch(
+                "force_bdss.mco.optimizer_engines.base_optimizer_engine"
+                ".time.monotonic", return_value=100.0):
+            engine.start_budget()
+            engine.share_budget(4)
+            self.assertEqual(2, engine.remaining_evaluations())
+            self.assertEqual(3.0, engine.remaining_time())
+
+            # The share left unused by a run is given to the next ones
+            engine.evaluation_count = 1
+            engine.share_budget(3)
+            self.assertEqual(3, engine.remaining_evaluations())
+
+            # Runs are allowed one evaluation while the budget lasts
+            engine.evaluation_count = 9
+            engine.share_budget(3)
+            self.assertEqual(1, engine.remaining_evaluations())
+            engine.evaluation_count = 10
+            engine.share_budget(2)
+            self.assertTrue(engine.budget_exhausted())
+
+    def test_drive_ask_tell_budget(self):
+        self.optimizer_engine.single_point_evaluator = GaussProbeEvaluator()
+        self.optimizer_engine.kpis = [KPISpecification(), KPISpecification()]
+        self.optimizer_engine.evaluation_budget = 3
+        optimizer = ProbeAskTellOptimizer(n_points=5)
+
+        for worker_pool in [None, ThreadPoolExecutor(max_workers=2)]:
+            self.optimizer_engine.evaluation_archive.clear()
+            self.optimizer_engine.start_budget()
+            optimizer.start([1, 1])
+            with self.assertRaises(EvaluationBudgetExhausted):
+                list(self.optimizer_engine.drive_ask_tell(
+                    optimizer, worker_pool, batch_size=2
+                ))
+            # The evaluations in progress are completed, and the
+            # optimizer is stopped
+            self.assertEqual(3, len(optimizer.told))
+            self.assertEqual(3, self.optimizer_engine.evaluation_count)
+            self.assertEqual([], optimizer.points)
+            if worker_pool is not None:
+                worker_pool.shutdown()
@@ -0,0 +1,186 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+import numpy as np
+
+from force_bdss.mco.optimizer_engines.evaluation_archive import (
+    EvaluationArchive,
+    GRID_CELL_TOLERANCES,
+    INITIAL_CAPACITY,
+    point_key,
+)
+
+
+class TestEvaluationArchive(TestCase):
+    def setUp(self):
+        self.archive = EvaluationArchive()
+
+    def test_point_key(self):
+        self.assertEqual((1.0, 2.0), point_key([1.0, 2.0]))
+        self.assertEqual(
+            ("a", (1, (2, 3)), "b"), point_key(["a", [1, (2, 3)], "b"])
+        )
+
+    def test_add_get(self):
+        self.assertIsNone(self.archive.get([1.0, 2.0]))
+        self.archive.add([1.0, 2.0], [3.0, 4.0])
+        self.archive.add([2.0, 1.0], [5, 6])
+
+        self.assertEqual(2, len(self.archive))
+        self.assertIn([1.0, 2.0], self.archive)
+        self.assertNotIn([1.0, 1.0], self.archive)
+        self.assertEqual([3.0, 4.0], self.archive.get([1.0, 2.0]))
+        self.assertEqual([5.0, 6.0], self.archive.get((2.0, 1.0)))
+        self.assertEqual(2, self.archive.hits)
+        self.assertEqual(1, self.archive.misses)
+
+        # Lookups of points already looked up are not counted again
+        self.assertEqual(
+            [3.0, 4.0], self.archive.get([1.0, 2.0], count=False))
+        self.assertIsNone(self.archive.get([1.0, 1.0], count=False))
+        self.assertEqual(2, self.archive.hits)
+        self.assertEqual(1, self.archive.misses)
+
+        # Points are only archived once
+        self.archive.add([1.0, 2.0], [7.0, 8.0])
+        self.assertEqual(2, len(self.archive))
+        self.assertEqual([7.0, 8.0], self.archive.get([1.0, 2.0]))
+
+        np.testing.assert_array_equal(
+            [[1.0, 2.0], [2.0, 1.0]], self.archive.points()
+        )
+        np.testing.assert_array_equal(
+            [[7.0, 8.0], [5.0, 6.0]], self.archive.kpi_values()
+        )
+
+    def test_nested_and_non_numerical(self):
+        self.archive.add([1.0, [2.0, 3.0]], ["a", 1])
+        self.assertEqual(["a", 1], self.archive.get([1.0, [2.0, 3.0]]))
+        self.assertEqual(
+            [[1.0, 2.0, 3.0]], self.archive.points().tolist()
+        )
+
+        # Non numerical KPIs convert the existing rows
+        self.archive.clear()
+        self.archive.add([1.0], [2.0])
+        self.archive.add([2.0], ["b"])
+        self.assertEqual([2.0], self.archive.get([1.0]))
+        self.assertEqual(["b"], self.archive.get([2.0]))
+
+    def test_growth(self):
+        for value in range(INITIAL_CAPACITY + 1):
+            self.archive.add([float(value)], [float(value) ** 2])
+
+        self.assertEqual(INITIAL_CAPACITY + 1, len(self.archive))
+        self.assertEqual(
+            2 * INITIAL_CAPACITY * 2 * 8, self.archive.memory_usage
+        )
+        self.assertEqual([16.0], self.archive.get([4.0]))
+        np.testing.assert_array_equal(
+            np.arange(INITIAL_CAPACITY + 1.0),
+            self.archive.points()[:, 0]
+        )
+
+    def test_memory_limit(self):
+        # Room for 4 rows of one parameter and one KPI
+        self.archive.memory_limit = 4 * 2 * 8
+        for value in range(6):
+            self.archive.add([float(value)], [float(value)])
+
+        self.assertEqual(4, len(self.archive))
+        self.assertLessEqual(
+            self.archive.memory_usage, self.archive.memory_limit
+        )
+        self.assertNotIn([0.0], self.archive)
+        self.assertNotIn([1.0], self.archive)
+        self.assertEqual([5.0], self.archive.get([5.0]))
+        np.testing.assert_array_equal(
+            [2.0, 3.0, 4.0, 5.0], self.archive.points()[:, 0]
+        )
+        np.testing.assert_array_equal(
+            [2.0, 3.0, 4.0, 5.0], self.archive.kpi_values()[:, 0]
+        )
+
+        self.archive.memory_limit = None
+        self.assertEqual(0, len(self.archive))
+
+    def test_shape_change(self):
+        self.archive.add([1.0], [1.0])
+        self.archive.add([1.0, 2.0], [1.0])
+        self.assertEqual(1, len(self.archive))
+        self.assertNotIn([1.0], self.archive)
+        self.assertEqual([1.0], self.archive.get([1.0, 2.0]))
+
+    def test_approximate_get(self):
+        self.archive.add([1.0, 2.0], [3.0])
+        self.archive.add([1.0 + 1e-7, 2.0], [4.0])
+        self.assertIsNone(self.archive.get([1.0 + 1e-12, 2.0]))
+
+        self.archive.tolerances = [1e-6, 0.0]
+        # The nearest point within the tolerances is matched
+        self.assertEqual([3.0], self.archive.get([1.0 + 1e-12, 2.0]))
+        self.assertEqual([4.0], self.archive.get([1.0 + 2e-7, 2.0]))
+        self.assertEqual([4.0], self.archive.get([1.0 + 9e-7, 2.0]))
+        self.assertIsNone(self.archive.get([1.0 + 2e-6, 2.0]))
+        # Values with a zero tolerance only match equal values
+        self.assertIsNone(self.archive.get([1.0, 2.0 + 1e-12]))
+        self.assertEqual(3, self.archive.approximate_hits)
+        self.assertEqual(3, self.archive.hits)
+        self.assertEqual(3, self.archive.misses)
+        self.assertEqual(
+            [3.0], self.archive.get([1.0 + 1e-12, 2.0], count=False))
+        self.assertEqual(3, self.archive.approximate_hits)
+        self.assertEqual(3, self.archive.hits)
+        # Approximate matches are not archived
+        self.assertEqual(2, len(self.archive))
+
+        # Lookups probe the neighbouring cells of the grid
+        boundary = GRID_CELL_TOLERANCES * 1e-6
+        self.archive.add([boundary - 1e-9, 2.0], [5.0])
+        self.assertEqual([5.0], self.archive.get([boundary + 1e-9, 2.0]))
+
+        # Non numerical or differently sized points are matched exactly
+        self.archive.add(["a", 2.0], [6.0])
+        self.assertEqual([6.0], self.archive.get(["a", 2.0]))
+        self.assertIsNone(self.archive.get([1.0, 2.0, 3.0]))
+
+    def test_approximate_get_overwritten(self):
+        self.archive.tolerances = [0.1]
+        self.archive.memory_limit = 2 * 2 * 8
+        for value in range(4):
+            self.archive.add([float(value)], [float(value)])
+
+        self.assertIsNone(self.archive.get([1.05]))
+        self.assertEqual([3.0], self.archive.get([3.05]))
+        self.assertEqual(2, sum(
+            len(rows) for rows in self.archive._grid.values()
+        ))
+
+        self.archive.tolerances = None
+        self.assertIsNone(self.archive.get([3.05]))
+
+    def test_pickle(self):
+        self.archive.add([1.0, 2.0], [3.0])
+        archive = pickle.loads(pickle.dumps(self.archive))
+        self.assertEqual([3.0], archive.get([1.0, 2.0]))
+        archive.add([2.0, 3.0], [4.0])
+        self.assertEqual(2, len(archive))
+        self.assertEqual(1, len(self.archive))
+
+    def test_concurrent_add(self):
+        def add(value):
+            self.archive.add([float(value)], [float(value)])
+            return self.archive.get([float(value)])
+
+        with ThreadPoolExecutor(max_workers=4) as worker_pool:
+            values = list(worker_pool.map(add, range(2 * INITIAL_CAPACITY)))
+
+        self.assertEqual([[float(i)] for i in range(len(values))], values)
+        self.assertEqual(2 * INITIAL_CAPACITY, len(self.archive))
+        np.testing.assert_array_equal(
+            self.archive.points(), self.archive.kpi_values()
+        )
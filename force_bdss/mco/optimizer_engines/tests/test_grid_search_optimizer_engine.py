@@ -0,0 +1,195 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+from unittest import TestCase, mock
+
+from traits.api import provides
+
+from force_bdss.api import (
+    CategoricalMCOParameterFactory,
+    FixedMCOParameterFactory,
+    KPISpecification,
+    ListedMCOParameterFactory,
+    RangedMCOParameterFactory,
+    RangedVectorMCOParameterFactory,
+)
+from force_bdss.mco.i_evaluator import IEvaluator
+from force_bdss.mco.optimizer_engines.grid_search_optimizer_engine import (
+    GridSearchOptimizerEngine,
+    parameter_grid_values,
+)
+from force_bdss.tests.dummy_classes.mco import DummyMCOFactory
+
+
+@provides(IEvaluator)
+class GridProbeEvaluator:
+    """Two conflicting KPIs of the ranged and listed parameters, which
+    increase with the fixed parameter, and are lower for the "low"
+    category"""
+
+    def evaluate(self, input_point):
+        x, y, category, offset = input_point
+        penalty = 0.0 if category == "low" else 1.0
+        return [
+            x + y + offset + penalty,
+            (1.0 - x) + (1.0 - y) + offset + penalty,
+        ]
+
+
+class TestGridSearchOptimizerEngine(TestCase):
+
+    def setUp(self):
+        self.factory = DummyMCOFactory({"id": "pid", "name": "Plugin"})
+        self.parameters = [
+            RangedMCOParameterFactory(self.factory).create_model(
+                {"lower_bound": 0.0, "upper_bound": 1.0, "n_samples": 3}
+            ),
+            ListedMCOParameterFactory(self.factory).create_model(
+                {"levels": [1.0, 0.0]}
+            ),
+            CategoricalMCOParameterFactory(self.factory).create_model(
+                {"categories": ["low", "high"]}
+            ),
+            FixedMCOParameterFactory(self.factory).create_model(
+                {"value": 2.0}
+            ),
+        ]
+        self.engine = GridSearchOptimizerEngine(
+            single_point_evaluator=GridProbeEvaluator(),
+            parameters=self.parameters,
+            kpis=[KPISpecification(), KPISpecification()],
+            chunk_size=5,
+        )
+
+    def test_init(self):
+        self.assertEqual("Grid_Search_Optimizer", self.engine.name)
+        self.assertEqual(12, self.engine.grid_size)
+
+    def test___getstate__(self):
+        state = self.engine.__getstate__()
+        self.assertDictEqual(
+            {"name": "Grid_Search_Optimizer",
+             "verbose_run": False,
+             "use_derivatives": False,
+             "evaluation_budget": None,
+             "time_limit": None,
+             "archive_tolerance": None,
+             "concurrency_mode": "Serial",
+             "max_workers": None,
+             "chunk_size": 5},
+            state,
+        )
+
+    def test_parameter_grid_values(self):
+        vector = RangedVectorMCOParameterFactory(self.factory).create_model(
+            {"dimension": 2, "lower_bound": [0.0, 0.0],
+             "upper_bound": [1.0, 2.0], "n_samples": 2}
+        )
+        self.assertEqual(
+            [[0.0, 0.0], [0.0, 2.0], [1.0, 0.0], [1.0, 2.0]],
+            parameter_grid_values(vector)
+        )
+        self.assertEqual(
+            [0.0, 1.0], parameter_grid_values(self.parameters[1])
+        )
+
+    def test_grid_points(self):
+        points = self.engine.grid_points()
+        self.assertEqual([0.0, 0.0, "low", 2.0], next(points))
+        self.assertEqual([0.0, 0.0, "high", 2.0], next(points))
+        self.assertEqual(10, len(list(points)))
+
+    def test_grid_points_lazy(self):
+        # The grid is not held in memory
+        self.engine.parameters = [
+            RangedMCOParameterFactory(self.factory).create_model(
+                {"lower_bound": 0.0, "upper_bound": 1.0, "n_samples": 100}
+            )
+            for _ in range(6)
+        ]
+        self.assertEqual(100 ** 6, self.engine.grid_size)
+        points = self.engine.grid_points()
+        self.assertEqual([0.0] * 6, next(points))
+
+    def test_optimize_verbose(self):
+        self.engine.verbose_run = True
+        results = list(self.engine.optimize())
+        self.assertEqual(12, len(results))
+        self.assertEqual(
+            list(self.engine.grid_points()),
+            [point for point, _ in results]
+        )
+        for point, kpis in results:
+            self.assertEqual(GridProbeEvaluator().evaluate(point), kpis)
+
+    def test_optimize_pareto_front(self):
+        results = list(self.engine.optimize())
+        # The KPIs of the "low" points trade off against each other, and
+        # dominate those of the "high" points
+        self.assertEqual(
+            [point for point in self.engine.grid_points()
+             if point[2] == "low"],
+            [point for point, _ in results]
+        )
+        self.assertEqual(12, len(self.engine.evaluation_archive))
+        # Each grid point is looked up once, and evaluated
+        archive = self.engine.evaluation_archive
+        self.assertEqual(0, archive.hits)
+        self.assertEqual(12, archive.misses)
+
+        # Archived points are counted once, as hits
+        kpis = self.engine._evaluate_batch(
+            [[0.0, 0.0, "low", 2.0], [0.5, 0.5, "low", 3.0]])
+        self.assertEqual([[2.0, 4.0], [4.0, 4.0]], kpis)
+        self.assertEqual(1, archive.hits)
+        self.assertEqual(13, archive.misses)
+
+    def test_optimize_maximise(self):
+        self.engine.kpis = [
+            KPISpecification(objective="MAXIMISE"),
+            KPISpecification(objective="MAXIMISE"),
+        ]
+        results = list(self.engine.optimize())
+        self.assertEqual(
+            [point for point in self.engine.grid_points()
+             if point[2] == "high"],
+            [point for point, _ in results]
+        )
+
+    def test_optimize_concurrent(self):
+        self.engine.concurrency_mode = "Thread"
+        self.engine.max_workers = 2
+        self.engine.verbose_run = True
+        results = list(self.engine.optimize())
+        self.assertEqual(
+            list(self.engine.grid_points()),
+            [point for point, _ in results]
+        )
+
+    def test_optimize_chunks(self):
+        with mock.patch.object(
+                GridSearchOptimizerEngine, "_evaluate_batch",
+                side_effect=lambda points, pool: [[0.0, 0.0]] * len(points)
+        ) as mock_evaluate:
+            list(self.engine.optimize())
+        self.assertEqual(
+            [5, 5, 2],
+            [len(call[0][0]) for call in mock_evaluate.call_args_list]
+        )
+
+    def test_optimize_evaluation_budget(self):
+        self.engine.evaluation_budget = 7
+        results = list(self.engine.optimize())
+        self.assertEqual(7, len(self.engine.evaluation_archive))
+        self.assertEqual(7, self.engine.evaluation_count)
+        # The front of the part of the grid searched is yielded
+        self.assertEqual(
+            [point for point in list(self.engine.grid_points())[:7]
+             if point[2] == "low"],
+            [point for point, _ in results]
+        )
+
+        self.engine.evaluation_budget = None
+        self.engine.time_limit = 0.0
+        self.assertEqual([], list(self.engine.optimize()))
+        self.assertEqual(0, len(self.engine.evaluation_archive))
@@ -0,0 +1,82 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+from unittest import TestCase
+
+import numpy as np
+from numpy.testing import assert_array_equal
+
+from force_bdss.mco.optimizer_engines.pareto_archive import ParetoArchive
+from force_bdss.mco.optimizer_engines.utilities import non_dominated_mask
+
+
+class TestParetoArchive(TestCase):
+
+    def setUp(self):
+        self.archive = ParetoArchive()
+
+    def test_add(self):
+        self.assertEqual((True, []), self.archive.add([2.0, 2.0], "a"))
+        self.assertEqual((True, []), self.archive.add([1.0, 3.0], "b"))
+        # Dominated
+        self.assertEqual((False, []), self.archive.add([2.0, 3.0], "c"))
+        # Dominates "a" only
+        self.assertEqual((True, ["a"]), self.archive.add([1.5, 1.5], "d"))
+        # Dominates all
+        self.assertEqual(
+            (True, ["b", "d"]), self.archive.add([0.0, 0.0], "e")
+        )
+
+        self.assertEqual(1, len(self.archive))
+        self.assertEqual(["e"], self.archive.items)
+        assert_array_equal([[0.0, 0.0]], self.archive.scores())
+
+    def test_duplicates(self):
+        self.archive.add([1.0, 2.0], "a")
+        self.assertEqual((False, []), self.archive.add([1.0, 2.0], "b"))
+        self.assertEqual(["a"], self.archive.items)
+
+        self.archive.accept_duplicates = True
+        self.assertEqual((True, []), self.archive.add([1.0, 2.0], "b"))
+        self.assertEqual(["a", "b"], self.archive.items)
+        self.assertEqual(
+            (True, ["a", "b"]), self.archive.add([1.0, 1.0], "c")
+        )
+
+    def test_dominates(self):
+        self.assertFalse(self.archive.dominates([1.0, 1.0]))
+        self.archive.add([1.0, 2.0])
+        self.assertTrue(self.archive.dominates([1.0, 2.0]))
+        self.assertTrue(self.archive.dominates([2.0, 2.0]))
+        self.assertFalse(self.archive.dominates([2.0, 1.0]))
+
+    def test_clear(self):
+        self.archive.add([1.0, 2.0], "a")
+        self.archive.clear()
+        self.assertEqual(0, len(self.archive))
+        self.assertEqual([], self.archive.items)
+
+        # Scores of a different size can be archived once cleared
+        self.archive.add([1.0, 2.0, 3.0], "b")
+        with self.assertRaisesRegex(ValueError, "3 KPIs"):
+            self.archive.add([1.0, 2.0], "c")
+
+    def test_non_dominated_set(self):
+        # The archive holds the non-dominated set of all the points
+        # added, as it grows beyond its initial capacity
+        random_state = np.random.RandomState(0)
+        for n_kpis in [2, 3]:
+            self.archive.clear()
+            points = random_state.random_sample((2000, n_kpis))
+            # Points along a front, so that many are non-dominated
+            points[:, 0] = 1.0 - points[:, 1:].sum(axis=1) / n_kpis
+            points += 0.01 * random_state.random_sample(points.shape)
+            for index, point in enumerate(points):
+                self.archive.add(point, index)
+
+            expected = np.flatnonzero(non_dominated_mask(points))
+            self.assertGreater(len(expected), 64)
+            self.assertEqual(list(expected), sorted(self.archive.items))
+            assert_array_equal(
+                points[self.archive.items], self.archive.scores()
+            )
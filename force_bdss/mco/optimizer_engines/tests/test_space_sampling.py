@@ -7,7 +7,9 @@ import numpy as np
 
 from force_bdss.mco.optimizer_engines.space_sampling import (
     UniformSpaceSampler, DirichletSpaceSampler,
-    SpaceSampler, resolution_to_sample_size)
+    HaltonSpaceSampler, LatinHypercubeSpaceSampler, SobolSpaceSampler,
+    SpaceSampler, binomial, resolution_to_sample_size,
+    simplex_lattice_chunks, unit_cube_to_simplex)
 
 
 class TestSpaceSampling(TestCase):
@@ -19,6 +21,40 @@ class TestSpaceSampling(TestCase):
         self.assertEqual(1, resolution_to_sample_size(3, 1))
         self.assertEqual(6, resolution_to_sample_size(3, 3))
         self.assertEqual(715, resolution_to_sample_size(5, 10))
+        # Exact for sizes beyond the precision of floats
+        self.assertEqual(
+            5498493658321124600506947888, resolution_to_sample_size(40, 61)
+        )
+
+    def test_binomial(self):
+        self.assertEqual(1, binomial(0, 0))
+        self.assertEqual(10, binomial(5, 2))
+        self.assertEqual(10, binomial(5, 3))
+        self.assertEqual(0, binomial(5, 6))
+        self.assertEqual(0, binomial(5, -1))
+
+    def test_simplex_lattice_chunks(self):
+        chunks = list(simplex_lattice_chunks(3, 2, chunk_size=4))
+        self.assertEqual([4, 2], [len(chunk) for chunk in chunks])
+        self.assertEqual(
+            [[2, 0, 0], [1, 1, 0], [1, 0, 1],
+             [0, 2, 0], [0, 1, 1], [0, 0, 2]],
+            np.concatenate(chunks).tolist()
+        )
+
+        self.assertEqual(
+            [[[0]]],
+            [chunk.tolist() for chunk in simplex_lattice_chunks(1, 0)]
+        )
+
+    def test_simplex_lattice_chunks_large(self):
+        # Lattices larger than 64 bits integers are streamed as objects
+        chunks = simplex_lattice_chunks(40, 60, chunk_size=3)
+        chunk = next(chunks)
+        self.assertEqual((3, 40), chunk.shape)
+        self.assertEqual([60, 60, 60], chunk.sum(axis=1).tolist())
+        self.assertEqual([60] + [0] * 39, chunk[0].tolist())
+        self.assertEqual([59, 1] + [0] * 38, chunk[1].tolist())
 
 
 class BaseTestSampler(TestCase):
@@ -110,6 +146,25 @@ class TestUniformSpaceSampler(BaseTestSampler):
             self.generate_space_samples(
                 with_zero_values=with_zero_values)
 
+    def test_generate_space_sample_chunks(self):
+        sampler = self.distribution(4, 5, chunk_size=8)
+        chunks = list(sampler.generate_space_sample_chunks())
+        self.assertEqual([8, 8, 8, 8, 3], [len(chunk) for chunk in chunks])
+        weights = np.concatenate(chunks)
+        self.assertEqual((35, 4), weights.shape)
+        np.testing.assert_allclose(1.0, weights.sum(axis=1))
+        self.assertTrue(np.all(weights > 0))
+        self.assertEqual(
+            weights.tolist(), list(sampler.generate_space_sample())
+        )
+
+        sampler = self.distribution(3, 1, with_zero_values=True)
+        self.assertEqual(
+            [[[1.0]]],
+            [chunk.tolist() for chunk in
+             sampler.generate_space_sample_chunks()]
+        )
+
 
 class TestDirichletSpaceSampler(BaseTestSampler):
 
@@ -128,3 +183,100 @@ class TestDirichletSpaceSampler(BaseTestSampler):
     def test_generate_space_sample(self):
         for alpha in self.alphas:
             self.generate_space_samples(alpha=alpha)
+
+    def test_seed(self):
+        sampler = self.distribution(3, 5, seed=2, chunk_size=4)
+        chunks = list(sampler.generate_space_sample_chunks())
+        self.assertEqual([4, 4, 4, 3], [len(chunk) for chunk in chunks])
+        self.assertEqual(
+            np.concatenate(chunks).tolist(),
+            list(sampler.generate_space_sample())
+        )
+
+
+class QuasiRandomSamplerTests:
+    """Tests common to the QuasiRandomSpaceSampler subclasses"""
+
+    def test_generate_space_sample(self):
+        for scramble in [False, True]:
+            self.generate_space_samples(scramble=scramble, seed=3)
+
+    def test_dimension_one(self):
+        sampler = self.distribution(1, 3, n_samples=3, seed=1)
+        self.assertEqual([[1.0]] * 3, list(sampler.generate_space_sample()))
+
+    def test_seed_and_chunks(self):
+        sampler = self.distribution(4, 3, n_samples=10, seed=5, chunk_size=4)
+        chunks = list(sampler.generate_space_sample_chunks())
+        self.assertEqual([4, 4, 2], [len(chunk) for chunk in chunks])
+        weights = np.concatenate(chunks)
+        np.testing.assert_allclose(1.0, weights.sum(axis=1))
+        self.assertTrue(np.all(weights >= 0))
+
+        # Samples are reproducible with a seed
+        self.assertEqual(
+            weights.tolist(), list(sampler.generate_space_sample()))
+        sampler.seed = 6
+        self.assertNotEqual(
+            weights.tolist(), list(sampler.generate_space_sample()))
+
+
+class TestSobolSpaceSampler(QuasiRandomSamplerTests, BaseTestSampler):
+
+    distribution = SobolSpaceSampler
+
+    def test__unit_cube_points(self):
+        sampler = self.distribution(3, 1, scramble=False)
+        np.testing.assert_allclose(
+            [[0.0, 0.0], [0.5, 0.5], [0.75, 0.25], [0.25, 0.75],
+             [0.375, 0.375], [0.875, 0.875]],
+            sampler._unit_cube_points(6, np.random.RandomState(0))
+        )
+
+    def test_max_dimension(self):
+        sampler = self.distribution(22, 1, n_samples=4)
+        self.assertEqual(4, len(list(sampler.generate_space_sample())))
+        with self.assertRaises(ValueError):
+            list(self.distribution(23, 1).generate_space_sample())
+
+
+class TestHaltonSpaceSampler(QuasiRandomSamplerTests, BaseTestSampler):
+
+    distribution = HaltonSpaceSampler
+
+    def test__unit_cube_points(self):
+        sampler = self.distribution(3, 1, scramble=False)
+        np.testing.assert_allclose(
+            [[0.0, 0.0], [0.5, 1 / 3], [0.25, 2 / 3], [0.75, 1 / 9]],
+            sampler._unit_cube_points(4, np.random.RandomState(0))
+        )
+
+
+class TestLatinHypercubeSpaceSampler(QuasiRandomSamplerTests, BaseTestSampler):
+
+    distribution = LatinHypercubeSpaceSampler
+
+    def test__unit_cube_points(self):
+        for scramble in [False, True]:
+            sampler = self.distribution(4, 1, scramble=scramble)
+            points = sampler._unit_cube_points(
+                5, np.random.RandomState(0))
+            # Each stratum of each axis holds exactly one point
+            for axis in points.T:
+                self.assertEqual(
+                    list(range(5)), sorted((axis * 5).astype(int)))
+            if not scramble:
+                np.testing.assert_allclose(0.5, (points * 5) % 1)
+
+
+class TestUnitCubeToSimplex(TestCase):
+
+    def test_unit_cube_to_simplex(self):
+        np.testing.assert_allclose(
+            [[0.2, 0.5, 0.3], [0.0, 0.0, 1.0], [1.0, 0.0, 0.0]],
+            unit_cube_to_simplex(
+                np.array([[0.7, 0.2], [0.0, 0.0], [1.0, 1.0]]))
+        )
+        np.testing.assert_allclose(
+            [[1.0]], unit_cube_to_simplex(np.empty((1, 0)))
+        )
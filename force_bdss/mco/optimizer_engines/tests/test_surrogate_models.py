@@ -0,0 +1,104 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+from unittest import TestCase
+
+import numpy as np
+from numpy.testing import assert_allclose
+
+from force_bdss.mco.optimizer_engines.surrogate_models import (
+    GaussianProcessSurrogate,
+    RBFSurrogate,
+    SURROGATE_MODELS,
+    expected_improvement,
+    lower_confidence_bound,
+)
+
+
+def branin_like(points):
+    return np.sin(3 * points[:, 0]) + (points[:, 1] - 0.4) ** 2
+
+
+class TestSurrogateModels(TestCase):
+
+    def setUp(self):
+        random_state = np.random.RandomState(0)
+        self.points = random_state.random_sample((30, 2))
+        self.values = branin_like(self.points)
+        self.test_points = random_state.random_sample((20, 2))
+
+    def test_models(self):
+        self.assertEqual(
+            {"GaussianProcess": GaussianProcessSurrogate,
+             "RBF": RBFSurrogate},
+            SURROGATE_MODELS
+        )
+
+    def test_gaussian_process(self):
+        model = GaussianProcessSurrogate()
+        model.fit(self.points, self.values)
+        self.assertEqual(2, len(model.length_scales))
+
+        # The evaluated values are reproduced, with no uncertainty
+        mean, std = model.predict(self.points)
+        assert_allclose(self.values, mean, atol=1e-3)
+        assert_allclose(0.0, std, atol=1e-2)
+
+        mean, std = model.predict(self.test_points)
+        assert_allclose(branin_like(self.test_points), mean, atol=0.05)
+        self.assertTrue(np.all(std > 0.0))
+
+        # Far from the evaluated points, the uncertainty grows
+        _, far_std = model.predict(np.array([[3.0, 3.0]]))
+        self.assertGreater(far_std[0], std.max())
+
+    def test_gaussian_process_fixed_length_scales(self):
+        model = GaussianProcessSurrogate(
+            optimize_length_scales=False, length_scales=np.array([0.3, 0.3])
+        )
+        model.fit(self.points, self.values)
+        assert_allclose([0.3, 0.3], model.length_scales)
+
+    def test_gaussian_process_constant_values(self):
+        model = GaussianProcessSurrogate()
+        model.fit(self.points, np.ones(len(self.points)))
+        mean, _ = model.predict(self.test_points)
+        assert_allclose(1.0, mean)
+
+    def test_rbf(self):
+        model = RBFSurrogate()
+        model.fit(self.points, self.values)
+
+        mean, std = model.predict(self.points)
+        assert_allclose(self.values, mean, atol=1e-8)
+        assert_allclose(0.0, std, atol=1e-8)
+
+        mean, std = model.predict(self.test_points)
+        assert_allclose(branin_like(self.test_points), mean, atol=0.05)
+        self.assertTrue(np.all(std > 0.0))
+
+    def test_rbf_linear(self):
+        # The linear tail reproduces linear functions exactly
+        model = RBFSurrogate()
+        model.fit(self.points, 2 * self.points[:, 0] - self.points[:, 1])
+        mean, _ = model.predict(self.test_points)
+        assert_allclose(
+            2 * self.test_points[:, 0] - self.test_points[:, 1], mean,
+            atol=1e-8
+        )
+
+    def test_expected_improvement(self):
+        improvement = expected_improvement(
+            np.array([0.0, 1.0, 1.0, 2.0]), np.array([0.0, 0.0, 1.0, 1.0]),
+            1.0
+        )
+        assert_allclose(
+            [1.0, 0.0, 0.3989423, 0.0833155], improvement, atol=1e-6
+        )
+
+    def test_lower_confidence_bound(self):
+        assert_allclose(
+            [1.0, -1.0],
+            lower_confidence_bound(
+                np.array([1.0, 2.0]), np.array([1.0, 0.5]), 2.0)
+        )
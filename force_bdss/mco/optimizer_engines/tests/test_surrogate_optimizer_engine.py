@@ -0,0 +1,216 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+from unittest import TestCase
+
+import numpy as np
+from numpy.testing import assert_allclose
+from traits.api import provides
+
+from force_bdss.api import (
+    KPISpecification,
+    ListedMCOParameterFactory,
+    RangedMCOParameterFactory,
+    RangedVectorMCOParameterFactory,
+)
+from force_bdss.mco.i_evaluator import IEvaluator
+from force_bdss.mco.optimizer_engines.surrogate_optimizer_engine import (
+    SurrogateOptimizerEngine,
+    augmented_chebyshev,
+)
+from force_bdss.mco.optimizer_engines.utilities import non_dominated_mask
+from force_bdss.tests.dummy_classes.mco import DummyMCOFactory
+from force_bdss.tests.probe_classes.evaluator import GaussProbeEvaluator
+
+
+@provides(IEvaluator)
+class TradeOffProbeEvaluator:
+    """Two conflicting KPIs, whose Pareto-efficient points are the
+    values of the first parameter between 0.2 and 0.8"""
+
+    def evaluate(self, input_point):
+        return [(input_point[0] - 0.2) ** 2, (input_point[0] - 0.8) ** 2]
+
+
+class TestAugmentedChebyshev(TestCase):
+
+    def test_augmented_chebyshev(self):
+        values = augmented_chebyshev(
+            np.array([[1.0, 0.0], [0.5, 0.5]]), np.array([0.5, 0.5]),
+            rho=0.1
+        )
+        assert_allclose([0.55, 0.3], values)
+
+
+class TestSurrogateOptimizerEngine(TestCase):
+
+    def setUp(self):
+        self.factory = DummyMCOFactory({"id": "pid", "name": "Plugin"})
+        self.parameters = [
+            RangedMCOParameterFactory(self.factory).create_model(
+                {"lower_bound": 0.0, "upper_bound": 1.0}
+            )
+            for _ in range(2)
+        ]
+        self.kpis = [KPISpecification(), KPISpecification()]
+        self.engine = SurrogateOptimizerEngine(
+            single_point_evaluator=GaussProbeEvaluator(),
+            parameters=self.parameters,
+            kpis=self.kpis,
+            max_evaluations=20,
+            seed=0,
+        )
+
+    def test_init(self):
+        self.assertEqual("Surrogate_Optimizer", self.engine.name)
+        self.assertEqual("GaussianProcess", self.engine.surrogate_model)
+        self.assertEqual(
+            "ExpectedImprovement", self.engine.acquisition_function
+        )
+
+    def test___getstate__(self):
+        state = self.engine.__getstate__()
+        self.assertDictEqual(
+            {"name": "Surrogate_Optimizer",
+             "verbose_run": False,
+             "use_derivatives": False,
+             "evaluation_budget": None,
+             "time_limit": None,
+             "archive_tolerance": None,
+             "surrogate_model": "GaussianProcess",
+             "acquisition_function": "ExpectedImprovement",
+             "exploration_weight": 2.0,
+             "max_evaluations": 20,
+             "n_initial_points": None,
+             "batch_size": 4,
+             "n_candidates": 1000,
+             "seed": 0,
+             "concurrency_mode": "Serial",
+             "max_workers": None},
+            state,
+        )
+
+    def test_optimize(self):
+        for model in ["GaussianProcess", "RBF"]:
+            self.engine.surrogate_model = model
+            results = list(self.engine.optimize())
+
+            self.assertEqual(20, len(self.engine.evaluation_archive))
+            # 5 initial points, then 4 batches of 4 points
+            self.assertEqual(4, len(self.engine.fit_times))
+            statistics = self.engine.surrogate_statistics()
+            self.assertEqual(20, statistics["evaluations"])
+            self.assertGreater(statistics["surrogate_fit_time"], 0.0)
+
+            # The KPIs are minimal at (0.33, 0.67)
+            self.assertGreaterEqual(len(results), 1)
+            best = min(sum(kpis) for _, kpis in results)
+            self.assertLess(best, 0.01)
+
+    def test_optimize_evaluation_budget(self):
+        self.engine.verbose_run = True
+        self.engine.evaluation_budget = 7
+        results = list(self.engine.optimize())
+        # 5 initial points, then a batch cut to the 2 points left
+        self.assertEqual(7, len(results))
+        self.assertEqual(7, self.engine.evaluation_count)
+        self.assertEqual(1, len(self.engine.fit_times))
+
+        self.engine.evaluation_budget = 3
+        self.assertEqual(3, len(list(self.engine.optimize())))
+        self.assertEqual(0, len(self.engine.fit_times))
+
+    def test_optimize_verbose(self):
+        self.engine.verbose_run = True
+        self.engine.n_initial_points = 3
+        self.engine.batch_size = 5
+        results = list(self.engine.optimize())
+
+        self.assertEqual(20, len(results))
+        # The initial parameter values are evaluated first
+        self.assertEqual([0.5, 0.5], list(results[0][0]))
+        for point, kpis in results:
+            self.assertEqual(
+                list(GaussProbeEvaluator().evaluate(point)), list(kpis)
+            )
+            for value in point:
+                self.assertTrue(0.0 <= value <= 1.0)
+
+    def test_optimize_pareto_front(self):
+        self.engine.single_point_evaluator = TradeOffProbeEvaluator()
+        self.engine.acquisition_function = "LowerConfidenceBound"
+        self.engine.max_evaluations = 30
+        results = list(self.engine.optimize())
+
+        self.assertGreater(len(results), 5)
+        scores = np.array([kpis for _, kpis in results])
+        self.assertTrue(non_dominated_mask(scores).all())
+        for point, _ in results:
+            self.assertTrue(0.2 <= point[0] <= 0.8)
+
+    def test_optimize_seed(self):
+        self.engine.verbose_run = True
+        first = [point for point, _ in self.engine.optimize()]
+        second = [point for point, _ in self.engine.optimize()]
+        assert_allclose(first, second)
+
+    def test_optimize_concurrent(self):
+        self.engine.verbose_run = True
+        serial = list(self.engine.optimize())
+        self.engine.concurrency_mode = "Thread"
+        self.engine.max_workers = 2
+        concurrent = list(self.engine.optimize())
+        assert_allclose(
+            [point for point, _ in serial],
+            [point for point, _ in concurrent]
+        )
+
+    def test_optimize_vector_parameter(self):
+        self.engine.parameters = [
+            RangedVectorMCOParameterFactory(self.factory).create_model(
+                {"dimension": 2, "lower_bound": [0.0, 0.0],
+                 "upper_bound": [1.0, 1.0], "initial_value": [0.5, 0.5]}
+            )
+        ]
+        self.engine.single_point_evaluator = VectorProbeEvaluator()
+        self.engine.verbose_run = True
+        results = list(self.engine.optimize())
+        self.assertEqual(20, len(results))
+        for point, _ in results:
+            self.assertEqual(1, len(point))
+            self.assertEqual(2, len(point[0]))
+
+    def test_unsupported_parameters(self):
+        self.engine.parameters = [
+            ListedMCOParameterFactory(self.factory).create_model(
+                {"levels": [0.0, 1.0]}
+            )
+        ]
+        with self.assertRaisesRegex(TypeError, "Ranged and RangedVector"):
+            list(self.engine.optimize())
+
+    def test_normalized_scores(self):
+        self.kpis[0].use_bounds = True
+        self.kpis[0].lower_bound = -1.0
+        self.kpis[0].upper_bound = 3.0
+        scores = np.array([[0.0, 1.0], [1.0, 3.0]])
+        assert_allclose(
+            [[0.25, 0.0], [0.5, 1.0]],
+            self.engine._normalized_scores(scores)
+        )
+
+        # The score of a target is its distance to the target value
+        self.kpis[0].objective = "TARGET"
+        self.kpis[0].target_value = 1.0
+        assert_allclose(
+            [[0.0, 0.0], [0.5, 1.0]],
+            self.engine._normalized_scores(scores)
+        )
+
+
+@provides(IEvaluator)
+class VectorProbeEvaluator:
+
+    def evaluate(self, input_point):
+        x, y = input_point[0]
+        return (x - 0.33) ** 2, (y - 0.67) ** 2
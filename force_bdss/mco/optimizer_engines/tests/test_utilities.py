@@ -3,9 +3,14 @@
 
 from unittest import TestCase
 
+import numpy as np
+
 from force_bdss.core.kpi_specification import KPISpecification
 from force_bdss.mco.optimizer_engines.utilities import (
-    convert_to_score)
+    convert_jacobian_to_score,
+    convert_to_score,
+    kpi_score_bounds,
+    non_dominated_mask)
 
 
 class TestConvertUtil(TestCase):
@@ -18,3 +23,56 @@ class TestConvertUtil(TestCase):
         values = [10.0, 20.0, 15.0]
         inv_values = convert_to_score(values, kpis)
         self.assertListEqual(list(inv_values), [10.0, -20.0, 5.0])
+
+    def test_convert_jacobian_to_score(self):
+        kpis = [
+            KPISpecification(objective="MINIMISE"),
+            KPISpecification(objective="MAXIMISE"),
+            KPISpecification(objective="TARGET", target_value=10),
+            KPISpecification(objective="TARGET", target_value=10)
+        ]
+        values = [10.0, 20.0, 15.0, 5.0]
+        jacobian = [[1.0, 2.0]] * 4
+        score_jacobian = convert_jacobian_to_score(jacobian, values, kpis)
+        np.testing.assert_array_equal(
+            [[1.0, 2.0], [-1.0, -2.0], [1.0, 2.0], [-1.0, -2.0]],
+            score_jacobian
+        )
+
+    def test_non_dominated_mask(self):
+        scores = [
+            [1.0, 4.0],
+            [2.0, 2.0],
+            [3.0, 3.0],
+            [2.0, 2.0],
+            [4.0, 1.0],
+            [4.0, 2.0],
+        ]
+        for chunk_size in [1, 4, 1024]:
+            mask = non_dominated_mask(scores, chunk_size=chunk_size)
+            self.assertListEqual(
+                [True, True, False, True, True, False], list(mask)
+            )
+        self.assertEqual(0, len(non_dominated_mask(np.empty((0, 2)))))
+
+    def test_kpi_score_bounds(self):
+        kpis = [
+            KPISpecification(
+                objective="MINIMISE", use_bounds=True,
+                lower_bound=1.0, upper_bound=3.0),
+            KPISpecification(
+                objective="MAXIMISE", use_bounds=True,
+                lower_bound=1.0, upper_bound=3.0),
+            KPISpecification(
+                objective="TARGET", target_value=2.0, use_bounds=True,
+                lower_bound=1.0, upper_bound=5.0),
+            KPISpecification(
+                objective="TARGET", target_value=0.0, use_bounds=True,
+                lower_bound=1.0, upper_bound=5.0),
+            KPISpecification(objective="MINIMISE"),
+        ]
+        lower, upper = kpi_score_bounds(kpis)
+        np.testing.assert_array_equal(
+            [1.0, -3.0, 0.0, 1.0, np.nan], lower)
+        np.testing.assert_array_equal(
+            [3.0, -1.0, 3.0, 5.0, np.nan], upper)
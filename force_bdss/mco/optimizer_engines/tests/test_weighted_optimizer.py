@@ -1,28 +1,44 @@
 #  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
 #  All rights reserved.
 
-from unittest import TestCase
+import os
+import pickle
+import shutil
+import tempfile
+import tracemalloc
+import warnings
+from unittest import TestCase, mock
+
+import numpy as np
 
 from force_bdss.api import (
     KPISpecification,
     RangedMCOParameterFactory,
 )
+from force_bdss.core.checkpoint import OptimizationCheckpoint
 from force_bdss.tests.dummy_classes.mco import DummyMCOFactory
 from force_bdss.tests.probe_classes.optimizer_engine import (
     MixinProbeOptimizerEngine)
 from force_bdss.mco.optimizer_engines.weighted_optimizer_engine import (
     sen_scaling_method,
+    simplex_adjacency_order,
 )
 from force_bdss.mco.optimizer_engines.space_sampling import (
     UniformSpaceSampler,
     DirichletSpaceSampler,
+    HaltonSpaceSampler,
+    LatinHypercubeSpaceSampler,
+    SobolSpaceSampler,
 )
 
 from force_bdss.mco.optimizer_engines.weighted_optimizer_engine import (
     WeightedOptimizerEngine
 )
 from force_bdss.mco.optimizers.scipy_optimizer import ScipyOptimizer
-from force_bdss.tests.probe_classes.evaluator import GaussProbeEvaluator
+from force_bdss.tests.probe_classes.evaluator import (
+    DifferentiableGaussProbeEvaluator,
+    GaussProbeEvaluator,
+)
 
 
 class WeightedScipyEngine(WeightedOptimizerEngine):
@@ -37,6 +53,50 @@ class DummyOptimizerEngine(MixinProbeOptimizerEngine, WeightedScipyEngine):
     pass
 
 
+class CountingEvaluator(GaussProbeEvaluator):
+    """Counts the number of evaluations"""
+    def __init__(self):
+        self.count = 0
+
+    def evaluate(self, input_point):
+        self.count += 1
+        return super().evaluate(input_point)
+
+
+class NonDifferentiableEvaluator(CountingEvaluator):
+    """Provides an `evaluate_with_jacobian` method, but never the
+    Jacobian of the KPIs"""
+    def evaluate_with_jacobian(self, input_point):
+        return self.evaluate(input_point), None
+
+
+class FileCountingEvaluator(GaussProbeEvaluator):
+    """Counts the number of evaluations in a file, including those of
+    worker processes"""
+    def __init__(self, path):
+        self.path = path
+
+    def evaluate(self, input_point):
+        with open(self.path, "a") as count_file:
+            count_file.write(".")
+        return super().evaluate(input_point)
+
+    @property
+    def count(self):
+        if not os.path.exists(self.path):
+            return 0
+        with open(self.path) as count_file:
+            return len(count_file.read())
+
+
+class CheckpointEvaluator(CountingEvaluator):
+    """Counts the number of evaluations, and saves the progress of the
+    optimization in a checkpoint"""
+    def __init__(self, checkpoint):
+        super().__init__()
+        self.checkpoint = checkpoint
+
+
 class TestSenScaling(TestCase):
     def setUp(self):
         self.plugin = {"id": "pid", "name": "Plugin"}
@@ -100,16 +160,29 @@ class TestWeightedOptimizer(TestCase):
                 "name": "Weighted_Optimizer",
                 "num_points": 7,
                 "space_search_mode": "Uniform",
+                "space_search_seed": None,
+                "concurrency_mode": "Serial",
+                "max_workers": None,
+                "preserve_order": False,
                 "verbose_run": False,
+                "warm_start": True,
+                "use_derivatives": False,
+                "evaluation_budget": None,
+                "time_limit": None,
+                "archive_tolerance": None,
                 "scaling_method": "sen_scaling_method",
             },
             state,
         )
 
     def test__space_search_distribution(self):
+        self.optimizer.space_search_seed = 4
         for strategy, klass in (
             ("Uniform", UniformSpaceSampler),
             ("Dirichlet", DirichletSpaceSampler),
+            ("Sobol", SobolSpaceSampler),
+            ("Halton", HaltonSpaceSampler),
+            ("LatinHypercube", LatinHypercubeSpaceSampler),
             ("Uniform", UniformSpaceSampler),
         ):
             self.optimizer.space_search_mode = strategy
@@ -117,6 +190,8 @@ class TestWeightedOptimizer(TestCase):
             self.assertIsInstance(distribution, klass)
             self.assertEqual(len(self.kpis), distribution.dimension)
             self.assertEqual(7, distribution.resolution)
+            if strategy != "Uniform":
+                self.assertEqual(4, distribution.seed)
 
     def test_scaling_factors(self):
         scaling_factors = self.mocked_optimizer.get_scaling_factors()
@@ -173,8 +248,335 @@ class TestWeightedOptimizer(TestCase):
         self.assertEqual(len(samples_default), len(samples_default))
 
     def test_optimize(self):
+        self.mocked_optimizer.warm_start = False
         for optimal_point, optimal_kpis, _ in self.mocked_optimizer.optimize():
             self.assertAlmostEqual(0.33, optimal_point[0])
             self.assertAlmostEqual(0.67, optimal_point[1])
             for kpi in optimal_kpis:
                 self.assertAlmostEqual(0.0, kpi)
+
+        # Warm-started optimizations stop as soon as the optimizer
+        # tolerance is met
+        self.mocked_optimizer.warm_start = True
+        for optimal_point, optimal_kpis, _ in self.mocked_optimizer.optimize():
+            self.assertAlmostEqual(0.33, optimal_point[0], places=6)
+            self.assertAlmostEqual(0.67, optimal_point[1], places=6)
+            for kpi in optimal_kpis:
+                self.assertAlmostEqual(0.0, kpi)
+        # Completed runs are only recorded for a checkpoint
+        self.assertEqual(set(), self.mocked_optimizer._completed_weights)
+
+    def test_optimize_warm_start(self):
+        self.mocked_optimizer.warm_start = False
+        cold_results = list(self.mocked_optimizer.optimize())
+        cold_evaluations = sum(
+            self.mocked_optimizer.evaluation_counts.values())
+        self.assertEqual(
+            len(cold_results), len(self.mocked_optimizer.evaluation_counts))
+
+        self.mocked_optimizer.warm_start = True
+        with mock.patch.object(
+                ScipyOptimizer, "optimize_function",
+                autospec=True,
+                side_effect=ScipyOptimizer.optimize_function) as mock_opt:
+            warm_results = list(self.mocked_optimizer.optimize())
+        warm_evaluations = sum(
+            self.mocked_optimizer.evaluation_counts.values())
+
+        self.assertLess(warm_evaluations, cold_evaluations)
+        self.assertCountEqual(
+            [weights for _, _, weights in cold_results],
+            [weights for _, _, weights in warm_results],
+        )
+        # Scaling runs are cold-started, weighted runs are warm-started
+        x0s = [call[1].get("x0") for call in mock_opt.call_args_list]
+        n_kpis = len(self.kpis)
+        self.assertEqual([None] * n_kpis, x0s[:n_kpis])
+        self.assertNotIn(None, x0s[n_kpis:])
+
+        for _, _, weights in warm_results:
+            statistics = self.mocked_optimizer.evaluation_statistics(weights)
+            self.assertEqual(
+                self.mocked_optimizer.evaluation_counts[tuple(weights)],
+                statistics["evaluations"],
+            )
+            self.assertAlmostEqual(
+                self.mocked_optimizer.cold_start_evaluations
+                - statistics["evaluations"],
+                statistics["evaluation_reduction"],
+            )
+
+        # Without any cold-started scaling run, e.g. with fixed scaling
+        # factors, there is no reduction to report
+        with mock.patch.object(
+                WeightedOptimizerEngine, "get_scaling_factors",
+                return_value=[1.0, 1.0]), warnings.catch_warnings():
+            warnings.simplefilter("error", RuntimeWarning)
+            results = list(self.mocked_optimizer.optimize())
+        self.assertEqual(0.0, self.mocked_optimizer.cold_start_evaluations)
+        for _, _, weights in results:
+            statistics = self.mocked_optimizer.evaluation_statistics(weights)
+            self.assertEqual(
+                -statistics["evaluations"],
+                statistics["evaluation_reduction"],
+            )
+
+    def test_simplex_adjacency_order(self):
+        samples = list(
+            UniformSpaceSampler(3, 4, with_zero_values=True)
+            .generate_space_sample()
+        )
+        order = simplex_adjacency_order(samples)
+        self.assertCountEqual(range(len(samples)), order)
+        self.assertEqual(0, order[0])
+        # Successive samples are neighbours on the simplex grid
+        steps = np.abs(np.diff(np.array(samples)[order], axis=0)).sum(axis=1)
+        np.testing.assert_allclose(2.0 / 3.0, steps)
+
+        self.assertEqual([], simplex_adjacency_order([]))
+
+    def test_simplex_adjacency_order_memory(self):
+        samples = list(
+            UniformSpaceSampler(6, 10, with_zero_values=True)
+            .generate_space_sample()
+        )
+        self.assertEqual(2002, len(samples))
+        tracemalloc.start()
+        try:
+            order = simplex_adjacency_order(samples)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        # A matrix of the distances between all the samples would take
+        # 32 MB, but only one vector of distances is needed at each step
+        self.assertLess(peak, 8 * 2 ** 20)
+        self.assertCountEqual(range(len(samples)), order)
+        steps = np.abs(np.diff(np.array(samples)[order], axis=0)).sum(axis=1)
+        np.testing.assert_allclose(2.0 / 9.0, steps)
+
+    def test_pickle(self):
+        engine = pickle.loads(pickle.dumps(self.mocked_optimizer))
+        self.assertIsInstance(engine, DummyOptimizerEngine)
+        self.assertEqual(4, len(engine.parameters))
+        self.assertEqual(2, len(engine.kpis))
+        self.assertIsInstance(
+            engine.single_point_evaluator, GaussProbeEvaluator)
+        self.assertIsInstance(engine.optimizer, ScipyOptimizer)
+
+    def test_optimize_process(self):
+        self.mocked_optimizer.warm_start = False
+        serial_results = list(self.mocked_optimizer.optimize())
+
+        self.mocked_optimizer.concurrency_mode = "Process"
+        self.mocked_optimizer.max_workers = 2
+        self.mocked_optimizer.preserve_order = True
+        ordered_results = list(self.mocked_optimizer.optimize())
+        self.assertEqual(len(serial_results), len(ordered_results))
+        for serial, ordered in zip(serial_results, ordered_results):
+            np.testing.assert_allclose(serial[0], ordered[0])
+            np.testing.assert_allclose(serial[1], ordered[1])
+            self.assertEqual(serial[2], ordered[2])
+
+        self.mocked_optimizer.preserve_order = False
+        results = list(self.mocked_optimizer.optimize())
+        self.assertCountEqual(
+            [weights for _, _, weights in serial_results],
+            [weights for _, _, weights in results],
+        )
+
+    def test_optimize_derivatives(self):
+        self.mocked_optimizer.use_derivatives = False
+        self.mocked_optimizer.single_point_evaluator = CountingEvaluator()
+        reference_results = list(self.mocked_optimizer.optimize())
+        reference_count = (
+            self.mocked_optimizer.single_point_evaluator.count)
+
+        evaluator = DifferentiableGaussProbeEvaluator()
+        self.mocked_optimizer.single_point_evaluator = evaluator
+        self.mocked_optimizer.use_derivatives = True
+        results = list(self.mocked_optimizer.optimize())
+
+        # All the evaluations compute the Jacobian, instead of estimating
+        # the gradients by finite differences
+        self.assertEqual(evaluator.count, evaluator.jacobian_count)
+        self.assertLess(evaluator.count, reference_count)
+        self.assertEqual(len(reference_results), len(results))
+        for reference, result in zip(reference_results, results):
+            np.testing.assert_allclose(reference[0], result[0], atol=1e-5)
+            np.testing.assert_allclose(reference[1], result[1], atol=1e-8)
+
+        # Derivatives are only computed on request
+        self.mocked_optimizer.use_derivatives = False
+        evaluator.jacobian_count = 0
+        list(self.mocked_optimizer.optimize())
+        self.assertEqual(0, evaluator.jacobian_count)
+
+    def test_optimize_unavailable_derivatives(self):
+        evaluator = CountingEvaluator()
+        self.mocked_optimizer.single_point_evaluator = evaluator
+        list(self.mocked_optimizer.optimize())
+        reference_count = evaluator.count
+
+        # Missing Jacobians fall back to finite differences, without
+        # evaluating any point again
+        evaluator = NonDifferentiableEvaluator()
+        self.mocked_optimizer.single_point_evaluator = evaluator
+        self.mocked_optimizer.use_derivatives = True
+        list(self.mocked_optimizer.optimize())
+        self.assertEqual(reference_count, evaluator.count)
+        self.assertEqual(
+            evaluator.count, len(self.mocked_optimizer.evaluation_archive))
+
+    def test_weighted_score_gradient(self):
+        self.mocked_optimizer.use_derivatives = True
+        self.assertIsNone(
+            self.mocked_optimizer._weighted_score_gradient(
+                [0.5, 0.5, 0.5, 0.5], [1.0, 1.0])
+        )
+        self.mocked_optimizer.single_point_evaluator = (
+            DifferentiableGaussProbeEvaluator())
+        gradient = self.mocked_optimizer._weighted_score_gradient(
+            [0.5, 0.5, 0.5, 0.5], [1.0, 2.0])
+        np.testing.assert_allclose([0.34, -0.68, 0.0, 0.0], gradient)
+
+    def test_optimize_evaluation_archive(self):
+        evaluator = CountingEvaluator()
+        self.mocked_optimizer.single_point_evaluator = evaluator
+        results = list(self.mocked_optimizer.optimize())
+
+        # Scaling and weighted optimization runs share the archive, so
+        # that no point is evaluated twice
+        archive = self.mocked_optimizer.evaluation_archive
+        self.assertEqual(evaluator.count, len(archive))
+        self.assertGreater(archive.hits, len(results))
+
+    def test_optimize_evaluation_budget(self):
+        evaluator = CountingEvaluator()
+        self.mocked_optimizer.single_point_evaluator = evaluator
+        reference_results = list(self.mocked_optimizer.optimize())
+        reference_count = evaluator.count
+
+        evaluator.count = 0
+        self.mocked_optimizer.evaluation_budget = reference_count // 3
+        results = list(self.mocked_optimizer.optimize())
+        self.assertLessEqual(evaluator.count, reference_count // 3)
+        self.assertEqual(
+            evaluator.count, self.mocked_optimizer.evaluation_count)
+        self.assertGreater(len(results), 0)
+        self.assertLessEqual(len(results), len(reference_results))
+        for point, kpis, _ in results:
+            np.testing.assert_allclose(
+                GaussProbeEvaluator().evaluate(point), kpis)
+
+        # The weighted optimizations are skipped once the budget is
+        # exhausted by the scaling runs
+        evaluator.count = 0
+        self.mocked_optimizer.evaluation_budget = 1
+        self.assertEqual([], list(self.mocked_optimizer.optimize()))
+        self.assertEqual(1, evaluator.count)
+
+    def test_optimize_resume(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        path = os.path.join(tmp_dir, "checkpoint.pkl")
+        self.mocked_optimizer.warm_start = False
+        self.mocked_optimizer.space_search_mode = "Dirichlet"
+
+        evaluator = CheckpointEvaluator(OptimizationCheckpoint(path=path))
+        self.mocked_optimizer.single_point_evaluator = evaluator
+        reference_results = list(self.mocked_optimizer.optimize())
+        state = evaluator.checkpoint.engine_state
+        self.assertEqual(
+            len(reference_results), len(state["completed_weights"]))
+        self.assertEqual(
+            len(evaluator.checkpoint.evaluations), evaluator.count)
+        # The random weights are rebuilt from their seed when resuming
+        self.assertNotIn("weights_samples", state)
+        self.assertIsInstance(state["space_search_seed"], int)
+
+        # Interrupt the optimization after two of its weighted runs
+        completed = state["completed_weights"][:2]
+        state["completed_weights"] = completed
+        evaluator.checkpoint.save()
+
+        checkpoint = OptimizationCheckpoint(path=path)
+        checkpoint.load()
+        evaluator = CheckpointEvaluator(checkpoint)
+        self.mocked_optimizer.single_point_evaluator = evaluator
+        with mock.patch.object(
+                WeightedOptimizerEngine, "get_scaling_factors") as mock_scale:
+            results = list(self.mocked_optimizer.optimize())
+        mock_scale.assert_not_called()
+
+        # The remaining runs, with the random weights of the interrupted
+        # optimization, are replayed from the restored evaluations
+        self.assertEqual(0, evaluator.count)
+        scaled_completed = [
+            tuple(np.multiply(weights, state["scaling_factors"]))
+            for weights in completed
+        ]
+        reference = {
+            tuple(weights): point
+            for point, _, weights in reference_results
+            if tuple(weights) not in scaled_completed
+        }
+        self.assertEqual(len(reference_results) - 2, len(reference))
+        self.assertCountEqual(
+            reference, [tuple(weights) for _, _, weights in results])
+        for point, _, weights in results:
+            np.testing.assert_allclose(reference[tuple(weights)], point)
+
+    def test_scaling_factors_evaluation_budget(self):
+        # Scaling runs ended by the budget before finding distinct
+        # extrema fall back to the default scaling factors
+        self.mocked_optimizer.kpis[0].scale_factor = 2.0
+        self.mocked_optimizer.evaluation_budget = 1
+        self.mocked_optimizer.start_budget()
+        self.mocked_optimizer._runs_left = 2
+        self.assertEqual(
+            [2.0, 1.0], self.mocked_optimizer.get_scaling_factors())
+
+    def test_optimize_time_limit(self):
+        evaluator = CountingEvaluator()
+        self.mocked_optimizer.single_point_evaluator = evaluator
+        self.mocked_optimizer.time_limit = 20.0
+        # Each evaluation takes a second
+        with mock.patch(
+                "force_bdss.mco.optimizer_engines.base_optimizer_engine"
+                ".time.monotonic", side_effect=lambda: evaluator.count):
+            results = list(self.mocked_optimizer.optimize())
+        self.assertLessEqual(evaluator.count, 20)
+        self.assertGreater(len(results), 0)
+
+        evaluator.count = 0
+        self.mocked_optimizer.time_limit = 0.0
+        self.assertEqual([], list(self.mocked_optimizer.optimize()))
+        self.assertEqual(0, evaluator.count)
+
+    def test_finite_difference_process_evaluation_budget(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        evaluator = FileCountingEvaluator(os.path.join(tmp_dir, "count"))
+        self.mocked_optimizer.single_point_evaluator = evaluator
+        self.mocked_optimizer.optimizer.gradient_mode = "FiniteDifference"
+        self.mocked_optimizer.optimizer.concurrency_mode = "Process"
+        self.mocked_optimizer.optimizer.max_workers = 2
+        self.mocked_optimizer.evaluation_budget = 30
+
+        results = list(self.mocked_optimizer.optimize())
+        self.assertGreater(len(results), 0)
+        # The finite differences evaluated by the worker processes are
+        # archived, counted and limited by the engine
+        archive = self.mocked_optimizer.evaluation_archive
+        self.assertLessEqual(evaluator.count, 30)
+        self.assertEqual(evaluator.count, len(archive))
+        self.assertEqual(
+            evaluator.count, self.mocked_optimizer.evaluation_count)
+
+    def test_optimize_process_evaluation_budget(self):
+        self.mocked_optimizer.concurrency_mode = "Process"
+        self.mocked_optimizer.max_workers = 2
+        self.mocked_optimizer.evaluation_budget = 100
+        results = list(self.mocked_optimizer.optimize())
+        self.assertGreater(len(results), 0)
+        self.assertLessEqual(self.mocked_optimizer.evaluation_count, 100)
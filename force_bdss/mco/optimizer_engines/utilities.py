@@ -38,3 +38,98 @@ def convert_to_score(array, kpis):
 
     np_array = np.where(np_kpi_mask == "MAXIMISE", -np_array, np_array)
     return np.where(np_kpi_mask == "TARGET", np.abs(np_array), np_array)
+
+
+def convert_jacobian_to_score(jacobian, array, kpis):
+    """ Given the `jacobian` of the raw (KPI) values in `array` with
+    respect to the parameters, and `kpis`, return the Jacobian of the
+    scores returned by `convert_to_score`.
+
+    Parameters
+    ----------
+    jacobian: array_like
+        K x P Jacobian of the K KPI values with respect to P parameters
+    array: List[int, float], np.array
+        array of (KPI) values
+    kpis: List of KPISpecification
+        list of KPI specification
+
+    Returns
+    --------
+    score_jacobian: np.array
+        New K x P array with the rows corresponding to
+        kpi.objective == 'MAXIMISE' inverted, and those with
+        kpi.objective == 'TARGET' multiplied by the sign of
+        _a - kpi.target_value
+    """
+    signs = []
+    for value, kpi in zip(array, kpis):
+        if kpi.objective == "MAXIMISE":
+            signs.append(-1.0)
+        elif kpi.objective == "TARGET":
+            if kpi.target_value is not None:
+                value = value - kpi.target_value
+            signs.append(np.sign(value))
+        else:
+            signs.append(1.0)
+    return np.asarray(signs)[:, None] * np.asarray(jacobian, dtype=float)
+
+
+def non_dominated_mask(scores, chunk_size=1024):
+    """ Given an array of `scores` returned by `convert_to_score`, return
+    which of them are not dominated by any other. A score dominates
+    another if none of its entries is larger and at least one is smaller.
+
+    Parameters
+    ----------
+    scores: array_like
+        N x K array of the minimization scores of N points
+    chunk_size: int
+        Number of points compared with all the others at once, which
+        bounds the memory used to chunk_size x N x K
+
+    Returns
+    --------
+    mask: np.array
+        Boolean array of length N, True for the Pareto-efficient points
+    """
+    scores = np.asarray(scores, dtype=float)
+    mask = np.ones(len(scores), dtype=bool)
+    for start in range(0, len(scores), chunk_size):
+        chunk = scores[start:start + chunk_size]
+        no_worse = (scores[None, :, :] <= chunk[:, None, :]).all(axis=2)
+        better = (scores[None, :, :] < chunk[:, None, :]).any(axis=2)
+        mask[start:start + chunk_size] = ~(no_worse & better).any(axis=1)
+    return mask
+
+
+def kpi_score_bounds(kpis):
+    """ Given the `kpis`, return the bounds of the scores returned by
+    `convert_to_score` for the KPIs whose values are bounded.
+
+    Parameters
+    ----------
+    kpis: List of KPISpecification
+        list of KPI specification
+
+    Returns
+    --------
+    lower, upper: np.array
+        Lowest and highest score of each KPI whose `use_bounds` is set,
+        and NaN for the other KPIs
+    """
+    lower = np.full(len(kpis), np.nan)
+    upper = np.full(len(kpis), np.nan)
+    bound_scores = np.array([
+        convert_to_score([kpi.lower_bound for kpi in kpis], kpis),
+        convert_to_score([kpi.upper_bound for kpi in kpis], kpis),
+    ], dtype=float).reshape(2, len(kpis))
+    for index, kpi in enumerate(kpis):
+        if not kpi.use_bounds:
+            continue
+        lower[index] = bound_scores[:, index].min()
+        upper[index] = bound_scores[:, index].max()
+        if (kpi.objective == "TARGET"
+                and kpi.lower_bound <= kpi.target_value <= kpi.upper_bound):
+            lower[index] = 0.0
+    return lower, upper
@@ -1,21 +1,34 @@
 #  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
 #  All rights reserved.
 
+import inspect
 import logging
+import time
+from concurrent.futures import as_completed
 from functools import partial
 
 import numpy as np
+from scipy.spatial import cKDTree
 
-from traits.api import Enum, Str, Instance
+from traits.api import (
+    Any, Bool, Dict, Either, Enum, Float, Instance, Int, List, Set, Str
+)
 
 from force_bdss.api import PositiveInt
+from force_bdss.core.worker_pool import create_worker_pool
 from force_bdss.mco.optimizer_engines.space_sampling import (
-    UniformSpaceSampler,
     DirichletSpaceSampler,
+    HaltonSpaceSampler,
+    LatinHypercubeSpaceSampler,
+    SobolSpaceSampler,
+    UniformSpaceSampler,
 )
 from force_bdss.mco.optimizers.i_optimizer import IOptimizer
 
-from .base_optimizer_engine import BaseOptimizerEngine
+from .base_optimizer_engine import (
+    BaseOptimizerEngine,
+    EvaluationBudgetExhausted,
+)
 
 log = logging.getLogger(__name__)
 
@@ -55,10 +68,95 @@ def sen_scaling_method(dimension, weighted_optimize):
         for _, optimal_kpis in weighted_optimize(weights):
             extrema[i] += np.asarray(optimal_kpis)
 
-    scaling_factors = np.reciprocal(extrema.max(0) - extrema.min(0))
+    # KPIs whose extrema are equal get infinite scaling factors
+    with np.errstate(divide="ignore"):
+        scaling_factors = np.reciprocal(extrema.max(0) - extrema.min(0))
     return scaling_factors
 
 
+def simplex_adjacency_order(weights_samples):
+    """ Orders weight vectors so that each one is followed by the nearest
+    of the remaining ones, starting from the first. Ties are broken in
+    favour of the vector with the fewest remaining nearest neighbours,
+    which avoids dead ends, so that successive samples of the grid of a
+    UniformSpaceSampler are neighbours on the simplex.
+
+    Parameters
+    ----------
+    weights_samples: list of list of float
+        The weight vectors to order
+
+    Returns
+    -------
+    order: list of int
+        The indices of the weight vectors, in their new order
+    """
+    samples = np.asarray(weights_samples, dtype=float)
+    if len(samples) == 0:
+        return []
+
+    # Only the distances from the last ordered sample are computed at each
+    # step, and the k-d tree finds the neighbours of tied candidates, so
+    # that the memory grows linearly with the number of samples
+    tree = cKDTree(samples)
+    neighbours = {}
+    remaining = np.ones(len(samples), dtype=bool)
+    order = [0]
+    remaining[0] = False
+    for _ in range(len(samples) - 1):
+        candidate_distances = np.abs(samples - samples[order[-1]]).sum(axis=1)
+        candidate_distances[~remaining] = np.inf
+        step = candidate_distances.min()
+        tolerance = 1e-8 + 1e-5 * step
+        nearest = np.flatnonzero(candidate_distances <= step + tolerance)
+        if len(nearest) > 1:
+            n_neighbours = _count_neighbours(
+                tree, samples, remaining, nearest, step, tolerance,
+                neighbours)
+            index = int(nearest[np.argmin(n_neighbours)])
+        else:
+            index = int(nearest[0])
+        order.append(index)
+        remaining[index] = False
+    return order
+
+
+def _count_neighbours(tree, samples, remaining, indices, step, tolerance,
+                      cache):
+    """ Counts, for each sample in `indices`, the remaining samples at an
+    l1-distance `step` from it, within `tolerance`. The neighbours found
+    for a given step are kept in `cache`, since the step of a regular grid
+    is the same throughout the ordering."""
+    counts = []
+    for index in indices:
+        cached_step, neighbours = cache.get(index, (np.inf, None))
+        if abs(cached_step - step) > tolerance:
+            neighbours = np.asarray(tree.query_ball_point(
+                samples[index], step + tolerance, p=1), dtype=int)
+            distances = np.abs(
+                samples[neighbours] - samples[index]).sum(axis=1)
+            neighbours = neighbours[np.abs(distances - step) <= tolerance]
+            cache[index] = (step, neighbours)
+        counts.append(np.count_nonzero(remaining[neighbours]))
+    return counts
+
+
+def _weighted_optimize_results(engine, weights, x0, kwargs,
+                               evaluation_budget=None, deadline=None):
+    """ Performs the weighted optimization of a pickled `engine` with
+    `weights` in a worker process, within its share of the
+    `evaluation_budget` and before the `deadline` (as returned by
+    `time.time`), and returns all of its results along with the number of
+    objective and KPI evaluations."""
+    engine.evaluation_budget = evaluation_budget
+    engine.time_limit = (
+        None if deadline is None else max(deadline - time.time(), 0.0)
+    )
+    engine.start_budget()
+    results = list(engine._weighted_optimize(weights, x0=x0, **kwargs))
+    return results, engine._score_count, engine.evaluation_count
+
+
 class WeightedOptimizerEngine(BaseOptimizerEngine):
     """ A priori multi-objective optimization.
 
@@ -78,6 +176,12 @@ class WeightedOptimizerEngine(BaseOptimizerEngine):
     to calculate its "scale".
     2) weight = scale x uniform-random-variate[0, 1), where
     SUM(variates) over objectives = 1.0
+
+    The `evaluation_budget` and `time_limit` are shared between the
+    scaling runs and the weighted optimizations: each run is given an
+    equal share of what is left when it starts. A run whose share is
+    exhausted ends with the best point it has evaluated, and the weight
+    samples left once the whole budget is exhausted are skipped.
     """
 
     #: Optimizer name
@@ -90,12 +194,75 @@ class WeightedOptimizerEngine(BaseOptimizerEngine):
     scaling_method = Str("sen_scaling_method")
 
     #: Space search distribution for weight points sampling
-    space_search_mode = Enum("Uniform", "Dirichlet")
+    space_search_mode = Enum(
+        "Uniform", "Dirichlet", "Sobol", "Halton", "LatinHypercube"
+    )
+
+    #: Seed of the random and quasi-random space search distributions.
+    #: If None, the samples differ at every optimization.
+    space_search_seed = Either(None, Int)
 
     #: IOptimizer class that provides library backend for optimizing a
     #: callable
     optimizer = Instance(IOptimizer, transient=True)
 
+    #: Concurrency backend of the weight sweep. In "Process" mode, the
+    #: weighted optimizations are solved concurrently in worker processes,
+    #: which requires the engine, including its optimizer and evaluator,
+    #: to be picklable. The scaling factors are always calculated in the
+    #: calling process.
+    concurrency_mode = Enum("Serial", "Process")
+
+    #: Maximum number of worker processes of the weight sweep. If None,
+    #: the number of processors is used.
+    max_workers = Either(None, PositiveInt)
+
+    #: Yield the results of a concurrent weight sweep in the order of the
+    #: weight samples, rather than as soon as they are completed
+    preserve_order = Bool(False)
+
+    #: Start each weighted optimization from the optimum already found
+    #: for the nearest weights, rather than from the initial parameter
+    #: values. Only used if the optimizer accepts a starting point `x0`.
+    warm_start = Bool(True)
+
+    #: Use the KPI Jacobians of evaluators providing an
+    #: `evaluate_with_jacobian` method as the gradients of the weighted
+    #: objectives, if the optimizer accepts a `gradient`. Where they are
+    #: not available, the optimizer falls back to finite differences.
+    use_derivatives = Bool(False)
+
+    #: Number of objective evaluations of each weighted optimization of
+    #: the last `optimize` call, by weights
+    evaluation_counts = Dict(visible=False, transient=True)
+
+    #: Mean number of objective evaluations of the cold-started scaling
+    #: runs of the last `optimize` call, or 0 if none of them completed
+    cold_start_evaluations = Float(visible=False, transient=True)
+
+    #: (weights, optimal point) pairs of the weighted optimizations solved
+    #: during the current `optimize` call
+    _solved_optima = List(transient=True)
+
+    #: Number of objective evaluations of the cold-started scaling runs
+    _cold_start_counts = List(Int, transient=True)
+
+    #: Weights, as tuples, of the weighted optimizations completed during
+    #: the current `optimize` call, or before the optimization was resumed.
+    #: Only recorded when the evaluator has a checkpoint.
+    _completed_weights = Set(transient=True)
+
+    #: Total number of objective evaluations performed by the engine
+    _score_count = Int(0, transient=True)
+
+    #: Number of runs of the current `optimize` call that have not
+    #: started yet, between which the budget left is shared
+    _runs_left = Int(1, transient=True)
+
+    #: Weighted score and point of the best evaluation of the current
+    #: weighted optimization
+    _run_best = Any(transient=True)
+
     def optimize(self, **kwargs):
         """ Generates optimization results.
 
@@ -105,23 +272,281 @@ class WeightedOptimizerEngine(BaseOptimizerEngine):
             Point of evaluation, objective value, weights
         """
 
-        #: Get non-zero weight combinations for each KPI
-        scaling_factors = self.get_scaling_factors()
-
-        #: loop through weight combinations
-        for weights in self.weights_samples():
-            log.info("Doing MCO run with weights: {}".format(weights))
+        # The evaluation archive and budget are shared by the scaling and
+        # weighted optimization runs
+        self.evaluation_archive.clear()
+        self.start_budget()
+        self.restore_evaluations()
+        self._solved_optima = []
+        self._cold_start_counts = []
+        self._completed_weights = set()
+        self.evaluation_counts = {}
+
+        # A resumed optimization reuses the weights and scaling factors
+        # of the interrupted one, and skips its completed runs
+        checkpoint = self._checkpoint()
+        state = {} if checkpoint is None else dict(checkpoint.engine_state)
+
+        self._completed_weights = {
+            tuple(weights) for weights in state.get("completed_weights", [])
+        }
+        weights_samples = [
+            list(weights)
+            for weights in self._checkpoint_weights_samples(state)
+            if tuple(weights) not in self._completed_weights
+        ]
+
+        scaling_factors = state.get("scaling_factors")
+        if scaling_factors is None:
+            self._runs_left = len(self.kpis) + len(weights_samples)
+            #: Get non-zero weight combinations for each KPI
+            scaling_factors = self.get_scaling_factors()
+            self._save_progress(
+                scaling_factors=scaling_factors,
+                solved_optima=list(self._solved_optima),
+                cold_start_counts=list(self._cold_start_counts),
+            )
+        else:
+            self._runs_left = len(weights_samples)
+            self._solved_optima = list(state["solved_optima"])
+            self._cold_start_counts = list(state["cold_start_counts"])
+        # No scaling run completes when the budget is exhausted by the first
+        self.cold_start_evaluations = (
+            float(np.mean(self._cold_start_counts))
+            if self._cold_start_counts else 0.0
+        )
+        if self.concurrency_mode == "Serial" and self._warm_start_enabled():
+            # Solve neighbouring weights one after the other, so that
+            # each optimization can start from the previous optimum
+            weights_samples = [
+                weights_samples[index]
+                for index in simplex_adjacency_order(weights_samples)
+            ]
 
-            #: multiply weights by scales
-            scaled_weights = [
+        #: multiply weights by scales
+        runs = [
+            (weights, [
                 weight * scale
                 for weight, scale in zip(weights, scaling_factors)
-            ]
+            ])
+            for weights in weights_samples
+        ]
+
+        if self.concurrency_mode == "Process":
+            yield from self._concurrent_sweep(runs, **kwargs)
+            return
+
+        #: loop through weight combinations
+        for index, (weights, scaled_weights) in enumerate(runs):
+            if not self._start_run():
+                log.warning(
+                    "Evaluation budget exhausted after {} evaluations: "
+                    "skipping the {} remaining MCO runs".format(
+                        self.evaluation_count, len(runs) - index)
+                )
+                break
+            log.info("Doing MCO run with weights: {}".format(scaled_weights))
 
             #: optimize
+            start_count = self._score_count
             for point, kpis in self._weighted_optimize(
-                    scaled_weights, **kwargs):
+                    scaled_weights,
+                    x0=self._warm_start_point(weights),
+                    **kwargs):
+                self._solved_optima.append((weights, point))
+                self._record_evaluations(
+                    scaled_weights, self._score_count - start_count
+                )
                 yield point, kpis, scaled_weights
+            self._complete_run(weights)
+
+    def evaluation_statistics(self, weights):
+        """ Returns the number of objective evaluations of the weighted
+        optimization with `weights`, and the number of evaluations saved
+        by its warm start, relative to the mean of the cold-started
+        scaling runs.
+
+        Parameters
+        ----------
+        weights: list of float
+            Weights yielded by `optimize`
+
+        Returns
+        -------
+        statistics: dict
+            The "evaluations" and "evaluation_reduction", which can be
+            passed on to a WeightedMCOProgressEvent
+        """
+        evaluations = self.evaluation_counts[tuple(weights)]
+        return {
+            "evaluations": evaluations,
+            "evaluation_reduction": self.cold_start_evaluations - evaluations,
+        }
+
+    def _concurrent_sweep(self, runs, **kwargs):
+        """ Solves the weighted optimizations of each of the `runs`, made
+        of the weights and scaled weights, in a pool of worker processes.
+        Warm starts are taken from the optima of the scaling runs.
+
+        Yields
+        ----------
+        optimization result: tuple(np.array, np.array, list)
+            Point of evaluation, objective value, weights
+        """
+        # The runs are solved concurrently, so the evaluations left are
+        # split between them upfront, and they all end by the deadline
+        budgets = [None] * len(runs)
+        remaining = self.remaining_evaluations()
+        if remaining is not None:
+            budgets = [
+                remaining // len(runs) + (index < remaining % len(runs))
+                for index in range(len(runs))
+            ]
+        remaining_time = self.remaining_time()
+        deadline = (
+            None if remaining_time is None else time.time() + remaining_time
+        )
+
+        worker_pool = create_worker_pool("Process", self.max_workers)
+        futures = {}
+        try:
+            for (weights, scaled_weights), budget in zip(runs, budgets):
+                if budget == 0:
+                    log.warning(
+                        "Evaluation budget exhausted: skipping MCO run "
+                        "with weights: {}".format(scaled_weights)
+                    )
+                    continue
+                log.info(
+                    "Submitting MCO run with weights: {}".format(
+                        scaled_weights)
+                )
+                future = worker_pool.submit(
+                    _weighted_optimize_results,
+                    self,
+                    scaled_weights,
+                    self._warm_start_point(weights),
+                    kwargs,
+                    budget,
+                    deadline,
+                )
+                futures[future] = (weights, scaled_weights)
+
+            if self.preserve_order:
+                completed = iter(futures)
+            else:
+                completed = as_completed(futures)
+
+            for future in completed:
+                weights, scaled_weights = futures[future]
+                results, evaluations, kpi_evaluations = future.result()
+                self.evaluation_count += kpi_evaluations
+                self._record_evaluations(scaled_weights, evaluations)
+                for point, kpis in results:
+                    yield point, kpis, scaled_weights
+                self._complete_run(weights)
+        finally:
+            # Do not wait for the remaining optimizations if the
+            # generator is closed early
+            for future in futures:
+                future.cancel()
+            worker_pool.shutdown()
+
+    def _record_evaluations(self, scaled_weights, evaluations):
+        self.evaluation_counts[tuple(scaled_weights)] = evaluations
+        log.info(
+            "MCO run with weights {} took {} evaluations ({:.1f} fewer "
+            "than the cold-started scaling runs)".format(
+                scaled_weights,
+                evaluations,
+                self.cold_start_evaluations - evaluations,
+            )
+        )
+
+    def _complete_run(self, weights):
+        """ Records the weighted optimization with `weights` as completed
+        in the checkpoint of the evaluator, if any."""
+        if self._checkpoint() is None:
+            return
+        self._completed_weights.add(tuple(weights))
+        self._save_progress(
+            completed_weights=list(self._completed_weights),
+            solved_optima=list(self._solved_optima),
+        )
+
+    def _checkpoint_weights_samples(self, state):
+        """ Generates the weights samples, the same as those of the
+        interrupted optimization when resuming from the engine `state`.
+        Rather than the weights, the checkpoint of the evaluator keeps the
+        seed of the random and quasi-random distributions, which is drawn
+        if `space_search_seed` is None."""
+        if self.space_search_mode == "Uniform":
+            return self.weights_samples()
+        seed = state.get("space_search_seed", self.space_search_seed)
+        if seed is None and self._checkpoint() is not None:
+            seed = int(np.random.randint(2 ** 31))
+        self._save_progress(space_search_seed=seed)
+        return self.weights_samples(seed=seed)
+
+    def _save_progress(self, **state):
+        """ Updates the engine state saved in the checkpoint of the
+        evaluator, if any."""
+        checkpoint = self._checkpoint()
+        if checkpoint is not None:
+            checkpoint.update_engine_state(**state)
+
+    def _start_run(self):
+        """ Limits the run about to start to its share of the budget
+        left, and returns whether it can evaluate any new point."""
+        self.share_budget(self._runs_left)
+        self._runs_left = max(self._runs_left - 1, 1)
+        return not self.budget_exhausted()
+
+    def _warm_start_enabled(self):
+        """ Whether warm starts are enabled and supported by the
+        optimizer."""
+        return self.warm_start and self._optimizer_accepts("x0")
+
+    def _gradient_enabled(self):
+        """ Whether the KPI Jacobians of the evaluator are used as the
+        gradients of the weighted objectives."""
+        return (
+            self._jacobian_evaluator() is not None
+            and self._optimizer_accepts("gradient")
+        )
+
+    def _optimizer_accepts(self, argument):
+        """ Whether the `optimize_function` method of the optimizer
+        accepts the keyword `argument`."""
+        try:
+            signature = inspect.signature(self.optimizer.optimize_function)
+        except (TypeError, ValueError):
+            return False
+        return argument in signature.parameters
+
+    def _warm_start_point(self, weights):
+        """ Returns the optimal point already found for the weights the
+        nearest to `weights`, or None if the optimization should not be
+        warm-started."""
+        if not self._solved_optima or not self._warm_start_enabled():
+            return None
+        distances = [
+            np.abs(np.subtract(solved_weights, weights)).sum()
+            for solved_weights, _ in self._solved_optima
+        ]
+        return self._solved_optima[int(np.argmin(distances))][1]
+
+    def _scaling_optimize(self, weights):
+        """ Performs a cold-started weighted optimization for the scaling
+        method, recording its optimum and number of evaluations."""
+        # Scaling runs are performed even once the budget is exhausted,
+        # since the scaling factors need an optimum of every KPI
+        self._start_run()
+        start_count = self._score_count
+        for point, kpis in self._weighted_optimize(weights):
+            self._solved_optima.append((list(weights), point))
+            yield point, kpis
+        self._cold_start_counts.append(self._score_count - start_count)
 
     def weights_samples(self, **kwargs):
         """ Generates necessary number of search space sample points
@@ -130,7 +555,7 @@ class WeightedOptimizerEngine(BaseOptimizerEngine):
             **kwargs
         ).generate_space_sample()
 
-    def _weighted_optimize(self, weights, **kwargs):
+    def _weighted_optimize(self, weights, x0=None, **kwargs):
         """ Performs single scipy.minimize operation on the dot product of
         the multiobjective function with `weights`.
 
@@ -138,16 +563,18 @@ class WeightedOptimizerEngine(BaseOptimizerEngine):
         ----------
         weights: List[Float]
             Weights for each KPI objective
+        x0: list, optional
+            MCO parameter values to start the optimization from. If None,
+            the optimizer starts from the initial parameter values.
 
         Returns
         ----------
         optimization result: tuple(np.array, np.array)
-            Point of evaluation, and objective values
+            Point of evaluation, and objective values. If the budget is
+            exhausted before the optimizer returns any point, the best
+            point evaluated so far is returned instead.
         """
 
-        # Clear the KPI cache at the start of the optimization
-        self._kpi_cache = {}
-
         log.info(
             "Running optimisation."
             + "Initial point: {}".format(self.initial_parameter_value)
@@ -158,21 +585,49 @@ class WeightedOptimizerEngine(BaseOptimizerEngine):
         weighted_score_func = partial(
             self._weighted_score, weights=weights)
 
-        # optimize and evaluate
-        for point in self.optimizer.optimize_function(
-                weighted_score_func,
-                self.parameters,
-                **kwargs):
-
-            # retrieve the function at the optimal point
-            kpis = self.retrieve_result(point)
+        if x0 is not None:
+            log.info("Warm start point: {}".format(x0))
+            kwargs["x0"] = x0
+        if self._gradient_enabled():
+            kwargs["gradient"] = partial(
+                self._weighted_score_gradient, weights=weights)
+        if self._optimizer_accepts("batch_function"):
+            # Only the workflow is evaluated by the workers of the
+            # optimizer, so that the engine archives and counts the
+            # evaluations, and enforces its budget
+            kwargs["batch_function"] = partial(
+                self._weighted_score_batch, weights=weights)
 
-            log.info(
-                "Optimal point : {}".format(point)
-                + "KPIs at optimal point : {}".format(kpis)
-            )
-
-            yield point, kpis
+        # optimize and evaluate
+        self._run_best = None
+        n_results = 0
+        try:
+            for point in self.optimizer.optimize_function(
+                    weighted_score_func,
+                    self.parameters,
+                    **kwargs):
+
+                # retrieve the function at the optimal point
+                kpis = self.retrieve_result(point)
+
+                log.info(
+                    "Optimal point : {}".format(point)
+                    + "KPIs at optimal point : {}".format(kpis)
+                )
+
+                n_results += 1
+                yield point, kpis
+        except EvaluationBudgetExhausted as exception:
+            log.warning("{}: ending the MCO run with weights {}".format(
+                exception, weights))
+            if n_results == 0 and self._run_best is not None:
+                point = self._run_best[1]
+                kpis = self.retrieve_result(point)
+                log.info(
+                    "Best point so far : {}".format(point)
+                    + "KPIs at best point : {}".format(kpis)
+                )
+                yield point, kpis
 
     def _weighted_score(self, input_point, weights):
         """ Calculates the weighted score of the KPI vector at `input_point`,
@@ -180,12 +635,46 @@ class WeightedOptimizerEngine(BaseOptimizerEngine):
 
         # Calculate the value of the raw objective function
         score = self._score(input_point)
-
-        # Return the score to be minimized
+        return self._record_weighted_score(input_point, score, weights)
+
+    def _weighted_score_batch(self, input_points, worker_pool, weights):
+        """ Calculates the weighted scores at `input_points`, evaluating
+        the points that are not archived concurrently with the
+        `worker_pool`. EvaluationBudgetExhausted is raised before any
+        evaluation if the budget does not allow all of them."""
+        missing = {
+            self._get_kpi_cache_key(point): point for point in input_points
+            if self.evaluation_archive.get(point, count=False) is None
+        }
+        if missing:
+            self._check_budget(pending=len(missing) - 1)
+        kpi_values = self._evaluate_batch(input_points, worker_pool)
+        return [
+            self._record_weighted_score(
+                point, self._minimization_score(kpis), weights)
+            for point, kpis in zip(input_points, kpi_values)
+        ]
+
+    def _record_weighted_score(self, input_point, score, weights):
+        """ Returns the dot product of the minimization `score` at
+        `input_point` with `weights`, and keeps track of the best point
+        of the run."""
+        self._score_count += 1
         score = np.dot(weights, score)
         log.info("Weighted score: {}".format(score))
+        if self._run_best is None or score < self._run_best[0]:
+            self._run_best = (score, input_point)
         return score
 
+    def _weighted_score_gradient(self, input_point, weights):
+        """ Calculates the gradient of the weighted score at `input_point`
+        from the KPI Jacobian of the evaluator, or returns None if it is
+        not available."""
+        jacobian = self._score_jacobian(input_point)
+        if jacobian is None:
+            return None
+        return np.dot(weights, jacobian)
+
     def get_scaling_factors(self):
         """ Calculates scaling factors for KPIs, defined in MCO.
         Scaling factors are calculated (as required) by the provided scaling
@@ -210,11 +699,21 @@ class WeightedOptimizerEngine(BaseOptimizerEngine):
         #: call of the .optimize method.
         #: Then, calculate scaling factors defined by the `scaling_method`
         scaling_factors = scaling_method(
-            len(self.kpis), self._weighted_optimize
+            len(self.kpis), self._scaling_optimize
         )
 
-        #: Apply the scaling factors where necessary
-        auto_scales = [kpi.auto_scale for kpi in self.kpis]
+        #: Apply the scaling factors where necessary. Scaling runs ended
+        #: by the budget may not find distinct extrema, in which case the
+        #: default scaling factors are kept.
+        auto_scales = np.array(
+            [kpi.auto_scale for kpi in self.kpis], dtype=bool
+        )
+        if not np.isfinite(scaling_factors[auto_scales]).all():
+            log.warning(
+                "Invalid KPI scaling factors {}: using the default scaling "
+                "factors instead".format(scaling_factors)
+            )
+            auto_scales &= np.isfinite(scaling_factors)
         default_scaling_factors[auto_scales] = scaling_factors[auto_scales]
 
         log.info(
@@ -231,6 +730,15 @@ class WeightedOptimizerEngine(BaseOptimizerEngine):
             distribution = UniformSpaceSampler
         elif self.space_search_mode == "Dirichlet":
             distribution = DirichletSpaceSampler
+        elif self.space_search_mode == "Sobol":
+            distribution = SobolSpaceSampler
+        elif self.space_search_mode == "Halton":
+            distribution = HaltonSpaceSampler
+        elif self.space_search_mode == "LatinHypercube":
+            distribution = LatinHypercubeSpaceSampler
         else:
             raise NotImplementedError
+
+        if distribution is not UniformSpaceSampler:
+            kwargs.setdefault("seed", self.space_search_seed)
         return distribution(len(self.kpis), self.num_points, **kwargs)
@@ -0,0 +1,207 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+from collections import deque
+import logging
+import threading
+
+from traits.api import Any, Bool, HasStrictTraits, Instance, provides
+
+from force_bdss.mco.optimizer_engines.evaluation_archive import point_key
+from force_bdss.mco.optimizers.i_ask_tell_optimizer import IAskTellOptimizer
+from force_bdss.mco.optimizers.i_optimizer import IOptimizer
+
+log = logging.getLogger(__name__)
+
+
+class OptimizationStopped(Exception):
+    """Raised in the objective function of an adapted optimizer when its
+    optimization is stopped."""
+
+
+class _Request:
+    """An evaluation requested by an adapted optimizer, waiting for its
+    objective value."""
+
+    __slots__ = ("point", "value", "told")
+
+    def __init__(self, point):
+        self.point = point
+        self.value = None
+        self.told = False
+
+
+@provides(IAskTellOptimizer)
+class CallbackAskTellAdapter(HasStrictTraits):
+    """ Drives an IOptimizer, which calls the objective function itself,
+    through the ask/tell protocol.
+
+    The optimizer runs in a background thread, where each call of the
+    objective function waits until the point it evaluates is asked and
+    its value is told. Optimizers that call the objective function from
+    several threads, such as a ScipyOptimizer evaluating its finite
+    differences in "Thread" concurrency mode, propose several points at
+    once.
+    """
+
+    #: The adapted optimizer
+    optimizer = Instance(IOptimizer)
+
+    #: Condition protecting the requests, and notified whenever they
+    #: change or the optimization ends
+    _condition = Any()
+
+    #: Requests of the optimizer that were not asked yet
+    _requests = Any()
+
+    #: Asked requests waiting for their value, by point key
+    _asked = Any()
+
+    #: Optimal points yielded by the optimizer
+    _results = Any()
+
+    #: Whether the optimization has ended
+    _finished = Bool(True)
+
+    #: Whether the optimization was stopped
+    _stopped = Bool(False)
+
+    #: Exception raised by the optimizer, if any
+    _error = Any()
+
+    #: Thread running the optimizer
+    _thread = Any()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._condition = threading.Condition()
+        self._reset()
+
+    def start(self, params, **kwargs):
+        """ Starts the optimization of the adapted optimizer in a
+        background thread. Any running optimization is stopped first.
+
+        Parameters
+        ----------
+        params: list of BaseMCOParameter objects
+            The BaseMCOParameter objects corresponding to the values.
+        kwargs:
+            Additional options passed to `optimize_function`.
+        """
+        self.stop()
+        self._reset()
+        self._finished = False
+        self._thread = threading.Thread(
+            target=self._run, args=(params, kwargs), daemon=True
+        )
+        self._thread.start()
+
+    def ask(self, n_points=1):
+        """ Returns up to `n_points` points requested by the optimizer,
+        waiting for a request if no asked point is waiting for its value.
+        """
+        with self._condition:
+            while not (self._requests or self._finished
+                       or self._n_pending()):
+                self._condition.wait()
+            self._raise_error()
+
+            points = []
+            while self._requests and len(points) < n_points:
+                request = self._requests.popleft()
+                self._asked.setdefault(
+                    point_key(request.point), deque()
+                ).append(request)
+                points.append(request.point)
+            return points
+
+    def tell(self, point, value):
+        """ Returns the objective `value` of an asked `point` to the
+        optimizer."""
+        key = point_key(point)
+        with self._condition:
+            requests = self._asked.get(key)
+            if not requests:
+                raise ValueError(
+                    "Point {} was not asked, or was already told".format(
+                        point)
+                )
+            request = requests.popleft()
+            if not requests:
+                del self._asked[key]
+            request.value = value
+            request.told = True
+            self._condition.notify_all()
+
+    def is_finished(self):
+        """ Returns whether the optimizer has returned, and all its
+        requests were told."""
+        with self._condition:
+            return (
+                self._finished and not self._requests
+                and not self._n_pending()
+            )
+
+    def result(self):
+        """ Returns the optimal points yielded by the optimizer so far."""
+        with self._condition:
+            self._raise_error()
+            return list(self._results)
+
+    def stop(self):
+        """ Stops the optimization, and waits for the optimizer to
+        return."""
+        thread = self._thread
+        if thread is None:
+            return
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        thread.join()
+        self._thread = None
+
+    def _run(self, params, kwargs):
+        """ Runs the optimizer to completion in the background thread."""
+        try:
+            for point in self.optimizer.optimize_function(
+                    self._objective, params, **kwargs):
+                with self._condition:
+                    self._results.append(point)
+        except OptimizationStopped:
+            log.info("Optimization stopped")
+        except Exception as e:
+            log.exception("The adapted optimizer raised an exception")
+            with self._condition:
+                self._error = e
+        finally:
+            with self._condition:
+                self._finished = True
+                self._condition.notify_all()
+
+    def _objective(self, point):
+        """ Objective function passed to the optimizer, which waits for
+        the value of `point` to be told."""
+        request = _Request(point)
+        with self._condition:
+            self._requests.append(request)
+            self._condition.notify_all()
+            while not (request.told or self._stopped):
+                self._condition.wait()
+            if not request.told:
+                raise OptimizationStopped()
+        return request.value
+
+    def _n_pending(self):
+        return sum(len(requests) for requests in self._asked.values())
+
+    def _raise_error(self):
+        if self._error is not None:
+            raise self._error
+
+    def _reset(self):
+        self._requests = deque()
+        self._asked = {}
+        self._results = []
+        self._finished = True
+        self._stopped = False
+        self._error = None
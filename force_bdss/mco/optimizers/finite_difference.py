@@ -0,0 +1,174 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+import numpy as np
+from traits.api import Any, Callable, Either, Enum, Float, HasStrictTraits, Int
+
+#: Finite difference schemes supported by the FiniteDifferenceGradient
+FINITE_DIFFERENCE_SCHEMES = ("forward", "central")
+
+#: Default relative step of each scheme, as used by SciPy
+DEFAULT_RELATIVE_STEPS = {
+    "forward": np.finfo(float).eps ** 0.5,
+    "central": np.finfo(float).eps ** (1 / 3),
+}
+
+
+class FiniteDifferenceGradient(HasStrictTraits):
+    """ Estimates the gradient of a scalar objective function by finite
+    differences, evaluating all the perturbed points of a gradient at
+    once through a worker pool.
+
+    The objective value at the last point passed to `objective` is
+    remembered, so that a gradient at the same point does not evaluate
+    it again. Steps that would leave the `bounds` are taken in the
+    opposite direction. If an `analytic_gradient` is provided, finite
+    differences are only used at the points where it is not available.
+
+    If a `batch_function` is provided, the perturbed points are passed to
+    it all at once, along with the `worker_pool`, instead of mapping the
+    `function` over the pool. This lets callers whose objective function
+    updates some state, such as an optimizer engine archiving and
+    counting its evaluations, only send the evaluations to the workers.
+    """
+
+    #: Objective function, which takes a one dimensional array and
+    #: returns a scalar
+    function = Callable()
+
+    #: Exact gradient of the objective function, which takes a one
+    #: dimensional array and returns the partial derivatives, or None
+    #: if they are not available at that point
+    analytic_gradient = Callable()
+
+    #: Objective function of several points, which takes a list of one
+    #: dimensional arrays and the `worker_pool`, and returns the list of
+    #: their scalar values
+    batch_function = Callable()
+
+    #: Finite difference scheme. Forward differences evaluate one
+    #: perturbed point per variable and central differences two, but
+    #: are more accurate.
+    scheme = Enum(*FINITE_DIFFERENCE_SCHEMES)
+
+    #: Step relative to the magnitude of each variable (and absolute for
+    #: variables smaller than one). If None, the default step of the
+    #: `scheme` is used.
+    step = Either(None, Float)
+
+    #: Sequence of (lower, upper) bounds of each variable, or None if
+    #: the variables are unbounded
+    bounds = Any()
+
+    #: Executor evaluating the perturbed points, or None to evaluate
+    #: them in the calling thread
+    worker_pool = Any()
+
+    #: Number of evaluations of the objective function
+    n_evaluations = Int(0)
+
+    #: Last point evaluated by `objective`, and its objective value
+    _last_point = Any()
+    _last_value = Any()
+
+    def objective(self, x):
+        """ Evaluates the objective function at `x`, and remembers its
+        value for the gradient at the same point."""
+        value = self.function(x)
+        self.n_evaluations += 1
+        self._last_point = np.array(x, dtype=float)
+        self._last_value = value
+        return value
+
+    def gradient(self, x):
+        """ Returns the gradient of the objective function at `x`, from
+        the `analytic_gradient` if available, or else estimated by finite
+        differences.
+
+        Parameters
+        ----------
+        x: numpy.array
+            The point where the gradient is estimated
+
+        Returns
+        -------
+        gradient: numpy.array
+            The partial derivative of the objective for each variable
+        """
+        if self.analytic_gradient is not None:
+            gradient = self.analytic_gradient(x)
+            if gradient is not None:
+                return np.asarray(gradient, dtype=float)
+
+        x = np.array(x, dtype=float)
+        steps, one_sided = self._steps(x)
+
+        # Perturbed points: the forward (or one sided) point of each
+        # variable, followed by the backward points of the central ones
+        identity = np.eye(len(x))
+        points = list(x + steps[:, None] * identity)
+        central = np.flatnonzero(~one_sided)
+        points.extend(x - steps[i] * identity[i] for i in central)
+
+        base_value = None
+        if one_sided.any():
+            if (self._last_point is not None
+                    and np.array_equal(self._last_point, x)):
+                base_value = self._last_value
+            else:
+                points.append(x)
+
+        values = self._evaluate(points)
+        if base_value is None and one_sided.any():
+            base_value = values.pop()
+
+        forward_values = np.asarray(values[:len(x)], dtype=float)
+        backward_values = np.asarray(values[len(x):], dtype=float)
+
+        # Use the exactly representable steps between the points
+        forward_steps = (x + steps) - x
+        gradient = np.empty(len(x))
+        gradient[one_sided] = (
+            forward_values[one_sided] - base_value
+        ) / forward_steps[one_sided]
+        backward_steps = x[central] - (x[central] - steps[central])
+        gradient[central] = (
+            forward_values[central] - backward_values
+        ) / (forward_steps[central] + backward_steps)
+        return gradient
+
+    def _steps(self, x):
+        """ Returns the signed step of each variable of `x`, and whether
+        it uses a one sided difference."""
+        step = self.step
+        if step is None:
+            step = DEFAULT_RELATIVE_STEPS[self.scheme]
+        steps = step * np.maximum(1.0, np.abs(x))
+        one_sided = np.full(len(x), self.scheme == "forward")
+
+        if self.bounds is None:
+            return steps, one_sided
+
+        lower, upper = (
+            np.array(bound, dtype=float) for bound in zip(*self.bounds)
+        )
+        if self.scheme == "forward":
+            backward = (x + steps > upper) & (x - steps >= lower)
+            steps[backward] *= -1
+        else:
+            # Central differences that would leave the bounds fall back
+            # to one sided differences inside them
+            outside = (x - steps < lower) | (x + steps > upper)
+            one_sided[outside] = True
+            backward = outside & (x + steps > upper) & (x - steps >= lower)
+            steps[backward] *= -1
+        return steps, one_sided
+
+    def _evaluate(self, points):
+        """ Returns the objective values at `points`."""
+        self.n_evaluations += len(points)
+        if self.batch_function is not None:
+            return list(self.batch_function(points, self.worker_pool))
+        if self.worker_pool is None:
+            return [self.function(point) for point in points]
+        return list(self.worker_pool.map(self.function, points))
@@ -0,0 +1,80 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+import abc
+import logging
+
+from traits.api import Interface
+
+log = logging.getLogger(__name__)
+
+
+class IAskTellOptimizer(Interface):
+    """ An optimizer that proposes the points to evaluate, and is told
+    their objective values, rather than calling the objective function
+    itself. Several points can be evaluated at the same time, so that an
+    optimizer engine can keep a pool of workers busy.
+    """
+
+    @abc.abstractmethod
+    def start(self, params, **kwargs):
+        """ Starts a new optimization.
+
+        Parameters
+        ----------
+        params: list of BaseMCOParameter objects
+            The BaseMCOParameter objects corresponding to the values.
+        kwargs:
+            Additional options of the optimizer.
+        """
+
+    @abc.abstractmethod
+    def ask(self, n_points=1):
+        """ Proposes points to evaluate.
+
+        Parameters
+        ----------
+        n_points: int
+            The maximum number of points to propose
+
+        Returns
+        -------
+        points: list of lists of BaseMCOParameter values
+            The points to evaluate. The list is empty if the optimizer
+            has finished, or needs the values of the points already
+            proposed to propose new ones. When no proposed point is
+            waiting for its value, at least one point is proposed unless
+            the optimizer has finished.
+        """
+
+    @abc.abstractmethod
+    def tell(self, point, value):
+        """ Reports the objective value of a proposed point.
+
+        Parameters
+        ----------
+        point: list of BaseMCOParameter values
+            A point returned by `ask`
+        value: float or list of float
+            The objective value at the point
+        """
+
+    @abc.abstractmethod
+    def is_finished(self):
+        """ Returns whether the optimization has finished."""
+
+    @abc.abstractmethod
+    def result(self):
+        """ Returns the optimal points found so far.
+
+        Returns
+        -------
+        points: list of lists of BaseMCOParameter values
+            The optimal points, in the order they were found. Points found
+            later are appended to the list.
+        """
+
+    @abc.abstractmethod
+    def stop(self):
+        """ Abandons the optimization. Points proposed and not yet told
+        are discarded."""
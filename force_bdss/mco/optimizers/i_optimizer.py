@@ -24,6 +24,13 @@ class IOptimizer(Interface):
             signature: func(<list of BaseMCOParameter values>)
         params: list of BaseMCOParameter objects
             The BaseMCOParameter objects corresponding to the values.
+        kwargs:
+            Additional options of the optimizer. Optimizers supporting
+            warm starts accept the values of the BaseMCOParameter objects
+            to start from as `x0`, and optimizers using gradients accept
+            the `gradient` of the objective function, which returns its
+            partial derivatives with respect to the flattened values, or
+            None where they are not available.
 
         Yields
         ------
@@ -4,11 +4,20 @@
 import numpy as np
 from functools import partial
 from traits.api import (
+    Either,
     Enum,
+    Float,
     provides,
     HasStrictTraits
 )
 
+from force_bdss.core.worker_pool import WORKER_POOL_MODES, create_worker_pool
+from force_bdss.local_traits import PositiveInt
+from force_bdss.mco.optimizers.finite_difference import (
+    FINITE_DIFFERENCE_SCHEMES,
+    FiniteDifferenceGradient,
+)
+
 from force_bdss.mco.parameters.mco_parameters import (
     RangedMCOParameter,
     RangedVectorMCOParameter
@@ -25,6 +34,12 @@ SCIPY_ALGORITHMS_KEYS = [
     "trust-ncg", "trust-exact", "trust-krylov"
 ]
 
+#: Algorithms that use the gradient of the objective function
+SCIPY_GRADIENT_ALGORITHMS = [
+    "SLSQP", "CG", "BFGS", "Newton-CG", "L-BFGS-B", "TNC",
+    "trust-constr", "dogleg", "trust-ncg", "trust-exact", "trust-krylov"
+]
+
 
 class ScipyTypeError(Exception):
     pass
@@ -38,7 +53,30 @@ class ScipyOptimizer(HasStrictTraits):
     #: Algorithms available to work with
     algorithms = Enum(*SCIPY_ALGORITHMS_KEYS)
 
-    def optimize_function(self, func, params):
+    #: How the gradient of the objective is estimated by the gradient
+    #: based algorithms. With "SciPy", SciPy evaluates the finite
+    #: difference points one at a time. With "FiniteDifference", they are
+    #: evaluated concurrently by a worker pool of `concurrency_mode`, and
+    #: the objective value at the base point is reused.
+    gradient_mode = Enum("SciPy", "FiniteDifference")
+
+    #: Finite difference scheme of the "FiniteDifference" gradient mode
+    finite_difference_scheme = Enum(*FINITE_DIFFERENCE_SCHEMES)
+
+    #: Relative step of the "FiniteDifference" gradient mode. If None,
+    #: the default step of the scheme is used.
+    finite_difference_step = Either(None, Float)
+
+    #: Concurrency backend evaluating the finite difference points. The
+    #: "Process" mode requires a picklable objective function.
+    concurrency_mode = Enum(*WORKER_POOL_MODES)
+
+    #: Maximum number of workers evaluating the finite difference points.
+    #: If None, the default of the concurrent.futures executor is used.
+    max_workers = Either(None, PositiveInt)
+
+    def optimize_function(self, func, params, x0=None, gradient=None,
+                          batch_function=None):
         """ Minimize the passed function.
 
         Parameters
@@ -50,6 +88,25 @@ class ScipyOptimizer(HasStrictTraits):
             return (objectives) will be summed.
         params: list of MCOParameter
             The MCO parameter objects corresponding to the parameter values.
+        x0: list of float or list, optional
+            The MCO parameter values to start the minimization from, for
+            instance the optimal point of a similar function. Values out
+            of the parameter bounds are clipped. If None, the initial
+            values of the parameters are used.
+        gradient: Callable, optional
+            The gradient of `func`, used by the gradient based algorithms.
+            Takes a list of MCO parameter values, and returns the partial
+            derivatives of the objective with respect to the flattened
+            parameter values, or None if they are not available at that
+            point, in which case they are estimated by finite differences.
+        batch_function: Callable, optional
+            Evaluates `func` at several points at once, in the
+            "FiniteDifference" gradient mode. Takes a list of lists of MCO
+            parameter values and the worker pool of the optimizer, and
+            returns the list of objective values. If None, `func` itself
+            is evaluated by the worker pool, which for the "Process"
+            concurrency mode requires it to be picklable and free of side
+            effects.
 
         Yields
         ------
@@ -72,21 +129,77 @@ class ScipyOptimizer(HasStrictTraits):
         tfunc = partial(self.translated_function, func=func, params=params)
 
         # get the initial parameter values and their bounds.
-        x0, bounds = self.get_initial_and_bounds(params)
+        initial_values, bounds = self.get_initial_and_bounds(params)
+        if x0 is None:
+            x0 = initial_values
+        else:
+            lower_bounds, upper_bounds = zip(*bounds)
+            x0 = np.clip(
+                self.translate_mco_to_array(x0, params),
+                lower_bounds,
+                upper_bounds
+            )
 
         # optimize the function
-        optimization_result = scipy_optimize.minimize(
-            tfunc,
-            x0,
-            method=self.algorithms,
-            bounds=bounds
-        )
+        if gradient is not None:
+            gradient = partial(
+                self.translated_gradient, gradient=gradient, params=params)
+        if batch_function is not None:
+            batch_function = partial(
+                self.translated_batch_function,
+                batch_function=batch_function,
+                params=params
+            )
+        if (self.algorithms in SCIPY_GRADIENT_ALGORITHMS
+                and (gradient is not None
+                     or self.gradient_mode == "FiniteDifference")):
+            optimization_result = self._minimize_with_gradient(
+                tfunc, x0, bounds, gradient, batch_function)
+        else:
+            optimization_result = scipy_optimize.minimize(
+                tfunc,
+                x0,
+                method=self.algorithms,
+                bounds=bounds
+            )
 
         # get the optimal point (list of optimal parameter values)
         optimal_point = self.translate_array_to_mco(
             optimization_result.x, params)
         yield optimal_point
 
+    def _minimize_with_gradient(self, tfunc, x0, bounds, tgradient=None,
+                                tbatch_function=None):
+        """ Minimizes `tfunc` with its gradient `tgradient`, where it is
+        available, or estimated by finite differences otherwise. The
+        finite differences are only evaluated concurrently in the
+        "FiniteDifference" gradient mode, by `tbatch_function` if
+        provided."""
+        worker_pool = None
+        if self.gradient_mode == "FiniteDifference":
+            worker_pool = create_worker_pool(
+                self.concurrency_mode, self.max_workers)
+        gradient = FiniteDifferenceGradient(
+            function=tfunc,
+            analytic_gradient=tgradient,
+            batch_function=tbatch_function,
+            scheme=self.finite_difference_scheme,
+            step=self.finite_difference_step,
+            bounds=bounds,
+            worker_pool=worker_pool
+        )
+        try:
+            return scipy_optimize.minimize(
+                gradient.objective,
+                x0,
+                method=self.algorithms,
+                jac=gradient.gradient,
+                bounds=bounds
+            )
+        finally:
+            if worker_pool is not None:
+                worker_pool.shutdown()
+
     def translated_function(self, array, func, params):
         """ A wrapper around the MCO function, where the
         MCO parameter list is replaced by a numpy array.
@@ -120,6 +233,63 @@ class ScipyOptimizer(HasStrictTraits):
 
         return objective
 
+    def translated_batch_function(self, arrays, worker_pool,
+                                  batch_function, params):
+        """ A wrapper around the batch evaluation of the MCO function,
+        where the MCO parameter lists are replaced by numpy arrays.
+
+        Parameters
+        ----------
+        arrays: list of numpy.array
+            The numpy arrays.
+        worker_pool: concurrent.futures.Executor or None
+            The executor evaluating the points.
+        batch_function: Callable
+            The batch evaluation of the MCO function, that takes a list of
+            lists of MCO parameter values and the `worker_pool`.
+        params: list of MCOParameter
+            The MCO parameter objects corresponding to the parameter values.
+
+        Return
+        ------
+        objectives: list of float
+            The result of the objective function at each point, summed
+            if it is not scalar.
+        """
+        param_values = [
+            self.translate_array_to_mco(array, params) for array in arrays
+        ]
+        return [
+            objective if np.isscalar(objective) else np.sum(objective)
+            for objective in batch_function(param_values, worker_pool)
+        ]
+
+    def translated_gradient(self, array, gradient, params):
+        """ A wrapper around the gradient of the MCO function, where the
+        MCO parameter list is replaced by a numpy array.
+
+        Parameters
+        ----------
+        array: numpy.array
+            The numpy array.
+        gradient: Callable
+            The gradient of the MCO function, that takes a list of MCO
+            parameter values.
+        params: list of MCOParameter
+            The MCO parameter objects corresponding to the parameter values.
+
+        Return
+        ------
+        gradient: numpy.array or None
+            The partial derivatives of the objective with respect to each
+            entry of `array`, or None if they are not available.
+        """
+        param_values = self.translate_array_to_mco(array, params)
+        derivatives = gradient(param_values)
+        if derivatives is None:
+            return None
+        return np.asarray(derivatives, dtype=float).ravel()
+
     @staticmethod
     def verify_mco_parameters(params):
         """ Verify that all the MCO parameters are either
@@ -0,0 +1,128 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+import time
+from unittest import TestCase
+
+from force_bdss.mco.optimizers.ask_tell_adapter import (
+    CallbackAskTellAdapter
+)
+from force_bdss.mco.optimizers.i_ask_tell_optimizer import IAskTellOptimizer
+from force_bdss.mco.optimizers.scipy_optimizer import ScipyOptimizer
+from force_bdss.mco.parameters.mco_parameters import (
+    RangedMCOParameterFactory,
+    RangedVectorMCOParameter,
+    RangedVectorMCOParameterFactory,
+)
+from force_bdss.tests.dummy_classes.mco import DummyMCOFactory
+from force_bdss.tests.probe_classes.optimizer import ProbeOptimizer
+
+
+class FailingOptimizer(ProbeOptimizer):
+
+    def optimize_function(self, func, params):
+        func([0.0])
+        raise ValueError("Optimizer failure")
+
+
+class TestCallbackAskTellAdapter(TestCase):
+
+    def setUp(self):
+        self.factory = DummyMCOFactory({"id": "pid", "name": "Plugin"})
+        self.parameters = [
+            RangedMCOParameterFactory(self.factory).create_model(
+                {"lower_bound": 0.0, "upper_bound": 1.0,
+                 "initial_value": 0.5}
+            )
+        ] * 2
+        self.adapter = CallbackAskTellAdapter(optimizer=ProbeOptimizer())
+        self.addCleanup(self.adapter.stop)
+
+    def test_provides(self):
+        self.assertIsInstance(self.adapter, IAskTellOptimizer)
+
+    def test_ask_tell(self):
+        self.adapter.start(self.parameters)
+        self.assertFalse(self.adapter.is_finished())
+
+        n_points = 0
+        while True:
+            points = self.adapter.ask(4)
+            if not points:
+                break
+            # The probe optimizer evaluates one point at a time
+            self.assertEqual([[0.5, 0.5]], points)
+            # Asked points must be told before new ones are proposed
+            self.assertEqual([], self.adapter.ask(4))
+            self.adapter.tell(points[0], 1.0)
+            n_points += 1
+
+        self.assertEqual(10, n_points)
+        self.assertTrue(self.adapter.is_finished())
+        self.assertEqual([[0.5, 0.5]] * 10, self.adapter.result())
+
+    def test_tell_not_asked(self):
+        self.adapter.start(self.parameters)
+        with self.assertRaises(ValueError):
+            self.adapter.tell([0.1, 0.1], 1.0)
+
+    def test_optimizer_error(self):
+        self.adapter.optimizer = FailingOptimizer()
+        self.adapter.start(self.parameters)
+        point, = self.adapter.ask()
+        self.adapter.tell(point, 1.0)
+        with self.assertLogs("force_bdss.mco.optimizers.ask_tell_adapter"):
+            with self.assertRaisesRegex(ValueError, "Optimizer failure"):
+                while self.adapter.ask():
+                    pass
+
+    def test_stop(self):
+        self.adapter.start(self.parameters)
+        self.assertEqual(1, len(self.adapter.ask()))
+        self.adapter.stop()
+        self.assertEqual([], self.adapter.result())
+
+        # The adapter can be started again
+        self.adapter.start(self.parameters)
+        self.assertEqual(1, len(self.adapter.ask()))
+
+    def test_concurrent_requests(self):
+        # Finite differences evaluated in threads are proposed together
+        parameters = [RangedVectorMCOParameter(
+            factory=RangedVectorMCOParameterFactory(self.factory),
+            dimension=3,
+            lower_bound=[-2, -2, -2],
+            upper_bound=[2, 2, 2],
+            initial_value=[1, 1, 1]
+        )]
+        self.adapter.optimizer = ScipyOptimizer(
+            gradient_mode="FiniteDifference",
+            finite_difference_scheme="central",
+            concurrency_mode="Thread",
+            max_workers=6,
+        )
+        self.adapter.start(parameters)
+
+        batch_sizes = []
+        pending = []
+        while True:
+            points = self.adapter.ask(6)
+            if not points and not pending:
+                break
+            pending.extend(points)
+            if points:
+                # Give the other threads of a gradient time to propose
+                # their points before telling the values
+                time.sleep(0.01)
+                continue
+            batch_sizes.append(len(pending))
+            for point in pending:
+                self.adapter.tell(
+                    point, sum(value ** 2 for value in point[0]))
+            pending = []
+
+        self.assertGreater(max(batch_sizes), 1)
+        x, y, z = self.adapter.result()[0][0]
+        self.assertAlmostEqual(x, 0.0, places=3)
+        self.assertAlmostEqual(y, 0.0, places=3)
+        self.assertAlmostEqual(z, 0.0, places=3)
@@ -0,0 +1,107 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+import numpy as np
+
+from force_bdss.mco.optimizers.finite_difference import (
+    FiniteDifferenceGradient
+)
+
+
+def cubic(x):
+    return float(np.sum(x ** 3) + x[0] * x[-1])
+
+
+def cubic_gradient(x):
+    gradient = 3 * x ** 2
+    gradient[0] += x[-1]
+    gradient[-1] += x[0]
+    return gradient
+
+
+class TestFiniteDifferenceGradient(TestCase):
+
+    def test_forward(self):
+        gradient = FiniteDifferenceGradient(function=cubic)
+        x = np.array([0.5, -1.0, 2.0])
+        np.testing.assert_allclose(
+            cubic_gradient(x), gradient.gradient(x), rtol=1e-6)
+
+        # One perturbed point per variable, and the base point
+        self.assertEqual(4, gradient.n_evaluations)
+
+    def test_forward_reuses_base_point(self):
+        gradient = FiniteDifferenceGradient(function=cubic)
+        x = np.array([0.5, -1.0, 2.0])
+        self.assertEqual(cubic(x), gradient.objective(x))
+        gradient.gradient(x)
+        self.assertEqual(4, gradient.n_evaluations)
+
+    def test_central(self):
+        gradient = FiniteDifferenceGradient(function=cubic, scheme="central")
+        x = np.array([0.5, -1.0, 2.0])
+        np.testing.assert_allclose(
+            cubic_gradient(x), gradient.gradient(x), rtol=1e-9)
+
+        # Two perturbed points per variable, and no base point
+        self.assertEqual(6, gradient.n_evaluations)
+
+    def test_step(self):
+        gradient = FiniteDifferenceGradient(
+            function=cubic, step=1e-3)
+        x = np.array([0.5, -1.0, 2.0])
+        # The truncation error of forward differences is proportional
+        # to the step
+        error = np.abs(cubic_gradient(x) - gradient.gradient(x))
+        self.assertTrue(np.all(error > 1e-4))
+        self.assertTrue(np.all(error < 1e-1))
+
+    def test_bounds(self):
+        points = []
+
+        def function(x):
+            points.append(x)
+            return cubic(x)
+
+        x = np.array([0.0, 1.0])
+        for scheme in ["forward", "central"]:
+            points.clear()
+            gradient = FiniteDifferenceGradient(
+                function=function,
+                scheme=scheme,
+                bounds=[(0.0, 1.0), (0.0, 1.0)],
+            )
+            np.testing.assert_allclose(
+                cubic_gradient(x), gradient.gradient(x), rtol=1e-4)
+            for point in points:
+                self.assertTrue(np.all(point >= 0.0))
+                self.assertTrue(np.all(point <= 1.0))
+
+    def test_worker_pool(self):
+        x = np.array([0.5, -1.0, 2.0])
+        serial = FiniteDifferenceGradient(function=cubic, scheme="central")
+        with ThreadPoolExecutor(max_workers=2) as worker_pool:
+            concurrent = FiniteDifferenceGradient(
+                function=cubic, scheme="central", worker_pool=worker_pool)
+            np.testing.assert_array_equal(
+                serial.gradient(x), concurrent.gradient(x))
+
+    def test_batch_function(self):
+        x = np.array([0.5, -1.0, 2.0])
+        batches = []
+
+        def batch_function(points, worker_pool):
+            batches.append((len(points), worker_pool))
+            return [cubic(point) for point in points]
+
+        serial = FiniteDifferenceGradient(function=cubic, scheme="central")
+        with ThreadPoolExecutor(max_workers=2) as worker_pool:
+            batched = FiniteDifferenceGradient(
+                function=cubic, scheme="central", worker_pool=worker_pool,
+                batch_function=batch_function)
+            np.testing.assert_array_equal(
+                serial.gradient(x), batched.gradient(x))
+        self.assertEqual([(6, worker_pool)], batches)
@@ -16,6 +16,10 @@ from force_bdss.mco.parameters.mco_parameters import (
 )
 
 
+def shifted_paraboloid(arg):
+    return (arg[0][0] - 0.5)**2 + (arg[0][1] + 1.0)**2
+
+
 class TestScipyOptimizer(TestCase):
 
     def setUp(self):
@@ -26,6 +30,10 @@ class TestScipyOptimizer(TestCase):
 
     def test_init(self):
         self.assertEqual("SLSQP", self.optimizer.algorithms)
+        self.assertEqual("SciPy", self.optimizer.gradient_mode)
+        self.assertEqual("forward", self.optimizer.finite_difference_scheme)
+        self.assertIsNone(self.optimizer.finite_difference_step)
+        self.assertEqual("Serial", self.optimizer.concurrency_mode)
 
     def test_verify_mco_parameters(self):
         optimizer = ScipyOptimizer()
@@ -65,3 +73,122 @@ class TestScipyOptimizer(TestCase):
             x, y = point[0]
             self.assertAlmostEqual(x, 0.0)
             self.assertAlmostEqual(y, 0.0)
+
+    def test_optimize_function_x0(self):
+
+        factory = RangedVectorMCOParameterFactory(self.factory)
+
+        params = [RangedVectorMCOParameter(
+            factory=factory,
+            name='coordinates',
+            dimension=2,
+            lower_bound=[-2, -2],
+            upper_bound=[2, 2],
+            initial_value=[1, 1]
+        )]
+
+        starts = []
+
+        def function(arg):
+            starts.append(arg)
+            return (arg[0][0] - 0.5)**2 + arg[0][1]**2
+
+        # The starting point is clipped to the bounds
+        for point in self.optimizer.optimize_function(
+                function, params, x0=[[0.5, -3.0]]):
+            x, y = point[0]
+            self.assertAlmostEqual(x, 0.5)
+            self.assertAlmostEqual(y, 0.0)
+
+        self.assertEqual([[0.5, -2.0]], starts[0])
+
+    def _vector_parameters(self):
+        factory = RangedVectorMCOParameterFactory(self.factory)
+        return [RangedVectorMCOParameter(
+            factory=factory,
+            name='coordinates',
+            dimension=2,
+            lower_bound=[-2, -2],
+            upper_bound=[2, 2],
+            initial_value=[1, 1]
+        )]
+
+    def test_optimize_function_finite_difference(self):
+        params = self._vector_parameters()
+        evaluations = {}
+
+        def function(arg):
+            evaluations[mode] += 1
+            return shifted_paraboloid(arg)
+
+        for mode in ["SciPy", "FiniteDifference"]:
+            evaluations[mode] = 0
+            self.optimizer.gradient_mode = mode
+            for point in self.optimizer.optimize_function(function, params):
+                x, y = point[0]
+                self.assertAlmostEqual(x, 0.5, places=3)
+                self.assertAlmostEqual(y, -1.0, places=3)
+
+        # The objective at the base point of each gradient is reused
+        self.assertLessEqual(
+            evaluations["FiniteDifference"], evaluations["SciPy"])
+
+    def test_optimize_function_concurrent(self):
+        params = self._vector_parameters()
+        self.optimizer.gradient_mode = "FiniteDifference"
+        self.optimizer.max_workers = 2
+
+        for scheme in ["forward", "central"]:
+            self.optimizer.finite_difference_scheme = scheme
+            for mode in ["Thread", "Process"]:
+                self.optimizer.concurrency_mode = mode
+                for point in self.optimizer.optimize_function(
+                        shifted_paraboloid, params):
+                    x, y = point[0]
+                    self.assertAlmostEqual(x, 0.5, places=3)
+                    self.assertAlmostEqual(y, -1.0, places=3)
+
+    def test_optimize_function_gradient_free(self):
+        # Algorithms that do not use gradients ignore the gradient mode
+        params = self._vector_parameters()
+        self.optimizer.algorithms = "Nelder-Mead"
+        self.optimizer.gradient_mode = "FiniteDifference"
+        for point in self.optimizer.optimize_function(
+                shifted_paraboloid, params):
+            x, y = point[0]
+            self.assertAlmostEqual(x, 0.5, places=3)
+            self.assertAlmostEqual(y, -1.0, places=3)
+
+    def test_optimize_function_gradient(self):
+        params = self._vector_parameters()
+        evaluations = []
+        gradients = []
+
+        def function(arg):
+            evaluations.append(arg)
+            return shifted_paraboloid(arg)
+
+        def gradient(arg):
+            gradients.append(arg)
+            return [2 * (arg[0][0] - 0.5), 2 * (arg[0][1] + 1.0)]
+
+        for point in self.optimizer.optimize_function(
+                function, params, gradient=gradient):
+            x, y = point[0]
+            self.assertAlmostEqual(x, 0.5, places=3)
+            self.assertAlmostEqual(y, -1.0, places=3)
+
+        # No finite differences are evaluated: the gradients are only
+        # requested at evaluated points
+        self.assertLessEqual(len(gradients), len(evaluations))
+        for arg in gradients:
+            self.assertIn(arg, evaluations)
+
+        # Unavailable gradients are estimated by finite differences
+        evaluations.clear()
+        for point in self.optimizer.optimize_function(
+                function, params, gradient=lambda arg: None):
+            x, y = point[0]
+            self.assertAlmostEqual(x, 0.5, places=3)
+            self.assertAlmostEqual(y, -1.0, places=3)
+        self.assertGreater(len(evaluations), len(gradients))
@@ -6,6 +6,11 @@ import unittest
 from traits.testing.api import UnittestTools
 
 from force_bdss.core.data_value import DataValue
+from force_bdss.core.kpi_specification import KPISpecification
+from force_bdss.events.mco_events import (
+    MCOFinishEvent,
+    MCOProgressMetricEvent,
+)
 from force_bdss.tests.dummy_classes.factory_registry import (
     DummyFactoryRegistry,
 )
@@ -94,3 +99,77 @@ class TestBaseMCOModel(unittest.TestCase, UnittestTools):
                     [DataValue(value=2), DataValue(value=3)],
                     [DataValue(value=4), DataValue(value=5)]
                 )
+
+    def test_notify_progress_metric_events(self):
+        workflow_file = ProbeWorkflowFile(path=fixtures.get("test_probe.json"))
+        workflow_file.read()
+        mco_model = workflow_file.workflow.mco_model
+        mco_model.kpis = [
+            KPISpecification(name="bar", objective="MINIMISE"),
+            KPISpecification(name="baz", objective="MAXIMISE"),
+        ]
+        mco_model.progress_metric_interval = 2
+        events = []
+        mco_model.on_trait_change(
+            lambda event: events.append(event), "event")
+
+        mco_model.notify_start_event()
+        kpis = [[2, -2], [1, -3], [1.5, -1.5], [4, -4], [0.5, -2.5]]
+        for kpi_values in kpis:
+            mco_model.notify_progress_event(
+                [DataValue(value=0)],
+                [DataValue(value=value) for value in kpi_values]
+            )
+        mco_model.notify_finish_event()
+
+        metric_events = [
+            event for event in events
+            if isinstance(event, MCOProgressMetricEvent)
+        ]
+        self.assertEqual(3, len(metric_events))
+        self.assertIsInstance(events[-1], MCOFinishEvent)
+        self.assertEqual(
+            [2, 4, 5], [event.n_points for event in metric_events])
+        self.assertEqual(
+            [2, 2, 2], [event.front_size for event in metric_events])
+
+        # The reference point is inferred from the first two points
+        first = metric_events[0]
+        self.assertAlmostEqual(2.1, first.reference_point[0])
+        self.assertAlmostEqual(3.1, first.reference_point[1])
+        self.assertFalse(first.estimated)
+        self.assertAlmostEqual(0.21, first.hypervolume)
+        self.assertGreater(metric_events[-1].hypervolume, first.hypervolume)
+
+        # A new run starts a new front
+        events[:] = []
+        mco_model.notify_start_event()
+        mco_model.notify_progress_event(
+            [DataValue(value=0)], [DataValue(value=2), DataValue(value=2)])
+        mco_model.notify_finish_event()
+        metric_events = [
+            event for event in events
+            if isinstance(event, MCOProgressMetricEvent)
+        ]
+        self.assertEqual(1, len(metric_events))
+        self.assertEqual(1, metric_events[0].n_points)
+
+    def test_progress_metric_kpi_bounds(self):
+        workflow_file = ProbeWorkflowFile(path=fixtures.get("test_probe.json"))
+        workflow_file.read()
+        mco_model = workflow_file.workflow.mco_model
+        mco_model.kpis = [
+            KPISpecification(
+                name="bar", objective="MINIMISE", use_bounds=True,
+                lower_bound=0.0, upper_bound=4.0),
+        ]
+        mco_model.progress_metric_interval = 1
+        events = []
+        mco_model.on_trait_change(
+            lambda event: events.append(event), "event")
+
+        mco_model.notify_progress_event(
+            [DataValue(value=0)], [DataValue(value=1)])
+        self.assertIsInstance(events[-1], MCOProgressMetricEvent)
+        self.assertEqual([4.0], events[-1].reference_point)
+        self.assertEqual(3.0, events[-1].hypervolume)
@@ -0,0 +1,142 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+from unittest import TestCase
+
+import numpy as np
+
+from force_bdss.mco.hypervolume import (
+    HypervolumeTracker,
+    hypervolume,
+    hypervolume_contribution,
+)
+
+
+def grid_hypervolume(scores, reference_point, lower_point, n_cells=40):
+    """Hypervolume counted on a regular grid of cell centers"""
+    axes = [
+        np.linspace(low, high, n_cells, endpoint=False)
+        + (high - low) / (2 * n_cells)
+        for low, high in zip(lower_point, reference_point)
+    ]
+    cells = np.stack(np.meshgrid(*axes), axis=-1).reshape(
+        -1, len(reference_point))
+    dominated = np.zeros(len(cells), dtype=bool)
+    for score in scores:
+        dominated |= (cells >= score).all(axis=1)
+    cell_volume = np.prod(
+        (np.asarray(reference_point) - lower_point) / n_cells)
+    return dominated.sum() * cell_volume
+
+
+class TestHypervolume(TestCase):
+
+    def test_hypervolume_1d(self):
+        self.assertEqual(3.0, hypervolume([[1.0], [2.0]], [4.0]))
+
+    def test_hypervolume_2d(self):
+        scores = [[1.0, 3.0], [2.0, 2.0], [3.0, 1.0], [3.0, 3.0]]
+        self.assertAlmostEqual(6.0, hypervolume(scores, [4.0, 4.0]))
+        # Scores beyond the reference point do not contribute
+        self.assertAlmostEqual(
+            6.0, hypervolume(scores + [[5.0, 0.0]], [4.0, 4.0]))
+        self.assertEqual(0.0, hypervolume([[5.0, 0.0]], [4.0, 4.0]))
+
+    def test_hypervolume_3d(self):
+        self.assertAlmostEqual(
+            8.0, hypervolume([[0.0, 0.0, 0.0]], [2.0, 2.0, 2.0]))
+        # Union of two boxes of volume 4 overlapping by 2
+        self.assertAlmostEqual(
+            6.0,
+            hypervolume(
+                [[0.0, 1.0, 0.0], [1.0, 0.0, 0.0]], [2.0, 2.0, 2.0]
+            )
+        )
+
+        random_state = np.random.RandomState(0)
+        scores = random_state.random_sample((10, 3))
+        self.assertAlmostEqual(
+            grid_hypervolume(scores, [1.0, 1.0, 1.0], [0.0, 0.0, 0.0]),
+            hypervolume(scores, [1.0, 1.0, 1.0]),
+            places=2
+        )
+
+    def test_hypervolume_dimension(self):
+        with self.assertRaisesRegex(ValueError, "up to 3 KPIs"):
+            hypervolume(np.zeros((1, 4)), np.ones(4))
+
+    def test_hypervolume_contribution(self):
+        scores = np.array([[1.0, 3.0], [3.0, 1.0]])
+        self.assertAlmostEqual(
+            1.0, hypervolume_contribution([2.0, 2.0], scores, [4.0, 4.0]))
+        self.assertEqual(
+            0.0, hypervolume_contribution([3.0, 3.0], scores, [4.0, 4.0]))
+        self.assertEqual(
+            9.0, hypervolume_contribution([1.0, 1.0], [], [4.0, 4.0]))
+
+
+class TestHypervolumeTracker(TestCase):
+
+    def test_exact(self):
+        random_state = np.random.RandomState(1)
+        for dimension in [2, 3]:
+            tracker = HypervolumeTracker(
+                reference_point=np.ones(dimension))
+            scores = random_state.random_sample((200, dimension))
+            for score in scores:
+                tracker.update(score)
+            self.assertEqual(200, tracker.n_points)
+            self.assertFalse(tracker.estimated)
+            self.assertAlmostEqual(
+                hypervolume(scores, np.ones(dimension)),
+                tracker.hypervolume
+            )
+            self.assertLess(tracker.front_size, 200)
+
+    def test_update_changes(self):
+        tracker = HypervolumeTracker(reference_point=[4.0, 4.0])
+        self.assertTrue(tracker.update([2.0, 2.0]))
+        self.assertFalse(tracker.update([3.0, 3.0]))
+        self.assertTrue(tracker.update([1.0, 3.0]))
+        self.assertEqual(2, tracker.front_size)
+        self.assertAlmostEqual(5.0, tracker.hypervolume)
+
+    def test_inferred_reference_point(self):
+        tracker = HypervolumeTracker(
+            reference_point=[np.nan, 4.0], n_warmup=3)
+        self.assertFalse(tracker.update([1.0, 3.0]))
+        self.assertFalse(tracker.update([3.0, 1.0]))
+        self.assertEqual(0.0, tracker.hypervolume)
+
+        # The reference point is inferred from the first three scores
+        self.assertTrue(tracker.update([2.0, 2.0]))
+        np.testing.assert_allclose([3.2, 4.0], tracker.reference_point)
+        self.assertAlmostEqual(
+            hypervolume(
+                [[1.0, 3.0], [3.0, 1.0], [2.0, 2.0]], [3.2, 4.0]),
+            tracker.hypervolume
+        )
+
+    def test_monte_carlo(self):
+        tracker = HypervolumeTracker(
+            reference_point=np.ones(4),
+            lower_point=np.zeros(4),
+            n_samples=20000,
+            seed=0,
+        )
+        self.assertTrue(tracker.estimated)
+        tracker.update([0.5, 0.0, 0.0, 0.0])
+        tracker.update([0.0, 0.5, 0.0, 0.0])
+        # Union of two boxes of volume 1/2 overlapping by 1/4
+        self.assertAlmostEqual(0.75, tracker.hypervolume, delta=0.02)
+        self.assertEqual(2, tracker.front_size)
+
+    def test_monte_carlo_inferred_bounds(self):
+        tracker = HypervolumeTracker(
+            reference_point=np.full(4, np.nan), n_warmup=2, seed=0)
+        tracker.update([0.0, 1.0, 1.0, 1.0])
+        self.assertIsNone(tracker._samples)
+        tracker.update([1.0, 0.0, 0.0, 0.0])
+        np.testing.assert_allclose(np.full(4, -0.1), tracker.lower_point)
+        np.testing.assert_allclose(np.full(4, 1.1), tracker.reference_point)
+        self.assertGreater(tracker.hypervolume, 0.0)
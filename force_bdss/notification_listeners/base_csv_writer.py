@@ -2,6 +2,7 @@
 #  All rights reserved.
 
 import csv
+import os
 
 from traits.api import Str, Instance, List, Dict, File
 
@@ -61,9 +62,11 @@ class BaseCSVWriter(BaseNotificationListener):
         if isinstance(event, MCOStartEvent):
             # MCOStartEvent is considered to be an "initialization" event
             # for CSVWriter. Here the header is defined, and the row_data
-            # dict is instantiated with new header keys
+            # dict is instantiated with new header keys. The rows of a
+            # resumed run are appended to the existing file.
             self.header = self.parse_start_event(event)
-            self.write_to_file(self.header, mode="w")
+            if not (event.resumed and os.path.exists(self.model.path)):
+                self.write_to_file(self.header, mode="w")
             self.row_data = self._row_data_default()
         elif isinstance(event, MCOProgressEvent):
             # MCOProgressEvent is considered to output the row data to
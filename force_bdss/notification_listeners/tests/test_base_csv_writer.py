@@ -82,6 +82,37 @@ class TestCSVWriter(TestCase, UnittestTools):
 
             mock_open.assert_called_once()
 
+    def test_deliver_resumed_start_event(self):
+        mock_open = mock.mock_open()
+        event = MCOStartEvent(
+            parameter_names=[p.name for p in self.parameters],
+            kpi_names=[k.name for k in self.kpis],
+            resumed=True,
+        )
+
+        # The header is written if the previous output does not exist
+        with mock.patch(_CSVWRITER_OPEN, mock_open, create=True), \
+                mock.patch("os.path.exists", return_value=False):
+            self.notification_listener.deliver(event)
+        mock_open.assert_called_once_with(self.model.path, "w")
+
+        # Otherwise, the rows of the resumed run are appended to it
+        mock_open.reset_mock()
+        with mock.patch(_CSVWRITER_OPEN, mock_open, create=True), \
+                mock.patch("os.path.exists", return_value=True):
+            self.notification_listener.deliver(event)
+            mock_open.assert_not_called()
+            self.assertListEqual(
+                ["p1", "p2", "kpi1", "kpi2"], self.notification_listener.header
+            )
+
+            self.notification_listener.deliver(
+                MCOProgressEvent(
+                    optimal_point=self.parameters, optimal_kpis=self.kpis
+                )
+            )
+            mock_open.assert_called_once_with(self.model.path, "a")
+
     def test_deliver_weighted_mco_start_event(self):
 
         mock_open = mock.mock_open()
@@ -1,6 +1,7 @@
 #  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
 #  All rights reserved.
 
+import numpy as np
 from traits.api import (
     provides,
     Instance
@@ -28,3 +29,23 @@ class GaussProbeEvaluator:
 
     def evaluate(self, input_point):
         return (input_point[0] - 0.33) ** 2, (input_point[1] - 0.67) ** 2
+
+
+class DifferentiableGaussProbeEvaluator(GaussProbeEvaluator):
+    """Counts the evaluations of the KPIs, with and without their
+    Jacobian"""
+
+    def __init__(self):
+        self.count = 0
+        self.jacobian_count = 0
+
+    def evaluate(self, input_point):
+        self.count += 1
+        return super().evaluate(input_point)
+
+    def evaluate_with_jacobian(self, input_point):
+        self.jacobian_count += 1
+        jacobian = np.zeros((2, len(input_point)))
+        jacobian[0, 0] = 2 * (input_point[0] - 0.33)
+        jacobian[1, 1] = 2 * (input_point[1] - 0.67)
+        return self.evaluate(input_point), jacobian
@@ -4,8 +4,13 @@
 
 from traits.api import (
     HasStrictTraits,
+    Int,
+    List,
     provides
 )
+from force_bdss.mco.optimizers.i_ask_tell_optimizer import (
+    IAskTellOptimizer
+)
 from force_bdss.mco.optimizers.i_optimizer import (
     IOptimizer
 )
@@ -38,3 +43,40 @@ class ProbeOptimizer(HasStrictTraits):
         for _ in range(10):
             func(point)
             yield point
+
+
+@provides(IAskTellOptimizer)
+class ProbeAskTellOptimizer(HasStrictTraits):
+    """Proposes `n_points` points along the diagonal of the unit
+    hypercube, and returns the one with the lowest told value"""
+
+    n_points = Int(8)
+
+    points = List()
+
+    told = List()
+
+    def start(self, params, **kwargs):
+        self.points = [
+            [index / (self.n_points - 1)] * len(params)
+            for index in range(self.n_points)
+        ]
+        self.told = []
+
+    def ask(self, n_points=1):
+        asked, self.points = self.points[:n_points], self.points[n_points:]
+        return asked
+
+    def tell(self, point, value):
+        self.told.append((point, value))
+
+    def is_finished(self):
+        return not self.points and len(self.told) == self.n_points
+
+    def result(self):
+        if not self.is_finished():
+            return []
+        return [min(self.told, key=lambda told: sum(told[1]))[0]]
+
+    def stop(self):
+        self.points = []
@@ -3,9 +3,13 @@
 
 import unittest
 
-from traits.api import HasTraits, List, Str, Int, Dict
+from traits.api import (
+    HasTraits, List, Str, Int, Dict, Event, Property
+)
 
 from force_bdss.utilities import (
+    create_from_traits,
+    picklable_traits,
     pop_dunder_recursive,
     pop_recursive,
     nested_getstate,
@@ -73,3 +77,24 @@ class TestDictUtils(unittest.TestCase):
                 "string": "abc",
             },
         )
+
+    def test_picklable_traits(self):
+        class Foo(HasTraits):
+            string = Str("abc")
+            int_list = List(Int(), transient=True)
+            event = Event()
+            length = Property(Int, depends_on="int_list")
+            _private = Int(1)
+
+            def _get_length(self):
+                return len(self.int_list)
+
+        f = Foo(int_list=[1, 2, 3])
+        traits = picklable_traits(f)
+        self.assertDictEqual(
+            traits, {"string": "abc", "int_list": [1, 2, 3]}
+        )
+
+        copy = create_from_traits(Foo, traits)
+        self.assertIsInstance(copy, Foo)
+        self.assertEqual(3, copy.length)
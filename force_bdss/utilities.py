@@ -62,3 +62,26 @@ def nested_getstate(state_dict):
         except AttributeError:
             pass
     return state_dict
+
+
+def picklable_traits(has_traits):
+    """ Returns the values of the public traits of `has_traits`, including
+    the transient ones that are left out of its serialized state, so that
+    an equivalent object can be created in another process.
+
+    Private traits, properties and events are not included.
+    """
+    names = has_traits.trait_names(
+        type=lambda trait_type: trait_type not in (
+            "event", "property", "delegate"
+        )
+    )
+    return has_traits.trait_get(
+        [name for name in names if not name.startswith("_")]
+    )
+
+
+def create_from_traits(klass, traits):
+    """ Creates an instance of `klass` from the trait values returned by
+    `picklable_traits`. Used when unpickling."""
+    return klass(**traits)